@@ -0,0 +1,390 @@
+"""
+API Load Test
+
+SQLiteにプロジェクト・モデル・実験を投入し、api.py の全エンドポイントに
+プロセス内のASGIクライアントから指定した並列数でリクエストを送ります。
+エンドポイントごとのレイテンシ（p50/p95/p99）とスループット（RPS）をJSONで出力します。
+
+実行方法:
+    python -m benchmarks.api_load
+    python -m benchmarks.api_load --projects 20 --models-per-project 10 --experiments-per-model 50 \\
+        --requests 500 --concurrency 16 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.routers import api
+from src.db import migrations, models
+from src.db.database import Base, get_db
+
+
+@dataclass
+class SeedKeys:
+    """リクエストのパラメータに使う投入済みデータのキー"""
+
+    project_ids: List[str]
+    project_names: List[str]
+    model_ids: List[str]
+    model_names: List[str]
+    experiment_ids: List[str]
+    model_version_ids: List[str]
+    change_cursors: List[str]
+
+
+def seed(engine: Engine, n_projects: int, models_per_project: int, experiments_per_model: int) -> SeedKeys:
+    """
+    ベンチマーク用のデータを一括投入
+
+    Args:
+        engine: SQLAlchemyエンジン
+        n_projects: プロジェクト数
+        models_per_project: 1プロジェクトあたりのモデル数
+        experiments_per_model: 1モデルあたりの実験数
+
+    Returns:
+        投入したデータのキー
+    """
+    projects = [{"project_id": f"p{i:08d}", "project_name": f"project_{i}"} for i in range(n_projects)]
+    model_rows = [
+        {"model_id": f"m{i:08d}", "project_id": f"p{i // models_per_project:08d}", "model_name": f"model_{i}"}
+        for i in range(n_projects * models_per_project)
+    ]
+    experiments = [
+        {
+            "experiment_id": f"e{i:08d}",
+            "model_id": f"m{i // experiments_per_model:08d}",
+            "model_version_id": f"v{i:08d}",
+            "parameters": {"learning_rate": 10 ** -(i % 5), "batch_size": 2 ** (i % 8)},
+            "training_dataset": "s3://bucket/train.csv",
+            "evaluations": {"accuracy": random.random(), "loss": random.random()},
+            "artifact_file_paths": {"model": f"s3://bucket/{i}/model.onnx"},
+        }
+        for i in range(len(model_rows) * experiments_per_model)
+    ]
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.Project), projects)
+        conn.execute(insert(models.Model), model_rows)
+        if experiments:
+            conn.execute(insert(models.Experiment), experiments)
+    # 一括投入した実験をプロジェクトのサマリーと変更フィードに反映
+    migrations.create_missing_model_summaries(engine)
+    migrations.create_missing_experiment_changes(engine)
+    with engine.connect() as conn:
+        change_ids = conn.scalars(select(models.ExperimentChange.change_id).order_by(models.ExperimentChange.change_id))
+        change_cursors = [str(change_id) for change_id in change_ids]
+
+    return SeedKeys(
+        project_ids=[row["project_id"] for row in projects],
+        project_names=[row["project_name"] for row in projects],
+        model_ids=[row["model_id"] for row in model_rows],
+        model_names=[row["model_name"] for row in model_rows],
+        experiment_ids=[row["experiment_id"] for row in experiments],
+        model_version_ids=[row["model_version_id"] for row in experiments],
+        change_cursors=change_cursors,
+    )
+
+
+# (メソッド, パステンプレート) -> (投入済みキー, 通し番号) から httpx.AsyncClient.request の引数を作る関数
+RequestFactory = Callable[[SeedKeys, int], Dict[str, Any]]
+
+SCENARIOS: Dict[Tuple[str, str], RequestFactory] = {
+    ("GET", "/projects/all"): lambda keys, n: {"url": "/projects/all", "params": {"limit": 100}},
+    ("GET", "/projects/id/{project_id}"): lambda keys, n: {
+        "url": f"/projects/id/{random.choice(keys.project_ids)}"
+    },
+    ("GET", "/projects/name/{project_name}"): lambda keys, n: {
+        "url": f"/projects/name/{random.choice(keys.project_names)}"
+    },
+    ("GET", "/projects/summary/{project_id}"): lambda keys, n: {
+        "url": f"/projects/summary/{random.choice(keys.project_ids)}"
+    },
+    ("POST", "/projects"): lambda keys, n: {"url": "/projects", "json": {"project_name": f"load_project_{n}"}},
+    ("GET", "/models/all"): lambda keys, n: {"url": "/models/all", "params": {"limit": 100}},
+    ("GET", "/models/id/{model_id}"): lambda keys, n: {"url": f"/models/id/{random.choice(keys.model_ids)}"},
+    ("GET", "/models/project-id/{project_id}"): lambda keys, n: {
+        "url": f"/models/project-id/{random.choice(keys.project_ids)}"
+    },
+    ("GET", "/models/name/{model_name}"): lambda keys, n: {
+        "url": f"/models/name/{random.choice(keys.model_names)}"
+    },
+    ("GET", "/models/project-name/{project_name}"): lambda keys, n: {
+        "url": f"/models/project-name/{random.choice(keys.project_names)}"
+    },
+    ("POST", "/models"): lambda keys, n: {
+        "url": "/models",
+        "json": {"project_id": random.choice(keys.project_ids), "model_name": f"load_model_{n}"},
+    },
+    ("GET", "/experiments/all"): lambda keys, n: {"url": "/experiments/all", "params": {"limit": 100}},
+    ("GET", "/experiments/changes"): lambda keys, n: {
+        "url": "/experiments/changes",
+        "params": {"since": random.choice(keys.change_cursors[-100:])},
+    },
+    ("GET", "/experiments/id/{experiment_id}"): lambda keys, n: {
+        "url": f"/experiments/id/{random.choice(keys.experiment_ids)}"
+    },
+    ("GET", "/experiments/model-version-id/{model_version_id}"): lambda keys, n: {
+        "url": f"/experiments/model-version-id/{random.choice(keys.model_version_ids)}"
+    },
+    ("GET", "/experiments/model-id/{model_id}"): lambda keys, n: {
+        "url": f"/experiments/model-id/{random.choice(keys.model_ids)}"
+    },
+    ("GET", "/experiments/leaderboard"): lambda keys, n: {
+        "url": "/experiments/leaderboard",
+        "params": {"model_id": random.choice(keys.model_ids), "metric": "accuracy", "k": 10},
+    },
+    ("GET", "/experiments/project-id/{project_id}"): lambda keys, n: {
+        "url": f"/experiments/project-id/{random.choice(keys.project_ids)}"
+    },
+    ("POST", "/experiments"): lambda keys, n: {
+        "url": "/experiments",
+        "json": {
+            "model_id": random.choice(keys.model_ids),
+            "model_version_id": f"load_v{n}",
+            "evaluations": {"accuracy": random.random()},
+        },
+    },
+    ("POST", "/experiments/bulk"): lambda keys, n: {
+        "url": "/experiments/bulk",
+        "json": {
+            "experiments": [
+                {"model_id": random.choice(keys.model_ids), "model_version_id": f"load_bulk_v{n}_{i}"}
+                for i in range(10)
+            ]
+        },
+    },
+    ("POST", "/experiments/evaluations/{experiment_id}"): lambda keys, n: {
+        "url": f"/experiments/evaluations/{random.choice(keys.experiment_ids)}",
+        "json": {"evaluations": {f"metric_{n % 10}": random.random()}},
+    },
+    ("POST", "/experiments/artifact-file-paths/{experiment_id}"): lambda keys, n: {
+        "url": f"/experiments/artifact-file-paths/{random.choice(keys.experiment_ids)}",
+        "json": {"artifact_file_paths": {"onnx": f"s3://bucket/load/{n}/model.onnx"}},
+    },
+}
+
+
+def router_endpoints() -> List[Tuple[str, str]]:
+    """
+    api.py に登録されている全エンドポイントを取得
+
+    Returns:
+        (メソッド, パステンプレート) のリスト
+
+    Raises:
+        KeyError: SCENARIOSにリクエストの作り方が定義されていないエンドポイントがある場合
+    """
+    endpoints = [
+        (method, route.path)
+        for route in api.router.routes
+        if isinstance(route, APIRoute)
+        for method in sorted(route.methods)
+    ]
+    missing = [endpoint for endpoint in endpoints if endpoint not in SCENARIOS]
+    if missing:
+        raise KeyError(f"No load-test scenario for endpoints: {missing}")
+    return endpoints
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """
+    レイテンシの分布とスループットを集計
+
+    Args:
+        latencies: リクエストごとのレイテンシ（秒）
+        errors: 2xx以外のレスポンス数
+        elapsed: 全リクエストの所要時間（秒）
+
+    Returns:
+        件数・エラー数・p50/p95/p99（ミリ秒）・RPSの辞書
+    """
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+        "rps": len(latencies) / elapsed,
+    }
+
+
+async def load_endpoint(
+    client: httpx.AsyncClient,
+    method: str,
+    factory: RequestFactory,
+    keys: SeedKeys,
+    n_requests: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    """
+    1つのエンドポイントに指定した並列数でリクエストを送信
+
+    Args:
+        client: ASGIトランスポートのHTTPクライアント
+        method: HTTPメソッド
+        factory: リクエストの引数を作る関数
+        keys: 投入済みデータのキー
+        n_requests: 送信するリクエスト数
+        concurrency: 同時に送信するリクエスト数
+
+    Returns:
+        summarize() の集計結果
+    """
+    sequence = count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while (n := next(sequence)) < n_requests:
+            request = factory(keys, n)
+            start = time.perf_counter()
+            response = await client.request(method, **request)
+            latencies.append(time.perf_counter() - start)
+            if not response.is_success:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, n_requests))))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_load(app: FastAPI, keys: SeedKeys, n_requests: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    """
+    全エンドポイントに順番に負荷をかける
+
+    Args:
+        app: 計測対象のFastAPIアプリ
+        keys: 投入済みデータのキー
+        n_requests: エンドポイントごとのリクエスト数
+        concurrency: 同時に送信するリクエスト数
+
+    Returns:
+        "メソッド パス" をキーとした集計結果の辞書
+    """
+    # 500エラーも例外ではなくレスポンスとして受け取り、エラー数に数える
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        for method, path in router_endpoints():
+            results[f"{method} {path}"] = await load_endpoint(
+                client=client,
+                method=method,
+                factory=SCENARIOS[(method, path)],
+                keys=keys,
+                n_requests=n_requests,
+                concurrency=concurrency,
+            )
+    return results
+
+
+def run(
+    database_url: str,
+    n_projects: int,
+    models_per_project: int,
+    experiments_per_model: int,
+    n_requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """
+    データを投入してから全エンドポイントの負荷試験を実行
+
+    Args:
+        database_url: SQLiteの接続URL
+        n_projects: プロジェクト数
+        models_per_project: 1プロジェクトあたりのモデル数
+        experiments_per_model: 1モデルあたりの実験数
+        n_requests: エンドポイントごとのリクエスト数
+        concurrency: 同時に送信するリクエスト数
+
+    Returns:
+        {"config": 実行条件, "endpoints": エンドポイントごとの集計結果}
+    """
+    # 同期エンドポイントはスレッドプールで実行されるため、スレッド間で接続を使えるようにする
+    engine = create_engine(database_url, connect_args={"check_same_thread": False, "timeout": 30})
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    keys = seed(engine, n_projects, models_per_project, experiments_per_model)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(api.router)
+    app.dependency_overrides[get_db] = override_get_db
+
+    try:
+        endpoints = asyncio.run(run_load(app, keys, n_requests, concurrency))
+    finally:
+        engine.dispose()
+
+    return {
+        "config": {
+            "projects": n_projects,
+            "models": len(keys.model_ids),
+            "experiments": len(keys.experiment_ids),
+            "requests_per_endpoint": n_requests,
+            "concurrency": concurrency,
+        },
+        "endpoints": endpoints,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test every endpoint of the model registry API")
+    parser.add_argument("--projects", type=int, default=10, help="Number of projects to seed")
+    parser.add_argument("--models-per-project", type=int, default=10, help="Number of models per project")
+    parser.add_argument("--experiments-per-model", type=int, default=20, help="Number of experiments per model")
+    parser.add_argument("--requests", type=int, default=200, help="Number of requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent requests")
+    parser.add_argument("--output", type=str, default=None, help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for request parameters")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = run(
+            database_url=f"sqlite:///{os.path.join(tmpdir, 'load.sqlite')}",
+            n_projects=args.projects,
+            models_per_project=args.models_per_project,
+            experiments_per_model=args.experiments_per_model,
+            n_requests=args.requests,
+            concurrency=args.concurrency,
+        )
+
+    body = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(body + "\n")
+    else:
+        print(body)
+
+
+if __name__ == "__main__":
+    main()
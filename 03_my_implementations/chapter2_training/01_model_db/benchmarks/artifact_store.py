@@ -0,0 +1,99 @@
+"""
+Artifact Store Benchmark
+
+同じ内容のモデルファイルを何度もエクスポートする場合（ハイパーパラメータスイープでの再エクスポートなど）の
+保存時間とディスク使用量を比較します。
+
+- copy: 実行ごとの成果物ディレクトリへファイルをコピー（従来の方法）
+- store: ArtifactStoreに保存し、実行ごとの出力はハードリンクに置き換え（link_source=True）
+  2回目以降はダイジェストの計算のみで、書き込みは発生しません
+
+実行方法:
+    python -m benchmarks.artifact_store --size-mb 50 --runs 20
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+from src.storage.artifact_store import ArtifactStore
+
+
+def disk_usage(root: Path) -> int:
+    """
+    ディレクトリ配下のディスク使用量（ハードリンクは1回だけ数える）
+
+    Args:
+        root: 対象ディレクトリ
+
+    Returns:
+        使用量（バイト）
+    """
+    seen = set()
+    total = 0
+    for path in root.rglob("*"):
+        st = path.lstat()
+        if path.is_file() and (st.st_dev, st.st_ino) not in seen:
+            seen.add((st.st_dev, st.st_ino))
+            total += st.st_blocks * 512
+    return total
+
+
+def run(size_mb: int, n_runs: int) -> Dict[str, Dict[str, float]]:
+    """
+    各保存方法の所要時間とディスク使用量を計測
+
+    Args:
+        size_mb: モデルファイルのサイズ（MB）
+        n_runs: エクスポートの回数
+
+    Returns:
+        保存方法名をキーとした {"seconds": ..., "bytes": ...} の辞書
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = Path(tmpdir) / "model.onnx"
+        with open(source, "wb") as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1024 * 1024))
+
+        copy_root = Path(tmpdir) / "copy"
+        start = time.perf_counter()
+        for i in range(n_runs):
+            (copy_root / f"run{i}").mkdir(parents=True)
+            shutil.copyfile(source, copy_root / f"run{i}" / "model.onnx")
+        results["copy"] = {"seconds": time.perf_counter() - start, "bytes": disk_usage(copy_root)}
+
+        store_root = Path(tmpdir) / "store"
+        store = ArtifactStore(store_root / "artifacts")
+        start = time.perf_counter()
+        for i in range(n_runs):
+            # 学習スクリプトが実行ごとに書き出したファイルを模す（書き出し自体は計測対象外）
+            (store_root / f"run{i}").mkdir(parents=True)
+            output = store_root / f"run{i}" / "model.onnx"
+            os.link(source, output)
+            store.put_file(output, link_source=True)
+        results["store"] = {"seconds": time.perf_counter() - start, "bytes": disk_usage(store_root)}
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark repeated artifact exports: plain copy vs artifact store")
+    parser.add_argument("--size-mb", type=int, default=50, help="Model file size in MB")
+    parser.add_argument("--runs", type=int, default=20, help="Number of identical exports")
+    args = parser.parse_args()
+
+    results = run(args.size_mb, args.runs)
+
+    print(f"Repeated export ({args.runs} runs x {args.size_mb} MB)")
+    for name, result in results.items():
+        print(f"  {name:<6} {result['seconds']:>8.2f} s {result['bytes'] / 1e6:>10,.1f} MB on disk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+List Response Serialization Benchmark
+
+一覧系レスポンス1ページ分の生成時間（DB読み込み + シリアライズ）とレスポンスサイズを比較します。
+
+- pydantic: 全カラムを読み込み、Pydanticのfrom_attributesで検証してシリアライズ（従来の方法）
+- orjson: 全カラムを読み込み、orjsonでシリアライズ
+- orjson + fields: experiment_id, created_datetime のみを読み込み、orjsonでシリアライズ
+
+実行方法:
+    python -m benchmarks.list_serialization --rows 1000 --repeat 20
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from benchmarks.bulk_insert import make_experiments
+from src.api.responses import ORJSON_OPTIONS, to_dicts
+from src.db import cruds, schemas
+from src.db.database import Base
+
+EXPERIMENT_LIST = TypeAdapter(list[schemas.Experiment])
+
+
+def serialize_pydantic(db: Session, limit: int) -> bytes:
+    """Pydantic（from_attributes）経由でシリアライズ"""
+    experiments, _ = cruds.select_experiment_page(db=db, limit=limit)
+    return EXPERIMENT_LIST.dump_json(EXPERIMENT_LIST.validate_python(experiments, from_attributes=True))
+
+
+def serialize_orjson(db: Session, limit: int, fields: Optional[List[str]] = None) -> bytes:
+    """orjsonで直接シリアライズ"""
+    experiments, _ = cruds.select_experiment_page(db=db, limit=limit, fields=fields)
+    return orjson.dumps(to_dicts(experiments, schemas.Experiment, fields), option=ORJSON_OPTIONS)
+
+
+def run(database_url: str, n_rows: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    各シリアライズ方法の所要時間とレスポンスサイズを計測
+
+    Args:
+        database_url: 計測対象のDB接続URL
+        n_rows: 登録・取得する実験の件数（1ページ分）
+        repeat: 計測回数
+
+    Returns:
+        方法名をキーとした {"median_ms": ..., "bytes": ...} の辞書
+    """
+    engine = create_engine(database_url)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with SessionLocal() as db:
+        project = cruds.add_project(db=db, project_name="bench_project")
+        model = cruds.add_model(db=db, project_id=project.project_id, model_name="bench_model")
+        cruds.add_experiments_bulk(db=db, experiments=make_experiments(model.model_id, n_rows))
+
+    methods: Dict[str, Callable[[Session], bytes]] = {
+        "pydantic": lambda db: serialize_pydantic(db, n_rows),
+        "orjson": lambda db: serialize_orjson(db, n_rows),
+        "orjson + fields": lambda db: serialize_orjson(db, n_rows, ["experiment_id", "created_datetime"]),
+    }
+
+    results = {}
+    for name, method in methods.items():
+        timings = []
+        for _ in range(repeat):
+            with SessionLocal() as db:
+                start = time.perf_counter()
+                body = method(db)
+                timings.append(time.perf_counter() - start)
+        results[name] = {"median_ms": statistics.median(timings) * 1000, "bytes": len(body)}
+
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--rows", type=int, default=1000, help="Number of experiments in one page")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of measurements per method")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.sqlite')}"
+        results = run(database_url, args.rows, args.repeat)
+
+    print(f"List response ({args.rows:,} experiments, median of {args.repeat})")
+    for name, result in results.items():
+        print(f"  {name:<18} {result['median_ms']:>10.2f} ms {result['bytes']:>12,} bytes")
+
+
+if __name__ == "__main__":
+    main()
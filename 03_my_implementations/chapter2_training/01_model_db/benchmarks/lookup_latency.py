@@ -0,0 +1,164 @@
+"""
+Lookup Latency Benchmark
+
+テーブルサイズを変えながら、CRUD層の主要な検索関数のレイテンシを計測します。
+インデックスが効いていれば、行数が増えてもレイテンシはほぼ一定になります。
+
+実行方法:
+    python -m benchmarks.lookup_latency
+    python -m benchmarks.lookup_latency --sizes 1000 10000 100000 --without-indexes
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.db import cruds, models
+from src.db.database import Base
+
+# 1モデルあたりの実験数、1プロジェクトあたりのモデル数
+EXPERIMENTS_PER_MODEL = 20
+MODELS_PER_PROJECT = 10
+
+
+def seed(engine: Engine, n_experiments: int) -> Dict[str, List[str]]:
+    """
+    ベンチマーク用のデータを一括投入
+
+    Args:
+        engine: SQLAlchemyエンジン
+        n_experiments: 実験の件数
+
+    Returns:
+        検索キーに使うID・名前のリスト
+    """
+    n_models = max(1, n_experiments // EXPERIMENTS_PER_MODEL)
+    n_projects = max(1, n_models // MODELS_PER_PROJECT)
+
+    projects = [{"project_id": f"p{i:08d}", "project_name": f"project_{i}"} for i in range(n_projects)]
+    model_rows = [
+        {"model_id": f"m{i:08d}", "project_id": f"p{i % n_projects:08d}", "model_name": f"model_{i}"}
+        for i in range(n_models)
+    ]
+    experiments = [
+        {
+            "experiment_id": f"e{i:08d}",
+            "model_id": f"m{i % n_models:08d}",
+            "model_version_id": f"v{i:08d}",
+            "parameters": {"learning_rate": 0.001, "seed": i},
+            "evaluations": {"accuracy": random.random()},
+        }
+        for i in range(n_experiments)
+    ]
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.Project), projects)
+        conn.execute(insert(models.Model), model_rows)
+        conn.execute(insert(models.Experiment), experiments)
+
+    return {
+        "project_ids": [row["project_id"] for row in projects],
+        "model_ids": [row["model_id"] for row in model_rows],
+        "model_names": [row["model_name"] for row in model_rows],
+        "model_version_ids": [row["model_version_id"] for row in experiments],
+    }
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """
+    関数の実行時間の中央値を計測
+
+    Args:
+        func: 計測対象の関数
+        repeat: 実行回数
+
+    Returns:
+        中央値（マイクロ秒）
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def run(n_experiments: int, repeat: int, with_indexes: bool) -> Dict[str, float]:
+    """
+    指定サイズのDBを作成し、各検索関数のレイテンシを計測
+
+    Args:
+        n_experiments: 実験の件数
+        repeat: 各検索の実行回数
+        with_indexes: Falseの場合はセカンダリインデックスを削除して計測
+
+    Returns:
+        検索関数名をキーとしたレイテンシ（マイクロ秒）の辞書
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'bench.sqlite')}")
+        Base.metadata.create_all(bind=engine)
+        if not with_indexes:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.drop(bind=engine)
+
+        keys = seed(engine, n_experiments)
+        db: Session = sessionmaker(bind=engine)()
+
+        lookups: Dict[str, Callable[[], object]] = {
+            "select_model_by_project_id": lambda: cruds.select_model_by_project_id(
+                db=db, project_id=random.choice(keys["project_ids"])
+            ),
+            "select_model_by_name": lambda: cruds.select_model_by_name(
+                db=db, model_name=random.choice(keys["model_names"])
+            ),
+            "select_experiment_by_model_id": lambda: cruds.select_experiment_by_model_id(
+                db=db, model_id=random.choice(keys["model_ids"])
+            ),
+            "select_experiment_by_model_version_id": lambda: cruds.select_experiment_by_model_version_id(
+                db=db, model_version_id=random.choice(keys["model_version_ids"])
+            ),
+        }
+
+        results = {}
+        for name, lookup in lookups.items():
+            results[name] = measure(lookup, repeat)
+            db.expunge_all()
+
+        db.close()
+        engine.dispose()
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark registry lookup latency vs table size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Experiment counts")
+    parser.add_argument("--repeat", type=int, default=200, help="Lookups per function")
+    parser.add_argument("--without-indexes", action="store_true", help="Drop secondary indexes for comparison")
+    args = parser.parse_args()
+
+    random.seed(42)
+    label = "without indexes" if args.without_indexes else "with indexes"
+    print(f"Lookup latency (median, microseconds, {label})")
+
+    header = f"{'function':<40}" + "".join(f"{size:>12,}" for size in args.sizes)
+    print(header)
+    print("-" * len(header))
+
+    all_results = {size: run(size, args.repeat, not args.without_indexes) for size in args.sizes}
+    for name in all_results[args.sizes[0]]:
+        print(f"{name:<40}" + "".join(f"{all_results[size][name]:>12.1f}" for size in args.sizes))
+
+
+if __name__ == "__main__":
+    main()
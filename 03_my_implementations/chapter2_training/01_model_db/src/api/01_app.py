@@ -6,7 +6,8 @@ Model DBのAPIアプリケーションのエントリーポイント。
 
 from fastapi import FastAPI
 
-from src.api.routers import api, health
+from src.api.routers import api, async_api, health
+from src.db.database import USE_ASYNC_DB
 
 # FastAPIアプリケーションの作成
 app = FastAPI(
@@ -17,4 +18,5 @@ app = FastAPI(
 
 # ルーターの登録
 app.include_router(health.router, tags=["Health"])
-app.include_router(api.router, tags=["API"])
+# USE_ASYNC_DB=true の場合は非同期セッション版のルーターを使用
+app.include_router(async_api.router if USE_ASYNC_DB else api.router, tags=["API"])
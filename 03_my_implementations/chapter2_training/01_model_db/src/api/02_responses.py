@@ -0,0 +1,139 @@
+"""
+Response Helpers
+
+一覧系エンドポイントのレスポンス生成を行います。
+fieldsパラメータによる射影と、orjsonによるシリアライズ、ETagによる条件付きGETを提供します。
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# datetimeをPydanticと同じ形式（UTCは"Z"）で出力する
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    orjsonでシリアライズするJSONレスポンス
+
+    一覧系エンドポイントではPydanticのfrom_attributesによる検証を経由せず、
+    カラム値の辞書を直接シリアライズします。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def parse_fields(fields: Optional[str], schema: type[BaseModel]) -> Optional[List[str]]:
+    """
+    fieldsクエリパラメータ（カンマ区切り）を解析
+
+    Args:
+        fields: カンマ区切りのフィールド名（例: "experiment_id,created_datetime"）
+        schema: 指定可能なフィールドを定義するPydanticスキーマ
+
+    Returns:
+        フィールド名のリスト（重複は除去）。未指定の場合はNone
+
+    Raises:
+        HTTPException: 空、またはスキーマにないフィールドが指定された場合（422）
+    """
+    if fields is None:
+        return None
+
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in schema.model_fields]
+    if not names or unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {unknown}. Available fields: {list(schema.model_fields)}",
+        )
+    return names
+
+
+def to_dicts(rows: Iterable[Any], schema: type[BaseModel], fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """
+    ORMオブジェクトをフィールド名と値の辞書に変換
+
+    Args:
+        rows: ORMオブジェクトのリスト
+        schema: 出力するフィールドを定義するPydanticスキーマ
+        fields: 出力するフィールド名（Noneの場合はスキーマの全フィールド）
+
+    Returns:
+        辞書のリスト
+    """
+    names = fields or list(schema.model_fields)
+    return [{name: getattr(row, name) for name in names} for row in rows]
+
+
+def to_ndjson_line(row: Any, schema: type[BaseModel], fields: Optional[List[str]]) -> bytes:
+    """
+    ORMオブジェクトをNDJSONの1行に変換
+
+    Args:
+        row: ORMオブジェクト
+        schema: 出力するフィールドを定義するPydanticスキーマ
+        fields: 出力するフィールド名（Noneの場合はスキーマの全フィールド）
+
+    Returns:
+        改行付きのJSONバイト列
+    """
+    names = fields or list(schema.model_fields)
+    return orjson.dumps({name: getattr(row, name) for name in names}, option=ORJSON_OPTIONS) + b"\n"
+
+
+def make_etag(key: str, version: Optional[int]) -> str:
+    """
+    行の主キーと行バージョンからETagを作成
+
+    レスポンスボディをハッシュせず、更新のたびに加算される行バージョンのみを使います。
+
+    Args:
+        key: 行の主キー
+        version: 行バージョン（カラム追加前の行はNone）
+
+    Returns:
+        引用符付きのETag（例: "01J9Z...-3"）
+    """
+    return f'"{key}-{version or 0}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Matchヘッダーの値（カンマ区切り・弱いETag・"*"を含む）がETagに一致するか"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def conditional_response(
+    request: Request,
+    row: Any,
+    schema: type[BaseModel],
+    key: str,
+    version: Optional[int],
+) -> Response:
+    """
+    ETag付きのレスポンスを作成し、If-None-Matchが一致する場合は304を返す
+
+    304の場合はボディのシリアライズも行いません。
+
+    Args:
+        request: リクエスト（If-None-Matchヘッダーを参照）
+        row: ORMオブジェクト
+        schema: 出力するフィールドを定義するPydanticスキーマ
+        key: 行の主キー
+        version: 行バージョン
+
+    Returns:
+        304レスポンス、またはETagヘッダー付きのJSONレスポンス
+    """
+    etag = make_etag(key, version)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(to_dicts([row], schema, None)[0], headers={"ETag": etag})
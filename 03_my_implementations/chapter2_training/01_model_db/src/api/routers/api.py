@@ -4,27 +4,129 @@ API Router
 プロジェクト、モデル、実験に関するAPIエンドポイントを提供します。
 """
 
-from fastapi import APIRouter, Depends
+import asyncio
+import os
+import time
+from typing import Any, Iterator, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from src.api.responses import ORJSONResponse, conditional_response, parse_fields, to_dicts, to_ndjson_line
 from src.db import cruds, schemas
 from src.db.database import get_db
 
 router = APIRouter()
 
+# 一覧系エンドポイントのページネーション設定
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+STREAM_CHUNK_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# 変更フィード（ロングポーリング）の設定
+MAX_CHANGES_WAIT_SECONDS = 30.0
+CHANGES_POLL_INTERVAL_SECONDS = float(os.getenv("CHANGES_POLL_INTERVAL_SECONDS", "0.5"))
+
+# 一覧系エンドポイントの射影パラメータ
+FIELDS_QUERY = Query(
+    None,
+    description="返すフィールド名のカンマ区切り（例: experiment_id,created_datetime）。未指定の場合は全フィールド",
+)
+
+
+def _set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """次ページのカーソルをレスポンスヘッダーに設定"""
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def _set_next_page(request: Request, response: Response, next_cursor: Optional[str]) -> None:
+    """
+    次ページのカーソルと次ページのURL（RFC 8288の `Link: <...>; rel="next"`）をレスポンスヘッダーに設定
+
+    一覧系エンドポイントはページ単位で返すため、全件を期待するクライアントが
+    汎用のHTTPクライアントの機能で続きのページを辿れるようにします。
+    """
+    _set_next_cursor(response, next_cursor)
+    if next_cursor is not None:
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+
+def _ndjson_response(
+    rows: Iterator[Any],
+    schema: type[BaseModel],
+    fields: Optional[List[str]] = None,
+) -> StreamingResponse:
+    """
+    ORMオブジェクトのイテレータをNDJSON形式でストリーミング返却
+
+    1行ずつシリアライズして送信するため、全件をメモリに載せません。
+
+    Args:
+        rows: ORMオブジェクトのイテレータ
+        schema: 出力するフィールドを定義するPydanticスキーマ
+        fields: 出力するフィールド名（Noneの場合はスキーマの全フィールド）
+
+    Returns:
+        application/x-ndjson のストリーミングレスポンス
+    """
+
+    def generate() -> Iterator[bytes]:
+        for row in rows:
+            yield to_ndjson_line(row, schema, fields)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 
 # ==================== Project Endpoints ====================
 
 
-@router.get("/projects/all", response_model=list[schemas.Project])
-def project_all(db: Session = Depends(get_db)):
+@router.get("/projects/all", response_model=list[schemas.Project], response_class=ORJSONResponse)
+def project_all(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+):
     """
     全プロジェクトを取得
 
+    作成日時順のキーセットページネーションで返します。
+    次ページがある場合は `X-Next-Cursor` ヘッダーにカーソル、`Link` ヘッダーに次ページのURLを設定します。
+    `stream=true` の場合はcursor以降の全件をNDJSONでストリーミングします。
+    `fields` を指定した場合は、指定したカラムのみをDBから読み込んで返します。
+    存在しないカーソルを指定した場合は400を返します。
+
+    Args:
+        limit: 1ページあたりの件数
+        cursor: 前ページのレスポンスヘッダーで受け取ったカーソル
+        stream: NDJSONストリーミングで全件を返すか
+        fields: 返すフィールド名のカンマ区切り
+
     Returns:
         プロジェクトのリスト
     """
-    return cruds.select_project_all(db=db)
+    field_names = parse_fields(fields, schemas.Project)
+    try:
+        if stream:
+            rows = cruds.iter_project_all(db=db, cursor=cursor, chunk_size=STREAM_CHUNK_SIZE, fields=field_names)
+            return _ndjson_response(rows, schemas.Project, field_names)
+
+        projects, next_cursor = cruds.select_project_page(
+            db=db, limit=limit, cursor=cursor, fields=field_names
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    response = ORJSONResponse(to_dicts(projects, schemas.Project, field_names))
+    _set_next_page(request, response, next_cursor)
+    return response
 
 
 @router.get("/projects/id/{project_id}", response_model=schemas.Project)
@@ -55,6 +157,28 @@ def project_by_name(project_name: str, db: Session = Depends(get_db)):
     return cruds.select_project_by_name(db=db, project_name=project_name)
 
 
+@router.get("/projects/summary/{project_id}", response_model=schemas.ProjectSummary)
+def project_summary(project_id: str, db: Session = Depends(get_db)):
+    """
+    プロジェクトの実験サマリーを取得
+
+    実験の作成・評価結果の更新時に差分更新されるサマリーテーブルを読むだけのため、
+    実験数に関わらず一定のコストで返します。実験が1件もないモデルは含まれません。
+
+    Args:
+        project_id: プロジェクトID
+
+    Returns:
+        実験数とモデルごとのサマリー（実験数・最新バージョン・評価指標ごとの最良値）
+    """
+    summaries = cruds.select_model_summaries_by_project_id(db=db, project_id=project_id)
+    return schemas.ProjectSummary(
+        project_id=project_id,
+        experiment_count=sum(summary.experiment_count for summary in summaries),
+        models=summaries,
+    )
+
+
 @router.post("/projects", response_model=schemas.Project)
 def add_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)):
     """
@@ -77,29 +201,66 @@ def add_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)):
 # ==================== Model Endpoints ====================
 
 
-@router.get("/models/all", response_model=list[schemas.Model])
-def model_all(db: Session = Depends(get_db)):
+@router.get("/models/all", response_model=list[schemas.Model], response_class=ORJSONResponse)
+def model_all(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+):
     """
     全モデルを取得
 
+    作成日時順のキーセットページネーションで返します。
+    次ページがある場合は `X-Next-Cursor` ヘッダーにカーソル、`Link` ヘッダーに次ページのURLを設定します。
+    `stream=true` の場合はcursor以降の全件をNDJSONでストリーミングします。
+    `fields` を指定した場合は、指定したカラムのみをDBから読み込んで返します。
+    存在しないカーソルを指定した場合は400を返します。
+
+    Args:
+        limit: 1ページあたりの件数
+        cursor: 前ページのレスポンスヘッダーで受け取ったカーソル
+        stream: NDJSONストリーミングで全件を返すか
+        fields: 返すフィールド名のカンマ区切り
+
     Returns:
         モデルのリスト
     """
-    return cruds.select_model_all(db=db)
+    field_names = parse_fields(fields, schemas.Model)
+    try:
+        if stream:
+            rows = cruds.iter_model_all(db=db, cursor=cursor, chunk_size=STREAM_CHUNK_SIZE, fields=field_names)
+            return _ndjson_response(rows, schemas.Model, field_names)
+
+        models, next_cursor = cruds.select_model_page(
+            db=db, limit=limit, cursor=cursor, fields=field_names
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    response = ORJSONResponse(to_dicts(models, schemas.Model, field_names))
+    _set_next_page(request, response, next_cursor)
+    return response
 
 
 @router.get("/models/id/{model_id}", response_model=schemas.Model)
-def model_by_id(model_id: str, db: Session = Depends(get_db)):
+def model_by_id(model_id: str, request: Request, db: Session = Depends(get_db)):
     """
     IDでモデルを取得
 
+    レスポンスにETagヘッダーを付与し、If-None-Matchが一致する場合は304を返します。
+
     Args:
         model_id: モデルID
 
     Returns:
         モデル情報
     """
-    return cruds.select_model_by_id(db=db, model_id=model_id)
+    model = cruds.select_model_by_id(db=db, model_id=model_id)
+    if model is None:
+        return None
+    return conditional_response(request, model, schemas.Model, model.model_id, model.version)
 
 
 @router.get("/models/project-id/{project_id}", response_model=list[schemas.Model])
@@ -167,15 +328,97 @@ def add_model(model: schemas.ModelCreate, db: Session = Depends(get_db)):
 # ==================== Experiment Endpoints ====================
 
 
-@router.get("/experiments/all", response_model=list[schemas.Experiment])
-def experiment_all(db: Session = Depends(get_db)):
+@router.get("/experiments/all", response_model=list[schemas.Experiment], response_class=ORJSONResponse)
+def experiment_all(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+):
     """
     全実験を取得
 
+    作成日時順のキーセットページネーションで返します。
+    次ページがある場合は `X-Next-Cursor` ヘッダーにカーソル、`Link` ヘッダーに次ページのURLを設定します。
+    `stream=true` の場合はcursor以降の全件をNDJSONでストリーミングします。
+    `fields` を指定した場合は、指定したカラムのみをDBから読み込んで返します。
+    存在しないカーソルを指定した場合は400を返します。
+
+    Args:
+        limit: 1ページあたりの件数
+        cursor: 前ページのレスポンスヘッダーで受け取ったカーソル
+        stream: NDJSONストリーミングで全件を返すか
+        fields: 返すフィールド名のカンマ区切り
+
     Returns:
         実験のリスト
     """
-    return cruds.select_experiment_all(db=db)
+    field_names = parse_fields(fields, schemas.Experiment)
+    try:
+        if stream:
+            rows = cruds.iter_experiment_all(db=db, cursor=cursor, chunk_size=STREAM_CHUNK_SIZE, fields=field_names)
+            return _ndjson_response(rows, schemas.Experiment, field_names)
+
+        experiments, next_cursor = cruds.select_experiment_page(
+            db=db, limit=limit, cursor=cursor, fields=field_names
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    response = ORJSONResponse(to_dicts(experiments, schemas.Experiment, field_names))
+    _set_next_page(request, response, next_cursor)
+    return response
+
+
+@router.get("/experiments/changes", response_model=list[schemas.Experiment], response_class=ORJSONResponse)
+async def experiment_changes(
+    since: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    wait: float = Query(0.0, ge=0.0, le=MAX_CHANGES_WAIT_SECONDS),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+):
+    """
+    指定したカーソルより後に登録された実験を取得（変更フィード）
+
+    新しい実験がない場合は最大 `wait` 秒待ってから返します（ロングポーリング）。
+    待機中はトランザクションを終了して接続をプールに返し、
+    `CHANGES_POLL_INTERVAL_SECONDS` ごとにインデックスの範囲検索のみを行います。
+    次回の `since` に指定するカーソルは `X-Next-Cursor` ヘッダーに常に設定します。
+    存在しないカーソルを指定した場合は400を返します。
+
+    Args:
+        since: 前回のレスポンスヘッダーで受け取ったカーソル（未指定の場合は先頭から）
+        limit: 最大取得件数
+        wait: 新しい実験がない場合の最大待機秒数
+        fields: 返すフィールド名のカンマ区切り
+
+    Returns:
+        登録順の実験のリスト
+    """
+    field_names = parse_fields(fields, schemas.Experiment)
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            experiments, next_cursor = await run_in_threadpool(
+                cruds.select_experiment_changes,
+                db=db,
+                since=since,
+                limit=limit,
+                fields=field_names,
+            )
+        except ValueError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+        remaining = deadline - time.monotonic()
+        if experiments or remaining <= 0:
+            break
+        await run_in_threadpool(db.rollback)
+        await asyncio.sleep(min(CHANGES_POLL_INTERVAL_SECONDS, remaining))
+
+    response = ORJSONResponse(to_dicts(experiments, schemas.Experiment, field_names))
+    _set_next_cursor(response, next_cursor)
+    return response
 
 
 @router.get("/experiments/id/{experiment_id}", response_model=schemas.Experiment)
@@ -193,34 +436,74 @@ def experiment_by_id(experiment_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/experiments/model-version-id/{model_version_id}", response_model=schemas.Experiment)
-def experiment_by_model_version_id(model_version_id: str, db: Session = Depends(get_db)):
+def experiment_by_model_version_id(model_version_id: str, request: Request, db: Session = Depends(get_db)):
     """
     モデルバージョンIDで実験を取得
 
+    レスポンスにETagヘッダーを付与し、If-None-Matchが一致する場合は304を返します。
+    サービング側のポーリングでは、変更がなければヘッダーのやり取りだけで済みます。
+
     Args:
         model_version_id: モデルバージョンID
 
     Returns:
         実験情報
     """
-    return cruds.select_experiment_by_model_version_id(db=db, model_version_id=model_version_id)
+    experiment = cruds.select_experiment_by_model_version_id(db=db, model_version_id=model_version_id)
+    if experiment is None:
+        return None
+    return conditional_response(request, experiment, schemas.Experiment, experiment.experiment_id, experiment.version)
 
 
-@router.get("/experiments/model-id/{model_id}", response_model=list[schemas.Experiment])
-def experiment_by_model_id(model_id: str, db: Session = Depends(get_db)):
+@router.get(
+    "/experiments/model-id/{model_id}", response_model=list[schemas.Experiment], response_class=ORJSONResponse
+)
+def experiment_by_model_id(
+    model_id: str,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+):
     """
     モデルIDで実験を取得
 
     Args:
         model_id: モデルID
+        fields: 返すフィールド名のカンマ区切り
 
     Returns:
         実験のリスト
     """
-    return cruds.select_experiment_by_model_id(db=db, model_id=model_id)
+    field_names = parse_fields(fields, schemas.Experiment)
+    experiments = cruds.select_experiment_by_model_id(db=db, model_id=model_id, fields=field_names)
+    return ORJSONResponse(to_dicts(experiments, schemas.Experiment, field_names))
+
+
+@router.get("/experiments/leaderboard", response_model=list[schemas.ExperimentLeaderboardEntry])
+def experiment_leaderboard(
+    model_id: str,
+    metric: str,
+    k: int = Query(10, ge=1, le=MAX_PAGE_LIMIT),
+    ascending: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    評価指標の上位k件の実験を取得
+
+    指標の抽出と並び替えはDB側で行い、評価結果のJSON全体は返しません。
 
+    Args:
+        model_id: モデルID
+        metric: 評価指標名（例: accuracy）
+        k: 取得件数
+        ascending: trueの場合は値が小さい順（lossなど）
 
-@router.get("/experiments/project-id/{project_id}")
+    Returns:
+        実験ID・モデルバージョンID・指標値・作成日時のリスト
+    """
+    return cruds.select_experiment_leaderboard(db=db, model_id=model_id, metric=metric, k=k, ascending=ascending)
+
+
+@router.get("/experiments/project-id/{project_id}", response_model=list[schemas.Experiment])
 def experiment_by_project_id(project_id: str, db: Session = Depends(get_db)):
     """
     プロジェクトIDで実験を取得
@@ -231,7 +514,9 @@ def experiment_by_project_id(project_id: str, db: Session = Depends(get_db)):
     Returns:
         実験のリスト
     """
-    return cruds.select_experiment_by_project_id(db=db, project_id=project_id)
+    # CRUD層は (Experiment, Model) の組を返すため、実験のみを返す
+    rows = cruds.select_experiment_by_project_id(db=db, project_id=project_id)
+    return [experiment for experiment, _ in rows]
 
 
 @router.post("/experiments", response_model=schemas.Experiment)
@@ -259,6 +544,27 @@ def add_experiment(experiment: schemas.ExperimentCreate, db: Session = Depends(g
     )
 
 
+@router.post("/experiments/bulk", response_model=schemas.ExperimentBulkCreated)
+def add_experiments_bulk(bulk: schemas.ExperimentBulkCreate, db: Session = Depends(get_db)):
+    """
+    実験を一括作成
+
+    1トランザクション・1回のINSERTで全件を書き込みます。
+
+    Args:
+        bulk: 実験一括作成リクエスト
+
+    Returns:
+        作成された実験IDのリスト（リクエストと同じ順序）
+    """
+    experiment_ids = cruds.add_experiments_bulk(
+        db=db,
+        experiments=[experiment.model_dump() for experiment in bulk.experiments],
+        commit=True,
+    )
+    return schemas.ExperimentBulkCreated(experiment_ids=experiment_ids)
+
+
 @router.post("/experiments/evaluations/{experiment_id}", response_model=schemas.Experiment)
 def update_evaluations(
     experiment_id: str,
@@ -0,0 +1,596 @@
+"""
+Async API Router
+
+api.py と同じエンドポイントを非同期セッションで提供します。
+USE_ASYNC_DB=true の場合、api.py の代わりに登録されます。
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.responses import ORJSONResponse, conditional_response, parse_fields, to_dicts, to_ndjson_line
+from src.api.routers.api import (
+    CHANGES_POLL_INTERVAL_SECONDS,
+    DEFAULT_PAGE_LIMIT,
+    FIELDS_QUERY,
+    MAX_CHANGES_WAIT_SECONDS,
+    MAX_PAGE_LIMIT,
+    STREAM_CHUNK_SIZE,
+    _set_next_cursor,
+    _set_next_page,
+)
+from src.db import async_cruds, schemas
+from src.db.database import get_async_db
+
+router = APIRouter()
+
+
+async def _ndjson_async_response(
+    rows: AsyncIterator[Any],
+    schema: type[BaseModel],
+    fields: Optional[List[str]] = None,
+) -> StreamingResponse:
+    """
+    ORMオブジェクトの非同期イテレータをNDJSON形式でストリーミング返却
+
+    先頭の1件を取得してからレスポンスを開始するため、
+    不正なカーソルなどの例外はステータスコード送信前に呼び出し元へ伝わります。
+
+    Args:
+        rows: ORMオブジェクトの非同期イテレータ
+        schema: 出力するフィールドを定義するPydanticスキーマ
+        fields: 出力するフィールド名（Noneの場合はスキーマの全フィールド）
+
+    Returns:
+        application/x-ndjson のストリーミングレスポンス
+    """
+
+    first = await anext(rows, None)
+
+    async def generate() -> AsyncIterator[bytes]:
+        if first is None:
+            return
+        yield to_ndjson_line(first, schema, fields)
+        async for row in rows:
+            yield to_ndjson_line(row, schema, fields)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+# ==================== Project Endpoints ====================
+
+
+@router.get("/projects/all", response_model=list[schemas.Project], response_class=ORJSONResponse)
+async def project_all(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    全プロジェクトを取得
+
+    作成日時順のキーセットページネーションで返します。
+    次ページがある場合は `X-Next-Cursor` ヘッダーにカーソル、`Link` ヘッダーに次ページのURLを設定します。
+    `stream=true` の場合はcursor以降の全件をNDJSONでストリーミングします。
+    `fields` を指定した場合は、指定したカラムのみをDBから読み込んで返します。
+    存在しないカーソルを指定した場合は400を返します。
+
+    Args:
+        limit: 1ページあたりの件数
+        cursor: 前ページのレスポンスヘッダーで受け取ったカーソル
+        stream: NDJSONストリーミングで全件を返すか
+        fields: 返すフィールド名のカンマ区切り
+
+    Returns:
+        プロジェクトのリスト
+    """
+    field_names = parse_fields(fields, schemas.Project)
+    try:
+        if stream:
+            rows = async_cruds.iter_project_all(db=db, cursor=cursor, chunk_size=STREAM_CHUNK_SIZE, fields=field_names)
+            return await _ndjson_async_response(rows, schemas.Project, field_names)
+
+        projects, next_cursor = await async_cruds.select_project_page(
+            db=db, limit=limit, cursor=cursor, fields=field_names
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    response = ORJSONResponse(to_dicts(projects, schemas.Project, field_names))
+    _set_next_page(request, response, next_cursor)
+    return response
+
+
+@router.get("/projects/id/{project_id}", response_model=schemas.Project)
+async def project_by_id(project_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    IDでプロジェクトを取得
+
+    Args:
+        project_id: プロジェクトID
+
+    Returns:
+        プロジェクト情報
+    """
+    return await async_cruds.select_project_by_id(db=db, project_id=project_id)
+
+
+@router.get("/projects/name/{project_name}", response_model=schemas.Project)
+async def project_by_name(project_name: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    名前でプロジェクトを取得
+
+    Args:
+        project_name: プロジェクト名
+
+    Returns:
+        プロジェクト情報
+    """
+    return await async_cruds.select_project_by_name(db=db, project_name=project_name)
+
+
+@router.get("/projects/summary/{project_id}", response_model=schemas.ProjectSummary)
+async def project_summary(project_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    プロジェクトの実験サマリーを取得
+
+    実験の作成・評価結果の更新時に差分更新されるサマリーテーブルを読むだけのため、
+    実験数に関わらず一定のコストで返します。実験が1件もないモデルは含まれません。
+
+    Args:
+        project_id: プロジェクトID
+
+    Returns:
+        実験数とモデルごとのサマリー（実験数・最新バージョン・評価指標ごとの最良値）
+    """
+    summaries = await async_cruds.select_model_summaries_by_project_id(db=db, project_id=project_id)
+    return schemas.ProjectSummary(
+        project_id=project_id,
+        experiment_count=sum(summary.experiment_count for summary in summaries),
+        models=summaries,
+    )
+
+
+@router.post("/projects", response_model=schemas.Project)
+async def add_project(project: schemas.ProjectCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    プロジェクトを作成
+
+    Args:
+        project: プロジェクト作成リクエスト
+
+    Returns:
+        作成されたプロジェクト情報
+    """
+    return await async_cruds.add_project(
+        db=db,
+        project_name=project.project_name,
+        description=project.description,
+        commit=True,
+    )
+
+
+# ==================== Model Endpoints ====================
+
+
+@router.get("/models/all", response_model=list[schemas.Model], response_class=ORJSONResponse)
+async def model_all(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    全モデルを取得
+
+    作成日時順のキーセットページネーションで返します。
+    次ページがある場合は `X-Next-Cursor` ヘッダーにカーソル、`Link` ヘッダーに次ページのURLを設定します。
+    `stream=true` の場合はcursor以降の全件をNDJSONでストリーミングします。
+    `fields` を指定した場合は、指定したカラムのみをDBから読み込んで返します。
+    存在しないカーソルを指定した場合は400を返します。
+
+    Args:
+        limit: 1ページあたりの件数
+        cursor: 前ページのレスポンスヘッダーで受け取ったカーソル
+        stream: NDJSONストリーミングで全件を返すか
+        fields: 返すフィールド名のカンマ区切り
+
+    Returns:
+        モデルのリスト
+    """
+    field_names = parse_fields(fields, schemas.Model)
+    try:
+        if stream:
+            rows = async_cruds.iter_model_all(db=db, cursor=cursor, chunk_size=STREAM_CHUNK_SIZE, fields=field_names)
+            return await _ndjson_async_response(rows, schemas.Model, field_names)
+
+        models, next_cursor = await async_cruds.select_model_page(
+            db=db, limit=limit, cursor=cursor, fields=field_names
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    response = ORJSONResponse(to_dicts(models, schemas.Model, field_names))
+    _set_next_page(request, response, next_cursor)
+    return response
+
+
+@router.get("/models/id/{model_id}", response_model=schemas.Model)
+async def model_by_id(model_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    IDでモデルを取得
+
+    レスポンスにETagヘッダーを付与し、If-None-Matchが一致する場合は304を返します。
+
+    Args:
+        model_id: モデルID
+
+    Returns:
+        モデル情報
+    """
+    model = await async_cruds.select_model_by_id(db=db, model_id=model_id)
+    if model is None:
+        return None
+    return conditional_response(request, model, schemas.Model, model.model_id, model.version)
+
+
+@router.get("/models/project-id/{project_id}", response_model=list[schemas.Model])
+async def model_by_project_id(project_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    プロジェクトIDでモデルを取得
+
+    Args:
+        project_id: プロジェクトID
+
+    Returns:
+        モデルのリスト
+    """
+    return await async_cruds.select_model_by_project_id(db=db, project_id=project_id)
+
+
+@router.get("/models/name/{model_name}", response_model=list[schemas.Model])
+async def model_by_name(model_name: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    モデル名でモデルを取得
+
+    Args:
+        model_name: モデル名
+
+    Returns:
+        モデルのリスト
+    """
+    return await async_cruds.select_model_by_name(db=db, model_name=model_name)
+
+
+@router.get("/models/project-name/{project_name}", response_model=list[schemas.Model])
+async def model_by_project_name(project_name: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    プロジェクト名でモデルを取得
+
+    Args:
+        project_name: プロジェクト名
+
+    Returns:
+        モデルのリスト
+    """
+    return await async_cruds.select_model_by_project_name(db=db, project_name=project_name)
+
+
+@router.post("/models", response_model=schemas.Model)
+async def add_model(model: schemas.ModelCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    モデルを作成
+
+    Args:
+        model: モデル作成リクエスト
+
+    Returns:
+        作成されたモデル情報
+    """
+    return await async_cruds.add_model(
+        db=db,
+        project_id=model.project_id,
+        model_name=model.model_name,
+        description=model.description,
+        commit=True,
+    )
+
+
+# ==================== Experiment Endpoints ====================
+
+
+@router.get("/experiments/all", response_model=list[schemas.Experiment], response_class=ORJSONResponse)
+async def experiment_all(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    全実験を取得
+
+    作成日時順のキーセットページネーションで返します。
+    次ページがある場合は `X-Next-Cursor` ヘッダーにカーソル、`Link` ヘッダーに次ページのURLを設定します。
+    `stream=true` の場合はcursor以降の全件をNDJSONでストリーミングします。
+    `fields` を指定した場合は、指定したカラムのみをDBから読み込んで返します。
+    存在しないカーソルを指定した場合は400を返します。
+
+    Args:
+        limit: 1ページあたりの件数
+        cursor: 前ページのレスポンスヘッダーで受け取ったカーソル
+        stream: NDJSONストリーミングで全件を返すか
+        fields: 返すフィールド名のカンマ区切り
+
+    Returns:
+        実験のリスト
+    """
+    field_names = parse_fields(fields, schemas.Experiment)
+    try:
+        if stream:
+            rows = async_cruds.iter_experiment_all(
+                db=db, cursor=cursor, chunk_size=STREAM_CHUNK_SIZE, fields=field_names
+            )
+            return await _ndjson_async_response(rows, schemas.Experiment, field_names)
+
+        experiments, next_cursor = await async_cruds.select_experiment_page(
+            db=db, limit=limit, cursor=cursor, fields=field_names
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    response = ORJSONResponse(to_dicts(experiments, schemas.Experiment, field_names))
+    _set_next_page(request, response, next_cursor)
+    return response
+
+
+@router.get("/experiments/changes", response_model=list[schemas.Experiment], response_class=ORJSONResponse)
+async def experiment_changes(
+    since: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    wait: float = Query(0.0, ge=0.0, le=MAX_CHANGES_WAIT_SECONDS),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    指定したカーソルより後に登録された実験を取得（変更フィード）
+
+    新しい実験がない場合は最大 `wait` 秒待ってから返します（ロングポーリング）。
+    存在しないカーソルを指定した場合は400を返します。
+
+    Args:
+        since: 前回のレスポンスヘッダーで受け取ったカーソル（未指定の場合は先頭から）
+        limit: 最大取得件数
+        wait: 新しい実験がない場合の最大待機秒数
+        fields: 返すフィールド名のカンマ区切り
+
+    Returns:
+        登録順の実験のリスト
+    """
+    field_names = parse_fields(fields, schemas.Experiment)
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            experiments, next_cursor = await async_cruds.select_experiment_changes(
+                db=db,
+                since=since,
+                limit=limit,
+                fields=field_names,
+            )
+        except ValueError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+        remaining = deadline - time.monotonic()
+        if experiments or remaining <= 0:
+            break
+        # 待機中は接続をプールに返す
+        await db.rollback()
+        await asyncio.sleep(min(CHANGES_POLL_INTERVAL_SECONDS, remaining))
+
+    response = ORJSONResponse(to_dicts(experiments, schemas.Experiment, field_names))
+    _set_next_cursor(response, next_cursor)
+    return response
+
+
+@router.get("/experiments/id/{experiment_id}", response_model=schemas.Experiment)
+async def experiment_by_id(experiment_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    IDで実験を取得
+
+    Args:
+        experiment_id: 実験ID
+
+    Returns:
+        実験情報
+    """
+    return await async_cruds.select_experiment_by_id(db=db, experiment_id=experiment_id)
+
+
+@router.get("/experiments/model-version-id/{model_version_id}", response_model=schemas.Experiment)
+async def experiment_by_model_version_id(
+    model_version_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    モデルバージョンIDで実験を取得
+
+    レスポンスにETagヘッダーを付与し、If-None-Matchが一致する場合は304を返します。
+    サービング側のポーリングでは、変更がなければヘッダーのやり取りだけで済みます。
+
+    Args:
+        model_version_id: モデルバージョンID
+
+    Returns:
+        実験情報
+    """
+    experiment = await async_cruds.select_experiment_by_model_version_id(db=db, model_version_id=model_version_id)
+    if experiment is None:
+        return None
+    return conditional_response(request, experiment, schemas.Experiment, experiment.experiment_id, experiment.version)
+
+
+@router.get(
+    "/experiments/model-id/{model_id}", response_model=list[schemas.Experiment], response_class=ORJSONResponse
+)
+async def experiment_by_model_id(
+    model_id: str,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    モデルIDで実験を取得
+
+    Args:
+        model_id: モデルID
+        fields: 返すフィールド名のカンマ区切り
+
+    Returns:
+        実験のリスト
+    """
+    field_names = parse_fields(fields, schemas.Experiment)
+    experiments = await async_cruds.select_experiment_by_model_id(db=db, model_id=model_id, fields=field_names)
+    return ORJSONResponse(to_dicts(experiments, schemas.Experiment, field_names))
+
+
+@router.get("/experiments/leaderboard", response_model=list[schemas.ExperimentLeaderboardEntry])
+async def experiment_leaderboard(
+    model_id: str,
+    metric: str,
+    k: int = Query(10, ge=1, le=MAX_PAGE_LIMIT),
+    ascending: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    評価指標の上位k件の実験を取得
+
+    指標の抽出と並び替えはDB側で行い、評価結果のJSON全体は返しません。
+
+    Args:
+        model_id: モデルID
+        metric: 評価指標名（例: accuracy）
+        k: 取得件数
+        ascending: trueの場合は値が小さい順（lossなど）
+
+    Returns:
+        実験ID・モデルバージョンID・指標値・作成日時のリスト
+    """
+    return await async_cruds.select_experiment_leaderboard(
+        db=db, model_id=model_id, metric=metric, k=k, ascending=ascending
+    )
+
+
+@router.get("/experiments/project-id/{project_id}", response_model=list[schemas.Experiment])
+async def experiment_by_project_id(project_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    プロジェクトIDで実験を取得
+
+    Args:
+        project_id: プロジェクトID
+
+    Returns:
+        実験のリスト
+    """
+    # CRUD層は (Experiment, Model) の組を返すため、実験のみを返す
+    rows = await async_cruds.select_experiment_by_project_id(db=db, project_id=project_id)
+    return [experiment for experiment, _ in rows]
+
+
+@router.post("/experiments", response_model=schemas.Experiment)
+async def add_experiment(experiment: schemas.ExperimentCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    実験を作成
+
+    Args:
+        experiment: 実験作成リクエスト
+
+    Returns:
+        作成された実験情報
+    """
+    return await async_cruds.add_experiment(
+        db=db,
+        model_version_id=experiment.model_version_id,
+        model_id=experiment.model_id,
+        parameters=experiment.parameters,
+        training_dataset=experiment.training_dataset,
+        validation_dataset=experiment.validation_dataset,
+        test_dataset=experiment.test_dataset,
+        evaluations=experiment.evaluations,
+        artifact_file_paths=experiment.artifact_file_paths,
+        commit=True,
+    )
+
+
+@router.post("/experiments/bulk", response_model=schemas.ExperimentBulkCreated)
+async def add_experiments_bulk(bulk: schemas.ExperimentBulkCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    実験を一括作成
+
+    1トランザクション・1回のINSERTで全件を書き込みます。
+
+    Args:
+        bulk: 実験一括作成リクエスト
+
+    Returns:
+        作成された実験IDのリスト（リクエストと同じ順序）
+    """
+    experiment_ids = await async_cruds.add_experiments_bulk(
+        db=db,
+        experiments=[experiment.model_dump() for experiment in bulk.experiments],
+        commit=True,
+    )
+    return schemas.ExperimentBulkCreated(experiment_ids=experiment_ids)
+
+
+@router.post("/experiments/evaluations/{experiment_id}", response_model=schemas.Experiment)
+async def update_evaluations(
+    experiment_id: str,
+    evaluations: schemas.ExperimentEvaluations,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    実験の評価結果を更新
+
+    Args:
+        experiment_id: 実験ID
+        evaluations: 新しい評価結果
+
+    Returns:
+        更新された実験情報
+    """
+    return await async_cruds.update_experiment_evaluation(
+        db=db,
+        experiment_id=experiment_id,
+        evaluations=evaluations.evaluations,
+    )
+
+
+@router.post("/experiments/artifact-file-paths/{experiment_id}", response_model=schemas.Experiment)
+async def update_artifact_file_paths(
+    experiment_id: str,
+    artifact_file_paths: schemas.ExperimentArtifactFilePaths,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    実験のモデルファイルパスを更新
+
+    Args:
+        experiment_id: 実験ID
+        artifact_file_paths: 新しいモデルファイルのパス
+
+    Returns:
+        更新された実験情報
+    """
+    return await async_cruds.update_experiment_artifact_file_paths(
+        db=db,
+        experiment_id=experiment_id,
+        artifact_file_paths=artifact_file_paths.artifact_file_paths,
+    )
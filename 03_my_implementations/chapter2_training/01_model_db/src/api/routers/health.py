@@ -6,6 +6,8 @@ Health Check Router
 
 from fastapi import APIRouter
 
+from src.db.cache import get_cache_stats
+
 router = APIRouter()
 
 
@@ -20,3 +22,17 @@ def health_check():
         dict: ステータス情報
     """
     return {"status": "ok"}
+
+
+@router.get("/health/cache")
+def cache_stats():
+    """
+    キャッシュ統計情報
+
+    レジストリ検索キャッシュごとのヒット数・ミス数・ヒット率・エントリ数を返します。
+    最大件数（REGISTRY_CACHE_MAXSIZE）やTTL（REGISTRY_CACHE_TTL_SECONDS）の調整に使用します。
+
+    Returns:
+        dict: キャッシュ名をキーとした統計情報
+    """
+    return get_cache_stats()
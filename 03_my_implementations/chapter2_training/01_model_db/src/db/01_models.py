@@ -5,13 +5,29 @@ SQLAlchemyを使用したデータベーステーブル定義。
 Project → Model → Experiment の3階層構造を定義します。
 """
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text
-from sqlalchemy.sql.functions import current_timestamp
-from sqlalchemy.types import JSON
+import datetime
+
+from typing import Any
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, Text, bindparam, case
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement, current_timestamp
+from sqlalchemy.types import JSON, Boolean
 
 from src.db.database import Base
 
 
+def _utcnow() -> datetime.datetime:
+    """
+    作成日時のデフォルト値（UTC、マイクロ秒精度）
+
+    SQLiteのCURRENT_TIMESTAMPは秒精度のため、同一秒内の登録順が
+    キーセットページネーションの並び順に反映されるようアプリ側で付与します。
+    """
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
 class Project(Base):
     """
     プロジェクトテーブル
@@ -20,6 +36,10 @@ class Project(Base):
     """
 
     __tablename__ = "projects"
+    __table_args__ = (
+        # キーセットページネーション（created_datetime, 主キー順）用
+        Index("ix_projects_created_datetime", "created_datetime", "project_id"),
+    )
 
     project_id = Column(
         String(255),
@@ -39,6 +59,7 @@ class Project(Base):
     )
     created_datetime = Column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=current_timestamp(),
         nullable=False,
         comment="作成日時",
@@ -53,6 +74,13 @@ class Model(Base):
     """
 
     __tablename__ = "models"
+    __table_args__ = (
+        # キーセットページネーション（created_datetime, 主キー順）用
+        Index("ix_models_created_datetime", "created_datetime", "model_id"),
+        # 同一プロジェクト内のモデル名の一意性を保証（insert-or-getの競合判定にも使用）
+        # 先頭カラムがproject_idのため、project_idでの検索もこのインデックスで賄う
+        Index("uq_models_project_id_model_name", "project_id", "model_name", unique=True),
+    )
 
     model_id = Column(
         String(255),
@@ -68,6 +96,7 @@ class Model(Base):
     model_name = Column(
         String(255),
         nullable=False,
+        index=True,
         comment="モデル名",
     )
     description = Column(
@@ -75,8 +104,15 @@ class Model(Base):
         nullable=True,
         comment="モデルの説明",
     )
+    version = Column(
+        Integer,
+        nullable=True,
+        default=1,
+        comment="行バージョン（更新のたびに加算。ETagに使用）",
+    )
     created_datetime = Column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=current_timestamp(),
         nullable=False,
         comment="作成日時",
@@ -92,6 +128,10 @@ class Experiment(Base):
     """
 
     __tablename__ = "experiments"
+    __table_args__ = (
+        # キーセットページネーション（created_datetime, 主キー順）用
+        Index("ix_experiments_created_datetime", "created_datetime", "experiment_id"),
+    )
 
     experiment_id = Column(
         String(255),
@@ -102,11 +142,13 @@ class Experiment(Base):
         String(255),
         ForeignKey("models.model_id"),
         nullable=False,
+        index=True,
         comment="モデルID（外部キー）",
     )
     model_version_id = Column(
         String(255),
         nullable=False,
+        index=True,
         comment="モデルバージョンID",
     )
     parameters = Column(
@@ -139,9 +181,161 @@ class Experiment(Base):
         nullable=True,
         comment="モデルファイルのパス（JSON形式）",
     )
+    artifact_digests = Column(
+        JSON,
+        nullable=True,
+        comment="モデルファイルのSHA-256ダイジェスト（JSON形式）",
+    )
+    version = Column(
+        Integer,
+        nullable=True,
+        default=1,
+        comment="行バージョン（更新のたびに加算。ETagに使用）",
+    )
     created_datetime = Column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=current_timestamp(),
         nullable=False,
         comment="作成日時",
     )
+
+
+class ExperimentChange(Base):
+    """
+    実験の変更フィード（アウトボックス）テーブル
+
+    実験の登録と同じトランザクションで1行ずつ追加します。
+    created_datetimeはアプリ側で付与されコミット順と一致しないため、変更フィードは
+    (txid, change_id) 順に読み、書き込んだトランザクションの終了が確定した行のみを返します。
+    """
+
+    __tablename__ = "experiment_changes"
+    __table_args__ = (
+        # 変更フィードの範囲検索（(txid, change_id)順）用
+        Index("ix_experiment_changes_txid_change_id", "txid", "change_id"),
+        # SQLiteで削除された行のchange_idを再利用しない
+        {"sqlite_autoincrement": True},
+    )
+
+    change_id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+        comment="変更の通し番号（変更フィードのカーソル）",
+    )
+    experiment_id = Column(
+        String(255),
+        ForeignKey("experiments.experiment_id"),
+        nullable=False,
+        comment="実験ID（外部キー）",
+    )
+    txid = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="書き込んだトランザクションID（PostgreSQL。書き込みが直列化されるSQLiteでは0）",
+    )
+
+
+class ModelSummary(Base):
+    """
+    モデルごとの実験サマリーテーブル
+
+    プロジェクトのサマリー取得でExperimentを集計しないよう、実験数・最新バージョン・
+    評価指標ごとの最良値を非正規化して保持します。
+    実験の作成・評価結果の更新と同じトランザクションで差分更新されます。
+    """
+
+    __tablename__ = "model_summaries"
+
+    model_id = Column(
+        String(255),
+        ForeignKey("models.model_id"),
+        primary_key=True,
+        comment="モデルID（外部キー）",
+    )
+    project_id = Column(
+        String(255),
+        ForeignKey("projects.project_id"),
+        nullable=False,
+        index=True,
+        comment="プロジェクトID（外部キー）",
+    )
+    model_name = Column(
+        String(255),
+        nullable=False,
+        comment="モデル名",
+    )
+    experiment_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="実験数",
+    )
+    latest_experiment_id = Column(
+        String(255),
+        nullable=True,
+        comment="最新（created_datetime, experiment_id順で最後）の実験ID",
+    )
+    latest_model_version_id = Column(
+        String(255),
+        nullable=True,
+        comment="最新の実験のモデルバージョンID",
+    )
+    latest_created_datetime = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="最新の実験の作成日時",
+    )
+    best_evaluations = Column(
+        JSON,
+        nullable=True,
+        comment="評価指標ごとの最良値（JSON形式。{指標名: {value, experiment_id, model_version_id}}）",
+    )
+
+
+class json_value_is_number(FunctionElement):
+    """
+    JSONのキーの値が数値かを判定するSQL式
+
+    json_value_is_number(evaluations, key) は、SQLiteでは json_type(evaluations, '$."key"') IN ('integer', 'real')、
+    PostgreSQLでは json_typeof(evaluations -> 'key') = 'number' になります。
+    """
+
+    type = Boolean()
+    inherit_cache = True
+    name = "json_value_is_number"
+
+
+@compiles(json_value_is_number, "sqlite")
+def _sqlite_json_value_is_number(element: json_value_is_number, compiler: Any, **kw: Any) -> str:
+    evaluations, key = element.clauses
+    return f"json_type({compiler.process(evaluations, **kw)}, {compiler.process(key, **kw)}) IN ('integer', 'real')"
+
+
+@compiles(json_value_is_number, "postgresql")
+def _postgresql_json_value_is_number(element: json_value_is_number, compiler: Any, **kw: Any) -> str:
+    evaluations, key = element.clauses
+    return f"json_typeof({compiler.process(evaluations, **kw)} -> {compiler.process(key, **kw)}) = 'number'"
+
+
+def evaluation_metric(metric: str, evaluations: Any = Experiment.evaluations) -> ColumnElement:
+    """
+    評価結果（JSON）から指標を数値として取り出すSQL式
+
+    SQLiteでは JSON_EXTRACT(evaluations, '$."metric"')、
+    PostgreSQLでは CAST(evaluations ->> 'metric' AS FLOAT) を、値がJSONの数値の場合のみ評価する
+    CASE式になります。文字列・オブジェクト・真偽値の場合はNULLになるため、
+    PostgreSQLのCASTのエラーや、SQLiteで文字列が数値より上に並ぶことはありません。
+    式インデックスと一致させるため、キーはバインドパラメータではなくリテラルとしてSQLに埋め込みます。
+
+    Args:
+        metric: 評価指標名（例: "accuracy"）
+        evaluations: 評価結果のカラム
+
+    Returns:
+        指標の値を表すSQL式（指標が存在しない、または数値でない場合はNULL）
+    """
+    key = bindparam("metric", metric, type_=JSON.JSONIndexType, literal_execute=True, unique=True)
+    return case((json_value_is_number(evaluations, key), evaluations[key].as_float()))
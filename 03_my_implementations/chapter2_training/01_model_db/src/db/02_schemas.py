@@ -6,9 +6,9 @@ PydanticモデルによるAPIのリクエスト/レスポンス構造定義。
 """
 
 import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ==================== Project Schemas ====================
@@ -84,6 +84,18 @@ class ExperimentCreate(ExperimentBase):
     pass
 
 
+class ExperimentBulkCreate(BaseModel):
+    """実験一括作成時のリクエストスキーマ"""
+
+    experiments: List[ExperimentCreate] = Field(min_length=1, max_length=10000)
+
+
+class ExperimentBulkCreated(BaseModel):
+    """実験一括作成時のレスポンススキーマ"""
+
+    experiment_ids: List[str]
+
+
 class ExperimentEvaluations(BaseModel):
     """実験の評価結果更新用スキーマ"""
 
@@ -100,6 +112,51 @@ class Experiment(ExperimentBase):
     """実験のレスポンススキーマ"""
 
     experiment_id: str
+    artifact_digests: Optional[Dict[str, str]] = None
+    created_datetime: datetime.datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ExperimentLeaderboardEntry(BaseModel):
+    """リーダーボードのレスポンススキーマ（評価結果のJSON全体は含まない）"""
+
+    experiment_id: str
+    model_version_id: str
+    value: float
     created_datetime: datetime.datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# ==================== Summary Schemas ====================
+
+
+class BestEvaluation(BaseModel):
+    """評価指標の最良値"""
+
+    value: float
+    experiment_id: str
+    model_version_id: str
+
+
+class ModelSummary(BaseModel):
+    """モデルごとの実験サマリーのレスポンススキーマ"""
+
+    model_id: str
+    model_name: str
+    experiment_count: int
+    latest_experiment_id: Optional[str] = None
+    latest_model_version_id: Optional[str] = None
+    latest_created_datetime: Optional[datetime.datetime] = None
+    best_evaluations: Optional[Dict[str, BestEvaluation]] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectSummary(BaseModel):
+    """プロジェクトの実験サマリーのレスポンススキーマ"""
+
+    project_id: str
+    experiment_count: int
+    models: List[ModelSummary]
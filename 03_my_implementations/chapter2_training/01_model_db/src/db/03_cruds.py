@@ -5,12 +5,882 @@ CRUD Layer
 Create, Read, Update, Delete の操作を提供します。
 """
 
-import uuid
-from typing import Any, Dict, List, Optional
+import datetime
+import json
+import math
+import os
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import JSON, and_, case, cast, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session, load_only
+from sqlalchemy.sql import ColumnElement, Select
 
-from src.db import models, schemas
+from src.db import cache, ids, models, schemas
+
+
+# ==================== Pagination Helpers ====================
+
+
+def _load_only(table: Any, fields: Optional[Sequence[str]]) -> List[Any]:
+    """
+    指定カラムのみを読み込むローダーオプションを作成
+
+    主キーは常に読み込まれます。
+
+    Args:
+        table: ORMモデルクラス
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        Query.options() / Select.options() に渡すオプションのリスト
+    """
+    if not fields:
+        return []
+    return [load_only(*(getattr(table, field) for field in fields))]
+
+
+def _keyset_query(
+    db: Session,
+    table: Any,
+    primary_key: Any,
+    cursor: Optional[str],
+    fields: Optional[Sequence[str]] = None,
+) -> Query:
+    """
+    (created_datetime, 主キー) 順のキーセットページネーション用クエリを作成
+
+    カーソルには前ページ最後の要素の主キーを使用します。
+    比較対象の作成日時はサブクエリでDBから取得するため、
+    DBごとの日時表現の違いに影響されません。
+
+    Args:
+        db: データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        cursor: 前ページ最後の要素の主キー（Noneの場合は先頭から）
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        ソート・絞り込み済みのクエリ
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    query = db.query(table).options(*_load_only(table, fields)).order_by(table.created_datetime, primary_key)
+    if cursor is None:
+        return query
+    if db.query(primary_key).filter(primary_key == cursor).first() is None:
+        raise ValueError(f"Unknown pagination cursor: {cursor!r}")
+
+    last_created = db.query(table.created_datetime).filter(primary_key == cursor).scalar_subquery()
+    return query.filter(
+        or_(
+            table.created_datetime > last_created,
+            and_(table.created_datetime == last_created, primary_key > cursor),
+        )
+    )
+
+
+def _select_page(
+    db: Session,
+    table: Any,
+    primary_key: Any,
+    limit: int,
+    cursor: Optional[str],
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    キーセットページネーションで1ページ分を取得
+
+    limit + 1 件を取得し、次ページの有無を判定します。
+
+    Args:
+        db: データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        limit: 1ページあたりの件数
+        cursor: 前ページ最後の要素の主キー
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (要素のリスト, 次ページのカーソル) のタプル。最終ページの場合カーソルはNone
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    query = _keyset_query(db=db, table=table, primary_key=primary_key, cursor=cursor, fields=fields)
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, getattr(rows[-1], primary_key.key)
+
+
+def _iter_all(
+    db: Session,
+    table: Any,
+    primary_key: Any,
+    cursor: Optional[str],
+    chunk_size: int,
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[Any]:
+    """
+    全件をチャンク単位で逐次取得
+
+    yield_perによりchunk_size件ずつフェッチするため、
+    テーブルサイズに関わらずメモリ使用量が一定に保たれます。
+    カーソルの検証は呼び出し時に行うため、ストリーミング開始前にエラーを検出できます。
+
+    Args:
+        db: データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        cursor: 開始位置のカーソル（Noneの場合は先頭から）
+        chunk_size: 1回のフェッチ件数
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        ORMオブジェクトのイテレータ
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    query = _keyset_query(db=db, table=table, primary_key=primary_key, cursor=cursor, fields=fields)
+    return (row for row in query.yield_per(chunk_size))
+
+
+# ==================== Insert-or-Get Helpers ====================
+
+# ON CONFLICT句をサポートするダイアレクトごとのinsert関数
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+# 主キーが衝突した場合にIDを再生成して挿入し直す最大回数
+MAX_ID_ATTEMPTS = 5
+
+
+def _id_collision_error(table: Any) -> RuntimeError:
+    """
+    主キーの再生成が上限に達した場合の例外を作成
+
+    Args:
+        table: ORMモデルクラス
+
+    Returns:
+        RuntimeError
+    """
+    return RuntimeError(f"Could not generate a unique {table.__tablename__} ID after {MAX_ID_ATTEMPTS} attempts")
+
+
+def _new_id(db: Session, table: Any) -> str:
+    """
+    既存行と衝突しない主キーを採番（ON CONFLICTをサポートしないダイアレクト用）
+
+    Args:
+        db: データベースセッション
+        table: ORMモデルクラス
+
+    Returns:
+        新しいID
+
+    Raises:
+        RuntimeError: MAX_ID_ATTEMPTS回続けて既存のIDと衝突した場合
+    """
+    for _ in range(MAX_ID_ATTEMPTS):
+        new_id = ids.generate_id()
+        if db.get(table, new_id) is None:
+            return new_id
+    raise _id_collision_error(table)
+
+
+def _insert_or_get(
+    db: Session,
+    table: Any,
+    primary_key: Any,
+    values: Dict[str, Any],
+    conflict_columns: List[Any],
+) -> Optional[Any]:
+    """
+    INSERT ... ON CONFLICT DO NOTHING ... RETURNINGで作成、または既存行を取得
+
+    主キーはここで採番します。何も挿入されなかった場合は一意キーで既存行を検索し、
+    既存行もなければ主キーの衝突とみなしてIDを再生成します。
+
+    Args:
+        db: データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        values: 新規作成時のカラム値（主キーを除く）
+        conflict_columns: 一意制約を構成するカラム
+
+    Returns:
+        作成された（または既存の）ORMオブジェクト。
+        ON CONFLICTをサポートしないダイアレクトの場合はNone
+
+    Raises:
+        RuntimeError: MAX_ID_ATTEMPTS回続けて主キーが衝突した場合
+    """
+    insert_func = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_func is None:
+        return None
+
+    # 未フラッシュの親レコード（commit=Falseで追加されたもの）を先に書き込む
+    db.flush()
+
+    for _ in range(MAX_ID_ATTEMPTS):
+        stmt = (
+            insert_func(table)
+            .values({**values, primary_key.key: ids.generate_id()})
+            .on_conflict_do_nothing()
+            .returning(table)
+        )
+        data = db.scalars(stmt).first()
+        if data is None:
+            data = db.query(table).filter(*(column == values[column.key] for column in conflict_columns)).first()
+        if data is not None:
+            return data
+
+    raise _id_collision_error(table)
+
+
+def _insert_new(db: Session, table: Any, primary_key: Any, values: Dict[str, Any]) -> Optional[Any]:
+    """
+    主キーを採番し、INSERT ... ON CONFLICT (主キー) DO NOTHING ... RETURNINGで1行作成
+
+    主キーが衝突して何も挿入されなかった場合は、IDを再生成して挿入し直します。
+
+    Args:
+        db: データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        values: カラム値（主キーを除く）
+
+    Returns:
+        作成されたORMオブジェクト。ON CONFLICTをサポートしないダイアレクトの場合はNone
+
+    Raises:
+        RuntimeError: MAX_ID_ATTEMPTS回続けて主キーが衝突した場合
+    """
+    insert_func = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_func is None:
+        return None
+
+    # 未フラッシュの親レコード（commit=Falseで追加されたもの）を先に書き込む
+    db.flush()
+
+    for _ in range(MAX_ID_ATTEMPTS):
+        stmt = (
+            insert_func(table)
+            .values({**values, primary_key.key: ids.generate_id()})
+            .on_conflict_do_nothing(index_elements=[primary_key])
+            .returning(table)
+        )
+        data = db.scalars(stmt).first()
+        if data is not None:
+            return data
+
+    raise _id_collision_error(table)
+
+
+def _insert_new_bulk(db: Session, table: Any, primary_key: Any, rows: List[Dict[str, Any]]) -> List[str]:
+    """
+    主キーを採番し、複数行を1回のexecutemany INSERTで作成
+
+    ON CONFLICTをサポートするダイアレクトでは衝突した行をRETURNINGで検出し、
+    その行だけIDを再生成して挿入し直します。
+
+    Args:
+        db: データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        rows: 行ごとのカラム値の辞書のリスト（主キーを除く）
+
+    Returns:
+        作成された行のIDのリスト（入力と同じ順序）
+
+    Raises:
+        RuntimeError: MAX_ID_ATTEMPTS回続けて主キーが衝突した場合
+    """
+    rows = [{**row, primary_key.key: ids.generate_id()} for row in rows]
+
+    # 未フラッシュの親レコード（commit=Falseで追加されたもの）を先に書き込む
+    db.flush()
+
+    insert_func = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_func is None:
+        db.execute(insert(table), rows)
+        return [row[primary_key.key] for row in rows]
+
+    stmt = insert_func(table.__table__).on_conflict_do_nothing(index_elements=[primary_key.key])
+    stmt = stmt.returning(table.__table__.c[primary_key.key])
+    pending = rows
+    for _ in range(MAX_ID_ATTEMPTS):
+        inserted = set(db.scalars(stmt, pending).all())
+        pending = [row for row in pending if row[primary_key.key] not in inserted]
+        if not pending:
+            return [row[primary_key.key] for row in rows]
+        for row in pending:
+            row[primary_key.key] = ids.generate_id()
+
+    raise _id_collision_error(table)
+
+
+# ==================== JSON Merge Helpers ====================
+
+
+def _postgresql_json_merge(column: Any, values: Dict[str, Any]) -> ColumnElement:
+    """
+    PostgreSQL用のJSONマージ式（jsonb ||）を作成
+
+    Args:
+        column: JSONカラム
+        values: マージする値
+
+    Returns:
+        column::jsonb || :values::jsonb をJSON型にキャストした式
+    """
+    # NULLやJSONのnull（未設定時の値）は空オブジェクトとして扱う
+    current = cast(column, postgresql.JSONB)
+    base = case((func.jsonb_typeof(current) == "object", current), else_=cast(literal("{}"), postgresql.JSONB))
+    return cast(base.op("||")(cast(literal(json.dumps(values)), postgresql.JSONB)), JSON)
+
+
+def _sqlite_json_merge(column: Any, values: Dict[str, Any]) -> ColumnElement:
+    """
+    SQLite用のJSONマージ式（json_set）を作成
+
+    json_patchはネストしたオブジェクトを再帰的にマージし、nullのキーを削除するため、
+    既存の動作（トップレベルのキーを上書き）に合わせてキーごとにjson_setで設定します。
+
+    Args:
+        column: JSONカラム
+        values: マージする値
+
+    Returns:
+        json_set(column, '$."key"', json(:value), ...) の式
+    """
+    # NULLやJSONのnull（未設定時の値）は空オブジェクトとして扱う
+    base = case((func.json_type(column) == "object", column), else_="{}")
+    arguments = []
+    for key, value in values.items():
+        arguments.extend([f'$."{key}"', func.json(json.dumps(value))])
+    return func.json_set(base, *arguments)
+
+
+def _is_sqlite_json_path_key(key: Any) -> bool:
+    """
+    SQLiteのJSONパス（$."key"）で表せるキーか判定
+
+    SQLiteのJSONパスは引用符のエスケープに対応しておらず、ダブルクォートを含むキーは書き込まれません。
+    また、JSONテキスト上でエスケープされるキー（バックスラッシュ・制御文字・非ASCII文字）は
+    保存済みのキーと一致せず重複して追加されるため、エスケープが不要な文字列のキーのみ許可します。
+
+    Args:
+        key: マージするキー
+
+    Returns:
+        JSONパスで表せる場合はTrue
+    """
+    return isinstance(key, str) and json.dumps(key) == f'"{key}"'
+
+
+# 1文のUPDATE ... RETURNINGでJSONをマージできるダイアレクトごとの式
+_JSON_MERGES: Dict[str, Callable[[Any, Dict[str, Any]], ColumnElement]] = {
+    "postgresql": _postgresql_json_merge,
+    "sqlite": _sqlite_json_merge,
+}
+
+# マージ式で表せるキーの判定（判定がないダイアレクトは全てのキーを表せる）
+_JSON_MERGE_KEY_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "sqlite": _is_sqlite_json_path_key,
+}
+
+
+def _update_experiment_json(
+    db: Session,
+    experiment_id: str,
+    updates: Dict[Any, Dict[str, Any]],
+    before_commit: Optional[Callable[[Any], None]] = None,
+) -> Optional[models.Experiment]:
+    """
+    実験のJSONカラムにサーバー側で値をマージ
+
+    対応ダイアレクトでは UPDATE ... SET column = <マージ式> ... RETURNING の1文で更新し、
+    返された行をDBアクセスなしでセッションに反映します。
+    それ以外のダイアレクト、またはマージ式で表せないキー（SQLiteのJSONパスで表せないキーなど）を
+    含む場合は SELECT ... FOR UPDATE で行ロックを取得してからマージします。
+    いずれの場合も、並行する更新が互いの書き込みを失うことはありません。
+    更新のたびに行バージョン（version）を1つ進めます（ETagの生成に使用）。
+    モデルバージョンIDの検索キャッシュはコミット後に無効化します。
+
+    Args:
+        db: データベースセッション
+        experiment_id: 実験ID
+        updates: 更新するJSONカラムをキー、マージする値を値とした辞書
+        before_commit: 更新後の行を受け取り、同じトランザクションで実行する処理（サマリーの更新など）
+
+    Returns:
+        更新された実験、または存在しない場合はNone
+    """
+    dialect = db.get_bind().dialect.name
+    json_merge = _JSON_MERGES.get(dialect)
+    key_check = _JSON_MERGE_KEY_CHECKS.get(dialect)
+    if key_check is not None and not all(key_check(key) for values in updates.values() for key in values):
+        json_merge = None
+
+    if json_merge is None:
+        data = (
+            db.query(models.Experiment)
+            .filter(models.Experiment.experiment_id == experiment_id)
+            .with_for_update()
+            .populate_existing()
+            .first()
+        )
+        if data is None:
+            db.rollback()
+            return None
+
+        # JSON型の更新を確実にするため、新しいdictを作成
+        for column, values in updates.items():
+            merged = dict(getattr(data, column.key) or {})
+            merged.update(values)
+            setattr(data, column.key, merged)
+        data.version = (data.version or 0) + 1
+        if before_commit is not None:
+            before_commit(data)
+        cache.invalidate_after_commit(db, cache.experiment_by_model_version_id_cache, data.model_version_id)
+
+        db.commit()
+        db.refresh(data)
+        return data
+
+    # 未フラッシュの変更を先に書き込む
+    db.flush()
+
+    table = models.Experiment.__table__
+    stmt = (
+        update(table)
+        .where(table.c.experiment_id == experiment_id)
+        .values({column.key: json_merge(table.c[column.key], values) for column, values in updates.items()})
+        .values(version=func.coalesce(table.c.version, 0) + 1)
+        .returning(*table.c)
+    )
+    row = db.execute(stmt).first()
+    if row is not None:
+        if before_commit is not None:
+            before_commit(row)
+        cache.invalidate_after_commit(db, cache.experiment_by_model_version_id_cache, row.model_version_id)
+    db.commit()
+
+    if row is None:
+        return None
+    return db.merge(cache.from_snapshot(models.Experiment, dict(row._mapping)), load=False)
+
+
+# ==================== Cache Helpers ====================
+
+
+def _cached_select(
+    db: Session,
+    registry_cache: cache.LRUTTLCache,
+    table: Any,
+    key: str,
+    query: Query,
+) -> Optional[Any]:
+    """
+    キャッシュ経由で1件取得（リードスルー）
+
+    ヒット時はスナップショットをDBアクセスなしでセッションにmergeして返します。
+    未コミットの書き込みをキャッシュしないよう、保存はトランザクション外で読み込んだ場合のみ行います。
+
+    Args:
+        db: データベースセッション
+        registry_cache: 使用するキャッシュ
+        table: ORMモデルクラス
+        key: キャッシュキー
+        query: ミス時に実行するクエリ
+
+    Returns:
+        ORMオブジェクト、または存在しない場合はNone
+    """
+    snapshot, generation = registry_cache.get(key)
+    if snapshot is not None:
+        return db.merge(cache.from_snapshot(table, snapshot), load=False)
+
+    cacheable = not db.in_transaction()
+    data = query.first()
+    if data is not None and cacheable:
+        registry_cache.set(key, cache.to_snapshot(data), generation)
+    return data
+
+
+# ==================== Change Feed Helpers ====================
+
+# 書き込み中のトランザクションIDを返すダイアレクトごとの式。
+# SQLiteは書き込みトランザクションを直列化するため、change_idの採番順がコミット順と一致し、txidは0とする
+_CURRENT_TXIDS: Dict[str, Callable[[], ColumnElement]] = {
+    "postgresql": lambda: func.txid_current(),
+}
+
+# 終了が確定したトランザクションIDの上限を返すダイアレクトごとの式。
+# スナップショットのxminより小さいIDのトランザクションは全てコミットまたはロールバック済み
+_FINISHED_TXID_HORIZONS: Dict[str, Callable[[], ColumnElement]] = {
+    "postgresql": lambda: func.txid_snapshot_xmin(func.txid_current_snapshot()),
+}
+
+
+def _record_changes_statement(dialect_name: str) -> Any:
+    """
+    変更フィードに実験を記録するINSERT文を作成
+
+    Args:
+        dialect_name: ダイアレクト名
+
+    Returns:
+        experiment_id をパラメータに取るINSERT文
+    """
+    current_txid = _CURRENT_TXIDS.get(dialect_name)
+    txid = current_txid() if current_txid is not None else literal(0)
+    return insert(models.ExperimentChange).values(txid=txid)
+
+
+def _record_experiment_changes(db: Session, experiment_ids: List[str]) -> None:
+    """
+    登録した実験を変更フィードに記録
+
+    実験の登録と同じトランザクションで、入力の順にchange_idを採番します。
+
+    Args:
+        db: データベースセッション
+        experiment_ids: 登録した実験IDのリスト
+    """
+    stmt = _record_changes_statement(db.get_bind().dialect.name)
+    db.execute(stmt, [{"experiment_id": experiment_id} for experiment_id in experiment_ids])
+
+
+def _change_cursor_select(since: str) -> Select:
+    """
+    変更フィードのカーソルが指す変更の (txid, change_id) を取得するSELECT文を作成
+
+    Args:
+        since: 前回のレスポンスで受け取ったカーソル（change_id）
+
+    Returns:
+        SELECT文
+
+    Raises:
+        ValueError: カーソルが整数でない場合
+    """
+    if not since.isdigit():
+        raise ValueError(f"Invalid change feed cursor: {since!r}")
+    change = models.ExperimentChange
+    return select(change.txid, change.change_id).where(change.change_id == int(since))
+
+
+def _experiment_changes_select(
+    dialect_name: str,
+    last: Optional[Tuple[int, int]],
+    fields: Optional[Sequence[str]] = None,
+) -> Select:
+    """
+    変更フィードのSELECT文を作成
+
+    (txid, change_id) 順に、カーソルより後の変更を返します。
+    PostgreSQLでは実行中のトランザクションより後のtxidの行を返さないため、
+    先に始まったトランザクションが後からコミットされても、その行をカーソルが追い越すことはありません。
+
+    Args:
+        dialect_name: ダイアレクト名
+        last: カーソルが指す変更の (txid, change_id)（Noneの場合は先頭から）
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (実験, change_id) を返すSELECT文
+    """
+    change = models.ExperimentChange
+    stmt = (
+        select(models.Experiment, change.change_id)
+        .options(*_load_only(models.Experiment, fields))
+        .join(change, change.experiment_id == models.Experiment.experiment_id)
+        .order_by(change.txid, change.change_id)
+    )
+    finished_horizon = _FINISHED_TXID_HORIZONS.get(dialect_name)
+    if finished_horizon is not None:
+        stmt = stmt.where(change.txid < finished_horizon())
+    if last is not None:
+        stmt = stmt.where(tuple_(change.txid, change.change_id) > tuple_(*last))
+    return stmt
+
+
+# ==================== Summary Helpers ====================
+
+# 値が小さいほど良い評価指標（カンマ区切り）。それ以外の指標は値が大きいほど良いとみなす
+SUMMARY_MINIMIZED_METRICS = frozenset(
+    metric for metric in os.getenv("SUMMARY_MINIMIZED_METRICS", "loss,log_loss,mae,mse,rmse").split(",") if metric
+)
+
+
+def _metric_value(value: Any) -> Optional[float]:
+    """
+    評価結果の値をサマリー用の数値に変換
+
+    Args:
+        value: 評価結果の値
+
+    Returns:
+        有限の数値の場合はfloat、それ以外（真偽値・文字列・NaNなど）はNone
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return float(value)
+
+
+def _is_better(metric: str, value: float, best: Optional[Dict[str, Any]]) -> bool:
+    """
+    評価指標の値が現在の最良値より良いか（同値の場合は先に記録された実験を優先）
+
+    Args:
+        metric: 評価指標名
+        value: 比較する値
+        best: 現在の最良値（{value, experiment_id, model_version_id}）、または未記録の場合はNone
+
+    Returns:
+        最良値を置き換える場合True
+    """
+    if best is None:
+        return True
+    if metric in SUMMARY_MINIMIZED_METRICS:
+        return value < best["value"]
+    return value > best["value"]
+
+
+def _utc(value: datetime.datetime) -> datetime.datetime:
+    """タイムゾーンなしの日時（SQLiteから読み込んだ値）をUTCとして扱う"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=datetime.timezone.utc)
+
+
+def _merge_best_evaluations(
+    summary: models.ModelSummary,
+    experiment_id: str,
+    model_version_id: str,
+    evaluations: Dict[str, Any],
+) -> List[str]:
+    """
+    実験の評価結果をサマリーの最良値にマージ
+
+    現在の最良値を持つ実験の値が悪化した（または数値でなくなった）指標は、
+    この実験の値だけでは最良値を決められないため、再集計が必要な指標として返します。
+
+    Args:
+        summary: 更新するサマリー
+        experiment_id: 実験ID
+        model_version_id: モデルバージョンID
+        evaluations: 実験の評価結果（更新した指標のみでも可）
+
+    Returns:
+        再集計が必要な評価指標名のリスト
+    """
+    best = dict(summary.best_evaluations or {})
+    stale = []
+    for metric, raw_value in evaluations.items():
+        value = _metric_value(raw_value)
+        current = best.get(metric)
+        if value is not None and _is_better(metric, value, current):
+            best[metric] = {"value": value, "experiment_id": experiment_id, "model_version_id": model_version_id}
+        elif current is not None and current["experiment_id"] == experiment_id and value != current["value"]:
+            stale.append(metric)
+    # JSON型の更新を確実にするため、新しいdictを代入
+    summary.best_evaluations = best
+    return stale
+
+
+def _record_experiment(
+    summary: models.ModelSummary,
+    experiment_id: str,
+    model_version_id: str,
+    created_datetime: datetime.datetime,
+    evaluations: Optional[Dict[str, Any]],
+) -> None:
+    """
+    新しい実験をサマリーに反映（実験数・最新バージョン・最良値）
+
+    Args:
+        summary: 更新するサマリー
+        experiment_id: 実験ID
+        model_version_id: モデルバージョンID
+        created_datetime: 作成日時
+        evaluations: 評価結果
+    """
+    summary.experiment_count = (summary.experiment_count or 0) + 1
+    if summary.latest_created_datetime is None or (_utc(created_datetime), experiment_id) > (
+        _utc(summary.latest_created_datetime),
+        summary.latest_experiment_id,
+    ):
+        summary.latest_experiment_id = experiment_id
+        summary.latest_model_version_id = model_version_id
+        summary.latest_created_datetime = created_datetime
+    _merge_best_evaluations(summary, experiment_id, model_version_id, evaluations or {})
+
+
+def _lock_model_summary(db: Session, model_id: str) -> Optional[models.ModelSummary]:
+    """
+    モデルのサマリーを行ロック付きで取得
+
+    Args:
+        db: データベースセッション
+        model_id: モデルID
+
+    Returns:
+        サマリー、または未作成の場合はNone
+    """
+    return (
+        db.query(models.ModelSummary)
+        .filter(models.ModelSummary.model_id == model_id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+
+
+def _create_model_summary(db: Session, model_id: str) -> bool:
+    """
+    モデルの全実験を集計してサマリーを作成
+
+    サマリー導入前に作成されたモデルや、最初の実験の登録時に使われます。
+    同じトランザクションで登録した実験も集計に含まれます。
+
+    Args:
+        db: データベースセッション
+        model_id: モデルID
+
+    Returns:
+        作成した場合（またはモデルが存在しない場合）True、
+        他のトランザクションが先に作成していた場合False
+    """
+    model = db.get(models.Model, model_id)
+    if model is None:
+        return True
+
+    summary = models.ModelSummary(
+        model_id=model.model_id,
+        project_id=model.project_id,
+        model_name=model.model_name,
+        experiment_count=0,
+    )
+    experiments = (
+        db.query(models.Experiment)
+        .options(
+            load_only(
+                models.Experiment.experiment_id,
+                models.Experiment.model_version_id,
+                models.Experiment.created_datetime,
+                models.Experiment.evaluations,
+            )
+        )
+        .filter(models.Experiment.model_id == model_id)
+    )
+    for experiment in experiments:
+        _record_experiment(
+            summary,
+            experiment.experiment_id,
+            experiment.model_version_id,
+            experiment.created_datetime,
+            experiment.evaluations,
+        )
+
+    insert_func = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_func is None:
+        db.add(summary)
+        db.flush()
+        return True
+
+    values = {key: value for key, value in cache.to_snapshot(summary).items() if value is not None}
+    stmt = insert_func(models.ModelSummary).values(values).on_conflict_do_nothing()
+    return db.scalar(stmt.returning(models.ModelSummary.model_id)) is not None
+
+
+def _lock_or_create_model_summary(db: Session, model_id: str) -> Optional[models.ModelSummary]:
+    """
+    モデルのサマリーを行ロック付きで取得し、未作成の場合は全実験を集計して作成
+
+    Args:
+        db: データベースセッション
+        model_id: モデルID
+
+    Returns:
+        差分を反映すべきサマリー。作成した場合（集計済み）やモデルが存在しない場合はNone
+    """
+    summary = _lock_model_summary(db, model_id)
+    if summary is not None or _create_model_summary(db, model_id):
+        return summary
+    # 並行するトランザクションが先に作成した
+    return _lock_model_summary(db, model_id)
+
+
+def _summarize_new_experiments(
+    db: Session,
+    model_id: str,
+    experiments: List[Tuple[str, str, datetime.datetime, Optional[Dict[str, Any]]]],
+) -> None:
+    """
+    新しく登録した実験をモデルのサマリーに反映
+
+    サマリーの行ロックを取得してから更新するため、並行する登録でも実験数などは失われません。
+
+    Args:
+        db: データベースセッション
+        model_id: モデルID
+        experiments: (experiment_id, model_version_id, created_datetime, evaluations) のリスト
+    """
+    summary = _lock_or_create_model_summary(db, model_id)
+    if summary is None:
+        return
+    for experiment in experiments:
+        _record_experiment(summary, *experiment)
+
+
+def _summarize_evaluation(
+    db: Session,
+    model_id: str,
+    experiment_id: str,
+    model_version_id: str,
+    evaluations: Dict[str, Any],
+) -> None:
+    """
+    評価結果の更新をモデルのサマリーの最良値に反映
+
+    最良値を持つ実験の値が悪化した指標のみ、リーダーボードのクエリ（上位1件）で再集計します。
+
+    Args:
+        db: データベースセッション
+        model_id: モデルID
+        experiment_id: 実験ID
+        model_version_id: モデルバージョンID
+        evaluations: 更新した評価結果
+    """
+    summary = _lock_or_create_model_summary(db, model_id)
+    if summary is None:
+        return
+
+    for metric in _merge_best_evaluations(summary, experiment_id, model_version_id, evaluations):
+        best = dict(summary.best_evaluations)
+        rows = select_experiment_leaderboard(
+            db=db, model_id=model_id, metric=metric, k=1, ascending=metric in SUMMARY_MINIMIZED_METRICS
+        )
+        if rows:
+            best[metric] = {
+                "value": rows[0].value,
+                "experiment_id": rows[0].experiment_id,
+                "model_version_id": rows[0].model_version_id,
+            }
+        else:
+            best.pop(metric)
+        summary.best_evaluations = best
 
 
 # ==================== Project CRUD ====================
@@ -29,6 +899,68 @@ def select_project_all(db: Session) -> List[models.Project]:
     return db.query(models.Project).all()
 
 
+def select_project_page(
+    db: Session,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[models.Project], Optional[str]]:
+    """
+    プロジェクトをページ単位で取得
+
+    Args:
+        db: データベースセッション
+        limit: 1ページあたりの件数
+        cursor: 前ページ最後のプロジェクトID（Noneの場合は先頭から）
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (プロジェクトのリスト, 次ページのカーソル) のタプル
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return _select_page(
+        db=db,
+        table=models.Project,
+        primary_key=models.Project.project_id,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+
+
+def iter_project_all(
+    db: Session,
+    cursor: Optional[str] = None,
+    chunk_size: int = 1000,
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[models.Project]:
+    """
+    全プロジェクトを逐次取得
+
+    Args:
+        db: データベースセッション
+        cursor: 開始位置のプロジェクトID（Noneの場合は先頭から）
+        chunk_size: 1回のフェッチ件数
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Yields:
+        プロジェクト
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return _iter_all(
+        db=db,
+        table=models.Project,
+        primary_key=models.Project.project_id,
+        cursor=cursor,
+        chunk_size=chunk_size,
+        fields=fields,
+    )
+
+
 def select_project_by_id(db: Session, project_id: str) -> Optional[models.Project]:
     """
     IDでプロジェクトを取得
@@ -54,7 +986,13 @@ def select_project_by_name(db: Session, project_name: str) -> Optional[models.Pr
     Returns:
         プロジェクト、または存在しない場合はNone
     """
-    return db.query(models.Project).filter(models.Project.project_name == project_name).first()
+    return _cached_select(
+        db=db,
+        registry_cache=cache.project_by_name_cache,
+        table=models.Project,
+        key=project_name,
+        query=db.query(models.Project).filter(models.Project.project_name == project_name),
+    )
 
 
 def add_project(
@@ -77,24 +1015,29 @@ def add_project(
     Returns:
         作成されたプロジェクト（または既存のプロジェクト）
     """
-    # 既存チェック
-    exists = select_project_by_name(db=db, project_name=project_name)
-    if exists:
-        return exists
-
-    # 新規作成
-    project_id = str(uuid.uuid4())[:6]
-    data = models.Project(
-        project_id=project_id,
-        project_name=project_name,
-        description=description,
+    data = _insert_or_get(
+        db=db,
+        table=models.Project,
+        primary_key=models.Project.project_id,
+        values={"project_name": project_name, "description": description},
+        conflict_columns=[models.Project.project_name],
     )
-    db.add(data)
-
+    if data is None:
+        # ON CONFLICTをサポートしないDBでは既存チェック後に作成
+        data = db.query(models.Project).filter(models.Project.project_name == project_name).first()
+        if data is None:
+            data = models.Project(
+                project_id=_new_id(db, models.Project),
+                project_name=project_name,
+                description=description,
+            )
+            db.add(data)
+
+    # 並行する読み込みが古い行をキャッシュし直さないよう、無効化はコミット後に行う
+    cache.invalidate_after_commit(db, cache.project_by_name_cache, project_name)
     if commit:
         db.commit()
         db.refresh(data)
-
     return data
 
 
@@ -114,6 +1057,68 @@ def select_model_all(db: Session) -> List[models.Model]:
     return db.query(models.Model).all()
 
 
+def select_model_page(
+    db: Session,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[models.Model], Optional[str]]:
+    """
+    モデルをページ単位で取得
+
+    Args:
+        db: データベースセッション
+        limit: 1ページあたりの件数
+        cursor: 前ページ最後のモデルID（Noneの場合は先頭から）
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (モデルのリスト, 次ページのカーソル) のタプル
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return _select_page(
+        db=db,
+        table=models.Model,
+        primary_key=models.Model.model_id,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+
+
+def iter_model_all(
+    db: Session,
+    cursor: Optional[str] = None,
+    chunk_size: int = 1000,
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[models.Model]:
+    """
+    全モデルを逐次取得
+
+    Args:
+        db: データベースセッション
+        cursor: 開始位置のモデルID（Noneの場合は先頭から）
+        chunk_size: 1回のフェッチ件数
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Yields:
+        モデル
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return _iter_all(
+        db=db,
+        table=models.Model,
+        primary_key=models.Model.model_id,
+        cursor=cursor,
+        chunk_size=chunk_size,
+        fields=fields,
+    )
+
+
 def select_model_by_id(db: Session, model_id: str) -> Optional[models.Model]:
     """
     IDでモデルを取得
@@ -125,7 +1130,13 @@ def select_model_by_id(db: Session, model_id: str) -> Optional[models.Model]:
     Returns:
         モデル、または存在しない場合はNone
     """
-    return db.query(models.Model).filter(models.Model.model_id == model_id).first()
+    return _cached_select(
+        db=db,
+        registry_cache=cache.model_by_id_cache,
+        table=models.Model,
+        key=model_id,
+        query=db.query(models.Model).filter(models.Model.model_id == model_id),
+    )
 
 
 def select_model_by_project_id(db: Session, project_id: str) -> List[models.Model]:
@@ -195,26 +1206,38 @@ def add_model(
     Returns:
         作成されたモデル（または既存のモデル）
     """
-    # 同一プロジェクト内での重複チェック
-    models_in_project = select_model_by_project_id(db=db, project_id=project_id)
-    for model in models_in_project:
-        if model.model_name == model_name:
-            return model
-
-    # 新規作成
-    model_id = str(uuid.uuid4())[:6]
-    data = models.Model(
-        model_id=model_id,
-        project_id=project_id,
-        model_name=model_name,
-        description=description,
+    data = _insert_or_get(
+        db=db,
+        table=models.Model,
+        primary_key=models.Model.model_id,
+        values={
+            "project_id": project_id,
+            "model_name": model_name,
+            "description": description,
+        },
+        conflict_columns=[models.Model.project_id, models.Model.model_name],
     )
-    db.add(data)
-
+    if data is None:
+        # ON CONFLICTをサポートしないDBでは既存チェック後に作成
+        data = (
+            db.query(models.Model)
+            .filter(models.Model.project_id == project_id, models.Model.model_name == model_name)
+            .first()
+        )
+        if data is None:
+            data = models.Model(
+                model_id=_new_id(db, models.Model),
+                project_id=project_id,
+                model_name=model_name,
+                description=description,
+            )
+            db.add(data)
+
+    # 並行する読み込みが古い行をキャッシュし直さないよう、無効化はコミット後に行う
+    cache.invalidate_after_commit(db, cache.model_by_id_cache, data.model_id)
     if commit:
         db.commit()
         db.refresh(data)
-
     return data
 
 
@@ -234,6 +1257,108 @@ def select_experiment_all(db: Session) -> List[models.Experiment]:
     return db.query(models.Experiment).all()
 
 
+def select_experiment_page(
+    db: Session,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[models.Experiment], Optional[str]]:
+    """
+    実験をページ単位で取得
+
+    Args:
+        db: データベースセッション
+        limit: 1ページあたりの件数
+        cursor: 前ページ最後の実験ID（Noneの場合は先頭から）
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (実験のリスト, 次ページのカーソル) のタプル
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return _select_page(
+        db=db,
+        table=models.Experiment,
+        primary_key=models.Experiment.experiment_id,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+
+
+def iter_experiment_all(
+    db: Session,
+    cursor: Optional[str] = None,
+    chunk_size: int = 1000,
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[models.Experiment]:
+    """
+    全実験を逐次取得
+
+    JSONカラムを含む大きな行でも、chunk_size件分しかメモリに保持しません。
+
+    Args:
+        db: データベースセッション
+        cursor: 開始位置の実験ID（Noneの場合は先頭から）
+        chunk_size: 1回のフェッチ件数
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Yields:
+        実験
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return _iter_all(
+        db=db,
+        table=models.Experiment,
+        primary_key=models.Experiment.experiment_id,
+        cursor=cursor,
+        chunk_size=chunk_size,
+        fields=fields,
+    )
+
+
+def select_experiment_changes(
+    db: Session,
+    since: Optional[str] = None,
+    limit: int = 100,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[models.Experiment], Optional[str]]:
+    """
+    指定したカーソルより後に登録された実験を取得（変更フィード）
+
+    実験と同じトランザクションで書き込まれる変更フィード（experiment_changes）を
+    (txid, change_id) インデックスの範囲検索で読むため、コストはテーブルサイズではなく
+    新しい行の件数に比例します。
+
+    Args:
+        db: データベースセッション
+        since: 前回取得したカーソル（Noneの場合は先頭から）
+        limit: 最大取得件数
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (登録順の実験のリスト, 次回のカーソル) のタプル。新しい実験がない場合カーソルはsinceのまま
+
+    Raises:
+        ValueError: sinceが存在しない変更を指す場合
+    """
+    last = None
+    if since is not None:
+        last = db.execute(_change_cursor_select(since)).first()
+        if last is None:
+            raise ValueError(f"Unknown change feed cursor: {since!r}")
+
+    stmt = _experiment_changes_select(db.get_bind().dialect.name, last, fields).limit(limit)
+    rows = db.execute(stmt).all()
+    if not rows:
+        return [], since
+    return [experiment for experiment, _ in rows], str(rows[-1].change_id)
+
+
 def select_experiment_by_id(db: Session, experiment_id: str) -> Optional[models.Experiment]:
     """
     IDで実験を取得
@@ -259,21 +1384,33 @@ def select_experiment_by_model_version_id(db: Session, model_version_id: str) ->
     Returns:
         実験、または存在しない場合はNone
     """
-    return db.query(models.Experiment).filter(models.Experiment.model_version_id == model_version_id).first()
+    return _cached_select(
+        db=db,
+        registry_cache=cache.experiment_by_model_version_id_cache,
+        table=models.Experiment,
+        key=model_version_id,
+        query=db.query(models.Experiment).filter(models.Experiment.model_version_id == model_version_id),
+    )
 
 
-def select_experiment_by_model_id(db: Session, model_id: str) -> List[models.Experiment]:
+def select_experiment_by_model_id(
+    db: Session,
+    model_id: str,
+    fields: Optional[Sequence[str]] = None,
+) -> List[models.Experiment]:
     """
     モデルIDで実験を取得
 
     Args:
         db: データベースセッション
         model_id: モデルID
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
 
     Returns:
         実験のリスト
     """
-    return db.query(models.Experiment).filter(models.Experiment.model_id == model_id).all()
+    query = db.query(models.Experiment).options(*_load_only(models.Experiment, fields))
+    return query.filter(models.Experiment.model_id == model_id).all()
 
 
 def select_experiment_by_project_id(db: Session, project_id: str) -> List[tuple]:
@@ -297,6 +1434,50 @@ def select_experiment_by_project_id(db: Session, project_id: str) -> List[tuple]
     )
 
 
+def select_experiment_leaderboard(
+    db: Session,
+    model_id: str,
+    metric: str,
+    k: int = 10,
+    ascending: bool = False,
+) -> List[Any]:
+    """
+    評価指標の上位k件の実験を取得
+
+    指標の抽出と並び替えをSQLで行い、必要なカラムのみを返します。
+    指標を持たない実験は除外します。
+    migrations.create_metric_indexes で作成した式インデックスがある場合、
+    モデルIDでの絞り込みと並び替えの両方にインデックスが使われます。
+
+    Args:
+        db: データベースセッション
+        model_id: モデルID
+        metric: 評価指標名（値が数値でない実験は除外されます）
+        k: 取得件数
+        ascending: Trueの場合は値が小さい順（lossなど）
+
+    Returns:
+        (experiment_id, model_version_id, value, created_datetime) の行のリスト
+    """
+    value = models.evaluation_metric(metric)
+    if ascending:
+        order = [value.asc(), models.Experiment.experiment_id.asc()]
+    else:
+        order = [value.desc(), models.Experiment.experiment_id.desc()]
+    return (
+        db.query(
+            models.Experiment.experiment_id,
+            models.Experiment.model_version_id,
+            value.label("value"),
+            models.Experiment.created_datetime,
+        )
+        .filter(models.Experiment.model_id == model_id, value.is_not(None))
+        .order_by(*order)
+        .limit(k)
+        .all()
+    )
+
+
 def add_experiment(
     db: Session,
     model_version_id: str,
@@ -312,6 +1493,8 @@ def add_experiment(
     """
     実験を作成
 
+    同じトランザクションで変更フィードへの記録と、モデルのサマリー（実験数・最新バージョン・最良値）も更新します。
+
     Args:
         db: データベースセッション
         model_version_id: モデルバージョンID
@@ -327,36 +1510,101 @@ def add_experiment(
     Returns:
         作成された実験
     """
-    experiment_id = str(uuid.uuid4())[:6]
-    data = models.Experiment(
-        experiment_id=experiment_id,
-        model_version_id=model_version_id,
-        model_id=model_id,
-        parameters=parameters,
-        training_dataset=training_dataset,
-        validation_dataset=validation_dataset,
-        test_dataset=test_dataset,
-        evaluations=evaluations,
-        artifact_file_paths=artifact_file_paths,
+    values = {
+        "model_version_id": model_version_id,
+        "model_id": model_id,
+        "parameters": parameters,
+        "training_dataset": training_dataset,
+        "validation_dataset": validation_dataset,
+        "test_dataset": test_dataset,
+        "evaluations": evaluations,
+        "artifact_file_paths": artifact_file_paths,
+    }
+    data = _insert_new(
+        db=db,
+        table=models.Experiment,
+        primary_key=models.Experiment.experiment_id,
+        values=values,
+    )
+    if data is None:
+        # ON CONFLICTをサポートしないDBでは衝突しないIDを確認してから作成
+        data = models.Experiment(experiment_id=_new_id(db, models.Experiment), **values)
+        db.add(data)
+        db.flush()
+
+    _record_experiment_changes(db, [data.experiment_id])
+    _summarize_new_experiments(
+        db, model_id, [(data.experiment_id, model_version_id, data.created_datetime, evaluations)]
     )
-    db.add(data)
 
+    cache.invalidate_after_commit(db, cache.experiment_by_model_version_id_cache, model_version_id)
     if commit:
         db.commit()
         db.refresh(data)
-
     return data
 
 
+def add_experiments_bulk(
+    db: Session,
+    experiments: List[Dict[str, Any]],
+    commit: bool = True,
+) -> List[str]:
+    """
+    実験を一括作成
+
+    IDをアプリ側で採番し、1回のexecutemany INSERTで書き込みます。
+    1トランザクションで完結し、行ごとのrefreshも行いません。
+    主キーが衝突した行のみIDを再生成して挿入し直します。
+    モデルのサマリーはモデルごとに1回だけ更新します。
+
+    Args:
+        db: データベースセッション
+        experiments: 実験ごとのカラム値の辞書のリスト
+            （add_experimentの引数と同じキー。model_id, model_version_idは必須）
+        commit: トランザクションをコミットするか
+
+    Returns:
+        作成された実験IDのリスト（入力と同じ順序）
+    """
+    # サマリーの最新バージョンを判定できるよう、作成日時をアプリ側で付与
+    rows = [{"created_datetime": models._utcnow(), **experiment} for experiment in experiments]
+    experiment_ids = _insert_new_bulk(
+        db=db,
+        table=models.Experiment,
+        primary_key=models.Experiment.experiment_id,
+        rows=rows,
+    )
+    _record_experiment_changes(db, experiment_ids)
+
+    by_model = defaultdict(list)
+    for experiment_id, row in zip(experiment_ids, rows):
+        by_model[row["model_id"]].append(
+            (experiment_id, row["model_version_id"], row["created_datetime"], row.get("evaluations"))
+        )
+    # 並行する一括登録とのデッドロックを避けるため、ロックはモデルID順に取得
+    for model_id in sorted(by_model):
+        _summarize_new_experiments(db, model_id, by_model[model_id])
+
+    for model_version_id in {experiment["model_version_id"] for experiment in experiments}:
+        cache.invalidate_after_commit(db, cache.experiment_by_model_version_id_cache, model_version_id)
+    if commit:
+        db.commit()
+    return experiment_ids
+
+
 def update_experiment_evaluation(
     db: Session,
     experiment_id: str,
     evaluations: Dict[str, Any],
-) -> models.Experiment:
+) -> Optional[models.Experiment]:
     """
     実験の評価結果を更新
 
     既存の評価結果に新しい評価結果をマージします。
+    マージはDB側で行うため、異なる評価指標を並行して書き込んでも更新は失われません。
+    同じトランザクションでモデルのサマリーの最良値も更新します。
+    実験の更新は1文のUPDATEですが、サマリー行のロック（SELECT ... FOR UPDATE）と更新、
+    最良値が悪化した場合は再集計のクエリが加わります。
 
     Args:
         db: データベースセッション
@@ -364,22 +1612,16 @@ def update_experiment_evaluation(
         evaluations: 新しい評価結果
 
     Returns:
-        更新された実験
+        更新された実験、または存在しない場合はNone
     """
-    data = select_experiment_by_id(db=db, experiment_id=experiment_id)
-
-    if data.evaluations is None:
-        data.evaluations = evaluations
-    else:
-        # 既存の評価結果に新しい評価結果をマージ
-        # SQLiteのJSON型の更新を確実にするため、新しいdictを作成
-        updated_evaluations = dict(data.evaluations)
-        updated_evaluations.update(evaluations)
-        data.evaluations = updated_evaluations
-
-    db.commit()
-    db.refresh(data)
-
+    data = _update_experiment_json(
+        db=db,
+        experiment_id=experiment_id,
+        updates={models.Experiment.evaluations: evaluations},
+        before_commit=lambda row: _summarize_evaluation(
+            db, row.model_id, row.experiment_id, row.model_version_id, evaluations
+        ),
+    )
     return data
 
 
@@ -387,11 +1629,12 @@ def update_experiment_artifact_file_paths(
     db: Session,
     experiment_id: str,
     artifact_file_paths: Dict[str, Any],
-) -> models.Experiment:
+) -> Optional[models.Experiment]:
     """
     実験のモデルファイルパスを更新
 
     既存のファイルパスに新しいファイルパスをマージします。
+    マージはDB側で行うため、並行して書き込んでも更新は失われません。
 
     Args:
         db: データベースセッション
@@ -399,20 +1642,67 @@ def update_experiment_artifact_file_paths(
         artifact_file_paths: 新しいモデルファイルのパス
 
     Returns:
-        更新された実験
+        更新された実験、または存在しない場合はNone
+    """
+    data = _update_experiment_json(
+        db=db,
+        experiment_id=experiment_id,
+        updates={models.Experiment.artifact_file_paths: artifact_file_paths},
+    )
+    return data
+
+
+def update_experiment_artifacts(
+    db: Session,
+    experiment_id: str,
+    artifact_file_paths: Dict[str, str],
+    artifact_digests: Dict[str, str],
+) -> Optional[models.Experiment]:
     """
-    data = select_experiment_by_id(db=db, experiment_id=experiment_id)
+    実験のモデルファイルパスとSHA-256ダイジェストを更新
 
-    if data.artifact_file_paths is None:
-        data.artifact_file_paths = artifact_file_paths
-    else:
-        # 既存のファイルパスに新しいファイルパスをマージ
-        # SQLiteのJSON型の更新を確実にするため、新しいdictを作成
-        updated_paths = dict(data.artifact_file_paths)
-        updated_paths.update(artifact_file_paths)
-        data.artifact_file_paths = updated_paths
+    2つのJSONカラムを1文のUPDATEでマージするため、パスとダイジェストが食い違うことはありません。
 
-    db.commit()
-    db.refresh(data)
+    Args:
+        db: データベースセッション
+        experiment_id: 実験ID
+        artifact_file_paths: ファイル名をキーとしたモデルファイルのパス
+        artifact_digests: ファイル名をキーとしたSHA-256ダイジェスト（16進数）
 
+    Returns:
+        更新された実験、または存在しない場合はNone
+    """
+    data = _update_experiment_json(
+        db=db,
+        experiment_id=experiment_id,
+        updates={
+            models.Experiment.artifact_file_paths: artifact_file_paths,
+            models.Experiment.artifact_digests: artifact_digests,
+        },
+    )
     return data
+
+
+# ==================== Summary CRUD ====================
+
+
+def select_model_summaries_by_project_id(db: Session, project_id: str) -> List[models.ModelSummary]:
+    """
+    プロジェクトIDでモデルごとの実験サマリーを取得
+
+    実験テーブルは参照せず、サマリーテーブルのproject_idインデックスのみを使います。
+    実験が1件もないモデルは含まれません。
+
+    Args:
+        db: データベースセッション
+        project_id: プロジェクトID
+
+    Returns:
+        モデル名順のサマリーのリスト
+    """
+    return (
+        db.query(models.ModelSummary)
+        .filter(models.ModelSummary.project_id == project_id)
+        .order_by(models.ModelSummary.model_name)
+        .all()
+    )
@@ -5,7 +5,10 @@ Database Layer
 """
 
 import os
+from functools import lru_cache
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -24,6 +27,36 @@ engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
 # セッションファクトリの作成
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 非同期モードの切り替え（trueの場合、APIは非同期セッションを使用）
+USE_ASYNC_DB = os.getenv("USE_ASYNC_DB", "false").lower() == "true"
+
+
+def to_async_database_url(url: str) -> str:
+    """
+    同期ドライバのURLを非同期ドライバのURLに変換
+
+    sqlite → sqlite+aiosqlite、postgresql → postgresql+asyncpg に置き換えます。
+    既にドライバが指定されている場合はそのまま返します。
+
+    Args:
+        url: データベース接続URL
+
+    Returns:
+        非同期ドライバのデータベース接続URL
+    """
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+# 非同期用のデータベース接続URL（未指定の場合はDATABASE_URLから変換）
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    to_async_database_url(SQLALCHEMY_DATABASE_URL),
+)
+
 # ORMモデルのベースクラス
 Base = declarative_base()
 
@@ -43,3 +76,33 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    非同期セッションファクトリを取得
+
+    非同期ドライバ（aiosqlite / asyncpg）は非同期モード使用時のみ必要なため、
+    エンジンは初回呼び出し時に作成します。
+
+    Returns:
+        非同期セッションファクトリ
+    """
+    async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+    # コミット後の属性アクセスで暗黙のI/Oが発生しないよう、expire_on_commitを無効化
+    return async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    """
+    非同期データベースセッションを取得する依存性注入用関数
+
+    FastAPIのDepends()で使用します。
+    DB待ちの間スレッドプールのスレッドを占有しないため、同時リクエスト数を増やせます。
+
+    Yields:
+        AsyncSession: 非同期データベースセッション
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
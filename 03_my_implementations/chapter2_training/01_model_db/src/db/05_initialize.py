@@ -6,6 +6,7 @@ Database Initialization
 
 from src.db.database import Base, engine
 from src.db import models  # modelsをインポートしてBaseに登録
+from src.db.migrations import migrate
 
 
 def init_db():
@@ -14,6 +15,11 @@ def init_db():
     Base.metadata.create_all(bind=engine)
     print("Database tables created successfully!")
 
+    # 既存テーブルに不足しているインデックスを追加
+    applied = migrate(engine)
+    for step in applied:
+        print(f"Migration applied: {step}")
+
 
 if __name__ == "__main__":
     init_db()
@@ -0,0 +1,284 @@
+"""
+Database Migrations
+
+既存データベースのスキーマをモデル定義に追従させます。
+create_allは既存テーブルにカラム・インデックスを追加しないため、
+不足しているNULL許容カラムとインデックスをここで作成します。
+追加したサマリーテーブルには既存の実験を集計した行を作成し、
+変更フィードには既存の実験を作成日時順に記録します。
+"""
+
+import os
+import re
+import warnings
+from typing import List, Sequence
+
+from sqlalchemy import Index, MetaData, insert, inspect, literal, select, text
+from sqlalchemy.exc import SAWarning
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+from src.db import cruds, models  # modelsをインポートしてBaseに登録
+from src.db.database import Base
+
+# リーダーボード用の式インデックスを作成する評価指標（カンマ区切り）
+LEADERBOARD_INDEXED_METRICS = [
+    metric for metric in os.getenv("LEADERBOARD_INDEXED_METRICS", "accuracy").split(",") if metric
+]
+
+
+def create_missing_tables(engine: Engine) -> List[str]:
+    """
+    モデル定義にあり、DBに存在しないテーブルを作成
+
+    Args:
+        engine: SQLAlchemyエンジン
+
+    Returns:
+        作成したテーブル名のリスト
+    """
+    inspector = inspect(engine)
+    missing = [table for table in Base.metadata.sorted_tables if not inspector.has_table(table.name)]
+    Base.metadata.create_all(bind=engine, tables=missing)
+    return [table.name for table in missing]
+
+
+def create_missing_columns(engine: Engine) -> List[str]:
+    """
+    モデル定義にあり、DBに存在しないNULL許容カラムを追加
+
+    既存の行はNULLのままになるため、NULL許容のカラムのみを対象とします。
+
+    Args:
+        engine: SQLAlchemyエンジン
+
+    Returns:
+        追加したカラム名（テーブル名.カラム名）のリスト
+    """
+    inspector = inspect(engine)
+    added = []
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            added.append(f"{table.name}.{column.name}")
+
+    return added
+
+
+def create_missing_indexes(engine: Engine) -> List[str]:
+    """
+    モデル定義にあり、DBに存在しないインデックスを作成
+
+    何度実行しても安全です（既存のインデックスはスキップします）。
+    一意インデックスの作成時に重複データが存在する場合は、DBがエラーを返します。
+
+    Args:
+        engine: SQLAlchemyエンジン
+
+    Returns:
+        作成したインデックス名のリスト
+    """
+    inspector = inspect(engine)
+    created = []
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        # 式インデックス（create_metric_indexesで管理）はリフレクションできない旨の警告を抑制
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", "Skipped unsupported reflection of expression-based index", SAWarning)
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            if index.name in existing:
+                continue
+            index.create(bind=engine)
+            created.append(index.name)
+
+    return created
+
+
+def _metric_index_name(metric: str, prefix: str = "ix_experiments_numeric_metric_") -> str:
+    """評価指標の式インデックス名（PostgreSQLの識別子の上限63文字に切り詰め）"""
+    return (prefix + re.sub(r"\W", "_", metric))[:63]
+
+
+def metric_index(metric: str) -> Index:
+    """
+    リーダーボード用の式インデックス (model_id, 指標値, experiment_id) を作成
+
+    指標値は models.evaluation_metric の式で、数値でない値はNULLとしてインデックスされます。
+    式インデックスはモデル定義（Base.metadata）に含めると
+    create_missing_indexes のリフレクションで検出できないため、テーブルのコピーに対して定義します。
+
+    Args:
+        metric: 評価指標名
+
+    Returns:
+        インデックス定義
+    """
+    table = models.Experiment.__table__.to_metadata(MetaData())
+    return Index(
+        _metric_index_name(metric),
+        table.c.model_id,
+        models.evaluation_metric(metric, evaluations=table.c.evaluations),
+        table.c.experiment_id,
+    )
+
+
+# 式インデックスの存在確認クエリ（SQLAlchemyのリフレクションは式インデックスを返さないため）
+_INDEX_EXISTS_QUERIES = {
+    "postgresql": "SELECT 1 FROM pg_indexes WHERE indexname = :name",
+    "sqlite": "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name",
+}
+
+
+def create_metric_indexes(engine: Engine, metrics: Sequence[str]) -> List[str]:
+    """
+    評価指標ごとのリーダーボード用インデックスを作成
+
+    何度実行しても安全です（既存のインデックスはスキップします）。
+
+    Args:
+        engine: SQLAlchemyエンジン
+        metrics: 評価指標名のリスト
+
+    Returns:
+        作成したインデックス名のリスト
+    """
+    exists_query = _INDEX_EXISTS_QUERIES.get(engine.dialect.name)
+    created = []
+
+    with engine.begin() as conn:
+        for metric in metrics:
+            index = metric_index(metric)
+            if exists_query is not None and conn.execute(text(exists_query), {"name": index.name}).first():
+                continue
+            conn.execute(CreateIndex(index, if_not_exists=True))
+            created.append(index.name)
+
+    return created
+
+
+def drop_legacy_metric_indexes(engine: Engine, metrics: Sequence[str]) -> List[str]:
+    """
+    数値の判定を含まない旧形式のリーダーボード用インデックスを削除
+
+    旧形式の式（CAST(evaluations ->> 'metric' AS FLOAT)）は、PostgreSQLでは数値でない値を含む実験の
+    登録をエラーにし、現在のリーダーボードのクエリからは使われません。
+
+    Args:
+        engine: SQLAlchemyエンジン
+        metrics: 評価指標名のリスト
+
+    Returns:
+        削除したインデックス名のリスト
+    """
+    exists_query = _INDEX_EXISTS_QUERIES.get(engine.dialect.name)
+    if exists_query is None:
+        return []
+
+    dropped = []
+    with engine.begin() as conn:
+        for metric in metrics:
+            name = _metric_index_name(metric, prefix="ix_experiments_metric_")
+            if conn.execute(text(exists_query), {"name": name}).first():
+                conn.execute(text(f'DROP INDEX "{name}"'))
+                dropped.append(name)
+    return dropped
+
+
+def create_missing_model_summaries(engine: Engine) -> List[str]:
+    """
+    実験があり、サマリーが未作成のモデルについて全実験を集計してサマリーを作成
+
+    サマリーテーブル導入前の実験を反映するためのもので、何度実行しても安全です。
+    以降のサマリーは実験の作成・評価結果の更新時に差分更新されます。
+
+    Args:
+        engine: SQLAlchemyエンジン
+
+    Returns:
+        サマリーを作成したモデルIDのリスト
+    """
+    with Session(engine) as db:
+        model_ids = [
+            model_id
+            for (model_id,) in db.query(models.Experiment.model_id)
+            .join(models.Model, models.Model.model_id == models.Experiment.model_id)
+            .outerjoin(models.ModelSummary, models.ModelSummary.model_id == models.Experiment.model_id)
+            .filter(models.ModelSummary.model_id.is_(None))
+            .distinct()
+            .order_by(models.Experiment.model_id)
+        ]
+        created = [model_id for model_id in model_ids if cruds._create_model_summary(db, model_id)]
+        db.commit()
+    return created
+
+
+def create_missing_experiment_changes(engine: Engine) -> int:
+    """
+    変更フィードに未記録の実験を作成日時順に記録
+
+    変更フィード導入前の実験を反映するためのもので、何度実行しても安全です。
+    txidは0のため、以降に登録される実験より前に並びます。
+
+    Args:
+        engine: SQLAlchemyエンジン
+
+    Returns:
+        記録した実験数
+    """
+    experiments = models.Experiment.__table__
+    changes = models.ExperimentChange.__table__
+    missing = (
+        select(experiments.c.experiment_id, literal(0))
+        .outerjoin(changes, changes.c.experiment_id == experiments.c.experiment_id)
+        .where(changes.c.change_id.is_(None))
+        .order_by(experiments.c.created_datetime, experiments.c.experiment_id)
+    )
+    with engine.begin() as conn:
+        result = conn.execute(insert(changes).from_select(["experiment_id", "txid"], missing))
+    return result.rowcount
+
+
+def migrate(engine: Engine, metrics: Sequence[str] = LEADERBOARD_INDEXED_METRICS) -> List[str]:
+    """
+    全マイグレーションを適用
+
+    Args:
+        engine: SQLAlchemyエンジン
+        metrics: リーダーボード用インデックスを作成する評価指標名のリスト
+
+    Returns:
+        適用したマイグレーション内容のリスト
+    """
+    applied = [f"create table {name}" for name in create_missing_tables(engine)]
+    applied += [f"add column {name}" for name in create_missing_columns(engine)]
+    applied += [f"create index {name}" for name in create_missing_indexes(engine)]
+    applied += [f"drop index {name}" for name in drop_legacy_metric_indexes(engine, metrics)]
+    applied += [f"create index {name}" for name in create_metric_indexes(engine, metrics)]
+    applied += [f"summarize model {model_id}" for model_id in create_missing_model_summaries(engine)]
+    recorded = create_missing_experiment_changes(engine)
+    if recorded:
+        applied.append(f"record {recorded} experiment(s) in the change feed")
+    return applied
+
+
+if __name__ == "__main__":
+    from src.db.database import engine
+
+    applied = migrate(engine)
+    print(f"Applied {len(applied)} migration(s)")
+    for step in applied:
+        print(f"  - {step}")
@@ -0,0 +1,1373 @@
+"""
+Async CRUD Layer
+
+cruds.py の非同期版です。AsyncSessionを受け取り、同じ操作を提供します。
+USE_ASYNC_DB=true の場合、APIはこちらを使用します。
+"""
+
+import datetime
+from collections import defaultdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql import Select
+
+from src.db import cache, ids, models
+from src.db.cruds import (
+    _JSON_MERGES,
+    MAX_ID_ATTEMPTS,
+    SUMMARY_MINIMIZED_METRICS,
+    _change_cursor_select,
+    _experiment_changes_select,
+    _id_collision_error,
+    _load_only,
+    _merge_best_evaluations,
+    _record_changes_statement,
+    _record_experiment,
+)
+
+
+# ==================== Pagination Helpers ====================
+
+
+def _keyset_select(
+    table: Any,
+    primary_key: Any,
+    cursor: Optional[str],
+    fields: Optional[Sequence[str]] = None,
+) -> Select:
+    """
+    (created_datetime, 主キー) 順のキーセットページネーション用SELECT文を作成
+
+    Args:
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        cursor: 前ページ最後の要素の主キー（Noneの場合は先頭から）
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        ソート・絞り込み済みのSELECT文
+    """
+    stmt = select(table).options(*_load_only(table, fields)).order_by(table.created_datetime, primary_key)
+    if cursor is None:
+        return stmt
+
+    last_created = select(table.created_datetime).where(primary_key == cursor).scalar_subquery()
+    return stmt.where(
+        or_(
+            table.created_datetime > last_created,
+            and_(table.created_datetime == last_created, primary_key > cursor),
+        )
+    )
+
+
+async def _check_cursor(db: AsyncSession, primary_key: Any, cursor: Optional[str]) -> None:
+    """
+    カーソルが既存の要素を指すかを検証
+
+    Args:
+        db: 非同期データベースセッション
+        primary_key: 主キーのカラム
+        cursor: 前ページ最後の要素の主キー（Noneの場合は検証しない）
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    if cursor is None:
+        return
+    if (await db.execute(select(primary_key).where(primary_key == cursor))).first() is None:
+        raise ValueError(f"Unknown pagination cursor: {cursor!r}")
+
+
+async def _select_page(
+    db: AsyncSession,
+    table: Any,
+    primary_key: Any,
+    limit: int,
+    cursor: Optional[str],
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    キーセットページネーションで1ページ分を取得
+
+    Args:
+        db: 非同期データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        limit: 1ページあたりの件数
+        cursor: 前ページ最後の要素の主キー
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (要素のリスト, 次ページのカーソル) のタプル。最終ページの場合カーソルはNone
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    await _check_cursor(db, primary_key, cursor)
+    stmt = _keyset_select(table=table, primary_key=primary_key, cursor=cursor, fields=fields).limit(limit + 1)
+    rows = list(await db.scalars(stmt))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, getattr(rows[-1], primary_key.key)
+
+
+async def _iter_all(
+    db: AsyncSession,
+    table: Any,
+    primary_key: Any,
+    cursor: Optional[str],
+    chunk_size: int,
+    fields: Optional[Sequence[str]] = None,
+) -> AsyncIterator[Any]:
+    """
+    全件をチャンク単位で逐次取得
+
+    Args:
+        db: 非同期データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        cursor: 開始位置のカーソル（Noneの場合は先頭から）
+        chunk_size: 1回のフェッチ件数
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Yields:
+        ORMオブジェクト
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    await _check_cursor(db, primary_key, cursor)
+    stmt = _keyset_select(table=table, primary_key=primary_key, cursor=cursor, fields=fields)
+    result = await db.stream_scalars(stmt.execution_options(yield_per=chunk_size))
+    async for row in result:
+        yield row
+
+
+# ==================== Insert-or-Get Helpers ====================
+
+# ON CONFLICT句をサポートするダイアレクトごとのinsert関数
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+async def _new_id(db: AsyncSession, table: Any) -> str:
+    """
+    既存行と衝突しない主キーを採番（ON CONFLICTをサポートしないダイアレクト用）
+
+    Args:
+        db: 非同期データベースセッション
+        table: ORMモデルクラス
+
+    Returns:
+        新しいID
+    """
+    for _ in range(MAX_ID_ATTEMPTS):
+        new_id = ids.generate_id()
+        if await db.get(table, new_id) is None:
+            return new_id
+    raise _id_collision_error(table)
+
+
+async def _insert_or_get(
+    db: AsyncSession,
+    table: Any,
+    primary_key: Any,
+    values: Dict[str, Any],
+    conflict_columns: List[Any],
+) -> Optional[Any]:
+    """
+    INSERT ... ON CONFLICT DO NOTHING ... RETURNINGで作成、または既存行を取得
+
+    Args:
+        db: 非同期データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        values: 新規作成時のカラム値（主キーを除く）
+        conflict_columns: 一意制約を構成するカラム
+
+    Returns:
+        作成された（または既存の）ORMオブジェクト。
+        ON CONFLICTをサポートしないダイアレクトの場合はNone
+    """
+    insert_func = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_func is None:
+        return None
+
+    # 未フラッシュの親レコード（commit=Falseで追加されたもの）を先に書き込む
+    await db.flush()
+
+    for _ in range(MAX_ID_ATTEMPTS):
+        stmt = (
+            insert_func(table)
+            .values({**values, primary_key.key: ids.generate_id()})
+            .on_conflict_do_nothing()
+            .returning(table)
+        )
+        data = (await db.scalars(stmt)).first()
+        if data is None:
+            data = await db.scalar(
+                select(table).where(*(column == values[column.key] for column in conflict_columns))
+            )
+        if data is not None:
+            return data
+
+    raise _id_collision_error(table)
+
+
+async def _insert_new(db: AsyncSession, table: Any, primary_key: Any, values: Dict[str, Any]) -> Optional[Any]:
+    """
+    主キーを採番し、INSERT ... ON CONFLICT (主キー) DO NOTHING ... RETURNINGで1行作成
+
+    Args:
+        db: 非同期データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        values: カラム値（主キーを除く）
+
+    Returns:
+        作成されたORMオブジェクト。ON CONFLICTをサポートしないダイアレクトの場合はNone
+    """
+    insert_func = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_func is None:
+        return None
+
+    # 未フラッシュの親レコード（commit=Falseで追加されたもの）を先に書き込む
+    await db.flush()
+
+    for _ in range(MAX_ID_ATTEMPTS):
+        stmt = (
+            insert_func(table)
+            .values({**values, primary_key.key: ids.generate_id()})
+            .on_conflict_do_nothing(index_elements=[primary_key])
+            .returning(table)
+        )
+        data = (await db.scalars(stmt)).first()
+        if data is not None:
+            return data
+
+    raise _id_collision_error(table)
+
+
+async def _insert_new_bulk(db: AsyncSession, table: Any, primary_key: Any, rows: List[Dict[str, Any]]) -> List[str]:
+    """
+    主キーを採番し、複数行を1回のexecutemany INSERTで作成（衝突した行のみ再挿入）
+
+    Args:
+        db: 非同期データベースセッション
+        table: ORMモデルクラス
+        primary_key: 主キーのカラム
+        rows: 行ごとのカラム値の辞書のリスト（主キーを除く）
+
+    Returns:
+        作成された行のIDのリスト（入力と同じ順序）
+    """
+    rows = [{**row, primary_key.key: ids.generate_id()} for row in rows]
+
+    # 未フラッシュの親レコード（commit=Falseで追加されたもの）を先に書き込む
+    await db.flush()
+
+    insert_func = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_func is None:
+        await db.execute(insert(table), rows)
+        return [row[primary_key.key] for row in rows]
+
+    stmt = insert_func(table.__table__).on_conflict_do_nothing(index_elements=[primary_key.key])
+    stmt = stmt.returning(table.__table__.c[primary_key.key])
+    pending = rows
+    for _ in range(MAX_ID_ATTEMPTS):
+        inserted = set((await db.scalars(stmt, pending)).all())
+        pending = [row for row in pending if row[primary_key.key] not in inserted]
+        if not pending:
+            return [row[primary_key.key] for row in rows]
+        for row in pending:
+            row[primary_key.key] = ids.generate_id()
+
+    raise _id_collision_error(table)
+
+
+# ==================== JSON Merge Helpers ====================
+
+
+async def _update_experiment_json(
+    db: AsyncSession,
+    experiment_id: str,
+    updates: Dict[Any, Dict[str, Any]],
+    before_commit: Optional[Callable[[Any], Awaitable[None]]] = None,
+) -> Optional[models.Experiment]:
+    """
+    実験のJSONカラムにサーバー側で値をマージ
+
+    マージ式は同期版 cruds._JSON_MERGES を共有します。
+    更新のたびに行バージョン（version）を1つ進めます（ETagの生成に使用）。
+    モデルバージョンIDの検索キャッシュはコミット後に無効化します。
+
+    Args:
+        db: 非同期データベースセッション
+        experiment_id: 実験ID
+        updates: 更新するJSONカラムをキー、マージする値を値とした辞書
+        before_commit: 更新後の行を受け取り、同じトランザクションで実行する処理（サマリーの更新など）
+
+    Returns:
+        更新された実験、または存在しない場合はNone
+    """
+    json_merge = _JSON_MERGES.get(db.get_bind().dialect.name)
+
+    if json_merge is None:
+        data = await db.scalar(
+            select(models.Experiment)
+            .where(models.Experiment.experiment_id == experiment_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        if data is None:
+            await db.rollback()
+            return None
+
+        # JSON型の更新を確実にするため、新しいdictを作成
+        for column, values in updates.items():
+            merged = dict(getattr(data, column.key) or {})
+            merged.update(values)
+            setattr(data, column.key, merged)
+        data.version = (data.version or 0) + 1
+        if before_commit is not None:
+            await before_commit(data)
+        cache.invalidate_after_commit(db, cache.experiment_by_model_version_id_cache, data.model_version_id)
+
+        await db.commit()
+        await db.refresh(data)
+        return data
+
+    # 未フラッシュの変更を先に書き込む
+    await db.flush()
+
+    table = models.Experiment.__table__
+    stmt = (
+        update(table)
+        .where(table.c.experiment_id == experiment_id)
+        .values({column.key: json_merge(table.c[column.key], values) for column, values in updates.items()})
+        .values(version=func.coalesce(table.c.version, 0) + 1)
+        .returning(*table.c)
+    )
+    row = (await db.execute(stmt)).first()
+    if row is not None:
+        if before_commit is not None:
+            await before_commit(row)
+        cache.invalidate_after_commit(db, cache.experiment_by_model_version_id_cache, row.model_version_id)
+    await db.commit()
+
+    if row is None:
+        return None
+    return await db.merge(cache.from_snapshot(models.Experiment, dict(row._mapping)), load=False)
+
+
+# ==================== Cache Helpers ====================
+
+
+async def _cached_select(
+    db: AsyncSession,
+    registry_cache: cache.LRUTTLCache,
+    table: Any,
+    key: str,
+    stmt: Select,
+) -> Optional[Any]:
+    """
+    キャッシュ経由で1件取得（リードスルー）
+
+    同期版 cruds._cached_select と同じキャッシュを共有します。
+
+    Args:
+        db: 非同期データベースセッション
+        registry_cache: 使用するキャッシュ
+        table: ORMモデルクラス
+        key: キャッシュキー
+        stmt: ミス時に実行するSELECT文
+
+    Returns:
+        ORMオブジェクト、または存在しない場合はNone
+    """
+    snapshot, generation = registry_cache.get(key)
+    if snapshot is not None:
+        return await db.merge(cache.from_snapshot(table, snapshot), load=False)
+
+    cacheable = not db.in_transaction()
+    data = await db.scalar(stmt.limit(1))
+    if data is not None and cacheable:
+        registry_cache.set(key, cache.to_snapshot(data), generation)
+    return data
+
+
+# ==================== Change Feed Helpers ====================
+
+
+async def _record_experiment_changes(db: AsyncSession, experiment_ids: List[str]) -> None:
+    """
+    登録した実験を変更フィードに記録
+
+    Args:
+        db: 非同期データベースセッション
+        experiment_ids: 登録した実験IDのリスト
+    """
+    stmt = _record_changes_statement(db.get_bind().dialect.name)
+    await db.execute(stmt, [{"experiment_id": experiment_id} for experiment_id in experiment_ids])
+
+
+# ==================== Summary Helpers ====================
+
+
+async def _lock_model_summary(db: AsyncSession, model_id: str) -> Optional[models.ModelSummary]:
+    """
+    モデルのサマリーを行ロック付きで取得
+
+    Args:
+        db: 非同期データベースセッション
+        model_id: モデルID
+
+    Returns:
+        サマリー、または未作成の場合はNone
+    """
+    return await db.scalar(
+        select(models.ModelSummary)
+        .where(models.ModelSummary.model_id == model_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+
+
+async def _create_model_summary(db: AsyncSession, model_id: str) -> bool:
+    """
+    モデルの全実験を集計してサマリーを作成
+
+    Args:
+        db: 非同期データベースセッション
+        model_id: モデルID
+
+    Returns:
+        作成した場合（またはモデルが存在しない場合）True、
+        他のトランザクションが先に作成していた場合False
+    """
+    model = await db.get(models.Model, model_id)
+    if model is None:
+        return True
+
+    summary = models.ModelSummary(
+        model_id=model.model_id,
+        project_id=model.project_id,
+        model_name=model.model_name,
+        experiment_count=0,
+    )
+    experiments = await db.scalars(
+        select(models.Experiment)
+        .options(
+            load_only(
+                models.Experiment.experiment_id,
+                models.Experiment.model_version_id,
+                models.Experiment.created_datetime,
+                models.Experiment.evaluations,
+            )
+        )
+        .where(models.Experiment.model_id == model_id)
+    )
+    for experiment in experiments:
+        _record_experiment(
+            summary,
+            experiment.experiment_id,
+            experiment.model_version_id,
+            experiment.created_datetime,
+            experiment.evaluations,
+        )
+
+    insert_func = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_func is None:
+        db.add(summary)
+        await db.flush()
+        return True
+
+    values = {key: value for key, value in cache.to_snapshot(summary).items() if value is not None}
+    stmt = insert_func(models.ModelSummary).values(values).on_conflict_do_nothing()
+    return await db.scalar(stmt.returning(models.ModelSummary.model_id)) is not None
+
+
+async def _lock_or_create_model_summary(db: AsyncSession, model_id: str) -> Optional[models.ModelSummary]:
+    """
+    モデルのサマリーを行ロック付きで取得し、未作成の場合は全実験を集計して作成
+
+    Args:
+        db: 非同期データベースセッション
+        model_id: モデルID
+
+    Returns:
+        差分を反映すべきサマリー。作成した場合（集計済み）やモデルが存在しない場合はNone
+    """
+    summary = await _lock_model_summary(db, model_id)
+    if summary is not None or await _create_model_summary(db, model_id):
+        return summary
+    # 並行するトランザクションが先に作成した
+    return await _lock_model_summary(db, model_id)
+
+
+async def _summarize_new_experiments(
+    db: AsyncSession,
+    model_id: str,
+    experiments: List[Tuple[str, str, datetime.datetime, Optional[Dict[str, Any]]]],
+) -> None:
+    """
+    新しく登録した実験をモデルのサマリーに反映
+
+    Args:
+        db: 非同期データベースセッション
+        model_id: モデルID
+        experiments: (experiment_id, model_version_id, created_datetime, evaluations) のリスト
+    """
+    summary = await _lock_or_create_model_summary(db, model_id)
+    if summary is None:
+        return
+    for experiment in experiments:
+        _record_experiment(summary, *experiment)
+
+
+async def _summarize_evaluation(
+    db: AsyncSession,
+    model_id: str,
+    experiment_id: str,
+    model_version_id: str,
+    evaluations: Dict[str, Any],
+) -> None:
+    """
+    評価結果の更新をモデルのサマリーの最良値に反映
+
+    Args:
+        db: 非同期データベースセッション
+        model_id: モデルID
+        experiment_id: 実験ID
+        model_version_id: モデルバージョンID
+        evaluations: 更新した評価結果
+    """
+    summary = await _lock_or_create_model_summary(db, model_id)
+    if summary is None:
+        return
+
+    for metric in _merge_best_evaluations(summary, experiment_id, model_version_id, evaluations):
+        best = dict(summary.best_evaluations)
+        rows = await select_experiment_leaderboard(
+            db=db, model_id=model_id, metric=metric, k=1, ascending=metric in SUMMARY_MINIMIZED_METRICS
+        )
+        if rows:
+            best[metric] = {
+                "value": rows[0].value,
+                "experiment_id": rows[0].experiment_id,
+                "model_version_id": rows[0].model_version_id,
+            }
+        else:
+            best.pop(metric)
+        summary.best_evaluations = best
+
+
+# ==================== Project CRUD ====================
+
+
+async def select_project_all(db: AsyncSession) -> List[models.Project]:
+    """
+    全プロジェクトを取得
+
+    Args:
+        db: 非同期データベースセッション
+
+    Returns:
+        プロジェクトのリスト
+    """
+    return list(await db.scalars(select(models.Project)))
+
+
+async def select_project_page(
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[models.Project], Optional[str]]:
+    """
+    プロジェクトをページ単位で取得
+
+    Args:
+        db: 非同期データベースセッション
+        limit: 1ページあたりの件数
+        cursor: 前ページ最後のプロジェクトID（Noneの場合は先頭から）
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (プロジェクトのリスト, 次ページのカーソル) のタプル
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return await _select_page(
+        db=db,
+        table=models.Project,
+        primary_key=models.Project.project_id,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+
+
+def iter_project_all(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    chunk_size: int = 1000,
+    fields: Optional[Sequence[str]] = None,
+) -> AsyncIterator[models.Project]:
+    """
+    全プロジェクトを逐次取得
+
+    Args:
+        db: 非同期データベースセッション
+        cursor: 開始位置のプロジェクトID（Noneの場合は先頭から）
+        chunk_size: 1回のフェッチ件数
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Yields:
+        プロジェクト
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return _iter_all(
+        db=db,
+        table=models.Project,
+        primary_key=models.Project.project_id,
+        cursor=cursor,
+        chunk_size=chunk_size,
+        fields=fields,
+    )
+
+
+async def select_project_by_id(db: AsyncSession, project_id: str) -> Optional[models.Project]:
+    """
+    IDでプロジェクトを取得
+
+    Args:
+        db: 非同期データベースセッション
+        project_id: プロジェクトID
+
+    Returns:
+        プロジェクト、または存在しない場合はNone
+    """
+    return await db.scalar(select(models.Project).where(models.Project.project_id == project_id))
+
+
+async def select_project_by_name(db: AsyncSession, project_name: str) -> Optional[models.Project]:
+    """
+    名前でプロジェクトを取得
+
+    Args:
+        db: 非同期データベースセッション
+        project_name: プロジェクト名
+
+    Returns:
+        プロジェクト、または存在しない場合はNone
+    """
+    return await _cached_select(
+        db=db,
+        registry_cache=cache.project_by_name_cache,
+        table=models.Project,
+        key=project_name,
+        stmt=select(models.Project).where(models.Project.project_name == project_name),
+    )
+
+
+async def add_project(
+    db: AsyncSession,
+    project_name: str,
+    description: Optional[str] = None,
+    commit: bool = True,
+) -> models.Project:
+    """
+    プロジェクトを作成
+
+    同名のプロジェクトが既に存在する場合は、既存のプロジェクトを返します。
+
+    Args:
+        db: 非同期データベースセッション
+        project_name: プロジェクト名
+        description: プロジェクトの説明
+        commit: トランザクションをコミットするか
+
+    Returns:
+        作成されたプロジェクト（または既存のプロジェクト）
+    """
+    data = await _insert_or_get(
+        db=db,
+        table=models.Project,
+        primary_key=models.Project.project_id,
+        values={"project_name": project_name, "description": description},
+        conflict_columns=[models.Project.project_name],
+    )
+    if data is None:
+        # ON CONFLICTをサポートしないDBでは既存チェック後に作成
+        data = await db.scalar(select(models.Project).where(models.Project.project_name == project_name))
+        if data is None:
+            data = models.Project(
+                project_id=await _new_id(db, models.Project),
+                project_name=project_name,
+                description=description,
+            )
+            db.add(data)
+
+    # 並行する読み込みが古い行をキャッシュし直さないよう、無効化はコミット後に行う
+    cache.invalidate_after_commit(db, cache.project_by_name_cache, project_name)
+    if commit:
+        await db.commit()
+        await db.refresh(data)
+    return data
+
+
+# ==================== Model CRUD ====================
+
+
+async def select_model_all(db: AsyncSession) -> List[models.Model]:
+    """
+    全モデルを取得
+
+    Args:
+        db: 非同期データベースセッション
+
+    Returns:
+        モデルのリスト
+    """
+    return list(await db.scalars(select(models.Model)))
+
+
+async def select_model_page(
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[models.Model], Optional[str]]:
+    """
+    モデルをページ単位で取得
+
+    Args:
+        db: 非同期データベースセッション
+        limit: 1ページあたりの件数
+        cursor: 前ページ最後のモデルID（Noneの場合は先頭から）
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (モデルのリスト, 次ページのカーソル) のタプル
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return await _select_page(
+        db=db,
+        table=models.Model,
+        primary_key=models.Model.model_id,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+
+
+def iter_model_all(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    chunk_size: int = 1000,
+    fields: Optional[Sequence[str]] = None,
+) -> AsyncIterator[models.Model]:
+    """
+    全モデルを逐次取得
+
+    Args:
+        db: 非同期データベースセッション
+        cursor: 開始位置のモデルID（Noneの場合は先頭から）
+        chunk_size: 1回のフェッチ件数
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Yields:
+        モデル
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return _iter_all(
+        db=db,
+        table=models.Model,
+        primary_key=models.Model.model_id,
+        cursor=cursor,
+        chunk_size=chunk_size,
+        fields=fields,
+    )
+
+
+async def select_model_by_id(db: AsyncSession, model_id: str) -> Optional[models.Model]:
+    """
+    IDでモデルを取得
+
+    Args:
+        db: 非同期データベースセッション
+        model_id: モデルID
+
+    Returns:
+        モデル、または存在しない場合はNone
+    """
+    return await _cached_select(
+        db=db,
+        registry_cache=cache.model_by_id_cache,
+        table=models.Model,
+        key=model_id,
+        stmt=select(models.Model).where(models.Model.model_id == model_id),
+    )
+
+
+async def select_model_by_project_id(db: AsyncSession, project_id: str) -> List[models.Model]:
+    """
+    プロジェクトIDでモデルを取得
+
+    Args:
+        db: 非同期データベースセッション
+        project_id: プロジェクトID
+
+    Returns:
+        モデルのリスト
+    """
+    return list(await db.scalars(select(models.Model).where(models.Model.project_id == project_id)))
+
+
+async def select_model_by_project_name(db: AsyncSession, project_name: str) -> List[models.Model]:
+    """
+    プロジェクト名でモデルを取得
+
+    Args:
+        db: 非同期データベースセッション
+        project_name: プロジェクト名
+
+    Returns:
+        モデルのリスト
+    """
+    project = await select_project_by_name(db=db, project_name=project_name)
+    if not project:
+        return []
+    return await select_model_by_project_id(db=db, project_id=project.project_id)
+
+
+async def select_model_by_name(db: AsyncSession, model_name: str) -> List[models.Model]:
+    """
+    モデル名でモデルを取得
+
+    Args:
+        db: 非同期データベースセッション
+        model_name: モデル名
+
+    Returns:
+        モデルのリスト
+    """
+    return list(await db.scalars(select(models.Model).where(models.Model.model_name == model_name)))
+
+
+async def add_model(
+    db: AsyncSession,
+    project_id: str,
+    model_name: str,
+    description: Optional[str] = None,
+    commit: bool = True,
+) -> models.Model:
+    """
+    モデルを作成
+
+    同一プロジェクト内で同名のモデルが既に存在する場合は、既存のモデルを返します。
+
+    Args:
+        db: 非同期データベースセッション
+        project_id: プロジェクトID
+        model_name: モデル名
+        description: モデルの説明
+        commit: トランザクションをコミットするか
+
+    Returns:
+        作成されたモデル（または既存のモデル）
+    """
+    data = await _insert_or_get(
+        db=db,
+        table=models.Model,
+        primary_key=models.Model.model_id,
+        values={
+            "project_id": project_id,
+            "model_name": model_name,
+            "description": description,
+        },
+        conflict_columns=[models.Model.project_id, models.Model.model_name],
+    )
+    if data is None:
+        # ON CONFLICTをサポートしないDBでは既存チェック後に作成
+        data = await db.scalar(
+            select(models.Model).where(models.Model.project_id == project_id, models.Model.model_name == model_name)
+        )
+        if data is None:
+            data = models.Model(
+                model_id=await _new_id(db, models.Model),
+                project_id=project_id,
+                model_name=model_name,
+                description=description,
+            )
+            db.add(data)
+
+    # 並行する読み込みが古い行をキャッシュし直さないよう、無効化はコミット後に行う
+    cache.invalidate_after_commit(db, cache.model_by_id_cache, data.model_id)
+    if commit:
+        await db.commit()
+        await db.refresh(data)
+    return data
+
+
+# ==================== Experiment CRUD ====================
+
+
+async def select_experiment_all(db: AsyncSession) -> List[models.Experiment]:
+    """
+    全実験を取得
+
+    Args:
+        db: 非同期データベースセッション
+
+    Returns:
+        実験のリスト
+    """
+    return list(await db.scalars(select(models.Experiment)))
+
+
+async def select_experiment_page(
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[models.Experiment], Optional[str]]:
+    """
+    実験をページ単位で取得
+
+    Args:
+        db: 非同期データベースセッション
+        limit: 1ページあたりの件数
+        cursor: 前ページ最後の実験ID（Noneの場合は先頭から）
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (実験のリスト, 次ページのカーソル) のタプル
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return await _select_page(
+        db=db,
+        table=models.Experiment,
+        primary_key=models.Experiment.experiment_id,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+
+
+def iter_experiment_all(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    chunk_size: int = 1000,
+    fields: Optional[Sequence[str]] = None,
+) -> AsyncIterator[models.Experiment]:
+    """
+    全実験を逐次取得
+
+    Args:
+        db: 非同期データベースセッション
+        cursor: 開始位置の実験ID（Noneの場合は先頭から）
+        chunk_size: 1回のフェッチ件数
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Yields:
+        実験
+
+    Raises:
+        ValueError: cursorが存在しない要素を指す場合
+    """
+    return _iter_all(
+        db=db,
+        table=models.Experiment,
+        primary_key=models.Experiment.experiment_id,
+        cursor=cursor,
+        chunk_size=chunk_size,
+        fields=fields,
+    )
+
+
+async def select_experiment_changes(
+    db: AsyncSession,
+    since: Optional[str] = None,
+    limit: int = 100,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[models.Experiment], Optional[str]]:
+    """
+    指定したカーソルより後に登録された実験を取得（変更フィード）
+
+    Args:
+        db: 非同期データベースセッション
+        since: 前回取得したカーソル（Noneの場合は先頭から）
+        limit: 最大取得件数
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        (登録順の実験のリスト, 次回のカーソル) のタプル。新しい実験がない場合カーソルはsinceのまま
+
+    Raises:
+        ValueError: sinceが存在しない変更を指す場合
+    """
+    last = None
+    if since is not None:
+        last = (await db.execute(_change_cursor_select(since))).first()
+        if last is None:
+            raise ValueError(f"Unknown change feed cursor: {since!r}")
+
+    stmt = _experiment_changes_select(db.get_bind().dialect.name, last, fields).limit(limit)
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return [], since
+    return [experiment for experiment, _ in rows], str(rows[-1].change_id)
+
+
+async def select_experiment_by_id(db: AsyncSession, experiment_id: str) -> Optional[models.Experiment]:
+    """
+    IDで実験を取得
+
+    Args:
+        db: 非同期データベースセッション
+        experiment_id: 実験ID
+
+    Returns:
+        実験、または存在しない場合はNone
+    """
+    return await db.scalar(select(models.Experiment).where(models.Experiment.experiment_id == experiment_id))
+
+
+async def select_experiment_by_model_version_id(
+    db: AsyncSession, model_version_id: str
+) -> Optional[models.Experiment]:
+    """
+    モデルバージョンIDで実験を取得
+
+    Args:
+        db: 非同期データベースセッション
+        model_version_id: モデルバージョンID
+
+    Returns:
+        実験、または存在しない場合はNone
+    """
+    return await _cached_select(
+        db=db,
+        registry_cache=cache.experiment_by_model_version_id_cache,
+        table=models.Experiment,
+        key=model_version_id,
+        stmt=select(models.Experiment).where(models.Experiment.model_version_id == model_version_id),
+    )
+
+
+async def select_experiment_by_model_id(
+    db: AsyncSession,
+    model_id: str,
+    fields: Optional[Sequence[str]] = None,
+) -> List[models.Experiment]:
+    """
+    モデルIDで実験を取得
+
+    Args:
+        db: 非同期データベースセッション
+        model_id: モデルID
+        fields: 読み込むカラム名のリスト（Noneの場合は全カラム）
+
+    Returns:
+        実験のリスト
+    """
+    stmt = select(models.Experiment).options(*_load_only(models.Experiment, fields))
+    return list(await db.scalars(stmt.where(models.Experiment.model_id == model_id)))
+
+
+async def select_experiment_by_project_id(db: AsyncSession, project_id: str) -> List[tuple]:
+    """
+    プロジェクトIDで実験を取得
+
+    ExperimentとModelをJOINして取得します。
+
+    Args:
+        db: 非同期データベースセッション
+        project_id: プロジェクトID
+
+    Returns:
+        実験のリスト
+    """
+    result = await db.execute(
+        select(models.Experiment, models.Model)
+        .where(models.Model.project_id == project_id)
+        .where(models.Experiment.model_id == models.Model.model_id)
+    )
+    return [tuple(row) for row in result]
+
+
+async def select_experiment_leaderboard(
+    db: AsyncSession,
+    model_id: str,
+    metric: str,
+    k: int = 10,
+    ascending: bool = False,
+) -> List[Any]:
+    """
+    評価指標の上位k件の実験を取得
+
+    Args:
+        db: 非同期データベースセッション
+        model_id: モデルID
+        metric: 評価指標名（値が数値でない実験は除外されます）
+        k: 取得件数
+        ascending: Trueの場合は値が小さい順（lossなど）
+
+    Returns:
+        (experiment_id, model_version_id, value, created_datetime) の行のリスト
+    """
+    value = models.evaluation_metric(metric)
+    if ascending:
+        order = [value.asc(), models.Experiment.experiment_id.asc()]
+    else:
+        order = [value.desc(), models.Experiment.experiment_id.desc()]
+    result = await db.execute(
+        select(
+            models.Experiment.experiment_id,
+            models.Experiment.model_version_id,
+            value.label("value"),
+            models.Experiment.created_datetime,
+        )
+        .where(models.Experiment.model_id == model_id, value.is_not(None))
+        .order_by(*order)
+        .limit(k)
+    )
+    return list(result.all())
+
+
+async def add_experiment(
+    db: AsyncSession,
+    model_version_id: str,
+    model_id: str,
+    parameters: Optional[Dict[str, Any]] = None,
+    training_dataset: Optional[str] = None,
+    validation_dataset: Optional[str] = None,
+    test_dataset: Optional[str] = None,
+    evaluations: Optional[Dict[str, Any]] = None,
+    artifact_file_paths: Optional[Dict[str, Any]] = None,
+    commit: bool = True,
+) -> models.Experiment:
+    """
+    実験を作成
+
+    同じトランザクションで変更フィードへの記録と、モデルのサマリーも更新します。
+
+    Args:
+        db: 非同期データベースセッション
+        model_version_id: モデルバージョンID
+        model_id: モデルID
+        parameters: 学習パラメータ
+        training_dataset: 学習データセットのパス
+        validation_dataset: 検証データセットのパス
+        test_dataset: テストデータセットのパス
+        evaluations: 評価結果
+        artifact_file_paths: モデルファイルのパス
+        commit: トランザクションをコミットするか
+
+    Returns:
+        作成された実験
+    """
+    values = {
+        "model_version_id": model_version_id,
+        "model_id": model_id,
+        "parameters": parameters,
+        "training_dataset": training_dataset,
+        "validation_dataset": validation_dataset,
+        "test_dataset": test_dataset,
+        "evaluations": evaluations,
+        "artifact_file_paths": artifact_file_paths,
+    }
+    data = await _insert_new(
+        db=db,
+        table=models.Experiment,
+        primary_key=models.Experiment.experiment_id,
+        values=values,
+    )
+    if data is None:
+        # ON CONFLICTをサポートしないDBでは衝突しないIDを確認してから作成
+        data = models.Experiment(experiment_id=await _new_id(db, models.Experiment), **values)
+        db.add(data)
+        await db.flush()
+
+    await _record_experiment_changes(db, [data.experiment_id])
+    await _summarize_new_experiments(
+        db, model_id, [(data.experiment_id, model_version_id, data.created_datetime, evaluations)]
+    )
+
+    cache.invalidate_after_commit(db, cache.experiment_by_model_version_id_cache, model_version_id)
+    if commit:
+        await db.commit()
+        await db.refresh(data)
+    return data
+
+
+async def add_experiments_bulk(
+    db: AsyncSession,
+    experiments: List[Dict[str, Any]],
+    commit: bool = True,
+) -> List[str]:
+    """
+    実験を一括作成
+
+    Args:
+        db: 非同期データベースセッション
+        experiments: 実験ごとのカラム値の辞書のリスト
+        commit: トランザクションをコミットするか
+
+    Returns:
+        作成された実験IDのリスト（入力と同じ順序）
+    """
+    # サマリーの最新バージョンを判定できるよう、作成日時をアプリ側で付与
+    rows = [{"created_datetime": models._utcnow(), **experiment} for experiment in experiments]
+    experiment_ids = await _insert_new_bulk(
+        db=db,
+        table=models.Experiment,
+        primary_key=models.Experiment.experiment_id,
+        rows=rows,
+    )
+    await _record_experiment_changes(db, experiment_ids)
+
+    by_model = defaultdict(list)
+    for experiment_id, row in zip(experiment_ids, rows):
+        by_model[row["model_id"]].append(
+            (experiment_id, row["model_version_id"], row["created_datetime"], row.get("evaluations"))
+        )
+    # 並行する一括登録とのデッドロックを避けるため、ロックはモデルID順に取得
+    for model_id in sorted(by_model):
+        await _summarize_new_experiments(db, model_id, by_model[model_id])
+
+    for model_version_id in {experiment["model_version_id"] for experiment in experiments}:
+        cache.invalidate_after_commit(db, cache.experiment_by_model_version_id_cache, model_version_id)
+    if commit:
+        await db.commit()
+    return experiment_ids
+
+
+async def update_experiment_evaluation(
+    db: AsyncSession,
+    experiment_id: str,
+    evaluations: Dict[str, Any],
+) -> Optional[models.Experiment]:
+    """
+    実験の評価結果を更新
+
+    既存の評価結果に新しい評価結果をマージします。
+    マージはDB側で行うため、異なる評価指標を並行して書き込んでも更新は失われません。
+    同じトランザクションでモデルのサマリーの最良値も更新します。
+    実験の更新は1文のUPDATEですが、サマリー行のロック（SELECT ... FOR UPDATE）と更新、
+    最良値が悪化した場合は再集計のクエリが加わります。
+
+    Args:
+        db: 非同期データベースセッション
+        experiment_id: 実験ID
+        evaluations: 新しい評価結果
+
+    Returns:
+        更新された実験、または存在しない場合はNone
+    """
+    data = await _update_experiment_json(
+        db=db,
+        experiment_id=experiment_id,
+        updates={models.Experiment.evaluations: evaluations},
+        before_commit=lambda row: _summarize_evaluation(
+            db, row.model_id, row.experiment_id, row.model_version_id, evaluations
+        ),
+    )
+    return data
+
+
+async def update_experiment_artifact_file_paths(
+    db: AsyncSession,
+    experiment_id: str,
+    artifact_file_paths: Dict[str, Any],
+) -> Optional[models.Experiment]:
+    """
+    実験のモデルファイルパスを更新
+
+    既存のファイルパスに新しいファイルパスをマージします。
+    マージはDB側で行うため、並行して書き込んでも更新は失われません。
+
+    Args:
+        db: 非同期データベースセッション
+        experiment_id: 実験ID
+        artifact_file_paths: 新しいモデルファイルのパス
+
+    Returns:
+        更新された実験、または存在しない場合はNone
+    """
+    data = await _update_experiment_json(
+        db=db,
+        experiment_id=experiment_id,
+        updates={models.Experiment.artifact_file_paths: artifact_file_paths},
+    )
+    return data
+
+
+async def update_experiment_artifacts(
+    db: AsyncSession,
+    experiment_id: str,
+    artifact_file_paths: Dict[str, str],
+    artifact_digests: Dict[str, str],
+) -> Optional[models.Experiment]:
+    """
+    実験のモデルファイルパスとSHA-256ダイジェストを更新
+
+    Args:
+        db: 非同期データベースセッション
+        experiment_id: 実験ID
+        artifact_file_paths: ファイル名をキーとしたモデルファイルのパス
+        artifact_digests: ファイル名をキーとしたSHA-256ダイジェスト（16進数）
+
+    Returns:
+        更新された実験、または存在しない場合はNone
+    """
+    data = await _update_experiment_json(
+        db=db,
+        experiment_id=experiment_id,
+        updates={
+            models.Experiment.artifact_file_paths: artifact_file_paths,
+            models.Experiment.artifact_digests: artifact_digests,
+        },
+    )
+    return data
+
+
+# ==================== Summary CRUD ====================
+
+
+async def select_model_summaries_by_project_id(db: AsyncSession, project_id: str) -> List[models.ModelSummary]:
+    """
+    プロジェクトIDでモデルごとの実験サマリーを取得
+
+    Args:
+        db: 非同期データベースセッション
+        project_id: プロジェクトID
+
+    Returns:
+        モデル名順のサマリーのリスト
+    """
+    return list(
+        await db.scalars(
+            select(models.ModelSummary)
+            .where(models.ModelSummary.project_id == project_id)
+            .order_by(models.ModelSummary.model_name)
+        )
+    )
@@ -0,0 +1,232 @@
+"""
+Cache Layer
+
+参照頻度が高く、ほとんど変更されないレジストリ検索結果のためのプロセス内キャッシュです。
+LRU（最大件数）とTTL（有効期限）の両方で古いエントリを破棄します。
+
+セッションに紐づいたORMオブジェクトはスレッド・セッションを跨いで共有できないため、
+キャッシュにはカラム値のスナップショットを保存し、ヒット時に呼び出し元のセッションへ復元します。
+
+キャッシュはプロセスごとに独立しています。APIを複数ワーカー（uvicorn --workers、複数レプリカ）で
+動かす場合、他のプロセスでの書き込みはTTL（REGISTRY_CACHE_TTL_SECONDS）が経過するまで反映されません。
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, SessionTransaction, make_transient_to_detached
+
+# キャッシュ設定（REGISTRY_CACHE_MAXSIZE=0 または REGISTRY_CACHE_TTL_SECONDS=0 で無効化）
+REGISTRY_CACHE_MAXSIZE = int(os.getenv("REGISTRY_CACHE_MAXSIZE", "1024"))
+REGISTRY_CACHE_TTL_SECONDS = float(os.getenv("REGISTRY_CACHE_TTL_SECONDS", "60"))
+
+
+class LRUTTLCache:
+    """
+    スレッドセーフなLRU+TTLキャッシュ
+
+    読み込み中に無効化が発生した場合に古い値を書き戻さないよう、
+    無効化のたびに世代番号を進め、読み込み開始時の世代と一致する場合のみ保存します。
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl_seconds: float):
+        """
+        Args:
+            name: キャッシュ名（統計情報の表示用）
+            maxsize: 最大エントリ数
+            ttl_seconds: エントリの有効期限（秒）
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュが有効か"""
+        return self.maxsize > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Tuple[Optional[Any], int]:
+        """
+        キャッシュから値を取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            (値, 世代番号) のタプル。ミスの場合、値はNone
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, self._generation
+                del self._entries[key]
+            self.misses += 1
+            return None, self._generation
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        """
+        値をキャッシュに保存
+
+        Args:
+            key: キャッシュキー
+            value: 保存する値
+            generation: get()で取得した世代番号（以降に無効化があった場合は保存しない）
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        指定したキーのエントリを削除
+
+        Args:
+            key: キャッシュキー
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """全エントリと統計情報を削除"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        統計情報を取得
+
+        Returns:
+            ヒット数・ミス数・ヒット率・現在のエントリ数などの辞書
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+# ==================== Registry Caches ====================
+
+project_by_name_cache = LRUTTLCache("project_by_name", REGISTRY_CACHE_MAXSIZE, REGISTRY_CACHE_TTL_SECONDS)
+model_by_id_cache = LRUTTLCache("model_by_id", REGISTRY_CACHE_MAXSIZE, REGISTRY_CACHE_TTL_SECONDS)
+experiment_by_model_version_id_cache = LRUTTLCache(
+    "experiment_by_model_version_id", REGISTRY_CACHE_MAXSIZE, REGISTRY_CACHE_TTL_SECONDS
+)
+
+REGISTRY_CACHES = (project_by_name_cache, model_by_id_cache, experiment_by_model_version_id_cache)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    全レジストリキャッシュの統計情報を取得
+
+    Returns:
+        キャッシュ名をキーとした統計情報の辞書
+    """
+    return {cache.name: cache.stats() for cache in REGISTRY_CACHES}
+
+
+def clear_caches() -> None:
+    """全レジストリキャッシュをクリア"""
+    for cache in REGISTRY_CACHES:
+        cache.clear()
+
+
+# ==================== Invalidation Helpers ====================
+
+# コミット待ちの無効化を保持するSession.infoのキー
+_PENDING_INVALIDATIONS_KEY = "registry_cache_pending_invalidations"
+
+
+def invalidate_after_commit(db: Any, registry_cache: LRUTTLCache, key: Hashable) -> None:
+    """
+    書き込みのコミット後にキャッシュのエントリを無効化
+
+    トランザクション中に無効化すると、コミットまでの間に並行する読み込みが
+    コミット済みの古い行を再びキャッシュし、TTLが切れるまで残ってしまいます。
+    そのため、トランザクション中の場合は無効化をセッションに登録し、
+    トランザクションの終了時（コミット・ロールバック・クローズ）に実行します。
+
+    Args:
+        db: データベースセッション（Session または AsyncSession）
+        registry_cache: 無効化するキャッシュ
+        key: キャッシュキー
+    """
+    # AsyncSessionの場合は内部の同期セッションのトランザクションを参照
+    session = getattr(db, "sync_session", db)
+    if not session.in_transaction():
+        registry_cache.invalidate(key)
+        return
+    session.info.setdefault(_PENDING_INVALIDATIONS_KEY, []).append((registry_cache, key))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _run_pending_invalidations(session: Session, transaction: SessionTransaction) -> None:
+    """最上位のトランザクションの終了時に、登録された無効化を実行"""
+    if transaction.parent is not None:
+        return
+    for registry_cache, key in session.info.pop(_PENDING_INVALIDATIONS_KEY, []):
+        registry_cache.invalidate(key)
+
+
+# ==================== Snapshot Helpers ====================
+
+
+def to_snapshot(data: Any) -> Dict[str, Any]:
+    """
+    ORMオブジェクトのカラム値をスナップショットとして取得
+
+    Args:
+        data: ORMオブジェクト
+
+    Returns:
+        カラム名と値の辞書
+    """
+    return copy.deepcopy({attr.key: getattr(data, attr.key) for attr in inspect(data).mapper.column_attrs})
+
+
+def from_snapshot(table: Any, snapshot: Dict[str, Any]) -> Any:
+    """
+    スナップショットからデタッチ状態のORMオブジェクトを復元
+
+    返されたオブジェクトは Session.merge(..., load=False) でDBアクセスなしにセッションへ追加できます。
+
+    Args:
+        table: ORMモデルクラス
+        snapshot: to_snapshot()で取得した辞書
+
+    Returns:
+        デタッチ状態のORMオブジェクト
+    """
+    data = table(**copy.deepcopy(snapshot))
+    make_transient_to_detached(data)
+    return data
@@ -0,0 +1,128 @@
+"""
+ID Generators
+
+レジストリの主キーを生成します。
+
+デフォルトは時刻順に並ぶULID（26文字、Crockford Base32）です。
+ランダムなIDと異なり、新しい行が主キーB-treeの末尾に追加されるため、
+挿入時のページ分割やキャッシュミスが減ります。
+
+環境変数 ID_GENERATOR（ulid / uuid7 / uuid4 / short_uuid4）、または set_id_generator() で切り替えられます。
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Union
+
+# Crockford Base32（I, L, O, Uを除く。辞書順と数値順が一致する）
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+
+class _MonotonicULID:
+    """
+    単調増加するULIDの生成器
+
+    同一ミリ秒内に複数生成した場合は、乱数部をインクリメントして順序を保証します。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_timestamp = -1
+        self._last_random = 0
+
+    def __call__(self) -> str:
+        timestamp = time.time_ns() // 1_000_000
+        with self._lock:
+            if timestamp <= self._last_timestamp and self._last_random < _RANDOM_MAX:
+                # 同一ミリ秒（または時計の巻き戻り）の場合は直前の値の次を使う
+                timestamp = self._last_timestamp
+                random = self._last_random + 1
+            else:
+                random = int.from_bytes(os.urandom(_RANDOM_BITS // 8), "big")
+            self._last_timestamp = timestamp
+            self._last_random = random
+
+        value = (timestamp << _RANDOM_BITS) | random
+        chars = []
+        for _ in range(26):
+            chars.append(_CROCKFORD_BASE32[value & 0x1F])
+            value >>= 5
+        return "".join(reversed(chars))
+
+
+new_ulid = _MonotonicULID()
+
+
+def new_uuid7() -> str:
+    """
+    UUIDv7（RFC 9562）形式のIDを生成
+
+    先頭48ビットがミリ秒単位のUNIX時刻のため、文字列の辞書順が生成順とほぼ一致します。
+
+    Returns:
+        ハイフン区切りのUUID文字列（36文字）
+    """
+    timestamp = time.time_ns() // 1_000_000
+    random = int.from_bytes(os.urandom(10), "big")
+    rand_a = random >> 68
+    rand_b = random & ((1 << 62) - 1)
+    value = (timestamp << 80) | (0x7 << 76) | (rand_a << 64) | (0b10 << 62) | rand_b
+    return str(uuid.UUID(int=value))
+
+
+def new_uuid4() -> str:
+    """
+    ランダムなUUIDv4を生成
+
+    Returns:
+        ハイフン区切りのUUID文字列（36文字）
+    """
+    return str(uuid.uuid4())
+
+
+def new_short_uuid4() -> str:
+    """
+    従来形式のID（UUIDv4の先頭6文字）を生成
+
+    衝突しやすいため、既存データとの互換性が必要な場合のみ使用します。
+
+    Returns:
+        6文字のID
+    """
+    return str(uuid.uuid4())[:6]
+
+
+ID_GENERATORS: Dict[str, Callable[[], str]] = {
+    "ulid": new_ulid,
+    "uuid7": new_uuid7,
+    "uuid4": new_uuid4,
+    "short_uuid4": new_short_uuid4,
+}
+
+_generator: Callable[[], str] = ID_GENERATORS[os.getenv("ID_GENERATOR", "ulid")]
+
+
+def set_id_generator(generator: Union[str, Callable[[], str]]) -> None:
+    """
+    主キーの生成方法を切り替え
+
+    Args:
+        generator: ID_GENERATORSの名前、またはIDを返す関数
+    """
+    global _generator
+    _generator = ID_GENERATORS[generator] if isinstance(generator, str) else generator
+
+
+def generate_id() -> str:
+    """
+    設定された生成方法で主キーを生成
+
+    Returns:
+        新しいID
+    """
+    return _generator()
@@ -0,0 +1,262 @@
+"""
+Artifact Store
+
+モデルファイルなどの成果物を、内容のSHA-256ダイジェストをキーとしてローカルファイルシステムに保存します。
+
+同じ内容のファイルは1つのオブジェクトとして保存され、取り出し時や登録元ファイルの置き換えには
+ハードリンクを使うため、同一のエクスポートを繰り返してもディスク使用量とコピー時間は増えません。
+読み書きはチャンク単位で行い、ファイル全体をメモリに読み込みません。
+
+ディレクトリ構成:
+    <root>/objects/<ダイジェストの先頭2文字>/<ダイジェスト>   保存済みオブジェクト（読み取り専用）
+    <root>/tmp/                                                 書き込み中の一時ファイル
+"""
+
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from src.db import cruds, models
+
+# 保存先のルートディレクトリ
+ARTIFACT_STORE_ROOT = os.getenv("ARTIFACT_STORE_ROOT", "./artifacts")
+
+# 読み書きのチャンクサイズ（1MiB）
+CHUNK_SIZE = 1024 * 1024
+
+PathLike = Union[str, os.PathLike]
+
+
+@dataclass(frozen=True)
+class StoredArtifact:
+    """保存済みオブジェクトの情報"""
+
+    digest: str
+    size: int
+    path: Path
+
+
+class ArtifactStore:
+    """
+    SHA-256による内容アドレス方式の成果物ストア
+
+    オブジェクトは一時ファイルに書き込んでからrenameで配置するため、
+    書き込み途中のファイルが読まれることはありません。
+    ハードリンクで共有されるオブジェクトが書き換えられないよう、配置後は読み取り専用にします。
+    """
+
+    def __init__(self, root: PathLike = ARTIFACT_STORE_ROOT, chunk_size: int = CHUNK_SIZE):
+        """
+        Args:
+            root: 保存先のルートディレクトリ
+            chunk_size: 読み書きのチャンクサイズ（バイト）
+        """
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+        self._objects = self.root / "objects"
+        self._tmp = self.root / "tmp"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._tmp.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, digest: str) -> Path:
+        """
+        ダイジェストに対応するオブジェクトのパスを取得
+
+        Args:
+            digest: SHA-256ダイジェスト（16進数）
+
+        Returns:
+            オブジェクトのパス（存在しない場合もある）
+        """
+        return self._objects / digest[:2] / digest
+
+    def exists(self, digest: str) -> bool:
+        """
+        オブジェクトが保存済みか
+
+        Args:
+            digest: SHA-256ダイジェスト（16進数）
+
+        Returns:
+            保存済みの場合True
+        """
+        return self.path_for(digest).is_file()
+
+    def put_stream(self, chunks: Iterable[bytes]) -> StoredArtifact:
+        """
+        バイト列のチャンクを保存
+
+        一時ファイルに書き込みながらダイジェストを計算し、同じ内容が保存済みの場合は一時ファイルを破棄します。
+
+        Args:
+            chunks: 保存する内容のチャンク
+
+        Returns:
+            保存済みオブジェクトの情報
+        """
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self._tmp)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    hasher.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            return self._commit(Path(tmp_name), hasher.hexdigest(), size)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+    def put_file(self, path: PathLike, link_source: bool = False) -> StoredArtifact:
+        """
+        ファイルを保存
+
+        先にダイジェストだけを計算し、保存済みの場合はコピーしません。
+        未保存の場合はコピーしながら計算したダイジェストを返します。
+        元のファイルはオブジェクトとして直接リンクせず、コピーしてから読み取り専用にします
+        （学習スクリプトが元のファイルを上書きしても保存済みの内容は変わりません）。
+
+        Args:
+            path: 保存するファイルのパス
+            link_source: Trueの場合、元のファイルを保存済みオブジェクトへのハードリンクに置き換える
+                （同じ内容のエクスポートが何度あってもディスク上には1つしか残らない）。
+                置き換え後のファイルは読み取り専用になります
+
+        Returns:
+            保存済みオブジェクトの情報
+        """
+        path = Path(path)
+        with open(path, "rb") as f:
+            digest, size = self._hash(f)
+
+        if self.exists(digest):
+            artifact = StoredArtifact(digest=digest, size=size, path=self.path_for(digest))
+        else:
+            # 保存する内容から計算し直したダイジェストを使う（ハッシュ計算後に書き換えられた場合も不整合にならない）
+            with open(path, "rb") as f:
+                artifact = self.put_stream(iter(lambda: f.read(self.chunk_size), b""))
+
+        if link_source and not path.samefile(artifact.path):
+            self._replace_with_link(artifact.path, path)
+        return artifact
+
+    def open(self, digest: str) -> BinaryIO:
+        """
+        オブジェクトを読み込み用に開く
+
+        Args:
+            digest: SHA-256ダイジェスト（16進数）
+
+        Returns:
+            バイナリファイルオブジェクト
+
+        Raises:
+            FileNotFoundError: オブジェクトが存在しない場合
+        """
+        return open(self.path_for(digest), "rb")
+
+    def iter_chunks(self, digest: str) -> Iterator[bytes]:
+        """
+        オブジェクトの内容をチャンク単位で読み込み
+
+        Args:
+            digest: SHA-256ダイジェスト（16進数）
+
+        Yields:
+            chunk_sizeバイトごとの内容
+        """
+        with self.open(digest) as f:
+            yield from iter(lambda: f.read(self.chunk_size), b"")
+
+    def materialize(self, digest: str, dest: PathLike) -> Path:
+        """
+        オブジェクトを指定したパスに配置
+
+        ハードリンクで配置するため、ファイルサイズに関わらずコピーは発生しません。
+        リンクできない場合はチャンク単位でコピーします。
+
+        Args:
+            digest: SHA-256ダイジェスト（16進数）
+            dest: 配置先のパス（既存のファイルは置き換え）
+
+        Returns:
+            配置先のパス
+        """
+        source = self.path_for(digest)
+        if not source.is_file():
+            raise FileNotFoundError(f"Artifact not found: {digest}")
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        self._replace_with_link(source, dest)
+        return dest
+
+    def _hash(self, f: BinaryIO) -> Tuple[str, int]:
+        """ファイルをチャンク単位で読み、(ダイジェスト, サイズ) を返す"""
+        hasher = hashlib.sha256()
+        size = 0
+        for chunk in iter(lambda: f.read(self.chunk_size), b""):
+            hasher.update(chunk)
+            size += len(chunk)
+        return hasher.hexdigest(), size
+
+    def _commit(self, tmp_path: Path, digest: str, size: int) -> StoredArtifact:
+        """一時ファイルをオブジェクトとして配置（保存済みの場合は何もしない）"""
+        target = self.path_for(digest)
+        if not target.exists():
+            target.parent.mkdir(exist_ok=True)
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp_path, target)
+        return StoredArtifact(digest=digest, size=size, path=target)
+
+    def _replace_with_link(self, source: Path, dest: Path) -> None:
+        """destをsourceへのハードリンクに置き換え（リンクできない場合はコピー）"""
+        fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            # mkstempで確保した一意な名前にリンクする（同じプロセス内の並行した配置とも衝突しない）
+            os.unlink(tmp_name)
+            try:
+                os.link(source, tmp_name)
+            except OSError:
+                shutil.copyfile(source, tmp_name)
+            os.replace(tmp_name, dest)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+
+def store_experiment_artifacts(
+    db: Session,
+    store: ArtifactStore,
+    experiment_id: str,
+    files: Dict[str, PathLike],
+    link_source: bool = False,
+) -> Optional[models.Experiment]:
+    """
+    実験の成果物をストアに保存し、パスとダイジェストをレジストリに記録
+
+    Args:
+        db: データベースセッション
+        store: 保存先のストア
+        experiment_id: 実験ID
+        files: ファイル名（例: "model"）をキーとした保存するファイルのパス
+        link_source: Trueの場合、元のファイルを保存済みオブジェクトへのハードリンクに置き換える
+
+    Returns:
+        更新された実験、または存在しない場合はNone
+    """
+    artifacts = {name: store.put_file(path, link_source=link_source) for name, path in files.items()}
+    return cruds.update_experiment_artifacts(
+        db=db,
+        experiment_id=experiment_id,
+        artifact_file_paths={name: str(artifact.path) for name, artifact in artifacts.items()},
+        artifact_digests={name: artifact.digest for name, artifact in artifacts.items()},
+    )
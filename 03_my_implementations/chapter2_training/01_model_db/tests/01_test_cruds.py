@@ -5,8 +5,11 @@ CRUD層のユニットテスト
 TDD - Redフェーズ：まず失敗するテストを書きます。
 """
 
+import datetime
+
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 from src.db.database import Base
 from src.db import cruds, models
@@ -303,3 +306,266 @@ class TestExperimentCRUD:
 
         assert updated_experiment.artifact_file_paths["model"] == "s3://bucket/model_v1.pkl"
         assert updated_experiment.artifact_file_paths["weights"] == "s3://bucket/weights.h5"
+
+
+class TestPaginationCRUD:
+    """キーセットページネーションとストリーミング取得のテスト"""
+
+    def _add_experiments(self, db_session, n):
+        project = cruds.add_project(db=db_session, project_name="test_project", commit=True)
+        model = cruds.add_model(db=db_session, project_id=project.project_id, model_name="test_model", commit=True)
+        for i in range(n):
+            cruds.add_experiment(db=db_session, model_id=model.model_id, model_version_id=f"v{i}", commit=True)
+
+    def test_select_experiment_page_walks_all_rows(self, db_session):
+        """カーソルを辿ると全件を重複・欠落なく取得できる"""
+        self._add_experiments(db_session, 7)
+
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = cruds.select_experiment_page(db=db_session, limit=3, cursor=cursor)
+            assert len(page) <= 3
+            seen.extend(e.experiment_id for e in page)
+            if cursor is None:
+                break
+
+        all_ids = [e.experiment_id for e in cruds.select_experiment_all(db=db_session)]
+        assert len(seen) == 7
+        assert sorted(seen) == sorted(all_ids)
+
+    def test_select_experiment_changes_returns_only_newer_rows(self, db_session):
+        """sinceより後に登録された実験のみが登録順に返される"""
+        self._add_experiments(db_session, 3)
+        all_experiments, last_cursor = cruds.select_experiment_changes(db=db_session)
+        _, first_cursor = cruds.select_experiment_changes(db=db_session, limit=1)
+
+        newer, cursor = cruds.select_experiment_changes(db=db_session, since=first_cursor)
+
+        assert [e.model_version_id for e in all_experiments] == ["v0", "v1", "v2"]
+        assert newer == all_experiments[1:]
+        assert cursor == last_cursor
+        assert cruds.select_experiment_changes(db=db_session, since=last_cursor) == ([], last_cursor)
+
+    def test_select_experiment_changes_ignores_created_datetime(self, db_session):
+        """作成日時が進んだ時計で付与された実験の後に登録された実験も返される"""
+        project = cruds.add_project(db=db_session, project_name="test_project")
+        model = cruds.add_model(db=db_session, project_id=project.project_id, model_name="test_model")
+        skewed = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+        cruds.add_experiments_bulk(
+            db=db_session,
+            experiments=[{"model_id": model.model_id, "model_version_id": "v0", "created_datetime": skewed}],
+        )
+        _, cursor = cruds.select_experiment_changes(db=db_session)
+
+        cruds.add_experiment(db=db_session, model_id=model.model_id, model_version_id="v1")
+        newer, _ = cruds.select_experiment_changes(db=db_session, since=cursor)
+
+        assert [e.model_version_id for e in newer] == ["v1"]
+
+    @pytest.mark.parametrize("since", ["999", "not-a-cursor"])
+    def test_select_experiment_changes_rejects_unknown_cursor(self, db_session, since):
+        """存在しない・整数でないカーソルはValueErrorになる"""
+        self._add_experiments(db_session, 1)
+
+        with pytest.raises(ValueError):
+            cruds.select_experiment_changes(db=db_session, since=since)
+
+    def test_select_project_page_last_page_has_no_cursor(self, db_session):
+        """最終ページではカーソルがNoneになる"""
+        cruds.add_project(db=db_session, project_name="project1", commit=True)
+        cruds.add_project(db=db_session, project_name="project2", commit=True)
+
+        projects, cursor = cruds.select_project_page(db=db_session, limit=2)
+
+        assert len(projects) == 2
+        assert cursor is None
+
+    def test_iter_experiment_all_matches_page_order(self, db_session):
+        """ストリーミング取得はページ取得と同じ順序で全件を返す"""
+        self._add_experiments(db_session, 5)
+
+        streamed = [e.experiment_id for e in cruds.iter_experiment_all(db=db_session, chunk_size=2)]
+        paged, _ = cruds.select_experiment_page(db=db_session, limit=5)
+
+        assert streamed == [e.experiment_id for e in paged]
+
+    def test_iter_model_all_from_cursor(self, db_session):
+        """カーソル指定時はその次の要素から返す"""
+        project = cruds.add_project(db=db_session, project_name="test_project", commit=True)
+        for name in ["model1", "model2", "model3"]:
+            cruds.add_model(db=db_session, project_id=project.project_id, model_name=name, commit=True)
+
+        first_page, cursor = cruds.select_model_page(db=db_session, limit=1)
+        rest = list(cruds.iter_model_all(db=db_session, cursor=cursor))
+
+        assert len(rest) == 2
+        assert first_page[0].model_id not in [m.model_id for m in rest]
+
+    def test_unknown_page_cursor_raises(self, db_session):
+        """存在しない・削除済みのカーソルはページ取得・ストリーミング取得ともにValueErrorになる"""
+        project = cruds.add_project(db=db_session, project_name="project", commit=True)
+        db_session.delete(project)
+        db_session.commit()
+
+        with pytest.raises(ValueError):
+            cruds.select_project_page(db=db_session, cursor=project.project_id)
+        with pytest.raises(ValueError):
+            cruds.iter_project_all(db=db_session, cursor=project.project_id)
+
+
+class TestInsertOrGet:
+    """一意制約を使ったinsert-or-getのテスト"""
+
+    def test_add_model_same_name_in_different_projects(self, db_session):
+        """別プロジェクトであれば同名モデルを作成できる"""
+        project1 = cruds.add_project(db=db_session, project_name="project1", commit=True)
+        project2 = cruds.add_project(db=db_session, project_name="project2", commit=True)
+
+        model1 = cruds.add_model(db=db_session, project_id=project1.project_id, model_name="shared", commit=True)
+        model2 = cruds.add_model(db=db_session, project_id=project2.project_id, model_name="shared", commit=True)
+
+        assert model1.model_id != model2.model_id
+        assert len(cruds.select_model_by_name(db=db_session, model_name="shared")) == 2
+
+    def test_add_model_without_commit_after_project_without_commit(self, db_session):
+        """commit=Falseで追加したプロジェクト配下にもモデルを作成できる"""
+        project = cruds.add_project(db=db_session, project_name="pending_project", commit=False)
+        model = cruds.add_model(db=db_session, project_id=project.project_id, model_name="model", commit=False)
+        db_session.commit()
+
+        assert cruds.select_model_by_id(db=db_session, model_id=model.model_id) is not None
+
+    def test_duplicate_model_insert_violates_unique_index(self, db_session):
+        """一意インデックスにより同一プロジェクト内の重複登録はDBレベルで拒否される"""
+        project = cruds.add_project(db=db_session, project_name="test_project", commit=True)
+        cruds.add_model(db=db_session, project_id=project.project_id, model_name="model", commit=True)
+
+        db_session.add(models.Model(model_id="dup001", project_id=project.project_id, model_name="model"))
+
+        with pytest.raises(IntegrityError):
+            db_session.commit()
+
+
+class TestBulkInsert:
+    """実験の一括作成のテスト"""
+
+    def test_add_experiments_bulk(self, db_session):
+        """一括作成した実験がIDの順序通りに取得できる"""
+        project = cruds.add_project(db=db_session, project_name="test_project", commit=True)
+        model = cruds.add_model(db=db_session, project_id=project.project_id, model_name="test_model", commit=True)
+
+        experiment_ids = cruds.add_experiments_bulk(
+            db=db_session,
+            experiments=[
+                {
+                    "model_id": model.model_id,
+                    "model_version_id": f"v{i}",
+                    "parameters": {"trial": i},
+                    "evaluations": {"accuracy": i / 10},
+                }
+                for i in range(5)
+            ],
+            commit=True,
+        )
+
+        assert len(experiment_ids) == 5
+        assert len(set(experiment_ids)) == 5
+        for i, experiment_id in enumerate(experiment_ids):
+            experiment = cruds.select_experiment_by_id(db=db_session, experiment_id=experiment_id)
+            assert experiment.model_version_id == f"v{i}"
+            assert experiment.parameters == {"trial": i}
+            assert experiment.created_datetime is not None
+
+    def test_add_experiments_bulk_without_commit_can_rollback(self, db_session):
+        """commit=Falseの場合はロールバックで全件取り消せる"""
+        project = cruds.add_project(db=db_session, project_name="test_project", commit=True)
+        model = cruds.add_model(db=db_session, project_id=project.project_id, model_name="test_model", commit=True)
+
+        cruds.add_experiments_bulk(
+            db=db_session,
+            experiments=[{"model_id": model.model_id, "model_version_id": "v1"}],
+            commit=False,
+        )
+        db_session.rollback()
+
+        assert cruds.select_experiment_all(db=db_session) == []
+
+
+class TestLeaderboardCRUD:
+    """リーダーボード取得のテスト"""
+
+    def _add_experiments(self, db_session, evaluations_list):
+        project = cruds.add_project(db=db_session, project_name="test_project", commit=True)
+        model = cruds.add_model(db=db_session, project_id=project.project_id, model_name="test_model", commit=True)
+        for i, evaluations in enumerate(evaluations_list):
+            cruds.add_experiment(
+                db=db_session, model_id=model.model_id, model_version_id=f"v{i}", evaluations=evaluations
+            )
+        return model.model_id
+
+    def test_top_k_by_metric(self, db_session):
+        """指標の降順で上位k件が返され、指標を持たない実験は除外される"""
+        model_id = self._add_experiments(
+            db_session,
+            [{"accuracy": 0.7}, {"accuracy": 0.95}, {"loss": 0.1}, None, {"accuracy": 0.8}],
+        )
+
+        rows = cruds.select_experiment_leaderboard(db=db_session, model_id=model_id, metric="accuracy", k=2)
+
+        assert [(row.model_version_id, row.value) for row in rows] == [("v1", 0.95), ("v4", 0.8)]
+        assert rows[0].created_datetime is not None
+
+    def test_excludes_non_numeric_values(self, db_session):
+        """文字列・オブジェクト・真偽値の指標は除外され、数値より上に並ばない"""
+        model_id = self._add_experiments(
+            db_session,
+            [{"accuracy": 0.7}, {"accuracy": "high"}, {"accuracy": {"top1": 0.9}}, {"accuracy": True}, {"accuracy": 1}],
+        )
+
+        rows = cruds.select_experiment_leaderboard(db=db_session, model_id=model_id, metric="accuracy")
+
+        assert [(row.model_version_id, row.value) for row in rows] == [("v4", 1), ("v0", 0.7)]
+
+    def test_ascending(self, db_session):
+        """ascending=Trueの場合は値が小さい順になる"""
+        model_id = self._add_experiments(db_session, [{"loss": 0.3}, {"loss": 0.1}, {"loss": 0.2}])
+
+        rows = cruds.select_experiment_leaderboard(
+            db=db_session, model_id=model_id, metric="loss", k=10, ascending=True
+        )
+
+        assert [row.value for row in rows] == [0.1, 0.2, 0.3]
+
+    def test_filters_by_model(self, db_session):
+        """他のモデルの実験は含まれない"""
+        model_id = self._add_experiments(db_session, [{"accuracy": 0.5}])
+        project_id = cruds.select_model_by_id(db=db_session, model_id=model_id).project_id
+        other = cruds.add_model(db=db_session, project_id=project_id, model_name="other_model")
+        cruds.add_experiment(
+            db=db_session, model_id=other.model_id, model_version_id="o1", evaluations={"accuracy": 1.0}
+        )
+
+        rows = cruds.select_experiment_leaderboard(db=db_session, model_id=model_id, metric="accuracy")
+
+        assert [row.model_version_id for row in rows] == ["v0"]
+
+
+class TestFieldProjectionCRUD:
+    """fieldsによるカラム射影のテスト"""
+
+    def test_select_experiment_page_loads_only_requested_columns(self, db_session):
+        """指定したカラムと主キーのみが読み込まれる"""
+        project = cruds.add_project(db=db_session, project_name="test_project", commit=True)
+        model = cruds.add_model(db=db_session, project_id=project.project_id, model_name="test_model", commit=True)
+        cruds.add_experiment(
+            db=db_session, model_id=model.model_id, model_version_id="v1", parameters={"large": list(range(100))}
+        )
+        db_session.expunge_all()
+
+        page, _ = cruds.select_experiment_page(db=db_session, limit=10, fields=["created_datetime"])
+
+        loaded = set(page[0].__dict__)
+        assert {"experiment_id", "created_datetime"} <= loaded
+        assert "parameters" not in loaded
+        assert "evaluations" not in loaded
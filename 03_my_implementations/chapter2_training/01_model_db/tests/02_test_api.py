@@ -5,11 +5,15 @@ API層の統合テスト
 TDD - Redフェーズ：まず失敗するテストを書きます。
 """
 
+import json
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from src.db import schemas
 from src.db.database import Base, get_db
 from src.api.app import app
 
@@ -315,6 +319,20 @@ class TestExperimentEndpoints:
         data = response.json()
         assert data["experiment_id"] == experiment_id
 
+    def test_get_experiments_by_project_id(self, test_client):
+        """プロジェクトIDで配下の全モデルの実験を取得できる"""
+        project_id = test_client.post("/projects", json={"project_name": "test_project"}).json()["project_id"]
+        for model_name in ["model_a", "model_b"]:
+            model_id = test_client.post(
+                "/models", json={"project_id": project_id, "model_name": model_name}
+            ).json()["model_id"]
+            test_client.post("/experiments", json={"model_id": model_id, "model_version_id": f"{model_name}_v1"})
+
+        response = test_client.get(f"/experiments/project-id/{project_id}")
+
+        assert response.status_code == 200
+        assert sorted(e["model_version_id"] for e in response.json()) == ["model_a_v1", "model_b_v1"]
+
     def test_update_experiment_evaluations(self, test_client):
         """実験の評価結果更新APIが正常に動作する"""
         project_response = test_client.post("/projects", json={"project_name": "test_project"})
@@ -378,3 +396,361 @@ class TestExperimentEndpoints:
         data = response.json()
         assert data["artifact_file_paths"]["model"] == "s3://bucket/model.pkl"
         assert data["artifact_file_paths"]["weights"] == "s3://bucket/weights.h5"
+
+
+class TestPaginationEndpoints:
+    """一覧系エンドポイントのページネーション・ストリーミングのテスト"""
+
+    def test_get_all_projects_paginated(self, test_client):
+        """limitとX-Next-Cursorヘッダーで全件を辿れる"""
+        for i in range(5):
+            test_client.post("/projects", json={"project_name": f"project{i}"})
+
+        names = []
+        params = {"limit": 2}
+        while True:
+            response = test_client.get("/projects/all", params=params)
+            assert response.status_code == 200
+            names.extend(p["project_name"] for p in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params = {"limit": 2, "cursor": cursor}
+
+        assert sorted(names) == [f"project{i}" for i in range(5)]
+
+    def test_get_all_projects_link_header(self, test_client):
+        """次ページがある場合はLinkヘッダーに次ページのURLが設定され、最終ページには付与されない"""
+        for i in range(3):
+            test_client.post("/projects", json={"project_name": f"project{i}"})
+
+        response = test_client.get("/projects/all", params={"limit": 2, "fields": "project_name"})
+        cursor = response.headers["X-Next-Cursor"]
+        link = response.headers["Link"]
+        assert link.endswith('>; rel="next"')
+        next_url = link[link.index("<") + 1 : link.index(">")]
+        assert f"cursor={cursor}" in next_url
+        assert "limit=2" in next_url and "fields=project_name" in next_url
+
+        last_page = test_client.get(next_url)
+        assert [p["project_name"] for p in last_page.json()] == ["project2"]
+        assert "Link" not in last_page.headers
+
+    def test_get_all_experiments_stream(self, test_client):
+        """stream=trueでNDJSONとして全件が返る"""
+        project_id = test_client.post("/projects", json={"project_name": "test_project"}).json()["project_id"]
+        model_id = test_client.post(
+            "/models", json={"project_id": project_id, "model_name": "test_model"}
+        ).json()["model_id"]
+        for i in range(3):
+            test_client.post(
+                "/experiments",
+                json={"model_id": model_id, "model_version_id": f"v{i}", "evaluations": {"accuracy": 0.9}},
+            )
+
+        response = test_client.get("/experiments/all", params={"stream": "true"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 3
+        assert all(line["evaluations"]["accuracy"] == 0.9 for line in lines)
+
+    def test_get_experiment_changes(self, test_client):
+        """sinceより後の実験のみが返り、X-Next-Cursorに次回のカーソルが設定される"""
+        project_id = test_client.post("/projects", json={"project_name": "test_project"}).json()["project_id"]
+        model_id = test_client.post(
+            "/models", json={"project_id": project_id, "model_name": "test_model"}
+        ).json()["model_id"]
+        test_client.post("/experiments", json={"model_id": model_id, "model_version_id": "v0"})
+        first_cursor = test_client.get("/experiments/changes").headers["X-Next-Cursor"]
+        test_client.post("/experiments", json={"model_id": model_id, "model_version_id": "v1"})
+
+        response = test_client.get("/experiments/changes", params={"since": first_cursor})
+
+        assert response.status_code == 200
+        assert [e["model_version_id"] for e in response.json()] == ["v1"]
+        assert response.headers["X-Next-Cursor"] != first_cursor
+        assert test_client.get("/experiments/changes", params={"since": response.headers["X-Next-Cursor"]}).json() == []
+
+    def test_get_experiment_changes_long_poll_timeout(self, test_client):
+        """新しい実験がない場合はwait秒待って空のリストを返し、カーソルは変わらない"""
+        project_id = test_client.post("/projects", json={"project_name": "test_project"}).json()["project_id"]
+        model_id = test_client.post(
+            "/models", json={"project_id": project_id, "model_name": "test_model"}
+        ).json()["model_id"]
+        test_client.post("/experiments", json={"model_id": model_id, "model_version_id": "v0"})
+        latest = test_client.get("/experiments/changes").headers["X-Next-Cursor"]
+
+        start = time.monotonic()
+        response = test_client.get("/experiments/changes", params={"since": latest, "wait": 0.3})
+
+        assert response.status_code == 200
+        assert response.json() == []
+        assert response.headers["X-Next-Cursor"] == latest
+        assert time.monotonic() - start >= 0.3
+
+    @pytest.mark.parametrize("stream", ["false", "true"])
+    def test_get_all_models_unknown_cursor(self, test_client, stream):
+        """存在しないカーソルを指定した場合は400を返す"""
+        response = test_client.get("/models/all", params={"cursor": "missing", "stream": stream})
+
+        assert response.status_code == 400
+
+    def test_get_experiment_changes_unknown_cursor(self, test_client):
+        """存在しないカーソルを指定した場合は400を返す"""
+        response = test_client.get("/experiments/changes", params={"since": "12345", "wait": 5})
+
+        assert response.status_code == 400
+
+    def test_get_all_models_limit_validation(self, test_client):
+        """上限を超えるlimitは422になる"""
+        response = test_client.get("/models/all", params={"limit": 100000})
+
+        assert response.status_code == 422
+
+
+class TestBulkExperimentEndpoint:
+    """実験一括作成エンドポイントのテスト"""
+
+    def test_create_experiments_bulk(self, test_client):
+        """一括作成APIが実験IDのリストを返す"""
+        project_id = test_client.post("/projects", json={"project_name": "test_project"}).json()["project_id"]
+        model_id = test_client.post(
+            "/models", json={"project_id": project_id, "model_name": "test_model"}
+        ).json()["model_id"]
+
+        response = test_client.post(
+            "/experiments/bulk",
+            json={
+                "experiments": [
+                    {"model_id": model_id, "model_version_id": f"v{i}", "parameters": {"trial": i}}
+                    for i in range(10)
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        experiment_ids = response.json()["experiment_ids"]
+        assert len(experiment_ids) == 10
+        found = test_client.get(f"/experiments/id/{experiment_ids[3]}").json()
+        assert found["model_version_id"] == "v3"
+        assert found["parameters"] == {"trial": 3}
+
+    def test_create_experiments_bulk_empty_rejected(self, test_client):
+        """空のリストは422になる"""
+        response = test_client.post("/experiments/bulk", json={"experiments": []})
+
+        assert response.status_code == 422
+
+
+class TestLeaderboardEndpoint:
+    """リーダーボードエンドポイントのテスト"""
+
+    def test_leaderboard(self, test_client):
+        """上位k件が指標の降順で、射影したフィールドのみ返される"""
+        project_id = test_client.post("/projects", json={"project_name": "test_project"}).json()["project_id"]
+        model_id = test_client.post(
+            "/models", json={"project_id": project_id, "model_name": "test_model"}
+        ).json()["model_id"]
+        for i, accuracy in enumerate([0.7, 0.9, 0.8]):
+            test_client.post(
+                "/experiments",
+                json={
+                    "model_id": model_id,
+                    "model_version_id": f"v{i}",
+                    "parameters": {"trial": i},
+                    "evaluations": {"accuracy": accuracy},
+                },
+            )
+
+        response = test_client.get(
+            "/experiments/leaderboard", params={"model_id": model_id, "metric": "accuracy", "k": 2}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [entry["model_version_id"] for entry in data] == ["v1", "v2"]
+        assert [entry["value"] for entry in data] == [0.9, 0.8]
+        assert set(data[0]) == {"experiment_id", "model_version_id", "value", "created_datetime"}
+
+    def test_leaderboard_requires_metric(self, test_client):
+        """metricが指定されていない場合は422になる"""
+        response = test_client.get("/experiments/leaderboard", params={"model_id": "m"})
+
+        assert response.status_code == 422
+
+
+class TestFieldProjectionEndpoints:
+    """fieldsパラメータによる射影のテスト"""
+
+    def _add_experiments(self, test_client, n):
+        project_id = test_client.post("/projects", json={"project_name": "test_project"}).json()["project_id"]
+        model_id = test_client.post(
+            "/models", json={"project_id": project_id, "model_name": "test_model"}
+        ).json()["model_id"]
+        for i in range(n):
+            test_client.post(
+                "/experiments",
+                json={
+                    "model_id": model_id,
+                    "model_version_id": f"v{i}",
+                    "parameters": {"trial": i},
+                    "evaluations": {"accuracy": 0.9},
+                },
+            )
+        return model_id
+
+    def test_get_all_experiments_with_fields(self, test_client):
+        """指定したフィールドのみが返される"""
+        self._add_experiments(test_client, 3)
+
+        response = test_client.get(
+            "/experiments/all", params={"fields": "experiment_id,created_datetime", "limit": 2}
+        )
+
+        assert response.status_code == 200
+        assert [set(entry) for entry in response.json()] == [{"experiment_id", "created_datetime"}] * 2
+        assert response.headers.get("X-Next-Cursor") is not None
+
+    def test_get_all_experiments_stream_with_fields(self, test_client):
+        """ストリーミングでも指定したフィールドのみが返される"""
+        self._add_experiments(test_client, 3)
+
+        response = test_client.get("/experiments/all", params={"fields": "model_version_id", "stream": "true"})
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [{"model_version_id": f"v{i}"} for i in range(3)]
+
+    def test_get_experiments_by_model_id_with_fields(self, test_client):
+        """モデルIDでの取得でも射影できる"""
+        model_id = self._add_experiments(test_client, 2)
+
+        response = test_client.get(f"/experiments/model-id/{model_id}", params={"fields": "experiment_id"})
+
+        assert response.status_code == 200
+        assert all(set(entry) == {"experiment_id"} for entry in response.json())
+
+    def test_full_response_matches_schema(self, test_client):
+        """fields未指定の場合はスキーマの全フィールドが返される"""
+        self._add_experiments(test_client, 1)
+
+        entry = test_client.get("/experiments/all").json()[0]
+
+        assert set(entry) == set(schemas.Experiment.model_fields)
+        assert entry["parameters"] == {"trial": 0}
+        assert schemas.Experiment.model_validate(entry).model_version_id == "v0"
+
+    def test_unknown_field_rejected(self, test_client):
+        """スキーマにないフィールドは422になる"""
+        response = test_client.get("/projects/all", params={"fields": "project_id,password"})
+
+        assert response.status_code == 422
+
+
+class TestConditionalGetEndpoints:
+    """ETag / If-None-Matchによる条件付き取得のテスト"""
+
+    def _add_experiment(self, test_client):
+        project_id = test_client.post("/projects", json={"project_name": "test_project"}).json()["project_id"]
+        model_id = test_client.post("/models", json={"project_id": project_id, "model_name": "test_model"}).json()[
+            "model_id"
+        ]
+        experiment_id = test_client.post(
+            "/experiments",
+            json={"model_id": model_id, "model_version_id": "v1.0.0", "evaluations": {"accuracy": 0.9}},
+        ).json()["experiment_id"]
+        return model_id, experiment_id
+
+    def test_etag_header_returned(self, test_client):
+        """単一取得のレスポンスにETagが付与される"""
+        model_id, _ = self._add_experiment(test_client)
+
+        model_response = test_client.get(f"/models/id/{model_id}")
+        experiment_response = test_client.get("/experiments/model-version-id/v1.0.0")
+
+        assert model_response.headers["ETag"].startswith(f'"{model_id}-')
+        assert experiment_response.headers["ETag"]
+        assert experiment_response.json()["evaluations"] == {"accuracy": 0.9}
+
+    def test_not_modified_when_etag_matches(self, test_client):
+        """If-None-Matchが一致する場合は本文なしの304になる"""
+        self._add_experiment(test_client)
+        etag = test_client.get("/experiments/model-version-id/v1.0.0").headers["ETag"]
+
+        response = test_client.get("/experiments/model-version-id/v1.0.0", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    def test_weak_and_list_etags_match(self, test_client):
+        """弱いETagや複数のETagを指定しても一致と判定される"""
+        model_id, _ = self._add_experiment(test_client)
+        etag = test_client.get(f"/models/id/{model_id}").headers["ETag"]
+
+        response = test_client.get(f"/models/id/{model_id}", headers={"If-None-Match": f'"other", W/{etag}'})
+
+        assert response.status_code == 304
+
+    def test_etag_changes_after_update(self, test_client):
+        """評価結果を更新するとETagが変わり、古いETagでは200が返る"""
+        _, experiment_id = self._add_experiment(test_client)
+        etag = test_client.get("/experiments/model-version-id/v1.0.0").headers["ETag"]
+
+        test_client.post(f"/experiments/evaluations/{experiment_id}", json={"evaluations": {"f1_score": 0.8}})
+        response = test_client.get("/experiments/model-version-id/v1.0.0", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["evaluations"] == {"accuracy": 0.9, "f1_score": 0.8}
+
+
+class TestProjectSummaryEndpoint:
+    """プロジェクトサマリーのエンドポイントテスト"""
+
+    def test_project_summary(self, test_client):
+        """実験の作成・評価結果の更新がサマリーに反映される"""
+        project_id = test_client.post("/projects", json={"project_name": "test_project"}).json()["project_id"]
+        model_ids = [
+            test_client.post("/models", json={"project_id": project_id, "model_name": name}).json()["model_id"]
+            for name in ["model_a", "model_b"]
+        ]
+        test_client.post(
+            "/experiments", json={"model_id": model_ids[0], "model_version_id": "a1", "evaluations": {"accuracy": 0.8}}
+        )
+        experiment_id = test_client.post(
+            "/experiments", json={"model_id": model_ids[0], "model_version_id": "a2"}
+        ).json()["experiment_id"]
+        test_client.post(f"/experiments/evaluations/{experiment_id}", json={"evaluations": {"accuracy": 0.9}})
+        test_client.post(
+            "/experiments/bulk",
+            json={"experiments": [{"model_id": model_ids[1], "model_version_id": f"b{i}"} for i in range(3)]},
+        )
+
+        response = test_client.get(f"/projects/summary/{project_id}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["project_id"] == project_id
+        assert data["experiment_count"] == 5
+        model_a, model_b = data["models"]
+        assert model_a["model_name"] == "model_a"
+        assert model_a["experiment_count"] == 2
+        assert model_a["latest_model_version_id"] == "a2"
+        assert model_a["best_evaluations"]["accuracy"] == {
+            "value": 0.9,
+            "experiment_id": experiment_id,
+            "model_version_id": "a2",
+        }
+        assert model_b["experiment_count"] == 3
+        assert model_b["latest_model_version_id"] == "b2"
+        assert model_b["best_evaluations"] == {}
+
+    def test_project_without_experiments(self, test_client):
+        """実験がないプロジェクトは空のサマリーになる"""
+        project_id = test_client.post("/projects", json={"project_name": "empty"}).json()["project_id"]
+
+        response = test_client.get(f"/projects/summary/{project_id}")
+
+        assert response.json() == {"project_id": project_id, "experiment_count": 0, "models": []}
@@ -0,0 +1,173 @@
+"""
+マイグレーションのテスト
+
+既存DBに不足しているカラム・インデックスが作成されることをテストします。
+"""
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from src.db import cruds, models
+from src.db.database import Base
+from src.db.migrations import (
+    create_metric_indexes,
+    create_missing_experiment_changes,
+    create_missing_columns,
+    create_missing_indexes,
+    drop_legacy_metric_indexes,
+    migrate,
+)
+
+
+@pytest.fixture
+def engine():
+    """テスト用インメモリデータベースのエンジンを作成"""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def _drop_all_indexes(engine):
+    """インデックス導入前のスキーマを再現する"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.drop(bind=engine)
+
+
+class TestCreateMissingColumns:
+    """create_missing_columnsのテスト"""
+
+    def test_adds_nullable_column_to_existing_table(self, engine):
+        """カラム追加前のテーブルにNULL許容カラムが追加され、既存行はNULLになる"""
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE experiments"))
+            conn.execute(
+                text(
+                    "CREATE TABLE experiments (experiment_id VARCHAR(255) PRIMARY KEY, model_id VARCHAR(255), "
+                    "model_version_id VARCHAR(255), parameters JSON, training_dataset TEXT, "
+                    "validation_dataset TEXT, test_dataset TEXT, evaluations JSON, artifact_file_paths JSON, "
+                    "created_datetime DATETIME)"
+                )
+            )
+            conn.execute(
+                text("INSERT INTO experiments (experiment_id, model_id, model_version_id) VALUES ('e1', 'm1', 'v1')")
+            )
+
+        added = create_missing_columns(engine)
+
+        assert added == ["experiments.artifact_digests", "experiments.version"]
+        with engine.connect() as conn:
+            row = conn.execute(text("SELECT artifact_digests, version FROM experiments")).one()
+            assert row.artifact_digests is None
+            assert row.version is None
+        assert create_missing_columns(engine) == []
+
+
+class TestCreateMissingIndexes:
+    """create_missing_indexesのテスト"""
+
+    def test_creates_indexes_on_existing_tables(self, engine):
+        """インデックスのない既存テーブルにインデックスが作成される"""
+        _drop_all_indexes(engine)
+
+        created = create_missing_indexes(engine)
+
+        assert "uq_models_project_id_model_name" in created
+        assert "ix_experiments_model_id" in created
+        assert "ix_experiments_model_version_id" in created
+        index_names = {index["name"] for index in inspect(engine).get_indexes("experiments")}
+        assert "ix_experiments_model_version_id" in index_names
+
+    def test_is_idempotent(self, engine):
+        """適用済みの場合は何もしない"""
+        assert create_missing_indexes(engine) == []
+        migrate(engine)
+        assert migrate(engine) == []
+
+    def test_unique_index_on_project_and_model_name(self, engine):
+        """(project_id, model_name) に一意インデックスが張られる"""
+        indexes = inspect(engine).get_indexes("models")
+        unique = [index for index in indexes if index["name"] == "uq_models_project_id_model_name"]
+
+        assert len(unique) == 1
+        assert unique[0]["unique"]
+        assert unique[0]["column_names"] == ["project_id", "model_name"]
+
+
+class TestCreateMissingExperimentChanges:
+    """create_missing_experiment_changesのテスト"""
+
+    def test_records_existing_experiments_in_created_order(self, engine):
+        """変更フィード導入前の実験が作成日時順に記録され、2回目は何も記録しない"""
+        with sessionmaker(bind=engine)() as db:
+            project = cruds.add_project(db=db, project_name="project")
+            model = cruds.add_model(db=db, project_id=project.project_id, model_name="model")
+            for i in range(3):
+                cruds.add_experiment(db=db, model_id=model.model_id, model_version_id=f"v{i}")
+            db.execute(text("DELETE FROM experiment_changes"))
+            db.commit()
+
+            assert create_missing_experiment_changes(engine) == 3
+            assert create_missing_experiment_changes(engine) == 0
+            experiments, _ = cruds.select_experiment_changes(db=db)
+
+        assert [e.model_version_id for e in experiments] == ["v0", "v1", "v2"]
+
+
+class TestCreateMetricIndexes:
+    """create_metric_indexesのテスト"""
+
+    def test_creates_metric_index(self, engine):
+        """評価指標の式インデックスが作成され、2回目はスキップされる"""
+        assert create_metric_indexes(engine, ["accuracy"]) == ["ix_experiments_numeric_metric_accuracy"]
+        assert create_metric_indexes(engine, ["accuracy"]) == []
+
+    def test_leaderboard_query_uses_metric_index(self, engine):
+        """リーダーボードのクエリが絞り込みと並び替えの両方に式インデックスを使う"""
+        create_metric_indexes(engine, ["accuracy"])
+        with sessionmaker(bind=engine)() as db:
+            query = db.query(models.Experiment.experiment_id)
+            value = models.evaluation_metric("accuracy")
+            statement = (
+                query.filter(models.Experiment.model_id == "m", value.is_not(None))
+                .order_by(value.desc(), models.Experiment.experiment_id.desc())
+                .limit(10)
+                .statement.compile(engine, compile_kwargs={"render_postcompile": True, "literal_binds": True})
+            )
+            plan = " ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {statement}")))
+
+        assert "ix_experiments_numeric_metric_accuracy" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_creates_metric_index_with_non_numeric_values(self, engine):
+        """数値でない値を含む実験があってもインデックスを作成でき、作成後も登録できる"""
+        with sessionmaker(bind=engine)() as db:
+            project = cruds.add_project(db=db, project_name="project")
+            model = cruds.add_model(db=db, project_id=project.project_id, model_name="model")
+            cruds.add_experiment(
+                db=db, model_id=model.model_id, model_version_id="v0", evaluations={"accuracy": "high"}
+            )
+
+            assert create_metric_indexes(engine, ["accuracy"]) == ["ix_experiments_numeric_metric_accuracy"]
+            cruds.add_experiment(
+                db=db, model_id=model.model_id, model_version_id="v1", evaluations={"accuracy": {"top1": 0.9}}
+            )
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v2", evaluations={"accuracy": 0.8})
+            rows = cruds.select_experiment_leaderboard(db=db, model_id=model.model_id, metric="accuracy")
+
+        assert [(row.model_version_id, row.value) for row in rows] == [("v2", 0.8)]
+
+    def test_drops_legacy_metric_index(self, engine):
+        """数値の判定を含まない旧形式のインデックスを削除する"""
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE INDEX ix_experiments_metric_accuracy "
+                    "ON experiments (model_id, JSON_EXTRACT(evaluations, '$.\"accuracy\"'), experiment_id)"
+                )
+            )
+
+        assert drop_legacy_metric_indexes(engine, ["accuracy"]) == ["ix_experiments_metric_accuracy"]
+        assert drop_legacy_metric_indexes(engine, ["accuracy"]) == []
@@ -0,0 +1,265 @@
+"""
+非同期CRUD層・非同期APIのテスト
+
+AsyncSession版のCRUD関数と、非同期ルーターのエンドポイントをテストします。
+"""
+
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from src.api.routers import async_api
+from src.db import async_cruds
+from src.db.database import Base, get_async_db, to_async_database_url
+
+
+# テスト用インメモリデータベース
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """テスト用の非同期セッションファクトリを作成"""
+    engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db_session(session_factory):
+    """テスト用の非同期データベースセッション"""
+    async with session_factory() as db:
+        yield db
+
+
+@pytest_asyncio.fixture
+async def async_client(session_factory):
+    """非同期ルーターを登録したアプリのテスト用クライアント"""
+    app = FastAPI()
+    app.include_router(async_api.router)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+class TestAsyncDatabaseUrl:
+    """非同期ドライバURLへの変換テスト"""
+
+    def test_sqlite_url(self):
+        assert to_async_database_url("sqlite:///./model_db.sqlite") == "sqlite+aiosqlite:///./model_db.sqlite"
+
+    def test_postgresql_url(self):
+        assert to_async_database_url("postgresql://u:p@host:5432/db") == "postgresql+asyncpg://u:p@host:5432/db"
+
+    def test_explicit_driver_is_kept(self):
+        assert to_async_database_url("postgresql+asyncpg://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+
+
+class TestAsyncCRUD:
+    """非同期CRUD操作のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_add_project_duplicate_returns_existing(self, db_session):
+        """同名プロジェクトを作成すると既存のプロジェクトが返される"""
+        project1 = await async_cruds.add_project(db=db_session, project_name="project", description="First")
+        project2 = await async_cruds.add_project(db=db_session, project_name="project", description="Second")
+
+        assert project1.project_id == project2.project_id
+        assert project2.description == "First"
+
+    @pytest.mark.asyncio
+    async def test_add_and_select_experiment(self, db_session):
+        """実験を作成し、各種キーで取得できる"""
+        project = await async_cruds.add_project(db=db_session, project_name="project")
+        model = await async_cruds.add_model(db=db_session, project_id=project.project_id, model_name="model")
+        experiment = await async_cruds.add_experiment(
+            db=db_session,
+            model_id=model.model_id,
+            model_version_id="v1.0.0",
+            evaluations={"accuracy": 0.9},
+        )
+
+        by_id = await async_cruds.select_experiment_by_id(db=db_session, experiment_id=experiment.experiment_id)
+        by_version = await async_cruds.select_experiment_by_model_version_id(
+            db=db_session, model_version_id="v1.0.0"
+        )
+        by_model = await async_cruds.select_experiment_by_model_id(db=db_session, model_id=model.model_id)
+        by_project = await async_cruds.select_experiment_by_project_id(db=db_session, project_id=project.project_id)
+
+        assert by_id.experiment_id == experiment.experiment_id
+        assert by_version.experiment_id == experiment.experiment_id
+        assert [e.experiment_id for e in by_model] == [experiment.experiment_id]
+        assert by_project[0][0].experiment_id == experiment.experiment_id
+        assert by_project[0][1].model_id == model.model_id
+
+    @pytest.mark.asyncio
+    async def test_update_experiment_evaluation(self, db_session):
+        """評価結果がマージされる"""
+        project = await async_cruds.add_project(db=db_session, project_name="project")
+        model = await async_cruds.add_model(db=db_session, project_id=project.project_id, model_name="model")
+        experiment = await async_cruds.add_experiment(
+            db=db_session, model_id=model.model_id, model_version_id="v1", evaluations={"accuracy": 0.9}
+        )
+
+        updated = await async_cruds.update_experiment_evaluation(
+            db=db_session, experiment_id=experiment.experiment_id, evaluations={"f1_score": 0.8}
+        )
+
+        assert updated.evaluations == {"accuracy": 0.9, "f1_score": 0.8}
+
+    @pytest.mark.asyncio
+    async def test_pagination_and_stream(self, db_session):
+        """ページ取得とストリーミング取得が同じ順序で全件を返す"""
+        project = await async_cruds.add_project(db=db_session, project_name="project")
+        model = await async_cruds.add_model(db=db_session, project_id=project.project_id, model_name="model")
+        await async_cruds.add_experiments_bulk(
+            db=db_session,
+            experiments=[{"model_id": model.model_id, "model_version_id": f"v{i}"} for i in range(5)],
+        )
+
+        paged = []
+        cursor = None
+        while True:
+            page, cursor = await async_cruds.select_experiment_page(db=db_session, limit=2, cursor=cursor)
+            paged.extend(e.experiment_id for e in page)
+            if cursor is None:
+                break
+        streamed = [e.experiment_id async for e in async_cruds.iter_experiment_all(db=db_session, chunk_size=2)]
+
+        assert len(paged) == 5
+        assert streamed == paged
+
+    @pytest.mark.asyncio
+    async def test_leaderboard(self, db_session):
+        """指標の降順で上位k件が返される"""
+        project = await async_cruds.add_project(db=db_session, project_name="project")
+        model = await async_cruds.add_model(db=db_session, project_id=project.project_id, model_name="model")
+        await async_cruds.add_experiments_bulk(
+            db=db_session,
+            experiments=[
+                {"model_id": model.model_id, "model_version_id": f"v{i}", "evaluations": {"accuracy": accuracy}}
+                for i, accuracy in enumerate([0.7, 0.9, 0.8])
+            ],
+        )
+
+        rows = await async_cruds.select_experiment_leaderboard(
+            db=db_session, model_id=model.model_id, metric="accuracy", k=2
+        )
+
+        assert [(row.model_version_id, row.value) for row in rows] == [("v1", 0.9), ("v2", 0.8)]
+
+
+    @pytest.mark.asyncio
+    async def test_model_summary(self, db_session):
+        """実験の作成・評価結果の更新がサマリーに反映される"""
+        project = await async_cruds.add_project(db=db_session, project_name="project")
+        model = await async_cruds.add_model(db=db_session, project_id=project.project_id, model_name="model")
+        best = await async_cruds.add_experiment(
+            db=db_session, model_id=model.model_id, model_version_id="v0", evaluations={"accuracy": 0.9}
+        )
+        await async_cruds.add_experiments_bulk(
+            db=db_session,
+            experiments=[
+                {"model_id": model.model_id, "model_version_id": f"v{i}", "evaluations": {"accuracy": 0.5 + i / 10}}
+                for i in range(1, 4)
+            ],
+        )
+        await async_cruds.update_experiment_evaluation(
+            db=db_session, experiment_id=best.experiment_id, evaluations={"accuracy": 0.1}
+        )
+
+        (summary,) = await async_cruds.select_model_summaries_by_project_id(
+            db=db_session, project_id=project.project_id
+        )
+
+        assert summary.experiment_count == 4
+        assert summary.latest_model_version_id == "v3"
+        assert summary.best_evaluations["accuracy"]["model_version_id"] == "v3"
+
+class TestAsyncAPI:
+    """非同期ルーターのエンドポイントテスト"""
+
+    @pytest.mark.asyncio
+    async def test_project_model_experiment_flow(self, async_client):
+        """プロジェクト・モデル・実験を作成して取得できる"""
+        project = (await async_client.post("/projects", json={"project_name": "project"})).json()
+        model = (
+            await async_client.post("/models", json={"project_id": project["project_id"], "model_name": "model"})
+        ).json()
+        created = (
+            await async_client.post(
+                "/experiments",
+                json={"model_id": model["model_id"], "model_version_id": "v1.0.0", "evaluations": {"accuracy": 0.9}},
+            )
+        ).json()
+
+        response = await async_client.get("/experiments/model-version-id/v1.0.0")
+
+        assert response.status_code == 200
+        assert response.json()["experiment_id"] == created["experiment_id"]
+        assert response.json()["evaluations"] == {"accuracy": 0.9}
+
+    @pytest.mark.asyncio
+    async def test_get_all_models_stream(self, async_client):
+        """stream=trueでNDJSONとして全件が返る"""
+        project = (await async_client.post("/projects", json={"project_name": "project"})).json()
+        for name in ["model1", "model2"]:
+            await async_client.post("/models", json={"project_id": project["project_id"], "model_name": name})
+
+        response = await async_client.get("/models/all", params={"stream": "true"})
+
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 2
+
+    @pytest.mark.asyncio
+    async def test_experiment_changes_long_poll_wakes_on_insert(self, async_client):
+        """待機中に作成された実験がロングポーリングのレスポンスで返る"""
+        project = (await async_client.post("/projects", json={"project_name": "project"})).json()
+        model = (
+            await async_client.post("/models", json={"project_id": project["project_id"], "model_name": "model"})
+        ).json()
+        await async_client.post("/experiments", json={"model_id": model["model_id"], "model_version_id": "v0"})
+        first_cursor = (await async_client.get("/experiments/changes")).headers["X-Next-Cursor"]
+
+        poll = asyncio.create_task(
+            async_client.get("/experiments/changes", params={"since": first_cursor, "wait": 10})
+        )
+        await asyncio.sleep(0.2)
+        await async_client.post("/experiments", json={"model_id": model["model_id"], "model_version_id": "v1"})
+        response = await asyncio.wait_for(poll, timeout=5)
+
+        assert response.status_code == 200
+        assert [e["model_version_id"] for e in response.json()] == ["v1"]
+        assert response.headers["X-Next-Cursor"] != first_cursor
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stream", ["false", "true"])
+    async def test_get_all_models_unknown_cursor(self, async_client, stream):
+        """存在しないカーソルを指定した場合は400を返す"""
+        response = await async_client.get("/models/all", params={"cursor": "missing", "stream": stream})
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_experiment_changes_unknown_cursor(self, async_client):
+        """存在しないカーソルを指定した場合は400を返す"""
+        response = await async_client.get("/experiments/changes", params={"since": "12345"})
+
+        assert response.status_code == 400
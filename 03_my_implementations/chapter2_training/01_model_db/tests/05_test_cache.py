@@ -0,0 +1,247 @@
+"""
+キャッシュ層のテスト
+
+LRU+TTLキャッシュ本体と、CRUD関数のリードスルー・無効化をテストします。
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from src.api.app import app
+from src.db import cache, cruds
+from src.db.database import Base
+
+
+# テスト用インメモリデータベース
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+
+@pytest.fixture
+def engine():
+    """テスト用エンジンを作成"""
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """テスト用セッションファクトリ"""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def statements(engine):
+    """実行されたSELECT文を記録する"""
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def seeded(session_factory):
+    """プロジェクト・モデル・実験を1件ずつ作成"""
+    with session_factory() as db:
+        project = cruds.add_project(db=db, project_name="project")
+        model = cruds.add_model(db=db, project_id=project.project_id, model_name="model")
+        experiment = cruds.add_experiment(
+            db=db, model_id=model.model_id, model_version_id="v1", evaluations={"accuracy": 0.9}
+        )
+        return {
+            "project_id": project.project_id,
+            "model_id": model.model_id,
+            "experiment_id": experiment.experiment_id,
+        }
+
+
+class TestLRUTTLCache:
+    """LRU+TTLキャッシュ本体のテスト"""
+
+    def test_hit_and_miss_counters(self):
+        """ヒット・ミスが計上される"""
+        lru = cache.LRUTTLCache("test", maxsize=10, ttl_seconds=60)
+        value, generation = lru.get("a")
+        lru.set("a", 1, generation)
+
+        assert value is None
+        assert lru.get("a")[0] == 1
+        assert lru.stats()["hits"] == 1
+        assert lru.stats()["misses"] == 1
+        assert lru.stats()["hit_rate"] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        """最大件数を超えると最も古く参照されたエントリが破棄される"""
+        lru = cache.LRUTTLCache("test", maxsize=2, ttl_seconds=60)
+        for key in ["a", "b"]:
+            lru.set(key, key, lru.get(key)[1])
+        lru.get("a")
+        lru.set("c", "c", lru.get("c")[1])
+
+        assert lru.get("a")[0] == "a"
+        assert lru.get("b")[0] is None
+        assert lru.get("c")[0] == "c"
+
+    def test_expires_after_ttl(self, monkeypatch):
+        """TTLを過ぎたエントリはミスになる"""
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        lru = cache.LRUTTLCache("test", maxsize=10, ttl_seconds=5)
+        lru.set("a", 1, lru.get("a")[1])
+
+        now[0] += 4
+        assert lru.get("a")[0] == 1
+        now[0] += 2
+        assert lru.get("a")[0] is None
+
+    def test_set_after_invalidate_is_ignored(self):
+        """読み込み中に無効化された場合、古い値は保存されない"""
+        lru = cache.LRUTTLCache("test", maxsize=10, ttl_seconds=60)
+        _, generation = lru.get("a")
+        lru.invalidate("a")
+        lru.set("a", "stale", generation)
+
+        assert lru.get("a")[0] is None
+
+    def test_disabled_when_maxsize_is_zero(self):
+        """最大件数0の場合はキャッシュしない"""
+        lru = cache.LRUTTLCache("test", maxsize=0, ttl_seconds=60)
+        lru.set("a", 1, lru.get("a")[1])
+
+        assert lru.get("a")[0] is None
+
+
+class TestInvalidateAfterCommit:
+    """コミット後の無効化のテスト"""
+
+    def test_invalidation_waits_for_commit(self, session_factory, seeded):
+        """トランザクション中に再キャッシュされた古い値も、コミット時に無効化される"""
+        lru = cache.LRUTTLCache("test", maxsize=10, ttl_seconds=60)
+        with session_factory() as db:
+            cruds.add_experiment(db=db, model_id=seeded["model_id"], model_version_id="v2", commit=False)
+            cache.invalidate_after_commit(db, lru, "v2")
+
+            # コミット前に並行する読み込みがコミット済みの（古い）値をキャッシュする
+            _, generation = lru.get("v2")
+            lru.set("v2", "stale", generation)
+            assert lru.get("v2")[0] == "stale"
+
+            db.commit()
+
+        assert lru.get("v2")[0] is None
+
+    def test_invalidates_immediately_outside_transaction(self, session_factory):
+        """トランザクション外ではその場で無効化される"""
+        lru = cache.LRUTTLCache("test", maxsize=10, ttl_seconds=60)
+        lru.set("key", "value", lru.get("key")[1])
+        with session_factory() as db:
+            cache.invalidate_after_commit(db, lru, "key")
+            assert lru.get("key")[0] is None
+
+    def test_add_experiment_without_commit_invalidates_on_commit(self, session_factory, seeded):
+        """commit=Falseのadd_experimentは、呼び出し元のコミット時にエントリを無効化する"""
+        with session_factory() as db:
+            cruds.select_experiment_by_model_version_id(db=db, model_version_id="v1")
+        with session_factory() as db:
+            cruds.add_experiment(db=db, model_id=seeded["model_id"], model_version_id="v1", commit=False)
+            assert cache.experiment_by_model_version_id_cache.stats()["size"] == 1
+            db.commit()
+
+        assert cache.experiment_by_model_version_id_cache.stats()["size"] == 0
+
+
+class TestCachedCRUD:
+    """CRUD関数のリードスルーと無効化のテスト"""
+
+    def test_select_model_by_id_hits_cache(self, session_factory, seeded, statements):
+        """2回目以降の取得ではSELECTが発行されない"""
+        with session_factory() as db:
+            first = cruds.select_model_by_id(db=db, model_id=seeded["model_id"])
+        with session_factory() as db:
+            second = cruds.select_model_by_id(db=db, model_id=seeded["model_id"])
+            assert second.model_name == "model"
+            assert second in db
+
+        assert first.model_id == second.model_id
+        assert len(statements) == 1
+        assert cache.model_by_id_cache.stats()["hits"] == 1
+
+    def test_select_project_by_name_invalidated_by_add_project(self, session_factory, seeded):
+        """add_projectで該当プロジェクト名のエントリが無効化される"""
+        with session_factory() as db:
+            cruds.select_project_by_name(db=db, project_name="project")
+            cruds.add_project(db=db, project_name="project")
+
+        assert cache.project_by_name_cache.stats()["size"] == 0
+
+    def test_update_evaluation_invalidates_model_version_entry(self, session_factory, seeded):
+        """評価結果を更新すると、次の取得で最新の値が返される"""
+        with session_factory() as db:
+            cached = cruds.select_experiment_by_model_version_id(db=db, model_version_id="v1")
+            assert cached.evaluations == {"accuracy": 0.9}
+        with session_factory() as db:
+            cruds.update_experiment_evaluation(
+                db=db, experiment_id=seeded["experiment_id"], evaluations={"f1_score": 0.8}
+            )
+        with session_factory() as db:
+            updated = cruds.select_experiment_by_model_version_id(db=db, model_version_id="v1")
+
+        assert updated.evaluations == {"accuracy": 0.9, "f1_score": 0.8}
+
+    def test_update_artifact_paths_invalidates_model_version_entry(self, session_factory, seeded):
+        """モデルファイルパスを更新すると、次の取得で最新の値が返される"""
+        with session_factory() as db:
+            cruds.select_experiment_by_model_version_id(db=db, model_version_id="v1")
+        with session_factory() as db:
+            cruds.update_experiment_artifact_file_paths(
+                db=db, experiment_id=seeded["experiment_id"], artifact_file_paths={"onnx": "model.onnx"}
+            )
+        with session_factory() as db:
+            updated = cruds.select_experiment_by_model_version_id(db=db, model_version_id="v1")
+
+        assert updated.artifact_file_paths == {"onnx": "model.onnx"}
+
+    def test_add_experiment_invalidates_only_its_model_version(self, session_factory, seeded):
+        """add_experimentは同じモデルバージョンIDのエントリのみ無効化する"""
+        with session_factory() as db:
+            cruds.add_experiment(db=db, model_id=seeded["model_id"], model_version_id="v2")
+        with session_factory() as db:
+            cruds.select_experiment_by_model_version_id(db=db, model_version_id="v1")
+            cruds.select_experiment_by_model_version_id(db=db, model_version_id="v2")
+        with session_factory() as db:
+            cruds.add_experiment(db=db, model_id=seeded["model_id"], model_version_id="v2")
+
+        assert cache.experiment_by_model_version_id_cache.stats()["size"] == 1
+
+    def test_cached_object_is_not_shared_between_sessions(self, session_factory, seeded):
+        """キャッシュから返されたオブジェクトを変更しても他のセッションに影響しない"""
+        with session_factory() as db:
+            cruds.select_experiment_by_model_version_id(db=db, model_version_id="v1")
+        with session_factory() as db:
+            experiment = cruds.select_experiment_by_model_version_id(db=db, model_version_id="v1")
+            experiment.evaluations["accuracy"] = 0.0
+        with session_factory() as db:
+            experiment = cruds.select_experiment_by_model_version_id(db=db, model_version_id="v1")
+
+        assert experiment.evaluations == {"accuracy": 0.9}
+
+
+class TestCacheStatsEndpoint:
+    """キャッシュ統計エンドポイントのテスト"""
+
+    def test_cache_stats(self):
+        """全キャッシュの統計情報が返される"""
+        client = TestClient(app)
+        response = client.get("/health/cache")
+
+        assert response.status_code == 200
+        assert set(response.json()) == {"project_by_name", "model_by_id", "experiment_by_model_version_id"}
+        assert response.json()["model_by_id"]["hits"] == 0
@@ -0,0 +1,183 @@
+"""
+JSONマージ更新のテスト
+
+評価結果・モデルファイルパスのサーバー側マージと、並行更新で書き込みが失われないことをテストします。
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from src.db import cruds
+from src.db.database import Base
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """複数スレッドから接続するため、ファイルベースのSQLiteを使用"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'merge.sqlite'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """テスト用セッションファクトリ"""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def experiment_id(session_factory):
+    """評価結果を持つ実験を1件作成"""
+    with session_factory() as db:
+        project = cruds.add_project(db=db, project_name="project")
+        model = cruds.add_model(db=db, project_id=project.project_id, model_name="model")
+        experiment = cruds.add_experiment(
+            db=db,
+            model_id=model.model_id,
+            model_version_id="v1",
+            evaluations={"accuracy": 0.9, "confusion": {"tp": 1, "fp": 2}},
+        )
+        return experiment.experiment_id
+
+
+@contextmanager
+def _executed_statements(engine):
+    """発行されたSQL文の種類（先頭のキーワード）を記録"""
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement.lstrip().split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestJsonMerge:
+    """JSONマージの動作テスト"""
+
+    def test_merge_is_shallow(self, session_factory, experiment_id):
+        """トップレベルのキーのみ上書きされ、ネストしたオブジェクトは置き換えられる"""
+        with session_factory() as db:
+            experiment = cruds.update_experiment_evaluation(
+                db=db,
+                experiment_id=experiment_id,
+                evaluations={"confusion": {"tp": 3}, "f1_score": None, "label": "best"},
+            )
+
+        assert experiment.evaluations == {
+            "accuracy": 0.9,
+            "confusion": {"tp": 3},
+            "f1_score": None,
+            "label": "best",
+        }
+
+    @pytest.mark.parametrize("key", ['x"y', "a\\b", "a\nb", "精度", "a.b", "[0]"])
+    def test_merge_awkward_keys(self, session_factory, experiment_id, key):
+        """JSONパスで表しにくいキーも、既存のキーを重複させずに書き込まれる"""
+        with session_factory() as db:
+            cruds.update_experiment_evaluation(db=db, experiment_id=experiment_id, evaluations={key: 1.0})
+            experiment = cruds.update_experiment_evaluation(
+                db=db, experiment_id=experiment_id, evaluations={key: 2.0}
+            )
+
+        with session_factory() as db:
+            stored = db.execute(
+                text("SELECT evaluations FROM experiments WHERE experiment_id = :id"), {"id": experiment_id}
+            ).scalar_one()
+
+        assert experiment.evaluations == {"accuracy": 0.9, "confusion": {"tp": 1, "fp": 2}, key: 2.0}
+        # 保存されたJSONテキストにキーが重複していない
+        stored_keys = [name for name, _ in json.loads(stored, object_pairs_hook=list)]
+        assert sorted(stored_keys) == sorted(["accuracy", "confusion", key])
+
+    def test_merge_into_unset_column(self, session_factory, experiment_id):
+        """未設定のカラムにもマージできる"""
+        with session_factory() as db:
+            experiment = cruds.update_experiment_artifact_file_paths(
+                db=db, experiment_id=experiment_id, artifact_file_paths={"onnx": "model.onnx"}
+            )
+
+        assert experiment.artifact_file_paths == {"onnx": "model.onnx"}
+
+    def test_single_statement_update(self, engine, session_factory, experiment_id):
+        """更新は1文のUPDATE ... RETURNINGで行われ、SELECTは発行されない（サマリーを持たないカラムの場合）"""
+        with _executed_statements(engine) as executed:
+            with session_factory() as db:
+                experiment = cruds.update_experiment_artifact_file_paths(
+                    db=db, experiment_id=experiment_id, artifact_file_paths={"onnx": "model.onnx"}
+                )
+                assert experiment.artifact_file_paths["onnx"] == "model.onnx"
+
+        assert executed == ["UPDATE"]
+
+    def test_evaluation_update_statements(self, engine, session_factory, experiment_id):
+        """評価結果の更新は実験の1文のUPDATEと、サマリー行のロック・更新のみを発行する"""
+        with _executed_statements(engine) as executed:
+            with session_factory() as db:
+                experiment = cruds.update_experiment_evaluation(
+                    db=db, experiment_id=experiment_id, evaluations={"f1_score": 0.8}
+                )
+                assert experiment.evaluations["f1_score"] == 0.8
+
+        assert executed == ["UPDATE", "SELECT", "UPDATE"]
+
+    def test_evaluation_update_statements_when_best_worsens(self, engine, session_factory, experiment_id):
+        """最良値が悪化した場合のみ、再集計のクエリが1文加わる"""
+        with _executed_statements(engine) as executed:
+            with session_factory() as db:
+                cruds.update_experiment_evaluation(db=db, experiment_id=experiment_id, evaluations={"accuracy": 0.1})
+
+        assert executed == ["UPDATE", "SELECT", "SELECT", "UPDATE"]
+
+    def test_update_reflected_in_session(self, session_factory, experiment_id):
+        """セッション内で取得済みのオブジェクトにも更新結果が反映される"""
+        with session_factory() as db:
+            loaded = cruds.select_experiment_by_id(db=db, experiment_id=experiment_id)
+            updated = cruds.update_experiment_evaluation(
+                db=db, experiment_id=experiment_id, evaluations={"f1_score": 0.8}
+            )
+
+            assert updated is loaded
+            assert loaded.evaluations["f1_score"] == 0.8
+
+    def test_missing_experiment(self, session_factory, experiment_id):
+        """存在しない実験の場合はNoneが返される"""
+        with session_factory() as db:
+            assert cruds.update_experiment_evaluation(db=db, experiment_id="missing", evaluations={"a": 1}) is None
+
+
+class TestConcurrentJsonMerge:
+    """並行更新のストレステスト"""
+
+    def test_concurrent_evaluators_do_not_lose_writes(self, session_factory, experiment_id):
+        """複数の評価プロセスが異なる指標を並行して書き込んでも、全ての指標が残る"""
+        n_workers = 8
+        n_updates = 25
+
+        def evaluate(worker: int) -> None:
+            for i in range(n_updates):
+                with session_factory() as db:
+                    cruds.update_experiment_evaluation(
+                        db=db, experiment_id=experiment_id, evaluations={f"metric_{worker}_{i}": i}
+                    )
+
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(evaluate, range(n_workers)))
+
+        with session_factory() as db:
+            experiment = cruds.select_experiment_by_id(db=db, experiment_id=experiment_id)
+
+        expected = {f"metric_{worker}_{i}" for worker in range(n_workers) for i in range(n_updates)}
+        assert expected <= set(experiment.evaluations)
+        assert experiment.evaluations["accuracy"] == 0.9
@@ -0,0 +1,125 @@
+"""
+主キー生成のテスト
+
+時刻順IDの形式・順序と、主キーが衝突した場合の再生成をテストします。
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.db import cruds, ids, models
+from src.db.database import Base
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    """ファイルベースのSQLiteセッション"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'ids.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def id_sequence():
+    """指定した順にIDを返す生成器に差し替え、終了後に元へ戻す"""
+    previous = ids._generator
+
+    def use(values):
+        iterator = iter(values)
+        ids.set_id_generator(lambda: next(iterator))
+
+    yield use
+    ids.set_id_generator(previous)
+
+
+class TestIdGenerators:
+    """ID生成器のテスト"""
+
+    def test_ulid_format(self):
+        """ULIDは26文字のCrockford Base32"""
+        value = ids.new_ulid()
+        assert len(value) == 26
+        assert set(value) <= set("0123456789ABCDEFGHJKMNPQRSTVWXYZ")
+
+    def test_ulid_is_monotonic(self):
+        """同一ミリ秒内に生成しても生成順に並ぶ"""
+        values = [ids.new_ulid() for _ in range(10_000)]
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+
+    def test_uuid7_version_and_variant(self):
+        """UUIDv7のバージョン・バリアントビットが設定されている"""
+        value = uuid.UUID(ids.new_uuid7())
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_set_id_generator_by_name(self, id_sequence):
+        """名前で生成方法を切り替えられる"""
+        ids.set_id_generator("short_uuid4")
+        assert len(ids.generate_id()) == 6
+
+    def test_unknown_generator(self):
+        """未知の名前はKeyError"""
+        with pytest.raises(KeyError):
+            ids.set_id_generator("unknown")
+
+
+class TestIdCollisionRetry:
+    """主キー衝突時の再生成テスト"""
+
+    def test_add_project_retries_on_collision(self, db_session, id_sequence):
+        """プロジェクトIDが衝突した場合は再生成したIDで作成される"""
+        id_sequence(["p1", "p1", "p2"])
+        first = cruds.add_project(db=db_session, project_name="first")
+        second = cruds.add_project(db=db_session, project_name="second")
+
+        assert first.project_id == "p1"
+        assert second.project_id == "p2"
+        assert second.project_name == "second"
+
+    def test_add_project_existing_does_not_retry(self, db_session, id_sequence):
+        """同名のプロジェクトが存在する場合は既存行を返す"""
+        id_sequence(["p1", "p2"])
+        first = cruds.add_project(db=db_session, project_name="same")
+        second = cruds.add_project(db=db_session, project_name="same")
+
+        assert second.project_id == first.project_id == "p1"
+
+    def test_add_experiment_retries_on_collision(self, db_session, id_sequence):
+        """実験IDが衝突した場合は再生成したIDで作成される"""
+        id_sequence(["p1", "m1", "e1", "e1", "e2"])
+        project = cruds.add_project(db=db_session, project_name="project")
+        model = cruds.add_model(db=db_session, project_id=project.project_id, model_name="model")
+        cruds.add_experiment(db=db_session, model_id=model.model_id, model_version_id="v1")
+        experiment = cruds.add_experiment(db=db_session, model_id=model.model_id, model_version_id="v2")
+
+        assert experiment.experiment_id == "e2"
+        assert experiment.model_version_id == "v2"
+
+    def test_bulk_retries_only_colliding_rows(self, db_session, id_sequence):
+        """一括登録では衝突した行のみ再生成される"""
+        id_sequence(["p1", "m1", "e1", "e2", "e1", "e3", "e4"])
+        project = cruds.add_project(db=db_session, project_name="project")
+        model = cruds.add_model(db=db_session, project_id=project.project_id, model_name="model")
+        cruds.add_experiment(db=db_session, model_id=model.model_id, model_version_id="v0")
+        experiment_ids = cruds.add_experiments_bulk(
+            db=db_session,
+            experiments=[{"model_id": model.model_id, "model_version_id": f"v{i}"} for i in range(1, 4)],
+        )
+
+        assert experiment_ids == ["e2", "e4", "e3"]
+        assert db_session.query(models.Experiment).count() == 4
+        assert db_session.get(models.Experiment, "e4").model_version_id == "v2"
+
+    def test_gives_up_after_max_attempts(self, db_session, id_sequence):
+        """衝突が続く場合はRuntimeError"""
+        id_sequence(["p1"] * (cruds.MAX_ID_ATTEMPTS + 1))
+        cruds.add_project(db=db_session, project_name="first")
+
+        with pytest.raises(RuntimeError):
+            cruds.add_project(db=db_session, project_name="second")
@@ -0,0 +1,38 @@
+"""
+負荷試験ハーネスのテスト
+
+全エンドポイントにリクエストの作り方が定義されていること、
+小さなデータで全エンドポイントがエラーなく計測できることをテストします。
+"""
+
+from benchmarks import api_load
+
+
+class TestApiLoad:
+    """benchmarks.api_load のテスト"""
+
+    def test_every_endpoint_has_scenario(self):
+        """api.py の全エンドポイントがSCENARIOSに含まれる"""
+        endpoints = api_load.router_endpoints()
+
+        assert ("GET", "/experiments/changes") in endpoints
+        assert set(endpoints) == set(api_load.SCENARIOS)
+
+    def test_run_reports_every_endpoint(self, tmp_path):
+        """全エンドポイントの集計結果がエラーなしで返る"""
+        results = api_load.run(
+            database_url=f"sqlite:///{tmp_path / 'load.sqlite'}",
+            n_projects=2,
+            models_per_project=2,
+            experiments_per_model=3,
+            n_requests=4,
+            concurrency=2,
+        )
+
+        assert results["config"]["experiments"] == 12
+        assert len(results["endpoints"]) == len(api_load.router_endpoints())
+        for summary in results["endpoints"].values():
+            assert summary["requests"] == 4
+            assert summary["errors"] == 0
+            assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+            assert summary["rps"] > 0
@@ -0,0 +1,141 @@
+"""
+成果物ストアのテスト
+
+SHA-256による重複排除、ハードリンクによる配置、チャンク単位の読み書き、
+レジストリへのダイジェストの記録をテストします。
+"""
+
+import hashlib
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.db import cruds
+from src.db.database import Base
+from src.storage.artifact_store import ArtifactStore, store_experiment_artifacts
+
+
+@pytest.fixture
+def store(tmp_path):
+    """小さなチャンクサイズのストア（チャンク境界を跨ぐ読み書きを確認するため）"""
+    return ArtifactStore(tmp_path / "store", chunk_size=4)
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    """エクスポート済みモデルを模したファイル"""
+    path = tmp_path / "run1" / "model.onnx"
+    path.parent.mkdir()
+    path.write_bytes(b"onnx-model-bytes")
+    return path
+
+
+def _object_count(store):
+    return sum(1 for path in (store.root / "objects").rglob("*") if path.is_file())
+
+
+class TestArtifactStore:
+    """ArtifactStoreのテスト"""
+
+    def test_put_file_is_content_addressed(self, store, model_file):
+        """ダイジェストは内容のSHA-256で、オブジェクトは読み取り専用で保存される"""
+        artifact = store.put_file(model_file)
+
+        assert artifact.digest == hashlib.sha256(b"onnx-model-bytes").hexdigest()
+        assert artifact.size == len(b"onnx-model-bytes")
+        assert artifact.path.read_bytes() == b"onnx-model-bytes"
+        assert artifact.path.stat().st_mode & 0o222 == 0
+
+    def test_identical_content_is_stored_once(self, store, model_file, tmp_path):
+        """同じ内容のファイルは1つのオブジェクトになる"""
+        copy = tmp_path / "run2" / "model.onnx"
+        copy.parent.mkdir()
+        copy.write_bytes(model_file.read_bytes())
+
+        first = store.put_file(model_file)
+        second = store.put_file(copy)
+        streamed = store.put_stream([b"onnx-", b"model-", b"bytes"])
+
+        assert first == second == streamed
+        assert _object_count(store) == 1
+
+    def test_put_file_returns_digest_of_stored_content(self, store, model_file, monkeypatch):
+        """ハッシュ計算後にファイルが書き換えられても、保存した内容のダイジェストを返す"""
+        monkeypatch.setattr(store, "_hash", lambda f: ("0" * 64, 0))
+
+        artifact = store.put_file(model_file)
+
+        assert artifact.digest == hashlib.sha256(b"onnx-model-bytes").hexdigest()
+        assert artifact.size == len(b"onnx-model-bytes")
+        assert artifact.path == store.path_for(artifact.digest)
+        assert artifact.path.read_bytes() == b"onnx-model-bytes"
+
+    def test_link_source_replaces_file_with_hardlink(self, store, model_file):
+        """link_source=Trueの場合、元のファイルは保存済みオブジェクトへのハードリンクになる"""
+        artifact = store.put_file(model_file, link_source=True)
+
+        assert model_file.samefile(artifact.path)
+        assert model_file.read_bytes() == b"onnx-model-bytes"
+        assert artifact.path.stat().st_nlink == 2
+
+    def test_source_changes_do_not_affect_stored_object(self, store, model_file):
+        """保存後に元のファイルを上書きしても、保存済みの内容は変わらない"""
+        artifact = store.put_file(model_file)
+        model_file.write_bytes(b"retrained")
+
+        assert artifact.path.read_bytes() == b"onnx-model-bytes"
+
+    def test_iter_chunks_and_materialize(self, store, model_file, tmp_path):
+        """チャンク単位で読み出せ、ハードリンクで任意のパスに配置できる"""
+        artifact = store.put_file(model_file)
+
+        chunks = list(store.iter_chunks(artifact.digest))
+        dest = store.materialize(artifact.digest, tmp_path / "serving" / "model.onnx")
+
+        assert all(len(chunk) <= 4 for chunk in chunks)
+        assert b"".join(chunks) == b"onnx-model-bytes"
+        assert dest.samefile(artifact.path)
+
+    def test_materialize_leaves_no_temporary_files(self, store, model_file, tmp_path):
+        """同じディレクトリへの配置を繰り返しても一時ファイルが残らない"""
+        artifact = store.put_file(model_file)
+        dest_dir = tmp_path / "serving"
+
+        for name in ("a.onnx", "b.onnx", "a.onnx"):
+            store.materialize(artifact.digest, dest_dir / name)
+
+        assert sorted(path.name for path in dest_dir.iterdir()) == ["a.onnx", "b.onnx"]
+
+    def test_materialize_unknown_digest(self, store, tmp_path):
+        """存在しないダイジェストはFileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            store.materialize("0" * 64, tmp_path / "model.onnx")
+
+
+class TestStoreExperimentArtifacts:
+    """レジストリへの記録のテスト"""
+
+    def test_records_path_and_digest(self, store, model_file):
+        """ストア上のパスとダイジェストが実験に記録される"""
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+        project = cruds.add_project(db=db, project_name="project")
+        model = cruds.add_model(db=db, project_id=project.project_id, model_name="model")
+        experiment = cruds.add_experiment(
+            db=db,
+            model_id=model.model_id,
+            model_version_id="v1",
+            artifact_file_paths={"preprocess": "s3://bucket/preprocess.pkl"},
+        )
+
+        updated = store_experiment_artifacts(db, store, experiment.experiment_id, {"model": model_file})
+
+        digest = hashlib.sha256(b"onnx-model-bytes").hexdigest()
+        assert updated.artifact_digests == {"model": digest}
+        assert updated.artifact_file_paths == {
+            "preprocess": "s3://bucket/preprocess.pkl",
+            "model": str(store.path_for(digest)),
+        }
+        db.close()
+        engine.dispose()
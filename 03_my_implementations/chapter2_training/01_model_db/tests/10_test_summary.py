@@ -0,0 +1,233 @@
+"""
+プロジェクトサマリーのテスト
+
+実験の作成・評価結果の更新でモデルごとのサマリーが差分更新されること、
+差分更新の結果が全件集計と一致すること、既存データのサマリーがマイグレーションで作成されることをテストします。
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from src.db import cache, cruds, models
+from src.db.database import Base
+from src.db.migrations import create_missing_model_summaries
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """複数スレッドから接続するため、ファイルベースのSQLiteを使用"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'summary.sqlite'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """テスト用セッションファクトリ"""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def model(session_factory):
+    """プロジェクトとモデルを1件ずつ作成"""
+    with session_factory() as db:
+        project = cruds.add_project(db=db, project_name="project")
+        return cruds.add_model(db=db, project_id=project.project_id, model_name="model")
+
+
+def _summary(session_factory, model_id):
+    with session_factory() as db:
+        return db.get(models.ModelSummary, model_id)
+
+
+def _rebuilt(session_factory, model_id):
+    """差分更新の結果と比較するため、同じモデルのサマリーを全件集計で作り直す"""
+    with session_factory() as db:
+        db.query(models.ModelSummary).filter(models.ModelSummary.model_id == model_id).delete()
+        cruds._create_model_summary(db, model_id)
+        summary = cache.to_snapshot(db.get(models.ModelSummary, model_id))
+        db.rollback()
+        return summary
+
+
+class TestIncrementalSummary:
+    """実験の作成・更新によるサマリーの差分更新テスト"""
+
+    def test_add_experiment_updates_summary(self, session_factory, model):
+        """実験数・最新バージョン・最良値が更新される"""
+        with session_factory() as db:
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v1", evaluations={"accuracy": 0.8})
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v2", evaluations={"accuracy": 0.7})
+
+        summary = _summary(session_factory, model.model_id)
+        assert summary.project_id == model.project_id
+        assert summary.model_name == "model"
+        assert summary.experiment_count == 2
+        assert summary.latest_model_version_id == "v2"
+        assert summary.best_evaluations["accuracy"]["value"] == 0.8
+        assert summary.best_evaluations["accuracy"]["model_version_id"] == "v1"
+
+    def test_minimized_metric(self, session_factory, model):
+        """SUMMARY_MINIMIZED_METRICSの指標は値が小さいほど良い"""
+        with session_factory() as db:
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v1", evaluations={"loss": 0.3})
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v2", evaluations={"loss": 0.1})
+
+        assert _summary(session_factory, model.model_id).best_evaluations["loss"]["model_version_id"] == "v2"
+
+    def test_non_numeric_values_ignored(self, session_factory, model):
+        """数値でない評価結果（真偽値・文字列・ネスト）は最良値に含まれない"""
+        with session_factory() as db:
+            cruds.add_experiment(
+                db=db,
+                model_id=model.model_id,
+                model_version_id="v1",
+                evaluations={"passed": True, "label": "best", "confusion": {"tp": 3}, "accuracy": 1},
+            )
+
+        best_evaluations = _summary(session_factory, model.model_id).best_evaluations
+        assert set(best_evaluations) == {"accuracy"}
+        assert best_evaluations["accuracy"]["value"] == 1.0
+
+    def test_commit_false_is_rolled_back_together(self, session_factory, model):
+        """サマリーは実験と同じトランザクションで更新される"""
+        with session_factory() as db:
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v1")
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v2", commit=False)
+            db.rollback()
+
+        assert _summary(session_factory, model.model_id).experiment_count == 1
+
+    def test_evaluation_update_improves_best(self, session_factory, model):
+        """評価結果の更新で最良値が更新される"""
+        with session_factory() as db:
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v1", evaluations={"accuracy": 0.8})
+            experiment = cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v2")
+            cruds.update_experiment_evaluation(
+                db=db, experiment_id=experiment.experiment_id, evaluations={"accuracy": 0.9}
+            )
+
+        best = _summary(session_factory, model.model_id).best_evaluations["accuracy"]
+        assert best == {"value": 0.9, "experiment_id": experiment.experiment_id, "model_version_id": "v2"}
+
+    def test_evaluation_update_worsens_best(self, session_factory, model):
+        """最良値を持つ実験の値が悪化した場合は再集計される"""
+        with session_factory() as db:
+            best = cruds.add_experiment(
+                db=db, model_id=model.model_id, model_version_id="v1", evaluations={"accuracy": 0.9}
+            )
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v2", evaluations={"accuracy": 0.8})
+            cruds.update_experiment_evaluation(db=db, experiment_id=best.experiment_id, evaluations={"accuracy": 0.5})
+
+        assert _summary(session_factory, model.model_id).best_evaluations["accuracy"]["model_version_id"] == "v2"
+
+    def test_evaluation_update_removes_best(self, session_factory, model):
+        """唯一の値が数値でなくなった指標は最良値から削除される"""
+        with session_factory() as db:
+            experiment = cruds.add_experiment(
+                db=db, model_id=model.model_id, model_version_id="v1", evaluations={"accuracy": 0.9}
+            )
+            cruds.update_experiment_evaluation(
+                db=db, experiment_id=experiment.experiment_id, evaluations={"accuracy": None}
+            )
+
+        assert _summary(session_factory, model.model_id).best_evaluations == {}
+
+    def test_bulk_matches_full_aggregation(self, session_factory, model):
+        """一括登録後のサマリーは全件集計の結果と一致する"""
+        with session_factory() as db:
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v0", evaluations={"accuracy": 0.5})
+            cruds.add_experiments_bulk(
+                db=db,
+                experiments=[
+                    {"model_id": model.model_id, "model_version_id": f"v{i}", "evaluations": {"accuracy": i / 10}}
+                    for i in range(1, 6)
+                ],
+            )
+
+        summary = _summary(session_factory, model.model_id)
+        rebuilt = _rebuilt(session_factory, model.model_id)
+        assert summary.experiment_count == rebuilt["experiment_count"] == 6
+        assert summary.latest_experiment_id == rebuilt["latest_experiment_id"]
+        assert summary.latest_model_version_id == "v5"
+        assert summary.best_evaluations == rebuilt["best_evaluations"]
+
+    def test_concurrent_adds_are_counted(self, session_factory, model):
+        """並行して実験を作成しても実験数は失われない"""
+
+        def add(i):
+            with session_factory() as db:
+                cruds.add_experiment(
+                    db=db, model_id=model.model_id, model_version_id=f"v{i}", evaluations={"accuracy": i / 100}
+                )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(add, range(40)))
+
+        summary = _summary(session_factory, model.model_id)
+        assert summary.experiment_count == 40
+        assert summary.best_evaluations["accuracy"]["model_version_id"] == "v39"
+
+
+class TestSelectProjectSummary:
+    """サマリー取得のテスト"""
+
+    def test_reads_only_summary_table(self, engine, session_factory, model):
+        """実験テーブルを参照せず、1文のSELECTで取得する"""
+        with session_factory() as db:
+            cruds.add_experiments_bulk(
+                db=db,
+                experiments=[{"model_id": model.model_id, "model_version_id": f"v{i}"} for i in range(100)],
+            )
+
+        executed = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            executed.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        with session_factory() as db:
+            summaries = cruds.select_model_summaries_by_project_id(db=db, project_id=model.project_id)
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+        assert [summary.experiment_count for summary in summaries] == [100]
+        assert len(executed) == 1
+        assert "experiments" not in executed[0].replace("model_summaries", "")
+
+
+class TestCreateMissingModelSummaries:
+    """既存データからのサマリー作成テスト"""
+
+    def test_backfills_existing_experiments(self, engine, session_factory, model):
+        """サマリー導入前の実験が集計され、再実行しても変化しない"""
+        with engine.begin() as conn:
+            conn.execute(
+                insert(models.Experiment),
+                [
+                    {
+                        "experiment_id": f"e{i}",
+                        "model_id": model.model_id,
+                        "model_version_id": f"v{i}",
+                        "evaluations": {"accuracy": i / 10},
+                    }
+                    for i in range(3)
+                ],
+            )
+
+        assert create_missing_model_summaries(engine) == [model.model_id]
+        assert create_missing_model_summaries(engine) == []
+
+        summary = _summary(session_factory, model.model_id)
+        assert summary.experiment_count == 3
+        assert summary.best_evaluations["accuracy"]["experiment_id"] == "e2"
+
+        # 以降は差分更新
+        with session_factory() as db:
+            cruds.add_experiment(db=db, model_id=model.model_id, model_version_id="v3")
+        assert _summary(session_factory, model.model_id).experiment_count == 4
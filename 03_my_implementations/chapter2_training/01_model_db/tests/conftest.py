@@ -0,0 +1,14 @@
+"""
+テスト共通設定
+"""
+
+import pytest
+from src.db import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_registry_caches():
+    """テストごとにDBを作り直すため、プロセス内キャッシュもテスト間でクリアする"""
+    cache.clear_caches()
+    yield
+    cache.clear_caches()
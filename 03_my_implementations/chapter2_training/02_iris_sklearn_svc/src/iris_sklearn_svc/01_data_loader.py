@@ -5,17 +5,31 @@ Data loader module for Iris dataset
 from typing import Tuple
 
 import numpy as np
+from joblib import Memory
 from sklearn.datasets import load_iris
 from sklearn.model_selection import train_test_split
 
 
-def get_data(
-    test_size: float = 0.3, random_state: int = 42
+def load_data() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Irisデータセットを読み込む
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: data, target
+    """
+    iris = load_iris()
+    return iris.data, iris.target
+
+
+def split_data(
+    data: np.ndarray, target: np.ndarray, test_size: float = 0.3, random_state: int = 42
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
-    Irisデータセットを読み込み、train/testに分割
+    データをtrain/testに分割し、float32に変換
 
     Args:
+        data (np.ndarray): 特徴量
+        target (np.ndarray): ラベル
         test_size (float): テストデータの割合（0.0-1.0）
         random_state (int): 乱数シード
 
@@ -23,10 +37,6 @@ def get_data(
         Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
             x_train, x_test, y_train, y_test
     """
-    iris = load_iris()
-    data = iris.data
-    target = iris.target
-
     x_train, x_test, y_train, y_test = train_test_split(
         data, target, shuffle=True, test_size=test_size, random_state=random_state
     )
@@ -38,3 +48,44 @@ def get_data(
     y_test = np.array(y_test).astype("float32")
 
     return x_train, x_test, y_train, y_test
+
+
+def get_data(
+    test_size: float = 0.3, random_state: int = 42
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Irisデータセットを読み込み、train/testに分割
+
+    Args:
+        test_size (float): テストデータの割合（0.0-1.0）
+        random_state (int): 乱数シード
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            x_train, x_test, y_train, y_test
+    """
+    data, target = load_data()
+    return split_data(data, target, test_size=test_size, random_state=random_state)
+
+
+def get_data_cached(
+    memory: Memory, test_size: float = 0.3, random_state: int = 42
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    get_dataの結果をディスクキャッシュから取得
+
+    読み込み（load_data）と分割（split_data）を別々にキャッシュします。
+    分割のキャッシュキーはデータの内容のハッシュ（フィンガープリント）と
+    test_size, random_stateのため、データが変わった場合だけ分割し直します。
+
+    Args:
+        memory (Memory): キャッシュ先のjoblib.Memory（location=Noneでキャッシュしない）
+        test_size (float): テストデータの割合（0.0-1.0）
+        random_state (int): 乱数シード
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            x_train, x_test, y_train, y_test
+    """
+    data, target = memory.cache(load_data)()
+    return memory.cache(split_data)(data, target, test_size=test_size, random_state=random_state)
@@ -2,12 +2,16 @@
 Model definition module for Iris classification
 """
 
+import copy
+from typing import Optional, Union
+
+from joblib import Memory
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.svm import SVC
 
 
-def build_pipeline() -> Pipeline:
+def build_pipeline(memory: Optional[Union[str, Memory]] = None) -> Pipeline:
     """
     scikit-learn パイプラインを構築
 
@@ -15,6 +19,12 @@ def build_pipeline() -> Pipeline:
     1. StandardScaler: 特徴量の標準化
     2. SVC: サポートベクターマシン分類器（RBFカーネル、確率出力有効）
 
+    memoryを指定すると、学習済みのStandardScalerを入力データとパラメータをキーに
+    ディスクへキャッシュするため、同じデータでの再学習ではSVCの学習だけが行われる。
+
+    Args:
+        memory (str | Memory | None): StandardScalerのキャッシュ先（Noneでキャッシュしない）
+
     Returns:
         Pipeline: 学習可能なscikit-learnパイプライン
     """
@@ -22,7 +32,25 @@ def build_pipeline() -> Pipeline:
         steps=[
             ("scaler", StandardScaler()),
             ("svc", SVC(kernel="rbf", probability=True, random_state=42)),
-        ]
+        ],
+        memory=memory,
     )
 
     return pipeline
+
+
+def without_cache(pipeline: Pipeline) -> Pipeline:
+    """
+    キャッシュ先（memory）を外したパイプラインを返す
+
+    memoryは学習時のキャッシュにだけ使う。保存するモデルに含めるとローカルのキャッシュ先が残り、
+    MLflowのskops形式での保存ではjoblib.Memoryが信頼されない型として拒否されるため、保存前に外す。
+    元のパイプラインは変更せず、学習済みのステップを共有する。
+
+    Args:
+        pipeline (Pipeline): 学習済みのscikit-learnパイプライン
+
+    Returns:
+        Pipeline: memory=Noneのパイプライン
+    """
+    return copy.copy(pipeline).set_params(memory=None)
@@ -6,8 +6,16 @@ from typing import Dict
 
 import numpy as np
 from sklearn.metrics import accuracy_score, precision_score, recall_score
+from sklearn.model_selection import RepeatedStratifiedKFold, cross_validate
 from sklearn.pipeline import Pipeline
 
+# 交差検証で計算する評価指標（evaluate_modelと同じ指標名とscikit-learnのscorer名）
+CV_SCORING = {
+    "accuracy": "accuracy",
+    "precision": "precision_macro",
+    "recall": "recall_macro",
+}
+
 
 def evaluate_model(
     trained_model: Pipeline, x_test: np.ndarray, y_test: np.ndarray
@@ -42,3 +50,49 @@ def evaluate_model(
     }
 
     return metrics
+
+
+def cross_validate_model(
+    pipeline: Pipeline,
+    x: np.ndarray,
+    y: np.ndarray,
+    n_splits: int = 5,
+    n_repeats: int = 1,
+    n_jobs: int = -1,
+    random_state: int = 42,
+) -> Dict[str, float]:
+    """
+    層化k分割交差検証でモデルを評価
+
+    各フォールドの学習・評価は別プロセスで並列に実行されるため、
+    コア数がフォールド数以上あれば実行時間は1回の学習とほぼ同じです。
+    渡したパイプラインは学習されません（フォールドごとに複製して学習）。
+
+    Args:
+        pipeline (Pipeline): 未学習のscikit-learnパイプライン
+        x (np.ndarray): 特徴量データ
+        y (np.ndarray): ラベルデータ
+        n_splits (int): 分割数（デフォルト: 5）
+        n_repeats (int): 分割を変えて繰り返す回数（デフォルト: 1）
+        n_jobs (int): 並列プロセス数（デフォルト: -1、全コア）
+        random_state (int): 分割の乱数シード（デフォルト: 42）
+
+    Returns:
+        Dict[str, float]: 評価指標ごとの平均と標準偏差
+            - cv_accuracy_mean, cv_accuracy_std
+            - cv_precision_mean, cv_precision_std
+            - cv_recall_mean, cv_recall_std
+    """
+    cv = RepeatedStratifiedKFold(
+        n_splits=n_splits, n_repeats=n_repeats, random_state=random_state
+    )
+    scores = cross_validate(pipeline, x, y, cv=cv, scoring=CV_SCORING, n_jobs=n_jobs)
+
+    # フォールドごとのスコアを平均と標準偏差に集約
+    metrics = {}
+    for name in CV_SCORING:
+        fold_scores = scores[f"test_{name}"]
+        metrics[f"cv_{name}_mean"] = float(np.mean(fold_scores))
+        metrics[f"cv_{name}_std"] = float(np.std(fold_scores))
+
+    return metrics
@@ -2,25 +2,55 @@
 Exporter module for ONNX conversion
 """
 
+import json
+
+import onnx
 from sklearn.pipeline import Pipeline
 from skl2onnx import convert_sklearn
 from skl2onnx.common.data_types import FloatTensorType
 
+# 確率出力のレイアウト
+# "tensor": float32の2次元テンソル (N, クラス数)
+# "zipmap": 行ごとの {クラス: 確率} 辞書のリスト（skl2onnxのデフォルト）
+OUTPUT_LAYOUT_TENSOR = "tensor"
+OUTPUT_LAYOUT_ZIPMAP = "zipmap"
+
 
-def export_to_onnx(trained_model: Pipeline, output_path: str) -> None:
+def export_to_onnx(trained_model: Pipeline, output_path: str, zipmap: bool = False) -> None:
     """
     学習済みモデルをONNX形式に変換して保存
 
+    デフォルトでは確率をfloat32の2次元テンソル (N, クラス数) として出力するため、
+    推論側はバッチ全体の確率を1つのndarrayとして受け取れます。
+    出力のレイアウトはモデルのメタデータ（metadata_props）に記録します。
+
+    - output_layout: "tensor" または "zipmap"
+    - probability_output: 確率の出力名
+    - class_labels: 確率の列に対応するクラスラベル（JSON配列）
+
     Args:
         trained_model (Pipeline): 学習済みscikit-learnパイプライン
         output_path (str): 出力ファイルパス（.onnx）
+        zipmap (bool): 確率を行ごとの辞書（ZipMap）で出力するか（デフォルト: False）
     """
     # 入力の型と形状を定義
     # Irisデータセットは4次元特徴量、batch_sizeはNone（可変）
     initial_type = [("float_input", FloatTensorType([None, 4]))]
 
     # scikit-learnモデルをONNXに変換
-    onnx_model = convert_sklearn(trained_model, initial_types=initial_type)
+    onnx_model = convert_sklearn(
+        trained_model, initial_types=initial_type, options={"zipmap": zipmap}
+    )
+
+    # 確率出力のレイアウトをメタデータに記録
+    onnx.helper.set_model_props(
+        onnx_model,
+        {
+            "output_layout": OUTPUT_LAYOUT_ZIPMAP if zipmap else OUTPUT_LAYOUT_TENSOR,
+            "probability_output": onnx_model.graph.output[1].name,
+            "class_labels": json.dumps(trained_model.classes_.tolist()),
+        },
+    )
 
     # ONNXモデルをファイルに保存
     with open(output_path, "wb") as f:
@@ -5,11 +5,13 @@ Main training script with MLflow integration
 import argparse
 
 import mlflow
+from joblib import Memory
 
-from iris_sklearn_svc.data_loader import get_data
-from iris_sklearn_svc.evaluator import evaluate_model
+from iris_sklearn_svc.data_loader import get_data_cached
+from iris_sklearn_svc.evaluator import cross_validate_model, evaluate_model
 from iris_sklearn_svc.exporter import export_to_onnx
-from iris_sklearn_svc.model import build_pipeline
+from iris_sklearn_svc.mlflow_manager import BatchLogger
+from iris_sklearn_svc.model import build_pipeline, without_cache
 from iris_sklearn_svc.trainer import train_model
 
 
@@ -28,13 +30,37 @@ def parse_args() -> argparse.Namespace:
         default=42,
         help="Random seed for reproducibility. Default: 42",
     )
+    parser.add_argument(
+        "--cv_folds",
+        type=int,
+        default=5,
+        help="Number of cross-validation folds (0 to skip, otherwise at least 2). Default: 5",
+    )
+    parser.add_argument(
+        "--cv_repeats",
+        type=int,
+        default=1,
+        help="Number of repeated cross-validation rounds. Default: 1",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=".cache",
+        help="Cache directory for the data split and fitted scaler (empty to disable). "
+        "Default: .cache",
+    )
     parser.add_argument(
         "--mlflow_experiment_name",
         type=str,
         default="iris_svc",
         help="MLflow experiment name. Default: iris_svc",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    # 1分割の交差検証は定義できない（RepeatedStratifiedKFoldの内部で失敗する前に拒否）
+    if args.cv_folds < 0 or args.cv_folds == 1:
+        parser.error(f"--cv_folds must be 0 (skip) or at least 2, got {args.cv_folds}")
+    return args
 
 
 def main() -> None:
@@ -42,25 +68,35 @@ def main() -> None:
     # コマンドライン引数を解析
     args = parse_args()
 
+    # データの読み込み・分割とStandardScalerの学習結果をディスクにキャッシュ
+    # （同じ引数の再実行やスイープではSVCの学習から始まる）
+    memory = Memory(args.cache_dir or None, verbose=0)
+
     # MLflow実験の設定
     mlflow.set_experiment(args.mlflow_experiment_name)
 
-    # MLflowランの開始
-    with mlflow.start_run():
+    # MLflowランの開始（パラメータ・メトリクスはBatchLoggerでまとめて書き込む）
+    with mlflow.start_run(), BatchLogger() as logger:
         # パラメータをログ
-        mlflow.log_param("test_size", args.test_size)
-        mlflow.log_param("random_state", args.random_state)
+        logger.log_params(
+            {
+                "test_size": args.test_size,
+                "random_state": args.random_state,
+                "cv_folds": args.cv_folds,
+                "cv_repeats": args.cv_repeats,
+            }
+        )
 
         # 1. データ読み込み
         print("📊 Loading Iris dataset...")
-        x_train, x_test, y_train, y_test = get_data(
-            test_size=args.test_size, random_state=args.random_state
+        x_train, x_test, y_train, y_test = get_data_cached(
+            memory, test_size=args.test_size, random_state=args.random_state
         )
         print(f"  Train samples: {len(x_train)}, Test samples: {len(x_test)}")
 
         # 2. モデル構築
         print("🏗️  Building pipeline...")
-        pipeline = build_pipeline()
+        pipeline = build_pipeline(memory=memory)
         print("  Pipeline: StandardScaler -> SVC(kernel='rbf', probability=True)")
 
         # 3. モデル学習
@@ -75,10 +111,28 @@ def main() -> None:
         print(f"  Precision: {metrics['precision']:.4f}")
         print(f"  Recall:    {metrics['recall']:.4f}")
 
-        # メトリクスをMLflowにログ
-        mlflow.log_metric("accuracy", metrics["accuracy"])
-        mlflow.log_metric("precision", metrics["precision"])
-        mlflow.log_metric("recall", metrics["recall"])
+        # 訓練データでの交差検証（フォールドを並列プロセスで評価）
+        cv_metrics = {}
+        if args.cv_folds > 0:
+            print(f"🔁 Cross-validating ({args.cv_folds} folds x {args.cv_repeats} repeats)...")
+            cv_metrics = cross_validate_model(
+                build_pipeline(memory=memory),
+                x_train,
+                y_train,
+                n_splits=args.cv_folds,
+                n_repeats=args.cv_repeats,
+                random_state=args.random_state,
+            )
+            for name in ("accuracy", "precision", "recall"):
+                print(
+                    f"  CV {name}: {cv_metrics[f'cv_{name}_mean']:.4f} "
+                    f"± {cv_metrics[f'cv_{name}_std']:.4f}"
+                )
+
+        # メトリクスをMLflowにログ（交差検証の平均・標準偏差も同じバッチで書き込む）
+        logger.log_metrics(
+            {**{key: metrics[key] for key in ("accuracy", "precision", "recall")}, **cv_metrics}
+        )
 
         # 5. モデルエクスポート（ONNX）
         print("💾 Exporting model to ONNX...")
@@ -89,8 +143,8 @@ def main() -> None:
         # ONNXモデルをMLflowにログ
         mlflow.log_artifact(output_path)
 
-        # scikit-learnモデルもMLflowに保存
-        mlflow.sklearn.log_model(trained_model, "model")
+        # scikit-learnモデルもMLflowに保存（キャッシュ先は含めない）
+        mlflow.sklearn.log_model(without_cache(trained_model), "model")
 
         print("\n✅ Training pipeline completed successfully!")
         active_run = mlflow.active_run()
@@ -3,8 +3,9 @@ Tests for data_loader module
 """
 
 import numpy as np
+from joblib import Memory
 
-from iris_sklearn_svc.data_loader import get_data
+from iris_sklearn_svc.data_loader import get_data, get_data_cached, load_data, split_data
 
 
 class TestGetData:
@@ -84,3 +85,37 @@ class TestGetData:
         # Irisデータセットは3クラス（0, 1, 2）
         assert len(unique_labels) == 3
         assert set(unique_labels) == {0.0, 1.0, 2.0}
+
+
+class TestGetDataCached:
+    """Tests for get_data_cached function"""
+
+    def test_cached_split_matches_get_data(self, tmp_path):
+        """キャッシュ経由でもget_dataと同じ分割結果が返ることを確認"""
+        memory = Memory(tmp_path, verbose=0)
+
+        cached = get_data_cached(memory, test_size=0.3, random_state=42)
+        expected = get_data(test_size=0.3, random_state=42)
+
+        for cached_array, expected_array in zip(cached, expected):
+            np.testing.assert_array_equal(cached_array, expected_array)
+
+    def test_split_is_keyed_by_data_and_arguments(self, tmp_path):
+        """分割のキャッシュキーがデータのフィンガープリントと引数を含むことを確認"""
+        memory = Memory(tmp_path, verbose=0)
+        cached_split = memory.cache(split_data)
+        data, target = load_data()
+
+        get_data_cached(memory, test_size=0.3, random_state=42)
+
+        assert cached_split.check_call_in_cache(data, target, test_size=0.3, random_state=42)
+        assert not cached_split.check_call_in_cache(data, target, test_size=0.3, random_state=0)
+        assert not cached_split.check_call_in_cache(
+            data + 1.0, target, test_size=0.3, random_state=42
+        )
+
+    def test_no_cache_location(self):
+        """location=Noneではキャッシュせずにデータを返すことを確認"""
+        x_train, x_test, _, _ = get_data_cached(Memory(None), test_size=0.2)
+
+        assert len(x_train) + len(x_test) == 150
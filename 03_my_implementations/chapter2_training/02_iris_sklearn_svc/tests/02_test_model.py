@@ -2,11 +2,13 @@
 Tests for model module
 """
 
+from joblib import Memory
+from sklearn.datasets import load_iris
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.svm import SVC
 
-from iris_sklearn_svc.model import build_pipeline
+from iris_sklearn_svc.model import build_pipeline, without_cache
 
 
 class TestBuildPipeline:
@@ -79,3 +81,28 @@ class TestBuildPipeline:
         assert len(pipeline1.steps) == len(pipeline2.steps)
         assert pipeline1.steps[0][0] == pipeline2.steps[0][0]
         assert pipeline1.steps[1][0] == pipeline2.steps[1][0]
+
+    def test_pipeline_caches_fitted_scaler(self, tmp_path):
+        """memoryを指定すると、同じデータでの再学習で学習済みスケーラーが再利用されることを確認"""
+        memory = Memory(tmp_path, verbose=0)
+        iris = load_iris()
+
+        build_pipeline(memory=memory).fit(iris.data, iris.target)
+        build_pipeline(memory=memory).fit(iris.data, iris.target)
+        assert len(list(tmp_path.rglob("output.pkl"))) == 1
+
+        # データが変わるとスケーラーは学習し直される
+        build_pipeline(memory=memory).fit(iris.data[:100], iris.target[:100])
+        assert len(list(tmp_path.rglob("output.pkl"))) == 2
+
+    def test_without_cache(self, tmp_path):
+        """キャッシュ先を外しても同じ予測になり、元のパイプラインは変更されないことを確認"""
+        memory = Memory(tmp_path, verbose=0)
+        iris = load_iris()
+        pipeline = build_pipeline(memory=memory).fit(iris.data, iris.target)
+
+        detached = without_cache(pipeline)
+
+        assert detached.memory is None
+        assert pipeline.memory is memory
+        assert (detached.predict(iris.data) == pipeline.predict(iris.data)).all()
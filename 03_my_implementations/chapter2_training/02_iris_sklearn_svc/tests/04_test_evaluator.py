@@ -5,7 +5,7 @@ Tests for evaluator module
 import pytest
 
 from iris_sklearn_svc.data_loader import get_data
-from iris_sklearn_svc.evaluator import evaluate_model
+from iris_sklearn_svc.evaluator import cross_validate_model, evaluate_model
 from iris_sklearn_svc.model import build_pipeline
 from iris_sklearn_svc.trainer import train_model
 
@@ -116,3 +116,52 @@ class TestEvaluateModel:
             f1_score = 2 * precision * recall / (precision + recall)
             # F1スコアは0-1の範囲
             assert 0.0 <= f1_score <= 1.0
+
+
+class TestCrossValidateModel:
+    """Tests for cross_validate_model function"""
+
+    @pytest.fixture
+    def train_data(self):
+        """交差検証用の訓練データを準備"""
+        x_train, _, y_train, _ = get_data(test_size=0.3, random_state=42)
+        return x_train, y_train
+
+    def test_returns_mean_and_std_per_metric(self, train_data):
+        """評価指標ごとに平均と標準偏差が返されることを確認"""
+        x_train, y_train = train_data
+        metrics = cross_validate_model(build_pipeline(), x_train, y_train, n_splits=3, n_jobs=2)
+
+        assert set(metrics) == {
+            f"cv_{name}_{stat}"
+            for name in ("accuracy", "precision", "recall")
+            for stat in ("mean", "std")
+        }
+        assert all(isinstance(value, float) for value in metrics.values())
+        assert metrics["cv_accuracy_mean"] > 0.85
+        assert 0.0 <= metrics["cv_accuracy_std"] < 0.2
+
+    def test_parallel_matches_sequential(self, train_data):
+        """並列プロセスで実行しても逐次実行と同じ結果になることを確認"""
+        x_train, y_train = train_data
+        sequential = cross_validate_model(build_pipeline(), x_train, y_train, n_splits=3, n_jobs=1)
+        parallel = cross_validate_model(build_pipeline(), x_train, y_train, n_splits=3, n_jobs=3)
+
+        assert sequential == pytest.approx(parallel)
+
+    def test_repeated_folds(self, train_data):
+        """繰り返しの交差検証でも同じ形式の結果が返されることを確認"""
+        x_train, y_train = train_data
+        metrics = cross_validate_model(
+            build_pipeline(), x_train, y_train, n_splits=3, n_repeats=2, n_jobs=2
+        )
+
+        assert 0.0 <= metrics["cv_recall_mean"] <= 1.0
+
+    def test_pipeline_is_not_fitted(self, train_data):
+        """渡したパイプラインは学習されないことを確認"""
+        x_train, y_train = train_data
+        pipeline = build_pipeline()
+        cross_validate_model(pipeline, x_train, y_train, n_splits=3, n_jobs=1)
+
+        assert not hasattr(pipeline.named_steps["scaler"], "mean_")
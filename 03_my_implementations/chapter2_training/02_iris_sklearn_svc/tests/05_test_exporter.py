@@ -2,10 +2,13 @@
 Tests for exporter module
 """
 
+import json
 import os
 from pathlib import Path
 
+import numpy as np
 import onnx
+import onnxruntime as ort
 import pytest
 
 from iris_sklearn_svc.data_loader import get_data
@@ -121,3 +124,37 @@ class TestExportToOnnx:
 
         # SVCモデルは小さいはず（1KB - 10MB）
         assert 1024 < file_size < 10 * 1024 * 1024
+
+    def test_probability_output_is_tensor(self, trained_model, output_path):
+        """確率がバッチ全体で1つのテンソルとして出力されることを確認"""
+        export_to_onnx(trained_model, output_path)
+
+        session = ort.InferenceSession(output_path)
+        x = np.random.rand(8, 4).astype(np.float32)
+        _, probabilities = session.run(None, {session.get_inputs()[0].name: x})
+
+        assert isinstance(probabilities, np.ndarray)
+        assert probabilities.shape == (8, 3)
+        assert probabilities.dtype == np.float32
+
+    def test_output_layout_metadata(self, trained_model, output_path):
+        """出力のレイアウトがメタデータに記録されることを確認"""
+        export_to_onnx(trained_model, output_path)
+
+        metadata = ort.InferenceSession(output_path).get_modelmeta().custom_metadata_map
+        assert metadata["output_layout"] == "tensor"
+        assert metadata["probability_output"] == "probabilities"
+        assert json.loads(metadata["class_labels"]) == [0, 1, 2]
+
+    def test_zipmap_option(self, trained_model, output_path):
+        """zipmap=Trueでは確率が行ごとの辞書で出力されることを確認"""
+        export_to_onnx(trained_model, output_path, zipmap=True)
+
+        session = ort.InferenceSession(output_path)
+        x = np.random.rand(2, 4).astype(np.float32)
+        _, probabilities = session.run(None, {session.get_inputs()[0].name: x})
+
+        assert [sorted(row) for row in probabilities] == [[0, 1, 2], [0, 1, 2]]
+        metadata = session.get_modelmeta().custom_metadata_map
+        assert metadata["output_layout"] == "zipmap"
+        assert metadata["probability_output"] == "output_probability"
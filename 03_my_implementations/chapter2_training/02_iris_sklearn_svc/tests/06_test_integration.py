@@ -164,14 +164,11 @@ class TestONNXInference:
         assert len(onnx_outputs) >= 2  # ラベルと確率の両方
         probabilities = onnx_outputs[1]
 
-        # 確率の形式を確認
-        assert len(probabilities) == 5  # 5サンプル分
-        for prob_dict in probabilities:
-            # 各サンプルはクラスごとの確率を持つ
-            assert isinstance(prob_dict, dict)
-            # 確率の合計が1に近いことを確認
-            total_prob = sum(prob_dict.values())
-            assert 0.99 <= total_prob <= 1.01
+        # 確率は (サンプル数, クラス数) のテンソル
+        assert isinstance(probabilities, np.ndarray)
+        assert probabilities.shape == (5, 3)
+        # 確率の合計が1に近いことを確認
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1.0, atol=0.01)
 
     def test_onnx_model_handles_batch_inference(self, onnx_model_path):
         """ONNXモデルがバッチ推論に対応していることを確認"""
@@ -0,0 +1,156 @@
+"""
+Tests for mlflow_manager module
+"""
+
+import threading
+
+import mlflow
+import pytest
+from mlflow.tracking import MlflowClient
+
+from iris_sklearn_svc.mlflow_manager import (
+    MAX_ENTITIES_PER_BATCH,
+    MAX_PARAMS_TAGS_PER_BATCH,
+    BatchLogger,
+)
+
+
+class RecordingClient:
+    """log_batchの呼び出しを記録するクライアント（gateがセットされるまで書き込みを待つ）"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = fail
+
+    def log_batch(self, run_id, metrics, params, tags):
+        self.gate.wait()
+        if self.fail:
+            raise ConnectionError("tracking server unavailable")
+        self.batches.append((list(metrics), list(params), list(tags)))
+
+
+class WorkerStopped(BaseException):
+    """バックグラウンドスレッドを終了させる例外（Exception以外）"""
+
+
+class StoppingClient:
+    """log_batchでWorkerStoppedを送出するクライアント"""
+
+    def log_batch(self, run_id, metrics, params, tags):
+        raise WorkerStopped()
+
+
+class TestBatchLogger:
+    """Tests for BatchLogger class"""
+
+    @pytest.fixture
+    def tracking_uri(self, tmp_path):
+        """テスト用のtracking URIを設定"""
+        mlflow.set_tracking_uri(f"file://{tmp_path}/mlruns")
+        mlflow.set_experiment("test_batch_logger")
+
+    def test_logs_to_mlflow(self, tracking_uri):
+        """パラメータ・メトリクス・タグがRunに記録されることを確認"""
+        with mlflow.start_run() as run:
+            with BatchLogger() as logger:
+                logger.log_params({"test_size": 0.3, "random_state": 42})
+                logger.log_metrics({"accuracy": 0.97, "recall": 0.95})
+                logger.set_tag("model", "svc")
+
+        run_data = mlflow.get_run(run.info.run_id).data
+        assert run_data.params == {"test_size": "0.3", "random_state": "42"}
+        assert run_data.metrics == {"accuracy": 0.97, "recall": 0.95}
+        assert run_data.tags["model"] == "svc"
+
+    def test_step_metrics_are_kept(self, tracking_uri):
+        """同じキーのステップごとの値が全て記録されることを確認"""
+        with mlflow.start_run() as run:
+            with BatchLogger() as logger:
+                for step in range(3):
+                    logger.log_metric("loss", 1.0 - step * 0.1, step=step)
+
+        history = MlflowClient().get_metric_history(run.info.run_id, "loss")
+        assert sorted(metric.step for metric in history) == [0, 1, 2]
+
+    def test_requires_active_run(self, tracking_uri):
+        """Run IDの指定もアクティブなRunもない場合はエラーになることを確認"""
+        with pytest.raises(RuntimeError):
+            BatchLogger()
+
+    def test_logging_does_not_wait_for_writes(self):
+        """書き込みが止まっていてもlog_*が即座に戻ることを確認"""
+        client = RecordingClient()
+        client.gate.clear()
+        logger = BatchLogger("run", flush_interval=0.01, client=client)
+
+        logger.log_params({"C": 1.0})
+        for step in range(100):
+            logger.log_metric("loss", 0.1, step=step)
+        assert client.batches == []
+
+        client.gate.set()
+        logger.close()
+        assert sum(len(metrics) for metrics, _, _ in client.batches) == 100
+
+    def test_values_are_written_in_one_batch(self):
+        """flush間隔内の値が1回のlog_batchにまとめられることを確認"""
+        client = RecordingClient()
+        with BatchLogger("run", flush_interval=60.0, client=client) as logger:
+            logger.log_params({"test_size": 0.3, "random_state": 42})
+            logger.log_metrics({"accuracy": 0.97, "precision": 0.96, "recall": 0.95})
+
+        assert len(client.batches) == 1
+        metrics, params, _ = client.batches[0]
+        assert len(metrics) == 3
+        assert len(params) == 2
+
+    def test_batches_respect_mlflow_limits(self):
+        """1回のlog_batchがMLflowの上限を超えないことを確認"""
+        client = RecordingClient()
+        with BatchLogger("run", client=client) as logger:
+            for step in range(2500):
+                logger.log_metric("loss", 0.1, step=step)
+            logger.set_tags({f"t{i}": i for i in range(150)})
+
+        for metrics, params, tags in client.batches:
+            assert len(tags) <= MAX_PARAMS_TAGS_PER_BATCH
+            assert len(metrics) + len(params) + len(tags) <= MAX_ENTITIES_PER_BATCH
+        assert sum(len(metrics) for metrics, _, _ in client.batches) == 2500
+        assert sum(len(tags) for _, _, tags in client.batches) == 150
+
+    def test_write_errors_are_raised_on_flush(self):
+        """バックグラウンドでの書き込みエラーがflushで送出されることを確認"""
+        logger = BatchLogger("run", client=RecordingClient(fail=True))
+        logger.log_metric("loss", 0.1)
+
+        with pytest.raises(ConnectionError):
+            logger.flush()
+        logger.close()
+
+        with pytest.raises(RuntimeError):
+            logger.log_metric("loss", 0.1)
+
+    def test_stopped_thread_is_raised_on_flush(self):
+        """バックグラウンドスレッドが終了した場合、flushが待ち続けずに例外を送出することを確認"""
+        logger = BatchLogger("run", client=StoppingClient())
+        logger.log_metric("loss", 0.1)
+
+        with pytest.raises(WorkerStopped):
+            logger.flush()
+        with pytest.raises(RuntimeError, match="has stopped"):
+            logger.close()
+
+    def test_exit_does_not_mask_exception(self):
+        """withブロック内の例外が書き込みエラーで置き換えられないことを確認"""
+        with pytest.raises(ValueError):
+            with BatchLogger("run", client=RecordingClient(fail=True)) as logger:
+                logger.log_metric("loss", 0.1)
+                raise ValueError("training failed")
+
+    def test_exit_raises_write_errors(self):
+        """例外なく抜けたwithブロックでは書き込みエラーが送出されることを確認"""
+        with pytest.raises(ConnectionError):
+            with BatchLogger("run", client=RecordingClient(fail=True)) as logger:
+                logger.log_metric("loss", 0.1)
@@ -5,12 +5,13 @@ import tempfile
 from argparse import ArgumentParser
 
 import mlflow
+from joblib import Memory
 
-from iris_binary.data_loader import IrisTarget, load_and_transform_data
+from iris_binary.data_loader import IrisTarget, load_and_transform_data_cached
 from iris_binary.exporter import export_to_onnx
 from iris_binary.mlflow_manager import log_experiment
-from iris_binary.model import build_svc_pipeline
-from iris_binary.trainer import evaluate_model, train_model
+from iris_binary.model import build_svc_pipeline, without_cache
+from iris_binary.trainer import cross_validate_model, evaluate_model, train_model
 
 
 def main():
@@ -28,6 +29,25 @@ def main():
         default="setosa",
         help="Target iris class for positive label",
     )
+    parser.add_argument(
+        "--cv_folds",
+        type=int,
+        default=5,
+        help="Number of cross-validation folds, 0 to skip, otherwise at least 2 (default: 5)",
+    )
+    parser.add_argument(
+        "--cv_repeats",
+        type=int,
+        default=1,
+        help="Number of repeated cross-validation rounds (default: 1)",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=".cache",
+        help="Cache directory for the data split and fitted scaler, empty to disable "
+        "(default: .cache)",
+    )
     parser.add_argument(
         "--tracking_uri",
         type=str,
@@ -42,6 +62,10 @@ def main():
     )
     args = parser.parse_args()
 
+    # 1分割の交差検証は定義できない（RepeatedStratifiedKFoldの内部で失敗する前に拒否）
+    if args.cv_folds < 0 or args.cv_folds == 1:
+        parser.error(f"--cv_folds must be 0 (skip) or at least 2, got {args.cv_folds}")
+
     # ターゲットクラスの変換
     if args.target_iris == "setosa":
         target_iris = IrisTarget.SETOSA
@@ -52,6 +76,10 @@ def main():
     else:
         raise ValueError(f"Invalid target_iris: {args.target_iris}")
 
+    # データの読み込み・分割とStandardScalerの学習結果をディスクにキャッシュ
+    # （同じ引数の再実行ではSVCの学習から始まる）
+    memory = Memory(args.cache_dir or None, verbose=0)
+
     # MLflow設定
     mlflow.set_tracking_uri(args.tracking_uri)
     mlflow.set_experiment(args.experiment_name)
@@ -63,14 +91,14 @@ def main():
 
     # データ読み込み
     print("📥 Loading data...")
-    X_train, X_test, y_train, y_test = load_and_transform_data(
-        test_size=args.test_size, target_iris=target_iris, random_state=42
+    X_train, X_test, y_train, y_test = load_and_transform_data_cached(
+        memory, test_size=args.test_size, target_iris=target_iris, random_state=42
     )
     print(f"   Train samples: {len(X_train)}, Test samples: {len(X_test)}")
 
     # モデル構築
     print("🏗️  Building model...")
-    model = build_svc_pipeline()
+    model = build_svc_pipeline(memory=memory)
 
     # 学習
     print("🎓 Training model...")
@@ -83,6 +111,23 @@ def main():
     print(f"   Precision: {metrics['precision']:.4f}")
     print(f"   Recall:    {metrics['recall']:.4f}")
 
+    # 交差検証（訓練データのフォールドを並列プロセスで評価）
+    cv_metrics = None
+    if args.cv_folds > 0:
+        print(f"🔁 Cross-validating ({args.cv_folds} folds x {args.cv_repeats} repeats)...")
+        cv_metrics = cross_validate_model(
+            build_svc_pipeline(memory=memory),
+            X_train,
+            y_train,
+            n_splits=args.cv_folds,
+            n_repeats=args.cv_repeats,
+        )
+        for name in ("accuracy", "precision", "recall"):
+            print(
+                f"   CV {name}: {cv_metrics[f'cv_{name}_mean']:.4f} "
+                f"± {cv_metrics[f'cv_{name}_std']:.4f}"
+            )
+
     # ONNX変換
     print("🔄 Converting to ONNX...")
     with tempfile.NamedTemporaryFile(suffix=".onnx", delete=False) as f:
@@ -95,7 +140,11 @@ def main():
     print("📝 Logging to MLflow...")
     with mlflow.start_run():
         run_id = log_experiment(
-            model=model, metrics=metrics, target_iris=target_iris, onnx_path=onnx_path
+            model=without_cache(model),
+            metrics=metrics,
+            target_iris=target_iris,
+            onnx_path=onnx_path,
+            cv_metrics=cv_metrics,
         )
         print(f"   Run ID: {run_id}")
 
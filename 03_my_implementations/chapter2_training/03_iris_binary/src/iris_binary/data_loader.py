@@ -4,6 +4,7 @@ from enum import Enum
 from typing import Tuple
 
 import numpy as np
+from joblib import Memory
 from sklearn.datasets import load_iris
 from sklearn.model_selection import train_test_split
 
@@ -16,15 +17,30 @@ class IrisTarget(Enum):
     VIRGINICA = 2
 
 
-def load_and_transform_data(
+def load_data() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Irisデータセットを読み込む
+
+    Returns:
+        X, y（yは3クラスのラベル）
+    """
+    iris = load_iris()
+    return iris.data, iris.target
+
+
+def transform_data(
+    X: np.ndarray,
+    y: np.ndarray,
     test_size: float = 0.3,
     target_iris: IrisTarget = IrisTarget.SETOSA,
     random_state: int = 42,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
-    Irisデータセットを読み込み、二値分類用に変換する
+    Irisデータを二値分類用に変換し、train/testに分割する
 
     Args:
+        X: 特徴量
+        y: 3クラスのラベル（変更されない）
         test_size: テストデータの割合
         target_iris: 陽性とするクラス
         random_state: 乱数シード
@@ -32,16 +48,8 @@ def load_and_transform_data(
     Returns:
         X_train, X_test, y_train, y_test
     """
-    # データ読み込み
-    iris = load_iris()
-    X = iris.data
-    y = iris.target
-
     # 二値化: target_irisを0（陽性）、その他を1（陰性）に変換
-    pos_index = np.where(y == target_iris.value)
-    neg_index = np.where(y != target_iris.value)
-    y[pos_index] = 0
-    y[neg_index] = 1
+    y = np.where(y == target_iris.value, 0, 1)
 
     # train/test分割
     X_train, X_test, y_train, y_test = train_test_split(
@@ -55,3 +63,53 @@ def load_and_transform_data(
     y_test = np.array(y_test).astype("float32")
 
     return X_train, X_test, y_train, y_test
+
+
+def load_and_transform_data(
+    test_size: float = 0.3,
+    target_iris: IrisTarget = IrisTarget.SETOSA,
+    random_state: int = 42,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Irisデータセットを読み込み、二値分類用に変換する
+
+    Args:
+        test_size: テストデータの割合
+        target_iris: 陽性とするクラス
+        random_state: 乱数シード
+
+    Returns:
+        X_train, X_test, y_train, y_test
+    """
+    X, y = load_data()
+    return transform_data(
+        X, y, test_size=test_size, target_iris=target_iris, random_state=random_state
+    )
+
+
+def load_and_transform_data_cached(
+    memory: Memory,
+    test_size: float = 0.3,
+    target_iris: IrisTarget = IrisTarget.SETOSA,
+    random_state: int = 42,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    load_and_transform_dataの結果をディスクキャッシュから取得する
+
+    読み込み（load_data）と変換・分割（transform_data）を別々にキャッシュします。
+    変換・分割のキャッシュキーはデータの内容のハッシュ（フィンガープリント）と
+    test_size, target_iris, random_stateのため、データが変わった場合だけ分割し直します。
+
+    Args:
+        memory: キャッシュ先のjoblib.Memory（location=Noneでキャッシュしない）
+        test_size: テストデータの割合
+        target_iris: 陽性とするクラス
+        random_state: 乱数シード
+
+    Returns:
+        X_train, X_test, y_train, y_test
+    """
+    X, y = memory.cache(load_data)()
+    return memory.cache(transform_data)(
+        X, y, test_size=test_size, target_iris=target_iris, random_state=random_state
+    )
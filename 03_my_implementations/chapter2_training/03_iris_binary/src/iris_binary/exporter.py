@@ -1,23 +1,47 @@
 """ONNX Exporter - ONNXモデルの変換とエクスポート"""
 
+import json
+
+import onnx
 from sklearn.pipeline import Pipeline
 from skl2onnx import convert_sklearn
 from skl2onnx.common.data_types import FloatTensorType
 
+# 確率出力のレイアウト
+# "tensor": float32の2次元テンソル (N, クラス数)
+# "zipmap": 行ごとの {クラス: 確率} 辞書のリスト（skl2onnxのデフォルト）
+OUTPUT_LAYOUT_TENSOR = "tensor"
+OUTPUT_LAYOUT_ZIPMAP = "zipmap"
+
 
-def export_to_onnx(model: Pipeline, filepath: str) -> None:
+def export_to_onnx(model: Pipeline, filepath: str, zipmap: bool = False) -> None:
     """
     scikit-learnモデルをONNX形式に変換して保存する
 
+    デフォルトでは確率をfloat32の2次元テンソル (N, 2) として出力します。
+    出力のレイアウトはモデルのメタデータ（output_layout, probability_output,
+    class_labels）に記録します。
+
     Args:
         model: 学習済みscikit-learnパイプライン
         filepath: 保存先のファイルパス
+        zipmap: 確率を行ごとの辞書（ZipMap）で出力するか（デフォルト: False）
     """
     # 入力の型を定義（4特徴量のfloat型）
     initial_type = [("float_input", FloatTensorType([None, 4]))]
 
     # ONNX変換
-    onnx_model = convert_sklearn(model, initial_types=initial_type)
+    onnx_model = convert_sklearn(model, initial_types=initial_type, options={"zipmap": zipmap})
+
+    # 確率出力のレイアウトをメタデータに記録
+    onnx.helper.set_model_props(
+        onnx_model,
+        {
+            "output_layout": OUTPUT_LAYOUT_ZIPMAP if zipmap else OUTPUT_LAYOUT_TENSOR,
+            "probability_output": onnx_model.graph.output[1].name,
+            "class_labels": json.dumps(model.classes_.tolist()),
+        },
+    )
 
     # ファイル保存
     with open(filepath, "wb") as f:
@@ -1,19 +1,210 @@
 """MLflow Manager - MLflowでの実験管理"""
 
-from typing import Dict, Optional
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
 
 import mlflow
 import mlflow.sklearn
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
 from sklearn.pipeline import Pipeline
 
 from iris_binary.data_loader import IrisTarget
 
 
+# log_batch 1回あたりの上限（MLflowのREST APIの制約）
+MAX_ENTITIES_PER_BATCH = 1000
+MAX_PARAMS_TAGS_PER_BATCH = 100
+
+# flush/closeの待機中にバックグラウンドスレッドの生存を確認する間隔（秒）
+THREAD_CHECK_INTERVAL = 0.1
+
+
+class _FlushRequest:
+    """バックグラウンドスレッドへのフラッシュ要求"""
+
+    def __init__(self, stop: bool = False) -> None:
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class BatchLogger:
+    """
+    パラメータ・メトリクス・タグをバッファしてlog_batchでまとめて記録する
+
+    log_*はキューに積むだけで即座に戻り、書き込みはバックグラウンドスレッドが
+    flush_interval秒ごとにまとめて行います。学習ループ内で毎ステップ記録しても
+    トラッキングサーバーへの書き込み待ちが発生しません。
+    書き込みで発生した例外はflush()またはclose()で送出されます。
+    例外で抜けたwithブロックでは、処理中の例外を優先して書き込みエラーは送出しません。
+
+    Example:
+        >>> with mlflow.start_run():
+        ...     with BatchLogger() as logger:
+        ...         logger.log_params({"model": "svc"})
+        ...         logger.log_metric("loss", 0.5, step=1)
+    """
+
+    def __init__(
+        self,
+        run_id: Optional[str] = None,
+        flush_interval: float = 1.0,
+        client: Optional[MlflowClient] = None,
+    ) -> None:
+        """
+        Args:
+            run_id: 記録先のRun ID（Noneの場合はアクティブなRun）
+            flush_interval: 書き込みをまとめる間隔（秒）
+            client: MLflowクライアント（Noneの場合は現在のトラッキングURIで作成）
+        """
+        if run_id is None:
+            active_run = mlflow.active_run()
+            if active_run is None:
+                raise RuntimeError("No active MLflow run")
+            run_id = active_run.info.run_id
+
+        self.run_id = run_id
+        self.flush_interval = flush_interval
+        self._client = client or MlflowClient()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="mlflow-batch-logger", daemon=True)
+        self._thread.start()
+
+    def log_param(self, key: str, value: Any) -> None:
+        """パラメータを記録"""
+        self._put(Param(key, str(value)))
+
+    def log_params(self, params: Dict[str, Any]) -> None:
+        """パラメータをまとめて記録"""
+        for key, value in params.items():
+            self.log_param(key, value)
+
+    def log_metric(self, key: str, value: float, step: Optional[int] = None) -> None:
+        """メトリクスを記録（タイムスタンプは呼び出し時刻）"""
+        self._put(Metric(key, float(value), int(time.time() * 1000), step or 0))
+
+    def log_metrics(self, metrics: Dict[str, float], step: Optional[int] = None) -> None:
+        """メトリクスをまとめて記録"""
+        for key, value in metrics.items():
+            self.log_metric(key, value, step=step)
+
+    def set_tag(self, key: str, value: Any) -> None:
+        """タグを記録"""
+        self._put(RunTag(key, str(value)))
+
+    def set_tags(self, tags: Dict[str, Any]) -> None:
+        """タグをまとめて記録"""
+        for key, value in tags.items():
+            self.set_tag(key, value)
+
+    def flush(self) -> None:
+        """キューに積まれた値を全て書き込むまで待機"""
+        self._request(_FlushRequest())
+
+    def close(self) -> None:
+        """残りの値を書き込んでバックグラウンドスレッドを終了"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._request(_FlushRequest(stop=True))
+        finally:
+            self._thread.join()
+
+    def __enter__(self) -> "BatchLogger":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # 処理中の例外を書き込みエラーで置き換えない
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _put(self, entity: Any) -> None:
+        if self._closed:
+            raise RuntimeError("BatchLogger is closed")
+        self._queue.put(entity)
+
+    def _request(self, request: _FlushRequest) -> None:
+        if self._thread.is_alive():
+            self._queue.put(request)
+            # スレッドが異常終了した場合に待ち続けないよう、生存を確認しながら待つ
+            while not request.done.wait(timeout=THREAD_CHECK_INTERVAL):
+                if not self._thread.is_alive():
+                    break
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        if not request.done.is_set():
+            raise RuntimeError("BatchLogger background thread has stopped")
+
+    def _run(self) -> None:
+        try:
+            self._drain()
+        except BaseException as e:  # スレッドの異常終了もflush/closeで送出する
+            self._error = self._error or e
+
+    def _drain(self) -> None:
+        while True:
+            # 最初の値が届いてからflush_interval秒の間に届いた値をまとめる
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while not isinstance(items[-1], _FlushRequest):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            while not isinstance(items[-1], _FlushRequest):
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            request = items.pop() if isinstance(items[-1], _FlushRequest) else None
+            try:
+                self._write(items)
+            except Exception as e:  # 呼び出し元のflush/closeで送出する
+                self._error = self._error or e
+
+            if request is not None:
+                request.done.set()
+                if request.stop:
+                    return
+
+    def _write(self, items: List[Any]) -> None:
+        metrics = [item for item in items if isinstance(item, Metric)]
+        # 同一バッチ内で同じキーのパラメータ・タグは最後の値を使う
+        params = list({item.key: item for item in items if isinstance(item, Param)}.values())
+        tags = list({item.key: item for item in items if isinstance(item, RunTag)}.values())
+
+        n = MAX_PARAMS_TAGS_PER_BATCH
+        while metrics or params or tags:
+            batch_params, params = params[:n], params[n:]
+            batch_tags, tags = tags[:n], tags[n:]
+            n_metrics = MAX_ENTITIES_PER_BATCH - len(batch_params) - len(batch_tags)
+            batch_metrics, metrics = metrics[:n_metrics], metrics[n_metrics:]
+            self._client.log_batch(
+                self.run_id, metrics=batch_metrics, params=batch_params, tags=batch_tags
+            )
+
+
 def log_experiment(
     model: Pipeline,
     metrics: Dict[str, float],
     target_iris: IrisTarget,
     onnx_path: Optional[str] = None,
+    cv_metrics: Optional[Dict[str, float]] = None,
 ) -> str:
     """
     実験結果をMLflowに記録する
@@ -23,19 +214,29 @@ def log_experiment(
         metrics: 評価指標
         target_iris: ターゲットクラス
         onnx_path: ONNXファイルのパス（Noneの場合はスキップ）
+        cv_metrics: 交差検証の平均・標準偏差（Noneの場合はスキップ）
 
     Returns:
         Run ID
     """
-    # パラメータの記録
-    mlflow.log_param("normalize", "StandardScaler")
-    mlflow.log_param("model", "svc")
-    mlflow.log_param("target_iris", target_iris.name.lower())
-
-    # メトリクスの記録
-    mlflow.log_metric("accuracy", metrics["accuracy"])
-    mlflow.log_metric("precision", metrics["precision"])
-    mlflow.log_metric("recall", metrics["recall"])
+    # アクティブなRunがない場合はmlflow.log_paramと同様に開始する
+    run_id = (mlflow.active_run() or mlflow.start_run()).info.run_id
+
+    # パラメータとメトリクスを1回のlog_batchで記録
+    with BatchLogger(run_id) as logger:
+        logger.log_params(
+            {
+                "normalize": "StandardScaler",
+                "model": "svc",
+                "target_iris": target_iris.name.lower(),
+            }
+        )
+        logger.log_metrics(
+            {
+                **{key: metrics[key] for key in ("accuracy", "precision", "recall")},
+                **(cv_metrics or {}),
+            }
+        )
 
     # モデルの記録
     mlflow.sklearn.log_model(model, artifact_path="model")
@@ -1,14 +1,24 @@
 """Model Builder - SVCパイプラインの構築"""
 
+import copy
+from typing import Optional, Union
+
+from joblib import Memory
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.svm import SVC
 
 
-def build_svc_pipeline() -> Pipeline:
+def build_svc_pipeline(memory: Optional[Union[str, Memory]] = None) -> Pipeline:
     """
     StandardScaler + SVC のパイプラインを構築する
 
+    memoryを指定すると、学習済みのStandardScalerを入力データとパラメータをキーに
+    キャッシュし、同じデータでの再学習ではSVCだけを学習する
+
+    Args:
+        memory: StandardScalerのキャッシュ先（Noneでキャッシュしない）
+
     Returns:
         Pipeline: scikit-learnパイプライン
     """
@@ -17,6 +27,23 @@ def build_svc_pipeline() -> Pipeline:
         ("svc", SVC(probability=True)),
     ]
 
-    pipeline = Pipeline(steps=steps)
+    pipeline = Pipeline(steps=steps, memory=memory)
 
     return pipeline
+
+
+def without_cache(pipeline: Pipeline) -> Pipeline:
+    """
+    キャッシュ先（memory）を外したパイプラインを返す
+
+    memoryは学習時のキャッシュにだけ使う。保存するモデルに含めるとローカルのキャッシュ先が残り、
+    MLflowのskops形式での保存ではjoblib.Memoryが信頼されない型として拒否されるため、保存前に外す。
+    元のパイプラインは変更せず、学習済みのステップを共有する。
+
+    Args:
+        pipeline: 学習済みのscikit-learnパイプライン
+
+    Returns:
+        Pipeline: memory=Noneのパイプライン
+    """
+    return copy.copy(pipeline).set_params(memory=None)
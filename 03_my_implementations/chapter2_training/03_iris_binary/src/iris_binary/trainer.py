@@ -4,8 +4,16 @@ from typing import Dict
 
 import numpy as np
 from sklearn import metrics
+from sklearn.model_selection import RepeatedStratifiedKFold, cross_validate
 from sklearn.pipeline import Pipeline
 
+# 交差検証で計算する評価指標（evaluate_modelと同じ指標名とscikit-learnのscorer名）
+CV_SCORING = {
+    "accuracy": "accuracy",
+    "precision": "precision_micro",
+    "recall": "recall_micro",
+}
+
 
 def train_model(model: Pipeline, X_train: np.ndarray, y_train: np.ndarray) -> None:
     """
@@ -42,3 +50,40 @@ def evaluate_model(model: Pipeline, X_test: np.ndarray, y_test: np.ndarray) -> D
         "precision": float(precision),
         "recall": float(recall),
     }
+
+
+def cross_validate_model(
+    model: Pipeline,
+    X: np.ndarray,
+    y: np.ndarray,
+    n_splits: int = 5,
+    n_repeats: int = 1,
+    n_jobs: int = -1,
+    random_state: int = 42,
+) -> Dict[str, float]:
+    """
+    層化k分割交差検証でモデルを評価する
+
+    各フォールドは別プロセスで並列に学習・評価されます。
+    渡したモデルはフォールドごとに複製されるため、学習されません。
+
+    Args:
+        model: 未学習のscikit-learnパイプライン
+        X: 特徴量
+        y: ラベル
+        n_splits: 分割数
+        n_repeats: 分割を変えて繰り返す回数
+        n_jobs: 並列プロセス数（-1で全コア）
+        random_state: 分割の乱数シード
+
+    Returns:
+        評価指標ごとの平均と標準偏差の辞書（cv_accuracy_mean, cv_accuracy_std など）
+    """
+    cv = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+    scores = cross_validate(model, X, y, cv=cv, scoring=CV_SCORING, n_jobs=n_jobs)
+
+    results = {}
+    for name in CV_SCORING:
+        results[f"cv_{name}_mean"] = float(np.mean(scores[f"test_{name}"]))
+        results[f"cv_{name}_std"] = float(np.std(scores[f"test_{name}"]))
+    return results
@@ -1,8 +1,15 @@
 """Data Loader のユニットテスト"""
 
 import numpy as np
+from joblib import Memory
 
-from iris_binary.data_loader import IrisTarget, load_and_transform_data
+from iris_binary.data_loader import (
+    IrisTarget,
+    load_and_transform_data,
+    load_and_transform_data_cached,
+    load_data,
+    transform_data,
+)
 
 
 class TestDataLoader:
@@ -103,3 +110,48 @@ class TestDataLoader:
         np.testing.assert_array_equal(X_test1, X_test2)
         np.testing.assert_array_equal(y_train1, y_train2)
         np.testing.assert_array_equal(y_test1, y_test2)
+
+
+class TestCachedDataLoader:
+    """キャッシュ付きData Loader のテストクラス"""
+
+    def test_cached_result_matches(self, tmp_path):
+        """キャッシュ経由でも同じ分割結果が返る"""
+        memory = Memory(tmp_path, verbose=0)
+
+        cached = load_and_transform_data_cached(
+            memory, test_size=0.3, target_iris=IrisTarget.VIRGINICA, random_state=42
+        )
+        expected = load_and_transform_data(
+            test_size=0.3, target_iris=IrisTarget.VIRGINICA, random_state=42
+        )
+
+        for cached_array, expected_array in zip(cached, expected):
+            np.testing.assert_array_equal(cached_array, expected_array)
+
+    def test_cache_key_includes_data_and_target(self, tmp_path):
+        """データの内容や陽性クラスが変わるとキャッシュが別になる"""
+        memory = Memory(tmp_path, verbose=0)
+        cached_transform = memory.cache(transform_data)
+        X, y = load_data()
+
+        load_and_transform_data_cached(memory, target_iris=IrisTarget.SETOSA)
+
+        assert cached_transform.check_call_in_cache(
+            X, y, test_size=0.3, target_iris=IrisTarget.SETOSA, random_state=42
+        )
+        assert not cached_transform.check_call_in_cache(
+            X, y, test_size=0.3, target_iris=IrisTarget.VERSICOLOR, random_state=42
+        )
+        assert not cached_transform.check_call_in_cache(
+            X + 1.0, y, test_size=0.3, target_iris=IrisTarget.SETOSA, random_state=42
+        )
+
+    def test_transform_does_not_modify_labels(self):
+        """二値化でキャッシュされた元のラベルが書き換えられない"""
+        X, y = load_data()
+        original = y.copy()
+
+        transform_data(X, y, target_iris=IrisTarget.VERSICOLOR)
+
+        np.testing.assert_array_equal(y, original)
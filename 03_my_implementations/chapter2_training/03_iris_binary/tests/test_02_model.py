@@ -1,10 +1,12 @@
 """Model Builder のユニットテスト"""
 
+from joblib import Memory
+from sklearn.datasets import load_iris
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.svm import SVC
 
-from iris_binary.model import build_svc_pipeline
+from iris_binary.model import build_svc_pipeline, without_cache
 
 
 class TestModelBuilder:
@@ -50,3 +52,27 @@ class TestModelBuilder:
 
         step_names = [name for name, _ in pipeline.steps]
         assert step_names == ["scaler", "svc"]
+
+    def test_pipeline_caches_fitted_scaler(self, tmp_path):
+        """memoryを指定すると同じデータでは学習済みスケーラーが再利用される"""
+        memory = Memory(tmp_path, verbose=0)
+        X, y = load_iris(return_X_y=True)
+
+        build_svc_pipeline(memory=memory).fit(X, y)
+        build_svc_pipeline(memory=memory).fit(X, y)
+        assert len(list(tmp_path.rglob("output.pkl"))) == 1
+
+        build_svc_pipeline(memory=memory).fit(X[:100], y[:100])
+        assert len(list(tmp_path.rglob("output.pkl"))) == 2
+
+    def test_without_cache(self, tmp_path):
+        """キャッシュ先を外しても同じ予測になり、元のパイプラインは変更されない"""
+        memory = Memory(tmp_path, verbose=0)
+        X, y = load_iris(return_X_y=True)
+        pipeline = build_svc_pipeline(memory=memory).fit(X, y)
+
+        detached = without_cache(pipeline)
+
+        assert detached.memory is None
+        assert pipeline.memory is memory
+        assert (detached.predict(X) == pipeline.predict(X)).all()
@@ -5,7 +5,7 @@ import pytest
 
 from iris_binary.data_loader import IrisTarget, load_and_transform_data
 from iris_binary.model import build_svc_pipeline
-from iris_binary.trainer import evaluate_model, train_model
+from iris_binary.trainer import cross_validate_model, evaluate_model, train_model
 
 
 class TestTrainer:
@@ -83,3 +83,32 @@ class TestTrainer:
 
         # setosaは線形分離可能なため、高精度が期待される
         assert metrics["accuracy"] > 0.90
+
+    def test_cross_validate_model(self, sample_data):
+        """交差検証で評価指標ごとの平均と標準偏差が計算できる"""
+        X_train, _, y_train, _ = sample_data
+        model = build_svc_pipeline()
+
+        cv_metrics = cross_validate_model(
+            model, X_train, y_train, n_splits=3, n_repeats=2, n_jobs=2
+        )
+
+        assert set(cv_metrics) == {
+            f"cv_{name}_{stat}"
+            for name in ("accuracy", "precision", "recall")
+            for stat in ("mean", "std")
+        }
+        for metric_name, value in cv_metrics.items():
+            assert 0.0 <= value <= 1.0, f"{metric_name} is out of range: {value}"
+
+        # 渡したモデルは学習されない
+        assert not hasattr(model.named_steps["svc"], "support_vectors_")
+
+    def test_cross_validate_model_parallel_matches_sequential(self, sample_data):
+        """並列プロセスで実行しても逐次実行と同じ結果になる"""
+        X_train, _, y_train, _ = sample_data
+
+        sequential = cross_validate_model(build_svc_pipeline(), X_train, y_train, n_jobs=1)
+        parallel = cross_validate_model(build_svc_pipeline(), X_train, y_train, n_jobs=2)
+
+        assert sequential == pytest.approx(parallel)
@@ -1,5 +1,6 @@
 """ONNX Exporter のユニットテスト"""
 
+import json
 import os
 import tempfile
 
@@ -110,11 +111,39 @@ class TestONNXExporter:
             # 2つの出力（ラベル + 確率）
             assert len(outputs) == 2
 
+            # 確率は (サンプル数, 2) のテンソル
             probabilities = outputs[1]
-            assert probabilities is not None
-            assert len(probabilities) == 5
+            assert isinstance(probabilities, np.ndarray)
+            assert probabilities.shape == (5, 2)
 
             # 確率が0〜1の範囲
-            for prob_dict in probabilities:
-                for prob in prob_dict.values():
-                    assert 0.0 <= prob <= 1.0
+            assert np.all((probabilities >= 0.0) & (probabilities <= 1.0))
+
+    def test_output_layout_metadata(self, trained_model):
+        """確率出力のレイアウトがメタデータに記録される"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(trained_model, onnx_path)
+
+            sess = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+            metadata = sess.get_modelmeta().custom_metadata_map
+
+        assert metadata["output_layout"] == "tensor"
+        assert metadata["probability_output"] == "probabilities"
+        assert json.loads(metadata["class_labels"]) == [0, 1]
+
+    def test_zipmap_option(self, trained_model, test_data):
+        """zipmap=Trueでは確率が行ごとの辞書で出力される"""
+        X_test, _ = test_data
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(trained_model, onnx_path, zipmap=True)
+
+            sess = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+            input_name = sess.get_inputs()[0].name
+            _, probabilities = sess.run(None, {input_name: X_test[:3]})
+            metadata = sess.get_modelmeta().custom_metadata_map
+
+        assert all(isinstance(row, dict) for row in probabilities)
+        assert metadata["output_layout"] == "zipmap"
@@ -2,12 +2,19 @@
 
 import os
 import tempfile
+import threading
 
 import mlflow
 import pytest
+from mlflow.tracking import MlflowClient
 
 from iris_binary.data_loader import IrisTarget, load_and_transform_data
-from iris_binary.mlflow_manager import log_experiment
+from iris_binary.mlflow_manager import (
+    MAX_ENTITIES_PER_BATCH,
+    MAX_PARAMS_TAGS_PER_BATCH,
+    BatchLogger,
+    log_experiment,
+)
 from iris_binary.model import build_svc_pipeline
 from iris_binary.trainer import evaluate_model, train_model
 
@@ -110,6 +117,25 @@ class TestMLflowManager:
             assert 0.0 <= run_data.metrics["precision"] <= 1.0
             assert 0.0 <= run_data.metrics["recall"] <= 1.0
 
+    def test_log_cv_metrics(self, mlflow_test_env, trained_model_and_metrics):
+        """交差検証の平均・標準偏差が評価指標と一緒に記録される"""
+        model, metrics = trained_model_and_metrics
+        cv_metrics = {"cv_accuracy_mean": 0.95, "cv_accuracy_std": 0.02}
+
+        with mlflow.start_run() as run:
+            log_experiment(
+                model=model,
+                metrics=metrics,
+                target_iris=IrisTarget.SETOSA,
+                cv_metrics=cv_metrics,
+            )
+
+            run_data = mlflow.get_run(run.info.run_id).data
+
+            assert run_data.metrics["cv_accuracy_mean"] == 0.95
+            assert run_data.metrics["cv_accuracy_std"] == 0.02
+            assert "accuracy" in run_data.metrics
+
     def test_log_model(self, mlflow_test_env, trained_model_and_metrics):
         """モデルがログ記録される（log_model呼び出しが成功する）"""
         model, metrics = trained_model_and_metrics
@@ -157,3 +183,141 @@ class TestMLflowManager:
                 onnx_artifacts = [p for p in artifact_paths if p.endswith(".onnx")]
 
                 assert len(onnx_artifacts) > 0
+
+
+class RecordingClient:
+    """log_batchの呼び出しを記録するクライアント（gateがセットされるまで書き込みを待つ）"""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = fail
+
+    def log_batch(self, run_id, metrics, params, tags):
+        self.gate.wait()
+        if self.fail:
+            raise ConnectionError("tracking server unavailable")
+        self.batches.append((run_id, list(metrics), list(params), list(tags)))
+
+
+class WorkerStopped(BaseException):
+    """バックグラウンドスレッドを終了させる例外（Exception以外）"""
+
+
+class StoppingClient:
+    """log_batchでWorkerStoppedを送出するクライアント"""
+
+    def log_batch(self, run_id, metrics, params, tags):
+        raise WorkerStopped()
+
+
+class TestBatchLogger:
+    """BatchLogger のテストクラス"""
+
+    @pytest.fixture
+    def mlflow_test_env(self):
+        """テスト用MLflow環境"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mlflow.set_tracking_uri(f"file://{tmpdir}/mlruns")
+            mlflow.set_experiment("test_batch_logger")
+            yield
+
+    def test_logs_params_metrics_and_tags(self, mlflow_test_env):
+        """パラメータ・ステップ付きメトリクス・タグが記録される"""
+        with mlflow.start_run() as run:
+            with BatchLogger() as logger:
+                logger.log_params({"model": "svc", "C": 1.0})
+                for step in range(5):
+                    logger.log_metric("loss", 1.0 / (step + 1), step=step)
+                logger.set_tags({"stage": "test"})
+
+        run_data = mlflow.get_run(run.info.run_id).data
+        assert run_data.params == {"model": "svc", "C": "1.0"}
+        assert run_data.metrics["loss"] == pytest.approx(0.2)
+        assert run_data.tags["stage"] == "test"
+
+        history = MlflowClient().get_metric_history(run.info.run_id, "loss")
+        assert sorted(metric.step for metric in history) == [0, 1, 2, 3, 4]
+
+    def test_requires_active_run(self, mlflow_test_env):
+        """Run IDの指定もアクティブなRunもない場合はエラー"""
+        with pytest.raises(RuntimeError):
+            BatchLogger()
+
+    def test_logging_does_not_wait_for_writes(self):
+        """書き込みが止まっていてもlog_*は即座に戻る"""
+        client = RecordingClient()
+        client.gate.clear()
+        logger = BatchLogger("run", flush_interval=0.01, client=client)
+
+        for step in range(100):
+            logger.log_metric("loss", 0.1, step=step)
+        assert client.batches == []
+
+        client.gate.set()
+        logger.close()
+        assert sum(len(metrics) for _, metrics, _, _ in client.batches) == 100
+
+    def test_values_are_batched(self):
+        """flush間隔内に記録された値は1回のlog_batchにまとめられる"""
+        client = RecordingClient()
+        with BatchLogger("run", flush_interval=60.0, client=client) as logger:
+            logger.log_params({"a": 1, "b": 2})
+            logger.log_metrics({"accuracy": 0.9, "recall": 0.8})
+            logger.flush()
+
+            assert len(client.batches) == 1
+            run_id, metrics, params, tags = client.batches[0]
+            assert run_id == "run"
+            assert [metric.key for metric in metrics] == ["accuracy", "recall"]
+            assert [param.key for param in params] == ["a", "b"]
+
+    def test_batches_respect_mlflow_limits(self):
+        """大量の値はlog_batchの上限ごとに分割される"""
+        client = RecordingClient()
+        with BatchLogger("run", client=client) as logger:
+            for step in range(2500):
+                logger.log_metric("loss", 0.1, step=step)
+            logger.log_params({f"p{i}": i for i in range(150)})
+
+        for _, metrics, params, tags in client.batches:
+            assert len(params) <= MAX_PARAMS_TAGS_PER_BATCH
+            assert len(metrics) + len(params) + len(tags) <= MAX_ENTITIES_PER_BATCH
+        assert sum(len(metrics) for _, metrics, _, _ in client.batches) == 2500
+        assert sum(len(params) for _, _, params, _ in client.batches) == 150
+
+    def test_write_errors_are_raised_on_flush(self):
+        """バックグラウンドでの書き込みエラーはflush()で送出される"""
+        logger = BatchLogger("run", client=RecordingClient(fail=True))
+        logger.log_metric("loss", 0.1)
+
+        with pytest.raises(ConnectionError):
+            logger.flush()
+        logger.close()
+
+        with pytest.raises(RuntimeError):
+            logger.log_metric("loss", 0.1)
+
+    def test_stopped_thread_is_raised_on_flush(self):
+        """バックグラウンドスレッドが終了した場合、flush()は待ち続けずに例外を送出する"""
+        logger = BatchLogger("run", client=StoppingClient())
+        logger.log_metric("loss", 0.1)
+
+        with pytest.raises(WorkerStopped):
+            logger.flush()
+        with pytest.raises(RuntimeError, match="has stopped"):
+            logger.close()
+
+    def test_exit_does_not_mask_exception(self):
+        """withブロック内の例外は書き込みエラーで置き換えられない"""
+        with pytest.raises(ValueError):
+            with BatchLogger("run", client=RecordingClient(fail=True)) as logger:
+                logger.log_metric("loss", 0.1)
+                raise ValueError("training failed")
+
+    def test_exit_raises_write_errors(self):
+        """例外なく抜けたwithブロックでは書き込みエラーが送出される"""
+        with pytest.raises(ConnectionError):
+            with BatchLogger("run", client=RecordingClient(fail=True)) as logger:
+                logger.log_metric("loss", 0.1)
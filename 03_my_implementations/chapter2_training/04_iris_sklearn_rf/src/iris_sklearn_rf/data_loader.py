@@ -3,14 +3,29 @@ Irisデータセットの読み込みモジュール。
 
 このモジュールはIrisデータセットの読み込みと、
 訓練/テストセットへの分割機能を提供します。
+読み込み・分割の結果をjoblib.Memoryでディスクにキャッシュする関数も提供します。
+メモリに載りきらないCSV/Parquetファイルを固定行数のチャンクで読み込む
+データソース（ChunkedDataSource）も提供します。
 """
 
-from typing import Tuple
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Sequence, Tuple
 
 import numpy as np
+import pyarrow.parquet as pq
+from joblib import Memory
 from sklearn.datasets import load_iris
 from sklearn.model_selection import train_test_split
 
+# Irisデータセットの特徴量の列名（CSV/Parquetで保存する場合）
+IRIS_FEATURE_COLUMNS = ("sepal_length", "sepal_width", "petal_length", "petal_width")
+
+# ChunkedDataSourceが扱うファイル形式（拡張子）
+CSV_SUFFIXES = (".csv",)
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
 
 def load_iris_data() -> Tuple[np.ndarray, np.ndarray]:
     """
@@ -55,3 +70,110 @@ def split_data(
     )
 
     return X_train, X_test, y_train, y_test
+
+
+def load_and_split_cached(
+    memory: Memory,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    stratify: bool = True,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    データの読み込みと分割の結果をディスクキャッシュから取得する。
+
+    読み込み（load_iris_data）と分割（split_data）を別々にキャッシュします。
+    分割のキャッシュキーはデータの内容のハッシュ（フィンガープリント）と
+    分割パラメータのため、データが変わった場合だけ分割し直します。
+
+    Args:
+        memory: キャッシュ先のjoblib.Memory（location=Noneでキャッシュしない）
+        test_size: テストセットの割合
+        random_state: 再現性のための乱数シード
+        stratify: Trueの場合、クラス分布を維持して分割
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            X_train, X_test, y_train, y_test
+    """
+    X, y = memory.cache(load_iris_data)()
+    return memory.cache(split_data)(
+        X, y, test_size=test_size, random_state=random_state, stratify=stratify
+    )
+
+
+@dataclass(frozen=True)
+class ChunkedDataSource:
+    """
+    CSV/Parquetファイルを固定行数のチャンクで読み込むデータソース。
+
+    イテレートするたびにファイルを先頭から読み直し、最大chunk_size行の
+    (X, y) を順に返します。同時にメモリに載るのは1チャンク分だけのため、
+    ファイル全体の大きさに関係なくメモリ使用量はchunk_sizeで決まります。
+    何度でもイテレートできるため、複数エポックの学習にも使えます。
+
+    CSVは1行目をヘッダー（列名）とするカンマ区切りの数値ファイルです。
+
+    Attributes:
+        path: CSV（.csv）またはParquet（.parquet, .pq）ファイルのパス
+        feature_columns: 特徴量の列名（この順にXの列になる）
+        label_column: ラベル（クラス番号）の列名
+        chunk_size: 1チャンクの最大行数
+
+    Examples:
+        >>> source = ChunkedDataSource("train.csv", IRIS_FEATURE_COLUMNS, "label", chunk_size=1000)
+        >>> for X_chunk, y_chunk in source:
+        ...     scaler.partial_fit(X_chunk)
+    """
+
+    path: str
+    feature_columns: Sequence[str]
+    label_column: str
+    chunk_size: int = 10_000
+
+    def __post_init__(self) -> None:
+        if self.chunk_size < 1:
+            raise ValueError(f"chunk_size must be >= 1, got {self.chunk_size}")
+        suffix = Path(self.path).suffix.lower()
+        if suffix not in CSV_SUFFIXES + PARQUET_SUFFIXES:
+            raise ValueError(f"Unsupported file format: {self.path}")
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        if Path(self.path).suffix.lower() in PARQUET_SUFFIXES:
+            return self._iter_parquet()
+        return self._iter_csv()
+
+    def _iter_csv(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            header = [name.strip() for name in f.readline().rstrip("\n").split(",")]
+            missing = [
+                name for name in (*self.feature_columns, self.label_column) if name not in header
+            ]
+            if missing:
+                raise KeyError(f"Columns not found in {self.path}: {missing}")
+            feature_indices = [header.index(name) for name in self.feature_columns]
+            label_index = header.index(self.label_column)
+
+            while True:
+                # ファイルの現在位置から最大chunk_size行だけを解析する
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", UserWarning)  # 末尾の空読みの警告
+                    chunk = np.loadtxt(
+                        f,
+                        delimiter=",",
+                        usecols=(*feature_indices, label_index),
+                        max_rows=self.chunk_size,
+                        ndmin=2,
+                    )
+                if len(chunk) == 0:
+                    return
+                yield chunk[:, :-1], chunk[:, -1].astype(np.int64)
+
+    def _iter_parquet(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        parquet_file = pq.ParquetFile(self.path)
+        for batch in parquet_file.iter_batches(
+            batch_size=self.chunk_size, columns=[*self.feature_columns, self.label_column]
+        ):
+            X_chunk = np.column_stack(
+                [batch.column(name).to_numpy().astype(np.float64) for name in self.feature_columns]
+            )
+            yield X_chunk, batch.column(self.label_column).to_numpy().astype(np.int64)
@@ -3,11 +3,15 @@
 
 このモジュールはStandardScalerとRandomForestClassifierを
 組み合わせたscikit-learn Pipelineを作成する機能を提供します。
+チャンクごとに逐次学習できるStandardScalerとSGDClassifierのPipelineも提供します。
 """
 
-from typing import Optional
+import copy
+from typing import Optional, Union
 
+from joblib import Memory
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
@@ -18,6 +22,8 @@ def create_rf_pipeline(
     min_samples_split: int = 2,
     min_samples_leaf: int = 1,
     random_state: int = 42,
+    n_jobs: Optional[int] = None,
+    memory: Optional[Union[str, Memory]] = None,
 ) -> Pipeline:
     """
     ランダムフォレスト分類パイプラインを作成する。
@@ -26,12 +32,18 @@ def create_rf_pipeline(
     1. StandardScaler: 特徴量を平均0、分散1に正規化
     2. RandomForestClassifier: アンサンブル分類器
 
+    memoryを指定すると、学習済みのStandardScalerを入力データとパラメータをキーに
+    キャッシュします。同じデータで学習する再実行やスイープの試行では、
+    ランダムフォレストの学習だけが行われます。
+
     Args:
         n_estimators: フォレスト内の決定木の数
         max_depth: 木の最大深さ（Noneで無制限）
         min_samples_split: 内部ノード分割に必要な最小サンプル数
         min_samples_leaf: 葉ノードに必要な最小サンプル数
         random_state: 再現性のための乱数シード
+        n_jobs: 決定木の学習・予測に使うスレッド数（Noneで1スレッド、-1で全コア）
+        memory: StandardScalerのキャッシュ先（パスまたはjoblib.Memory、Noneでキャッシュしない）
 
     Returns:
         Pipeline: scikit-learn Pipelineオブジェクト
@@ -46,9 +58,54 @@ def create_rf_pipeline(
         min_samples_split=min_samples_split,
         min_samples_leaf=min_samples_leaf,
         random_state=random_state,
+        n_jobs=n_jobs,
     )
 
     # パイプラインの作成
-    pipeline = Pipeline([("scaler", scaler), ("classifier", classifier)])
+    pipeline = Pipeline([("scaler", scaler), ("classifier", classifier)], memory=memory)
 
     return pipeline
+
+
+def without_cache(pipeline: Pipeline) -> Pipeline:
+    """
+    キャッシュ先（memory）を外したパイプラインを返す。
+
+    memoryは学習時のキャッシュにだけ使います。保存するモデルに含めるとローカルのキャッシュ先が残り、
+    MLflowのskops形式での保存ではjoblib.Memoryが信頼されない型として拒否されるため、保存前に外します。
+
+    Args:
+        pipeline: 学習済みのscikit-learnパイプライン
+
+    Returns:
+        Pipeline: memory=Noneのパイプライン（元のパイプラインは変更せず、学習済みのステップを共有する）
+    """
+    return copy.copy(pipeline).set_params(memory=None)
+
+
+def create_incremental_pipeline(
+    alpha: float = 0.0001,
+    random_state: int = 42,
+) -> Pipeline:
+    """
+    チャンクごとに逐次学習できる分類パイプラインを作成する。
+
+    どちらのステップもpartial_fitを持つため、メモリに載りきらないデータを
+    trainer.train_incremental でチャンクごとに学習できます。
+    確率を出力するためにロジスティック損失を使うので、RandomForestと同じく
+    ONNXにエクスポートすると確率テンソルを出力します。
+
+    パイプラインの構成:
+    1. StandardScaler: 特徴量を平均0、分散1に正規化
+    2. SGDClassifier: ロジスティック回帰（確率的勾配降下法）
+
+    Args:
+        alpha: L2正則化の強さ
+        random_state: 再現性のための乱数シード
+
+    Returns:
+        Pipeline: scikit-learn Pipelineオブジェクト
+    """
+    scaler = StandardScaler()
+    classifier = SGDClassifier(loss="log_loss", alpha=alpha, random_state=random_state)
+    return Pipeline([("scaler", scaler), ("classifier", classifier)])
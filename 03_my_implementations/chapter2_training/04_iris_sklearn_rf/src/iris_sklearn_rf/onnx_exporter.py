@@ -3,31 +3,75 @@ ONNXエクスポートと検証モジュール。
 
 このモジュールはscikit-learnモデルをONNX形式にエクスポートし、
 エクスポートされたモデルを検証する機能を提供します。
+エクスポート後にONNX Runtimeのグラフ最適化を適用し、元のモデルとの
+サイズ・レイテンシ・精度の差を比較する機能も提供します。
+複数のバッチサイズでscikit-learnとONNX Runtimeの確率・ラベル・レイテンシを比較し、
+パリティやレイテンシが基準を満たさないエクスポートを失敗させる検証ハーネスも提供します。
 """
 
+import json
+import os
+import time
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
 import numpy as np
+import onnx
 import onnxruntime as rt
 from skl2onnx import convert_sklearn
 from skl2onnx.common.data_types import FloatTensorType
 from sklearn.pipeline import Pipeline
 
 
-def export_to_onnx(pipeline: Pipeline, onnx_path: str) -> None:
+# 確率出力のレイアウト
+# "tensor": float32の2次元テンソル (N, クラス数)
+# "zipmap": 行ごとの {クラス: 確率} 辞書のリスト（skl2onnxのデフォルト）
+OUTPUT_LAYOUT_TENSOR = "tensor"
+OUTPUT_LAYOUT_ZIPMAP = "zipmap"
+
+# 検証ハーネスで計測するバッチサイズ（入力が足りない場合は行を繰り返して作る）
+HARNESS_BATCH_SIZES = (1, 8, 64, 512, 4096)
+
+# 記録済みのベースラインに対するONNXのp50レイテンシの許容倍率
+# （計測回数が少ないp50のばらつきで誤って失敗しないよう、2倍を超える遅化のみを回帰とみなす）
+MAX_BASELINE_LATENCY_RATIO = 2.0
+
+
+def export_to_onnx(pipeline: Pipeline, onnx_path: str, zipmap: bool = False) -> None:
     """
     scikit-learnパイプラインをONNX形式にエクスポートする。
 
+    デフォルトでは確率をfloat32の2次元テンソル (N, クラス数) として出力するため、
+    バッチ推論の結果を行ごとの辞書に変換せずに1つのndarrayとして受け取れます。
+    出力のレイアウトはモデルのメタデータ（metadata_props）に記録します。
+
+    - output_layout: "tensor" または "zipmap"
+    - probability_output: 確率の出力名
+    - class_labels: 確率の列に対応するクラスラベル（JSON配列）
+
     Args:
         pipeline: 学習済みscikit-learn Pipeline
         onnx_path: ONNXモデルの保存先パス
+        zipmap: 確率を行ごとの辞書（ZipMap）で出力するか（デフォルト: False）
 
     Raises:
         Exception: モデルが未学習または変換に失敗した場合
     """
-    # 入力タイプの定義（Irisデータセットは4特徴量）
-    initial_type = [("float_input", FloatTensorType([None, 4]))]
+    # 入力タイプの定義（特徴量の数は学習時の入力から取得する）
+    initial_type = [("float_input", FloatTensorType([None, pipeline.n_features_in_]))]
 
     # ONNXに変換
-    onnx_model = convert_sklearn(pipeline, initial_types=initial_type)
+    onnx_model = convert_sklearn(pipeline, initial_types=initial_type, options={"zipmap": zipmap})
+
+    # 確率出力のレイアウトをメタデータに記録
+    onnx.helper.set_model_props(
+        onnx_model,
+        {
+            "output_layout": OUTPUT_LAYOUT_ZIPMAP if zipmap else OUTPUT_LAYOUT_TENSOR,
+            "probability_output": onnx_model.graph.output[1].name,
+            "class_labels": json.dumps(pipeline.classes_.tolist()),
+        },
+    )
 
     # ファイルに保存
     with open(onnx_path, "wb") as f:
@@ -35,7 +79,11 @@ def export_to_onnx(pipeline: Pipeline, onnx_path: str) -> None:
 
 
 def validate_onnx_model(
-    pipeline: Pipeline, onnx_path: str, X_test: np.ndarray, tolerance: float = 1e-5
+    pipeline: Pipeline,
+    onnx_path: str,
+    X_test: np.ndarray,
+    tolerance: float = 1e-5,
+    n_threads: Optional[int] = None,
 ) -> bool:
     """
     ONNXモデルの予測がscikit-learnの予測と一致することを検証する。
@@ -45,15 +93,21 @@ def validate_onnx_model(
         onnx_path: ONNXモデルファイルのパス
         X_test: 予測を検証するテストデータ
         tolerance: 数値差の許容誤差（分類では未使用）
+        n_threads: ONNX Runtimeの演算スレッド数（Noneで全コア）。
+            複数プロセスで並列に検証する場合はプロセスごとの割り当て数を指定する
 
     Returns:
         bool: 予測が一致すればTrue、そうでなければFalse
+
+    Notes:
+        - 呼び出しごとにセッションを作成する。複数のバッチサイズで確率・レイテンシまで
+          検証する場合は、セッションを1回だけ作成するrun_parity_harnessを使用する
     """
     # scikit-learnの予測を取得
     sklearn_pred = pipeline.predict(X_test)
 
     # ONNXモデルをロードして予測を取得
-    sess = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    sess = _create_session(onnx_path, n_threads)
     input_name = sess.get_inputs()[0].name
     label_name = sess.get_outputs()[0].name
 
@@ -63,3 +117,378 @@ def validate_onnx_model(
 
     # 予測を比較
     return np.array_equal(sklearn_pred, onnx_pred)
+
+
+def _create_session(onnx_path: str, n_threads: Optional[int] = None) -> rt.InferenceSession:
+    """CPU実行プロバイダのセッションを作成する（n_threadsで演算スレッド数を制限）。"""
+    sess_options = rt.SessionOptions()
+    if n_threads is not None:
+        sess_options.intra_op_num_threads = n_threads
+        sess_options.inter_op_num_threads = 1
+    return rt.InferenceSession(onnx_path, sess_options, providers=["CPUExecutionProvider"])
+
+
+# オフライン最適化のレベル
+# "all"はレイアウト変換などCPU固有の最適化を含むため、同じ種類のCPUで推論する場合のみ使用する
+OPTIMIZATION_LEVELS = {
+    "basic": rt.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": rt.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": rt.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+def optimized_model_path(onnx_path: str, suffix: str = "opt") -> str:
+    """
+    元のモデルと同じディレクトリに置く派生モデルのパスを返す。
+
+    Args:
+        onnx_path: 元のONNXモデルのパス（例: models/iris_rf.onnx）
+        suffix: ファイル名に付けるサフィックス
+
+    Returns:
+        str: 派生モデルのパス（例: models/iris_rf.opt.onnx）
+    """
+    root, ext = os.path.splitext(onnx_path)
+    return f"{root}.{suffix}{ext or '.onnx'}"
+
+
+def optimize_onnx_model(
+    onnx_path: str,
+    optimized_path: Optional[str] = None,
+    level: str = "extended",
+) -> str:
+    """
+    ONNX Runtimeのオフライングラフ最適化を適用したモデルを保存する。
+
+    最適化済みのモデルを保存しておくと、推論サーバーの起動時に最適化を省略できます。
+
+    Args:
+        onnx_path: 元のONNXモデルのパス
+        optimized_path: 保存先のパス（Noneで元のモデルの隣に *.opt.onnx）
+        level: 最適化レベル（"basic", "extended", "all"）
+
+    Returns:
+        str: 最適化済みモデルのパス
+
+    Raises:
+        ValueError: 不明な最適化レベルの場合
+    """
+    if level not in OPTIMIZATION_LEVELS:
+        raise ValueError(f"level must be one of {list(OPTIMIZATION_LEVELS)}, got {level!r}")
+
+    optimized_path = optimized_path or optimized_model_path(onnx_path)
+    sess_options = rt.SessionOptions()
+    sess_options.graph_optimization_level = OPTIMIZATION_LEVELS[level]
+    sess_options.optimized_model_filepath = optimized_path
+    rt.InferenceSession(onnx_path, sess_options, providers=["CPUExecutionProvider"])
+    return optimized_path
+
+
+def measure_latency(
+    onnx_path: str,
+    X: np.ndarray,
+    n_runs: int = 100,
+    n_threads: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    1行とバッチ全体の推論レイテンシ（中央値、ミリ秒）を計測する。
+
+    セッションは1回だけ作成し、ウォームアップ後に計測します。
+
+    Args:
+        onnx_path: ONNXモデルのパス
+        X: 入力データ（バッチレイテンシはX全体で計測）
+        n_runs: 計測回数
+        n_threads: ONNX Runtimeの演算スレッド数（Noneで全コア）
+
+    Returns:
+        dict: single_row_ms, batch_ms
+    """
+    sess = _create_session(onnx_path, n_threads)
+    input_name = sess.get_inputs()[0].name
+    label_name = sess.get_outputs()[0].name
+
+    X_float32 = X.astype(np.float32)
+    latencies = {}
+    for name, batch in (("single_row_ms", X_float32[:1]), ("batch_ms", X_float32)):
+        sess.run([label_name], {input_name: batch})  # ウォームアップ
+        timings = []
+        for _ in range(n_runs):
+            start = time.perf_counter()
+            sess.run([label_name], {input_name: batch})
+            timings.append((time.perf_counter() - start) * 1000)
+        latencies[name] = float(np.median(timings))
+    return latencies
+
+
+def _onnx_accuracy(onnx_path: str, X: np.ndarray, y: np.ndarray) -> float:
+    sess = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    input_name = sess.get_inputs()[0].name
+    label_name = sess.get_outputs()[0].name
+    onnx_pred = sess.run([label_name], {input_name: X.astype(np.float32)})[0]
+    return float(np.mean(onnx_pred == y))
+
+
+def compare_onnx_models(
+    pipeline: Pipeline,
+    onnx_path: str,
+    optimized_path: str,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    n_runs: int = 100,
+) -> Dict[str, float]:
+    """
+    元のONNXモデルと最適化済みモデルのサイズ・レイテンシ・精度を比較する。
+
+    最適化済みモデルの予測がscikit-learnと一致するかもvalidate_onnx_modelで検証します。
+
+    Args:
+        pipeline: 元の学習済みscikit-learn Pipeline
+        onnx_path: 元のONNXモデルのパス
+        optimized_path: 最適化済みONNXモデルのパス
+        X_test: テスト用特徴量
+        y_test: テスト用ラベル
+        n_runs: レイテンシの計測回数
+
+    Returns:
+        dict: original_*/optimized_* のサイズ（size_bytes）、1行・バッチのレイテンシ
+            （single_row_ms, batch_ms）、精度（accuracy）と各差分（*_delta）、
+            最適化済みモデルのパリティ（optimized_valid: 1.0 or 0.0）
+    """
+    report: Dict[str, float] = {}
+    for prefix, path in (("original", onnx_path), ("optimized", optimized_path)):
+        report[f"{prefix}_size_bytes"] = float(os.path.getsize(path))
+        for name, value in measure_latency(path, X_test, n_runs=n_runs).items():
+            report[f"{prefix}_{name}"] = value
+        report[f"{prefix}_accuracy"] = _onnx_accuracy(path, X_test, y_test)
+
+    for name in ("size_bytes", "single_row_ms", "batch_ms", "accuracy"):
+        report[f"{name}_delta"] = report[f"optimized_{name}"] - report[f"original_{name}"]
+    report["optimized_valid"] = float(validate_onnx_model(pipeline, optimized_path, X_test))
+    return report
+
+
+def _latency_percentiles_ms(predict: Callable[[], object], n_runs: int) -> Tuple[float, float]:
+    """ウォームアップ後にn_runs回実行し、レイテンシのp50とp99（ミリ秒）を返す。"""
+    predict()  # ウォームアップ
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        predict()
+        timings.append((time.perf_counter() - start) * 1000)
+    p50, p99 = np.percentile(timings, [50, 99])
+    return float(p50), float(p99)
+
+
+def run_parity_harness(
+    pipeline: Pipeline,
+    onnx_path: str,
+    X: np.ndarray,
+    batch_sizes: Sequence[int] = HARNESS_BATCH_SIZES,
+    n_runs: int = 50,
+    n_threads: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    複数のバッチサイズでscikit-learnとONNX Runtimeの予測・レイテンシを比較する。
+
+    セッションは1回だけ作成し、全バッチサイズの推論・計測で使い回します。
+    確率はメタデータのprobability_outputの出力を使うため、tensor・zipmapの
+    どちらのレイアウトでも比較できます。
+
+    Args:
+        pipeline: 元の学習済みscikit-learn Pipeline
+        onnx_path: ONNXモデルのパス
+        X: 入力データ。バッチサイズより行が少ない場合は行を繰り返して使う
+        batch_sizes: 計測するバッチサイズ（デフォルト: 1, 8, 64, 512, 4096）
+        n_runs: バッチサイズごとのレイテンシの計測回数
+        n_threads: ONNX Runtimeの演算スレッド数（Noneで全コア）
+
+    Returns:
+        dict: バッチサイズごとの batch_{N}_max_abs_error（確率の最大絶対誤差）、
+            batch_{N}_label_agreement（ラベルの一致率）、
+            batch_{N}_native_p50_ms, batch_{N}_native_p99_ms（scikit-learnのpredict_proba）、
+            batch_{N}_onnx_p50_ms, batch_{N}_onnx_p99_ms（ONNX Runtime）
+
+    Examples:
+        >>> report = run_parity_harness(pipeline, "models/iris_rf.onnx", X_test)
+        >>> report["batch_4096_label_agreement"]
+        1.0
+    """
+    sess = _create_session(onnx_path, n_threads)
+    input_name = sess.get_inputs()[0].name
+    label_name = sess.get_outputs()[0].name
+    metadata = sess.get_modelmeta().custom_metadata_map
+    probability_name = metadata.get("probability_output", sess.get_outputs()[1].name)
+    output_names = [label_name, probability_name]
+
+    X_float32 = X.astype(np.float32)
+    report: Dict[str, float] = {}
+    for batch_size in batch_sizes:
+        batch = np.resize(X_float32, (batch_size, X_float32.shape[1]))
+        onnx_labels, onnx_proba = sess.run(output_names, {input_name: batch})
+        if isinstance(onnx_proba, list):
+            # ZipMapの出力（行ごとの辞書）は2次元配列に変換する
+            onnx_proba = np.array([list(row.values()) for row in onnx_proba])
+
+        prefix = f"batch_{batch_size}"
+        report[f"{prefix}_max_abs_error"] = float(
+            np.max(np.abs(pipeline.predict_proba(batch) - onnx_proba))
+        )
+        report[f"{prefix}_label_agreement"] = float(
+            np.mean(pipeline.predict(batch) == onnx_labels)
+        )
+        report[f"{prefix}_native_p50_ms"], report[f"{prefix}_native_p99_ms"] = (
+            _latency_percentiles_ms(partial(pipeline.predict_proba, batch), n_runs)
+        )
+        report[f"{prefix}_onnx_p50_ms"], report[f"{prefix}_onnx_p99_ms"] = (
+            _latency_percentiles_ms(partial(sess.run, output_names, {input_name: batch}), n_runs)
+        )
+    return report
+
+
+def check_parity_report(
+    report: Dict[str, float],
+    max_abs_error: float = 0.05,
+    min_label_agreement: float = 1.0,
+    max_latency_ratio: Optional[float] = None,
+    latency_budget_ms: Optional[Dict[int, float]] = None,
+    baseline: Optional[Dict[str, float]] = None,
+    max_baseline_ratio: float = MAX_BASELINE_LATENCY_RATIO,
+) -> None:
+    """
+    run_parity_harnessの結果が基準を満たすか検証し、満たさない場合はエクスポートを失敗させる。
+
+    ランダムフォレストのONNXは閾値をfloat32で比較するため、閾値付近の行では一部の決定木の
+    分岐が変わり、確率が 1/n_estimators 単位でずれます。max_abs_errorのデフォルトは
+    100本の決定木のうち数本の分岐が変わる程度の誤差を許容します。
+
+    Args:
+        report: run_parity_harnessの結果
+        max_abs_error: 確率の最大絶対誤差の上限（デフォルト: 0.05）
+        min_label_agreement: ラベルの一致率の下限
+        max_latency_ratio: ONNX Runtimeのp50レイテンシの上限（scikit-learnのp50に対する倍率）。
+            Noneの場合は検証しない
+        latency_budget_ms: バッチサイズごとのONNX Runtimeのp99レイテンシの上限（ミリ秒）。
+            Noneの場合は検証しない
+        baseline: 前回検証を通過したモデルのrun_parity_harnessの結果（load_parity_baseline）。
+            Noneの場合、またはバッチサイズが含まれない場合は検証しない
+        max_baseline_ratio: ONNX Runtimeのp50レイテンシの上限（ベースラインのp50に対する倍率、
+            デフォルト: 2.0）
+
+    Raises:
+        ValueError: いずれかのバッチサイズで基準を満たさない場合（全ての違反を列挙する）
+    """
+    failures: List[str] = []
+    batch_sizes = sorted(
+        int(name.split("_")[1]) for name in report if name.endswith("_label_agreement")
+    )
+    for batch_size in batch_sizes:
+        prefix = f"batch_{batch_size}"
+        error = report[f"{prefix}_max_abs_error"]
+        if error > max_abs_error:
+            failures.append(f"{prefix}: max_abs_error {error:.2e} > {max_abs_error:.2e}")
+        agreement = report[f"{prefix}_label_agreement"]
+        if agreement < min_label_agreement:
+            failures.append(
+                f"{prefix}: label_agreement {agreement:.4f} < {min_label_agreement:.4f}"
+            )
+        onnx_p50 = report[f"{prefix}_onnx_p50_ms"]
+        native_p50 = report[f"{prefix}_native_p50_ms"]
+        if max_latency_ratio is not None and onnx_p50 > native_p50 * max_latency_ratio:
+            failures.append(
+                f"{prefix}: onnx p50 {onnx_p50:.3f} ms > {max_latency_ratio} x "
+                f"native p50 {native_p50:.3f} ms"
+            )
+        budget = (latency_budget_ms or {}).get(batch_size)
+        onnx_p99 = report[f"{prefix}_onnx_p99_ms"]
+        if budget is not None and onnx_p99 > budget:
+            failures.append(f"{prefix}: onnx p99 {onnx_p99:.3f} ms > budget {budget:.3f} ms")
+        baseline_p50 = (baseline or {}).get(f"{prefix}_onnx_p50_ms")
+        if baseline_p50 is not None and onnx_p50 > baseline_p50 * max_baseline_ratio:
+            failures.append(
+                f"{prefix}: onnx p50 {onnx_p50:.3f} ms > {max_baseline_ratio} x "
+                f"baseline p50 {baseline_p50:.3f} ms"
+            )
+
+    if failures:
+        raise ValueError("ONNX model failed parity/latency checks: " + "; ".join(failures))
+
+
+def load_parity_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    記録済みのパリティ・レイテンシのベースラインを読み込む。
+
+    Args:
+        path: save_parity_baselineで保存したJSONファイルのパス
+
+    Returns:
+        dict: モデル名（"original", "optimized" など）ごとのrun_parity_harnessの結果。
+            ファイルがない場合は空の辞書
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        baseline: Dict[str, Dict[str, float]] = json.load(f)
+    return baseline
+
+
+def save_parity_baseline(path: str, reports: Dict[str, Dict[str, float]]) -> None:
+    """
+    検証を通過したモデルのrun_parity_harnessの結果を次回のベースラインとして保存する。
+
+    レイテンシはマシンに依存するため、ベースラインは推論に使うものと同じ種類のマシンで記録します。
+
+    Args:
+        path: 保存先のJSONファイルのパス
+        reports: モデル名ごとのrun_parity_harnessの結果
+    """
+    with open(path, "w") as f:
+        json.dump(reports, f, indent=2, sort_keys=True)
+
+
+def run_export_gate(
+    pipeline: Pipeline,
+    onnx_paths: Dict[str, str],
+    X: np.ndarray,
+    baseline: Optional[Dict[str, Dict[str, float]]] = None,
+    max_latency_ratio: Optional[float] = None,
+    latency_budget_ms: Optional[Dict[int, float]] = None,
+    max_baseline_ratio: float = MAX_BASELINE_LATENCY_RATIO,
+    n_runs: int = 50,
+) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+    """
+    出荷する全てのONNXモデル（元のモデルと最適化・量子化済みモデル）をハーネスで検証する。
+
+    モデルごとにrun_parity_harnessを実行し、check_parity_reportの基準と、
+    baselineに同じ名前のモデルの結果がある場合はそのレイテンシからの回帰を検証します。
+    ファイルの削除やベースラインの保存は行わないため、呼び出し元で結果を記録してから判断できます。
+
+    Args:
+        pipeline: 元の学習済みscikit-learn Pipeline
+        onnx_paths: モデル名とONNXモデルのパス（例: {"original": ..., "optimized": ...}）
+        X: 入力データ（run_parity_harnessと同じ）
+        baseline: load_parity_baselineで読み込んだモデル名ごとのベースライン
+        max_latency_ratio: check_parity_reportに渡す（Noneの場合は検証しない）
+        latency_budget_ms: check_parity_reportに渡す（Noneの場合は検証しない）
+        max_baseline_ratio: check_parity_reportに渡す（デフォルト: 2.0）
+        n_runs: バッチサイズごとのレイテンシの計測回数
+
+    Returns:
+        Tuple[dict, list]: モデル名ごとのrun_parity_harnessの結果と、基準を満たさなかった
+            モデルのエラーメッセージのリスト（全て通過した場合は空）
+    """
+    reports: Dict[str, Dict[str, float]] = {}
+    failures: List[str] = []
+    for name, onnx_path in onnx_paths.items():
+        reports[name] = run_parity_harness(pipeline, onnx_path, X, n_runs=n_runs)
+        try:
+            check_parity_report(
+                reports[name],
+                max_latency_ratio=max_latency_ratio,
+                latency_budget_ms=latency_budget_ms,
+                baseline=(baseline or {}).get(name),
+                max_baseline_ratio=max_baseline_ratio,
+            )
+        except ValueError as e:
+            failures.append(f"{name}: {e}")
+    return reports, failures
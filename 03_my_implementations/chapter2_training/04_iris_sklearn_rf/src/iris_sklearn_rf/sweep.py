@@ -0,0 +1,406 @@
+"""
+ランダムフォレストのハイパーパラメータスイープモジュール。
+
+このモジュールはグリッドサーチまたはランダムサーチで生成した試行を
+プロセスプールに分配し、試行ごとに学習・評価・ONNXエクスポートを
+ワーカープロセス内で実行します。結果は完了した順に返されます。
+
+CPUコアはワーカー数 × 試行あたりのスレッド数（n_jobs）が
+コア数を超えないように割り当てます（過剰なスレッド生成を防ぐため）。
+
+使い方:
+    python -m iris_sklearn_rf.sweep --search grid
+    python -m iris_sklearn_rf.sweep --search random --n-trials 50 --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import mlflow
+import numpy as np
+from joblib import Memory
+from scipy.stats import randint
+from sklearn.model_selection import ParameterGrid, ParameterSampler
+from threadpoolctl import threadpool_limits
+
+from iris_sklearn_rf.data_loader import load_and_split_cached
+from iris_sklearn_rf.model import create_rf_pipeline
+from iris_sklearn_rf.onnx_exporter import export_to_onnx, validate_onnx_model
+from iris_sklearn_rf.trainer import evaluate_model, train_model
+
+# グリッドサーチのデフォルト探索空間（36試行）
+DEFAULT_PARAM_GRID: Dict[str, List[Any]] = {
+    "n_estimators": [50, 100, 200],
+    "max_depth": [None, 3, 5],
+    "min_samples_split": [2, 4],
+    "min_samples_leaf": [1, 2],
+}
+
+# ランダムサーチのデフォルト探索空間（リストは一様に選択、分布はrvsでサンプリング）
+DEFAULT_PARAM_DISTRIBUTIONS: Dict[str, Any] = {
+    "n_estimators": randint(20, 301),
+    "max_depth": [None, 2, 3, 4, 5, 6, 8, 10],
+    "min_samples_split": randint(2, 11),
+    "min_samples_leaf": randint(1, 5),
+}
+
+# 最良の試行を選ぶ評価指標
+SELECTION_METRIC = "accuracy"
+
+# ワーカープロセスごとのデータ（プロセス起動時に1回だけ受け渡す）
+_worker_data: Dict[str, np.ndarray] = {}
+
+
+@dataclass(frozen=True)
+class TrialResult:
+    """1試行の結果。"""
+
+    trial_id: int
+    params: Dict[str, Any]
+    metrics: Dict[str, float]
+    onnx_path: str
+    onnx_valid: bool
+    train_seconds: float
+    n_jobs: int
+
+
+def grid_trials(param_grid: Dict[str, Sequence[Any]] = DEFAULT_PARAM_GRID) -> List[Dict[str, Any]]:
+    """
+    グリッドサーチの試行（パラメータの全組み合わせ）を生成する。
+
+    Args:
+        param_grid: パラメータ名と候補値のリストの辞書
+
+    Returns:
+        List[Dict[str, Any]]: 試行ごとのパラメータの辞書のリスト
+    """
+    return list(ParameterGrid(param_grid))
+
+
+def random_trials(
+    n_trials: int,
+    param_distributions: Dict[str, Any] = DEFAULT_PARAM_DISTRIBUTIONS,
+    random_state: int = 42,
+) -> List[Dict[str, Any]]:
+    """
+    ランダムサーチの試行を生成する。
+
+    Args:
+        n_trials: 試行数
+        param_distributions: パラメータ名と候補値のリストまたはscipy.statsの分布の辞書
+        random_state: 再現性のための乱数シード
+
+    Returns:
+        List[Dict[str, Any]]: 試行ごとのパラメータの辞書のリスト
+    """
+    sampler = ParameterSampler(param_distributions, n_iter=n_trials, random_state=random_state)
+    # numpyの整数型をMLflowやJSONで扱えるようPythonの型に変換
+    return [
+        {
+            name: value.item() if isinstance(value, np.generic) else value
+            for name, value in params.items()
+        }
+        for params in sampler
+    ]
+
+
+def available_cpus() -> int:
+    """
+    このプロセスが使用できるCPUコア数を取得する。
+
+    Returns:
+        int: CPUアフィニティ（コンテナのCPU制限を含む）を考慮したコア数
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def plan_workers(
+    n_trials: int,
+    n_workers: Optional[int] = None,
+    n_jobs_per_trial: Optional[int] = None,
+    n_cpus: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    ワーカー数と試行あたりのスレッド数を決める。
+
+    未指定の場合は試行単位の並列を優先し（ワーカー数 = min(試行数, コア数)）、
+    余ったコアを試行内の並列（RandomForestのn_jobs）に割り当てます。
+    ワーカー数 × n_jobs がコア数を超えないようにします。
+    ワーカー数は指定した場合もコア数までに制限し、指定したスレッド数との積がコア数を
+    超える場合は警告します。
+
+    Args:
+        n_trials: 試行数
+        n_workers: ワーカープロセス数（Noneで自動）
+        n_jobs_per_trial: 試行あたりのスレッド数（Noneで自動）
+        n_cpus: 使用できるコア数（Noneでavailable_cpus()）
+
+    Returns:
+        Tuple[int, int]: (ワーカー数, 試行あたりのスレッド数)
+
+    Raises:
+        ValueError: 試行数・ワーカー数・スレッド数が1未満の場合
+    """
+    n_cpus = n_cpus or available_cpus()
+    if n_trials < 1:
+        raise ValueError(f"n_trials must be at least 1, got {n_trials}")
+    if n_workers is not None and n_workers < 1:
+        raise ValueError(f"n_workers must be at least 1, got {n_workers}")
+    if n_jobs_per_trial is not None and n_jobs_per_trial < 1:
+        raise ValueError(f"n_jobs_per_trial must be at least 1, got {n_jobs_per_trial}")
+
+    if n_workers is None:
+        n_workers = max(1, min(n_trials, n_cpus // (n_jobs_per_trial or 1)))
+    n_workers = min(n_workers, n_trials, n_cpus)
+    if n_jobs_per_trial is None:
+        n_jobs_per_trial = max(1, n_cpus // n_workers)
+    elif n_workers * n_jobs_per_trial > n_cpus:
+        warnings.warn(
+            f"{n_workers} workers x {n_jobs_per_trial} jobs per trial oversubscribes {n_cpus} CPUs",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    return n_workers, n_jobs_per_trial
+
+
+def _init_worker(
+    X_train: np.ndarray,
+    X_test: np.ndarray,
+    y_train: np.ndarray,
+    y_test: np.ndarray,
+    n_jobs: int,
+) -> None:
+    """
+    ワーカープロセスを初期化する（データの受け渡しとスレッド数の制限）。
+
+    Args:
+        X_train: 訓練用特徴量行列
+        X_test: テスト用特徴量行列
+        y_train: 訓練用ターゲットベクトル
+        y_test: テスト用ターゲットベクトル
+        n_jobs: このワーカーが使用できるスレッド数
+    """
+    _worker_data.update(X_train=X_train, X_test=X_test, y_train=y_train, y_test=y_test)
+    # numpy/BLASなどのネイティブスレッドプールも割り当て数に制限する
+    threadpool_limits(limits=n_jobs)
+
+
+def run_trial(
+    trial_id: int,
+    params: Dict[str, Any],
+    output_dir: str,
+    n_jobs: int = 1,
+    random_state: int = 42,
+    memory: Optional[Memory] = None,
+) -> TrialResult:
+    """
+    1試行の学習・評価・ONNXエクスポート・検証を実行する（ワーカープロセス内で実行）。
+
+    Args:
+        trial_id: 試行番号（ONNXファイル名に使用）
+        params: create_rf_pipelineに渡すハイパーパラメータ
+        output_dir: ONNXモデルの保存先ディレクトリ
+        n_jobs: 学習・検証に使うスレッド数
+        random_state: 再現性のための乱数シード
+        memory: StandardScalerのキャッシュ先（試行間で学習済みスケーラーを共有する）
+
+    Returns:
+        TrialResult: 試行の結果
+    """
+    start = time.perf_counter()
+    pipeline = create_rf_pipeline(
+        **params, random_state=random_state, n_jobs=n_jobs, memory=memory
+    )
+    fitted_pipeline = train_model(pipeline, _worker_data["X_train"], _worker_data["y_train"])
+    train_seconds = time.perf_counter() - start
+
+    metrics = evaluate_model(fitted_pipeline, _worker_data["X_test"], _worker_data["y_test"])
+
+    onnx_path = str(Path(output_dir) / f"iris_rf_trial_{trial_id:04d}.onnx")
+    export_to_onnx(fitted_pipeline, onnx_path)
+    onnx_valid = validate_onnx_model(
+        fitted_pipeline, onnx_path, _worker_data["X_test"], n_threads=n_jobs
+    )
+
+    return TrialResult(
+        trial_id=trial_id,
+        params=params,
+        metrics={name: float(value) for name, value in metrics.items()},
+        onnx_path=onnx_path,
+        onnx_valid=onnx_valid,
+        train_seconds=train_seconds,
+        n_jobs=n_jobs,
+    )
+
+
+def run_sweep(
+    trials: List[Dict[str, Any]],
+    X_train: np.ndarray,
+    X_test: np.ndarray,
+    y_train: np.ndarray,
+    y_test: np.ndarray,
+    output_dir: str = "models/sweep",
+    n_workers: Optional[int] = None,
+    n_jobs_per_trial: Optional[int] = None,
+    random_state: int = 42,
+    memory: Optional[Memory] = None,
+) -> Iterator[TrialResult]:
+    """
+    試行をプロセスプールで並列に実行し、完了した順に結果を返す。
+
+    ワーカーはspawnで起動します（親プロセスのスレッドプールをforkで引き継がないため）。
+    データはワーカーの起動時に1回だけ渡し、試行ごとにはパラメータのみを送ります。
+
+    Args:
+        trials: 試行ごとのハイパーパラメータのリスト
+        X_train: 訓練用特徴量行列
+        X_test: テスト用特徴量行列
+        y_train: 訓練用ターゲットベクトル
+        y_test: テスト用ターゲットベクトル
+        output_dir: ONNXモデルの保存先ディレクトリ
+        n_workers: ワーカープロセス数（Noneで自動）
+        n_jobs_per_trial: 試行あたりのスレッド数（Noneで自動）
+        random_state: 再現性のための乱数シード
+        memory: StandardScalerのキャッシュ先（Noneでキャッシュしない）。
+            全試行が同じ訓練データで学習するため、キャッシュ後の試行や再実行では
+            スケーラーの学習を省略する
+
+    Yields:
+        TrialResult: 完了した試行の結果
+    """
+    n_workers, n_jobs = plan_workers(len(trials), n_workers, n_jobs_per_trial)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(X_train, X_test, y_train, y_test, n_jobs),
+    ) as executor:
+        futures = [
+            executor.submit(
+                run_trial, trial_id, params, output_dir, n_jobs, random_state, memory
+            )
+            for trial_id, params in enumerate(trials)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def log_trial(result: TrialResult) -> None:
+    """
+    試行の結果をMLflowのネストしたRunとして記録する。
+
+    Args:
+        result: 試行の結果
+    """
+    with mlflow.start_run(run_name=f"trial_{result.trial_id:04d}", nested=True):
+        mlflow.log_params(
+            {name: value if value is not None else "None" for name, value in result.params.items()}
+        )
+        mlflow.log_param("n_jobs", result.n_jobs)
+        mlflow.log_metrics({**result.metrics, "train_seconds": result.train_seconds})
+        mlflow.log_param("onnx_valid", result.onnx_valid)
+        mlflow.log_artifact(result.onnx_path)
+
+
+def main() -> None:
+    """ハイパーパラメータスイープを実行する。"""
+    parser = argparse.ArgumentParser(description="Random forest hyperparameter sweep")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid", help="探索方法")
+    parser.add_argument("--n-trials", type=int, default=30, help="ランダムサーチの試行数")
+    parser.add_argument("--workers", type=int, default=None, help="ワーカープロセス数（省略時は自動）")
+    parser.add_argument(
+        "--jobs-per-trial", type=int, default=None, help="試行あたりのスレッド数（省略時は自動）"
+    )
+    parser.add_argument("--output-dir", type=str, default="models/sweep", help="ONNXモデルの保存先")
+    parser.add_argument("--random-state", type=int, default=42, help="乱数シード")
+    parser.add_argument("--no-mlflow", action="store_true", help="MLflowに記録しない")
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=".cache",
+        help="データ分割・学習済みスケーラーのキャッシュ先（空文字でキャッシュしない）",
+    )
+    args = parser.parse_args()
+
+    if args.search == "grid":
+        trials = grid_trials()
+    else:
+        trials = random_trials(args.n_trials, random_state=args.random_state)
+    n_workers, n_jobs = plan_workers(len(trials), args.workers, args.jobs_per_trial)
+
+    print("=" * 80)
+    print("Iris Random Forest Classification - Hyperparameter Sweep")
+    print("=" * 80)
+    print(f"  - 探索方法: {args.search} ({len(trials)} 試行)")
+    print(f"  - ワーカー数: {n_workers} × 試行あたりのスレッド数: {n_jobs} (CPU: {available_cpus()})")
+
+    memory = Memory(args.cache_dir or None, verbose=0)
+    X_train, X_test, y_train, y_test = load_and_split_cached(
+        memory, random_state=args.random_state
+    )
+
+    if not args.no_mlflow:
+        mlflow.set_experiment("iris_random_forest_sweep")
+        mlflow.start_run(run_name=f"sweep_{args.search}")
+        mlflow.log_params({"search": args.search, "n_trials": len(trials), "n_workers": n_workers})
+
+    best: Optional[TrialResult] = None
+    start = time.perf_counter()
+    try:
+        results = run_sweep(
+            trials,
+            X_train,
+            X_test,
+            y_train,
+            y_test,
+            output_dir=args.output_dir,
+            n_workers=n_workers,
+            n_jobs_per_trial=n_jobs,
+            random_state=args.random_state,
+            memory=memory,
+        )
+        for done, result in enumerate(results, start=1):
+            score = result.metrics[SELECTION_METRIC]
+            status = "✓" if result.onnx_valid else "✗"
+            print(
+                f"  [{done:>3}/{len(trials)}] trial {result.trial_id:04d} "
+                f"{SELECTION_METRIC}={score:.4f} onnx={status} "
+                f"({result.train_seconds:.2f}s) {result.params}"
+            )
+            if not args.no_mlflow:
+                log_trial(result)
+            if best is None or score > best.metrics[SELECTION_METRIC]:
+                best = result
+        elapsed = time.perf_counter() - start
+
+        if not args.no_mlflow and best is not None:
+            best_score = best.metrics[SELECTION_METRIC]
+            mlflow.log_metrics({f"best_{SELECTION_METRIC}": best_score, "wall_seconds": elapsed})
+            mlflow.log_param("best_trial_id", best.trial_id)
+    finally:
+        if not args.no_mlflow:
+            mlflow.end_run()
+
+    print("\n" + "=" * 80)
+    print(f"スイープが完了しました（{elapsed:.1f}秒）")
+    if best is not None:
+        best_score = best.metrics[SELECTION_METRIC]
+        print(f"  - 最良の試行: {best.trial_id:04d} {SELECTION_METRIC}={best_score:.4f}")
+        print(f"  - パラメータ: {best.params}")
+        print(f"  - ONNXモデル: {best.onnx_path}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
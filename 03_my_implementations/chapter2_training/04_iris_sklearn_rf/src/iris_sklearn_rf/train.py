@@ -14,11 +14,20 @@ from pathlib import Path
 
 import mlflow
 import mlflow.sklearn
-
-from iris_sklearn_rf.data_loader import load_iris_data, split_data
-from iris_sklearn_rf.model import create_rf_pipeline
-from iris_sklearn_rf.onnx_exporter import export_to_onnx, validate_onnx_model
-from iris_sklearn_rf.trainer import evaluate_model, train_model
+from joblib import Memory
+
+from iris_sklearn_rf.data_loader import load_and_split_cached
+from iris_sklearn_rf.model import create_rf_pipeline, without_cache
+from iris_sklearn_rf.onnx_exporter import (
+    compare_onnx_models,
+    export_to_onnx,
+    load_parity_baseline,
+    optimize_onnx_model,
+    run_export_gate,
+    save_parity_baseline,
+    validate_onnx_model,
+)
+from iris_sklearn_rf.trainer import cross_validate_model, evaluate_model, train_model
 
 
 def main() -> None:
@@ -30,6 +39,18 @@ def main() -> None:
     n_estimators = 100
     max_depth = None  # 深さ無制限
     test_size = 0.2
+    cv_folds = 5
+    cv_repeats = 2
+    # ONNXモデルのレイテンシ上限（オプトイン、Noneで検証しない）
+    # - scikit-learnのp50に対する倍率（少ない計測回数のp50はばらつくため、既定では比較しない）
+    # - バッチサイズごとのp99の上限（ミリ秒、例: {1: 1.0, 4096: 50.0}）
+    # 既定では前回通過したモデルのレイテンシ（ベースライン）からの回帰のみを検証する
+    max_onnx_latency_ratio = None
+    onnx_latency_budget_ms = None
+
+    # データの読み込み・分割とStandardScalerの学習結果のキャッシュ先
+    # （環境変数CACHE_DIRで変更、空文字でキャッシュしない）
+    memory = Memory(os.getenv("CACHE_DIR", ".cache") or None, verbose=0)
 
     print("=" * 80)
     print("Iris Random Forest Classification - Training Pipeline")
@@ -37,13 +58,11 @@ def main() -> None:
 
     # 1. データの読み込みと分割
     print("\n[1/5] データを読み込み中...")
-    X, y = load_iris_data()
-    print(f"  - データセット形状: {X.shape}")
-    print(f"  - クラス数: {len(set(y))}")
-
-    X_train, X_test, y_train, y_test = split_data(
-        X, y, test_size=test_size, random_state=random_state, stratify=True
+    X_train, X_test, y_train, y_test = load_and_split_cached(
+        memory, test_size=test_size, random_state=random_state, stratify=True
     )
+    print(f"  - データセット形状: ({len(X_train) + len(X_test)}, {X_train.shape[1]})")
+    print(f"  - クラス数: {len(set(y_train))}")
     print(f"  - 訓練セット: {X_train.shape[0]} サンプル")
     print(f"  - テストセット: {X_test.shape[0]} サンプル")
 
@@ -52,7 +71,8 @@ def main() -> None:
     pipeline = create_rf_pipeline(
         n_estimators=n_estimators,
         max_depth=max_depth,
-        random_state=random_state
+        random_state=random_state,
+        memory=memory,
     )
     fitted_pipeline = train_model(pipeline, X_train, y_train)
     print(f"  - モデル: RandomForestClassifier")
@@ -66,6 +86,27 @@ def main() -> None:
     for metric_name, metric_value in metrics.items():
         print(f"    - {metric_name}: {metric_value:.4f}")
 
+    # 訓練データでの交差検証（フォールドをワーカープロセスで並列に評価）
+    cv_metrics = cross_validate_model(
+        create_rf_pipeline(
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            random_state=random_state,
+            memory=memory,
+        ),
+        X_train,
+        y_train,
+        n_splits=cv_folds,
+        n_repeats=cv_repeats,
+        random_state=random_state,
+    )
+    print(f"  - 交差検証（{cv_folds}分割 × {cv_repeats}回）:")
+    for metric_name in metrics:
+        print(
+            f"    - {metric_name}: {cv_metrics[f'cv_{metric_name}_mean']:.4f} "
+            f"± {cv_metrics[f'cv_{metric_name}_std']:.4f}"
+        )
+
     # 4. MLflowへのログ記録
     print("\n[4/5] MLflowにログ記録中...")
     experiment_name = "iris_random_forest"
@@ -77,13 +118,18 @@ def main() -> None:
         mlflow.log_param("max_depth", max_depth if max_depth is not None else "None")
         mlflow.log_param("random_state", random_state)
         mlflow.log_param("test_size", test_size)
+        mlflow.log_param("cv_folds", cv_folds)
+        mlflow.log_param("cv_repeats", cv_repeats)
 
         # メトリクスの記録
         for metric_name, metric_value in metrics.items():
             mlflow.log_metric(metric_name, metric_value)
 
-        # モデルの記録
-        mlflow.sklearn.log_model(fitted_pipeline, "model")
+        # 交差検証の平均・標準偏差は1回のバッチで記録
+        mlflow.log_metrics(cv_metrics)
+
+        # モデルの記録（キャッシュ先は含めない）
+        mlflow.sklearn.log_model(without_cache(fitted_pipeline), "model")
 
         # 参照用にRun IDを取得
         run_id = mlflow.active_run().info.run_id
@@ -106,6 +152,69 @@ def main() -> None:
     else:
         print("  - ONNX検証: ✗ 失敗")
 
+    # グラフ最適化を適用したモデルを隣に保存（出荷する全てのモデルを検証するため、検証より先に作成）
+    optimized_path = optimize_onnx_model(str(onnx_path))
+    onnx_paths = {"original": str(onnx_path), "optimized": optimized_path}
+
+    # 出荷する全てのモデルについて、バッチサイズごとの確率・ラベル・レイテンシを検証
+    # （基準を満たさない場合、または前回通過したモデルからレイテンシが回帰した場合は失敗させる）
+    baseline_path = onnx_dir / "iris_rf.parity.json"
+    parity_reports, parity_failures = run_export_gate(
+        fitted_pipeline,
+        onnx_paths,
+        X_test,
+        baseline=load_parity_baseline(str(baseline_path)),
+        max_latency_ratio=max_onnx_latency_ratio,
+        latency_budget_ms=onnx_latency_budget_ms,
+    )
+    for name, parity_report in parity_reports.items():
+        print(f"  - パリティ・レイテンシ（{name}、p50 / p99 ms）:")
+        for batch_size in sorted(
+            int(key.split("_")[1]) for key in parity_report if key.endswith("_label_agreement")
+        ):
+            prefix = f"batch_{batch_size}"
+            print(
+                f"    - バッチ{batch_size:>5}: 誤差 {parity_report[f'{prefix}_max_abs_error']:.2e}, "
+                f"一致率 {parity_report[f'{prefix}_label_agreement']:.4f}, "
+                f"sklearn {parity_report[f'{prefix}_native_p50_ms']:.3f} / "
+                f"{parity_report[f'{prefix}_native_p99_ms']:.3f}, "
+                f"ONNX {parity_report[f'{prefix}_onnx_p50_ms']:.3f} / "
+                f"{parity_report[f'{prefix}_onnx_p99_ms']:.3f}"
+            )
+    with mlflow.start_run(run_id=run_id):
+        for name, parity_report in parity_reports.items():
+            metric_prefix = "onnx_parity" if name == "original" else f"onnx_parity_{name}"
+            mlflow.log_metrics(
+                {f"{metric_prefix}_{key}": value for key, value in parity_report.items()}
+            )
+    if parity_failures:
+        # 基準を満たさないモデルは出力先に残さない
+        for path in onnx_paths.values():
+            os.remove(path)
+        raise ValueError("ONNX export gate failed: " + " | ".join(parity_failures))
+    save_parity_baseline(str(baseline_path), parity_reports)
+
+    # 元のモデルと最適化済みモデルのサイズ・レイテンシ・精度を比較
+    report = compare_onnx_models(fitted_pipeline, str(onnx_path), optimized_path, X_test, y_test)
+    print(f"  - 最適化済みONNXモデル: {optimized_path}")
+    print(
+        f"    - サイズ: {report['original_size_bytes']:.0f} → "
+        f"{report['optimized_size_bytes']:.0f} bytes"
+    )
+    print(
+        f"    - レイテンシ（1行）: {report['original_single_row_ms']:.3f} → "
+        f"{report['optimized_single_row_ms']:.3f} ms"
+    )
+    print(
+        f"    - レイテンシ（{len(X_test)}行）: {report['original_batch_ms']:.3f} → "
+        f"{report['optimized_batch_ms']:.3f} ms"
+    )
+    print(f"    - 精度の差: {report['accuracy_delta']:+.4f}")
+    print(f"    - ONNX検証: {'✓ 成功' if report['optimized_valid'] else '✗ 失敗'}")
+
+    with mlflow.start_run(run_id=run_id):
+        mlflow.log_metrics({f"onnx_{name}": value for name, value in report.items()})
+
     print("\n" + "=" * 80)
     print("学習パイプラインが正常に完了しました！")
     print("=" * 80)
@@ -0,0 +1,112 @@
+"""
+メモリに載りきらないデータ向けの逐次学習スクリプト。
+
+CSV/Parquetファイルをチャンクごとに読み込み、StandardScalerとSGDClassifierの
+パイプラインをpartial_fitで学習します。学習済みモデルはtrain.pyと同じ
+ONNXエクスポート・検証・グラフ最適化の処理でエクスポートします。
+
+使用例:
+    python -m iris_sklearn_rf.train_incremental \\
+        --train-path data/train.csv --test-path data/test.csv --chunk-size 10000
+"""
+
+import argparse
+from pathlib import Path
+
+import mlflow
+
+from iris_sklearn_rf.data_loader import IRIS_FEATURE_COLUMNS, ChunkedDataSource
+from iris_sklearn_rf.model import create_incremental_pipeline
+from iris_sklearn_rf.onnx_exporter import (
+    export_to_onnx,
+    optimize_onnx_model,
+    validate_onnx_model,
+)
+from iris_sklearn_rf.trainer import evaluate_incremental, train_incremental
+
+
+def parse_args() -> argparse.Namespace:
+    """コマンドライン引数を解析する。"""
+    parser = argparse.ArgumentParser(description="Train an incremental Iris classifier")
+    parser.add_argument("--train-path", required=True, help="学習データ（CSV/Parquet）")
+    parser.add_argument("--test-path", required=True, help="評価データ（CSV/Parquet）")
+    parser.add_argument(
+        "--feature-columns",
+        nargs="+",
+        default=list(IRIS_FEATURE_COLUMNS),
+        help="特徴量の列名",
+    )
+    parser.add_argument("--label-column", default="label", help="ラベルの列名")
+    parser.add_argument(
+        "--classes", nargs="+", type=int, default=[0, 1, 2], help="全クラスのラベル"
+    )
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="1チャンクの行数")
+    parser.add_argument("--epochs", type=int, default=5, help="学習のエポック数")
+    parser.add_argument("--alpha", type=float, default=0.0001, help="L2正則化の強さ")
+    parser.add_argument(
+        "--onnx-path", default="models/iris_sgd.onnx", help="ONNXモデルの保存先"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """チャンク単位の学習パイプラインを実行する。"""
+    args = parse_args()
+
+    train_source = ChunkedDataSource(
+        args.train_path, args.feature_columns, args.label_column, args.chunk_size
+    )
+    test_source = ChunkedDataSource(
+        args.test_path, args.feature_columns, args.label_column, args.chunk_size
+    )
+
+    print("=" * 80)
+    print("Iris Incremental Classification - Training Pipeline")
+    print("=" * 80)
+
+    # 1. チャンクごとの学習
+    print(f"\n[1/4] チャンクごとに学習中（{args.chunk_size}行 × {args.epochs}エポック）...")
+    pipeline = create_incremental_pipeline(alpha=args.alpha)
+    train_incremental(pipeline, train_source, args.classes, n_epochs=args.epochs)
+
+    # 2. チャンクごとの評価
+    print("\n[2/4] チャンクごとに評価中...")
+    metrics = evaluate_incremental(pipeline, test_source, args.classes)
+    for metric_name, metric_value in metrics.items():
+        print(f"    - {metric_name}: {metric_value:.4f}")
+
+    # 3. ONNXへのエクスポート（train.pyと同じ処理）
+    print("\n[3/4] ONNXにエクスポート中...")
+    onnx_path = Path(args.onnx_path)
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    export_to_onnx(pipeline, str(onnx_path))
+    X_sample, _ = next(iter(test_source))
+    is_valid = validate_onnx_model(pipeline, str(onnx_path), X_sample)
+    optimized_path = optimize_onnx_model(str(onnx_path))
+    print(f"  - ONNXモデル保存先: {onnx_path}")
+    print(f"  - 最適化済みONNXモデル: {optimized_path}")
+    print(f"  - ONNX検証: {'✓ 成功' if is_valid else '✗ 失敗'}")
+
+    # 4. MLflowへのログ記録
+    print("\n[4/4] MLflowにログ記録中...")
+    mlflow.set_experiment("iris_incremental")
+    with mlflow.start_run():
+        mlflow.log_params(
+            {
+                "model": "SGDClassifier",
+                "chunk_size": args.chunk_size,
+                "epochs": args.epochs,
+                "alpha": args.alpha,
+            }
+        )
+        mlflow.log_metrics({**metrics, "onnx_valid": float(is_valid)})
+        mlflow.log_artifact(str(onnx_path))
+        print(f"  - MLflow run ID: {mlflow.active_run().info.run_id}")
+
+    print("\n" + "=" * 80)
+    print("学習パイプラインが正常に完了しました！")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
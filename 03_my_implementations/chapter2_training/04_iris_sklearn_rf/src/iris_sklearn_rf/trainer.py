@@ -2,14 +2,32 @@
 モデルの学習と評価モジュール。
 
 このモジュールは機械学習モデルの学習と評価を行う機能を提供します。
+k分割交差検証のフォールドを複数プロセスで並列に評価する機能も提供します。
+メモリに載りきらないデータをチャンクごとに学習・評価する機能も提供します。
 """
 
-from typing import Dict
+from typing import Dict, Iterable, Sequence, Tuple
 
 import numpy as np
-from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.metrics import (
+    accuracy_score,
+    confusion_matrix,
+    f1_score,
+    precision_score,
+    recall_score,
+)
+from sklearn.model_selection import RepeatedStratifiedKFold, cross_validate
 from sklearn.pipeline import Pipeline
 
+# 交差検証で計算するメトリクス（evaluate_modelと同じメトリクス名とscikit-learnのscorer名）
+CV_SCORING = {
+    "accuracy": "accuracy",
+    "f1_score_macro": "f1_macro",
+    "f1_score_weighted": "f1_weighted",
+    "precision_macro": "precision_macro",
+    "recall_macro": "recall_macro",
+}
+
 
 def train_model(pipeline: Pipeline, X_train: np.ndarray, y_train: np.ndarray) -> Pipeline:
     """
@@ -57,3 +75,155 @@ def evaluate_model(pipeline: Pipeline, X_test: np.ndarray, y_test: np.ndarray) -
     }
 
     return metrics
+
+
+def cross_validate_model(
+    pipeline: Pipeline,
+    X: np.ndarray,
+    y: np.ndarray,
+    n_splits: int = 5,
+    n_repeats: int = 1,
+    n_jobs: int = -1,
+    random_state: int = 42,
+) -> Dict[str, float]:
+    """
+    層化k分割交差検証でモデルを評価する。
+
+    各フォールドの学習と評価はワーカープロセスで並列に実行されるため、
+    フォールド数分のコアがあれば1回の学習とほぼ同じ時間で終わります。
+    パイプラインはフォールドごとに複製して学習されるため、渡したパイプラインは変更されません。
+    RandomForestの`n_jobs`を指定している場合は、プロセス数とスレッド数の積がコア数を
+    超えないように`n_jobs`を調整してください。
+
+    Args:
+        pipeline: 未学習のscikit-learn Pipeline
+        X: 特徴量行列
+        y: ターゲットベクトル
+        n_splits: 分割数
+        n_repeats: 分割を変えて繰り返す回数
+        n_jobs: 並列に実行するプロセス数（-1で全コア）
+        random_state: 分割の乱数シード
+
+    Returns:
+        Dict[str, float]: evaluate_modelの各メトリクスの平均（cv_<name>_mean）と
+            標準偏差（cv_<name>_std）
+    """
+    cv = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+    scores = cross_validate(pipeline, X, y, cv=cv, scoring=CV_SCORING, n_jobs=n_jobs)
+
+    # フォールドごとのスコアを平均と標準偏差に集約
+    metrics = {}
+    for name in CV_SCORING:
+        metrics[f"cv_{name}_mean"] = float(np.mean(scores[f"test_{name}"]))
+        metrics[f"cv_{name}_std"] = float(np.std(scores[f"test_{name}"]))
+
+    return metrics
+
+
+def train_incremental(
+    pipeline: Pipeline,
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray]],
+    classes: Sequence[int],
+    n_epochs: int = 5,
+) -> Pipeline:
+    """
+    データをチャンクごとに読み込んでパイプラインを逐次学習する。
+
+    1パス目でスケーラーの平均・分散をpartial_fitで集計し、2パス目以降で
+    標準化したチャンクを分類器のpartial_fitに渡します。一度に保持するのは
+    1チャンク分だけなので、データ全体がメモリに載らなくても学習できます。
+
+    SGDは読み込んだ順にパラメータを更新するため、ファイルの行はクラスが偏らないよう
+    事前にシャッフルしておいてください（クラス順に並んだファイルでは精度が下がります）。
+
+    Args:
+        pipeline: create_incremental_pipelineで作成したPipeline
+            （"scaler"と"classifier"がpartial_fitを持つ）
+        chunks: (X_chunk, y_chunk) を返す再イテレート可能なデータ
+            （ChunkedDataSourceなど）
+        classes: 全クラスのラベル（最初のチャンクに全クラスが含まれるとは限らないため）
+        n_epochs: 分類器の学習でデータ全体を読み込む回数
+
+    Returns:
+        Pipeline: 学習済みパイプライン
+
+    Raises:
+        ValueError: n_epochsが1未満、またはデータが空の場合
+    """
+    if n_epochs < 1:
+        raise ValueError(f"n_epochs must be >= 1, got {n_epochs}")
+
+    scaler = pipeline.named_steps["scaler"]
+    classifier = pipeline.named_steps["classifier"]
+
+    # 1パス目: 標準化の統計量を集計
+    n_samples = 0
+    for X_chunk, _ in chunks:
+        scaler.partial_fit(X_chunk)
+        n_samples += len(X_chunk)
+    if n_samples == 0:
+        raise ValueError("No training data in chunks")
+
+    # 2パス目以降: 確定した統計量で標準化して分類器を学習
+    for _ in range(n_epochs):
+        for X_chunk, y_chunk in chunks:
+            classifier.partial_fit(scaler.transform(X_chunk), y_chunk, classes=classes)
+
+    return pipeline
+
+
+def evaluate_incremental(
+    pipeline: Pipeline,
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray]],
+    classes: Sequence[int],
+) -> Dict[str, float]:
+    """
+    データをチャンクごとに読み込んで学習済みモデルを評価する。
+
+    チャンクごとの混同行列を足し合わせてからメトリクスを計算するため、
+    evaluate_modelと同じ値を、予測結果全体を保持せずに求められます。
+
+    Args:
+        pipeline: 学習済みscikit-learn Pipeline
+        chunks: (X_chunk, y_chunk) を返すデータ（ChunkedDataSourceなど）
+        classes: 全クラスのラベル
+
+    Returns:
+        Dict[str, float]: evaluate_modelと同じメトリクスの辞書
+
+    Raises:
+        ValueError: データが空の場合
+    """
+    matrix = np.zeros((len(classes), len(classes)), dtype=np.int64)
+    for X_chunk, y_chunk in chunks:
+        matrix += confusion_matrix(y_chunk, pipeline.predict(X_chunk), labels=classes)
+    if matrix.sum() == 0:
+        raise ValueError("No evaluation data in chunks")
+
+    # クラスごとの適合率・再現率・F1（分母が0のクラスは0、scikit-learnのデフォルトと同じ）
+    true_positives = np.diag(matrix).astype(np.float64)
+    support = matrix.sum(axis=1)
+    predicted = matrix.sum(axis=0)
+    precision = np.divide(
+        true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0
+    )
+    recall = np.divide(
+        true_positives, support, out=np.zeros_like(true_positives), where=support > 0
+    )
+    f1_denominator = precision + recall
+    f1 = np.divide(
+        2 * precision * recall,
+        f1_denominator,
+        out=np.zeros_like(true_positives),
+        where=f1_denominator > 0,
+    )
+
+    # evaluate_modelと同様に、データに現れたクラスだけで平均する
+    present = (support + predicted) > 0
+    return {
+        "accuracy": float(true_positives.sum() / matrix.sum()),
+        "f1_score_macro": float(f1[present].mean()),
+        "f1_score_weighted": float(np.average(f1, weights=support)),
+        "precision_macro": float(precision[present].mean()),
+        "recall_macro": float(recall[present].mean()),
+    }
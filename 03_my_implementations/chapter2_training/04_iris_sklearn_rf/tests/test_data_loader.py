@@ -5,8 +5,18 @@ Irisデータセットの読み込みと分割機能をテストします。
 """
 
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from joblib import Memory
 
-from iris_sklearn_rf.data_loader import load_iris_data, split_data
+from iris_sklearn_rf.data_loader import (
+    IRIS_FEATURE_COLUMNS,
+    ChunkedDataSource,
+    load_and_split_cached,
+    load_iris_data,
+    split_data,
+)
 
 
 class TestLoadIrisData:
@@ -107,3 +117,109 @@ class TestSplitData:
         # Check total samples
         total_samples = X_train.shape[0] + X_test.shape[0]
         assert total_samples == X.shape[0], "Train + test should equal total samples"
+
+
+def _write_iris_files(tmp_path):
+    """Write the Iris dataset as CSV and Parquet files with a label column."""
+    X, y = load_iris_data()
+    csv_path = tmp_path / "iris.csv"
+    np.savetxt(
+        csv_path,
+        np.column_stack([X, y]),
+        delimiter=",",
+        header=",".join([*IRIS_FEATURE_COLUMNS, "label"]),
+        comments="",
+    )
+    parquet_path = tmp_path / "iris.parquet"
+    table = pa.table({**{name: X[:, i] for i, name in enumerate(IRIS_FEATURE_COLUMNS)}, "label": y})
+    pq.write_table(table, parquet_path, row_group_size=64)
+    return X, y, str(csv_path), str(parquet_path)
+
+
+class TestLoadAndSplitCached:
+    """Test cases for load_and_split_cached function."""
+
+    def test_cached_split_matches_split_data(self, tmp_path) -> None:
+        """Test that the cached split equals an uncached load and split."""
+        memory = Memory(tmp_path, verbose=0)
+
+        cached = load_and_split_cached(memory, test_size=0.2, random_state=0)
+        X, y = load_iris_data()
+        expected = split_data(X, y, test_size=0.2, random_state=0)
+
+        for cached_array, expected_array in zip(cached, expected):
+            np.testing.assert_array_equal(cached_array, expected_array)
+
+    def test_split_is_keyed_by_data_and_params(self, tmp_path) -> None:
+        """Test that the split cache key covers the data fingerprint and split parameters."""
+        memory = Memory(tmp_path, verbose=0)
+        cached_split = memory.cache(split_data)
+        X, y = load_iris_data()
+
+        load_and_split_cached(memory, test_size=0.2, random_state=42)
+
+        assert cached_split.check_call_in_cache(
+            X, y, test_size=0.2, random_state=42, stratify=True
+        )
+        assert not cached_split.check_call_in_cache(
+            X, y, test_size=0.3, random_state=42, stratify=True
+        )
+        assert not cached_split.check_call_in_cache(
+            X + 1.0, y, test_size=0.2, random_state=42, stratify=True
+        )
+
+
+class TestChunkedDataSource:
+    """Test cases for ChunkedDataSource."""
+
+    @pytest.mark.parametrize("file_format", ["csv", "parquet"])
+    def test_chunks_cover_whole_file(self, tmp_path, file_format: str) -> None:
+        """Test that chunks are bounded by chunk_size and concatenate to the full data."""
+        X, y, csv_path, parquet_path = _write_iris_files(tmp_path)
+        path = csv_path if file_format == "csv" else parquet_path
+        source = ChunkedDataSource(path, IRIS_FEATURE_COLUMNS, "label", chunk_size=40)
+
+        chunks = list(source)
+
+        assert all(len(X_chunk) <= 40 for X_chunk, _ in chunks)
+        np.testing.assert_allclose(np.concatenate([X_chunk for X_chunk, _ in chunks]), X)
+        np.testing.assert_array_equal(np.concatenate([y_chunk for _, y_chunk in chunks]), y)
+        assert chunks[0][1].dtype == np.int64
+
+    def test_csv_chunks_have_fixed_size(self, tmp_path) -> None:
+        """Test that every CSV chunk except the last has exactly chunk_size rows."""
+        _, _, csv_path, _ = _write_iris_files(tmp_path)
+
+        source = ChunkedDataSource(csv_path, IRIS_FEATURE_COLUMNS, "label", chunk_size=64)
+
+        sizes = [len(X_chunk) for X_chunk, _ in source]
+
+        assert sizes == [64, 64, 22]
+
+    def test_column_selection_and_order(self, tmp_path) -> None:
+        """Test that only the requested columns are returned in the requested order."""
+        X, _, csv_path, _ = _write_iris_files(tmp_path)
+        columns = ["petal_width", "sepal_length"]
+
+        X_chunk, _ = next(iter(ChunkedDataSource(csv_path, columns, "label", chunk_size=10)))
+
+        np.testing.assert_allclose(X_chunk, X[:10][:, [3, 0]])
+
+    def test_can_be_iterated_repeatedly(self, tmp_path) -> None:
+        """Test that each iteration starts again from the beginning of the file."""
+        _, _, csv_path, _ = _write_iris_files(tmp_path)
+        source = ChunkedDataSource(csv_path, IRIS_FEATURE_COLUMNS, "label", chunk_size=50)
+
+        assert sum(len(y_chunk) for _, y_chunk in source) == 150
+        assert sum(len(y_chunk) for _, y_chunk in source) == 150
+
+    def test_invalid_arguments(self, tmp_path) -> None:
+        """Test that bad chunk sizes, formats and columns raise errors."""
+        _, _, csv_path, _ = _write_iris_files(tmp_path)
+
+        with pytest.raises(ValueError):
+            ChunkedDataSource(csv_path, IRIS_FEATURE_COLUMNS, "label", chunk_size=0)
+        with pytest.raises(ValueError):
+            ChunkedDataSource("iris.json", IRIS_FEATURE_COLUMNS, "label")
+        with pytest.raises(KeyError):
+            list(ChunkedDataSource(csv_path, ["unknown"], "label"))
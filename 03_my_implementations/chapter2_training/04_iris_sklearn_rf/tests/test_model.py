@@ -4,11 +4,14 @@ modelモジュールのユニットテスト。
 モデルパイプラインの構築と設定をテストします。
 """
 
+from joblib import Memory
+from sklearn.datasets import load_iris
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
-from iris_sklearn_rf.model import create_rf_pipeline
+from iris_sklearn_rf.model import create_incremental_pipeline, create_rf_pipeline, without_cache
 
 
 class TestCreateRFPipeline:
@@ -111,3 +114,48 @@ class TestCreateRFPipeline:
 
         assert predictions.shape == (1,), "Should predict for 1 sample"
         assert predictions[0] in [0, 1, 2], "Prediction should be one of the classes"
+
+    def test_create_rf_pipeline_caches_fitted_scaler(self, tmp_path) -> None:
+        """Test that memory reuses the fitted scaler for the same training data."""
+        memory = Memory(tmp_path, verbose=0)
+        X, y = load_iris(return_X_y=True)
+
+        create_rf_pipeline(n_estimators=5, memory=memory).fit(X, y)
+        create_rf_pipeline(n_estimators=20, memory=memory).fit(X, y)
+        assert len(list(tmp_path.rglob("output.pkl"))) == 1, "Scaler should be fitted once"
+
+        create_rf_pipeline(n_estimators=5, memory=memory).fit(X[:100], y[:100])
+        assert len(list(tmp_path.rglob("output.pkl"))) == 2, "New data should refit the scaler"
+
+    def test_without_cache(self, tmp_path) -> None:
+        """Test that the detached pipeline predicts the same and the original keeps its memory."""
+        memory = Memory(tmp_path, verbose=0)
+        X, y = load_iris(return_X_y=True)
+        pipeline = create_rf_pipeline(n_estimators=5, memory=memory).fit(X, y)
+
+        detached = without_cache(pipeline)
+
+        assert detached.memory is None
+        assert pipeline.memory is memory
+        assert (detached.predict(X) == pipeline.predict(X)).all()
+
+
+class TestCreateIncrementalPipeline:
+    """Test cases for create_incremental_pipeline function."""
+
+    def test_steps_support_partial_fit(self) -> None:
+        """Test that both steps can be trained chunk by chunk."""
+        pipeline = create_incremental_pipeline()
+
+        assert [name for name, _ in pipeline.steps] == ["scaler", "classifier"]
+        assert isinstance(pipeline.named_steps["classifier"], SGDClassifier)
+        assert all(hasattr(step, "partial_fit") for _, step in pipeline.steps)
+
+    def test_classifier_outputs_probabilities(self) -> None:
+        """Test that the classifier uses log loss so predict_proba is available."""
+        pipeline = create_incremental_pipeline(alpha=0.001, random_state=0)
+
+        classifier = pipeline.named_steps["classifier"]
+        assert classifier.loss == "log_loss"
+        assert classifier.alpha == 0.001
+        assert classifier.random_state == 0
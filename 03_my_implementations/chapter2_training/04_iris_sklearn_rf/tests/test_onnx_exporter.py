@@ -4,14 +4,28 @@ onnx_exporterモジュールのユニットテスト。
 ONNXモデルのエクスポートと検証機能をテストします。
 """
 
+import json
 import os
 import tempfile
 
+import numpy as np
+import onnxruntime as rt
 import pytest
 
 from iris_sklearn_rf.data_loader import load_iris_data, split_data
 from iris_sklearn_rf.model import create_rf_pipeline
-from iris_sklearn_rf.onnx_exporter import export_to_onnx, validate_onnx_model
+from iris_sklearn_rf.onnx_exporter import (
+    HARNESS_BATCH_SIZES,
+    check_parity_report,
+    compare_onnx_models,
+    export_to_onnx,
+    load_parity_baseline,
+    optimize_onnx_model,
+    run_export_gate,
+    run_parity_harness,
+    save_parity_baseline,
+    validate_onnx_model,
+)
 from iris_sklearn_rf.trainer import train_model
 
 
@@ -75,6 +89,49 @@ class TestExportToONNX:
             with pytest.raises(Exception):  # Will be sklearn's NotFittedError or similar
                 export_to_onnx(pipeline, onnx_path)
 
+    def test_probabilities_are_a_single_tensor(self) -> None:
+        """Test that batch probabilities come back as one (N, n_classes) float32 array."""
+        X, y = load_iris_data()
+        X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.2, random_state=42)
+        fitted_pipeline = train_model(create_rf_pipeline(n_estimators=10), X_train, y_train)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(fitted_pipeline, onnx_path)
+
+            sess = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+            metadata = sess.get_modelmeta().custom_metadata_map
+            probabilities = sess.run(
+                [metadata["probability_output"]],
+                {sess.get_inputs()[0].name: X_test.astype(np.float32)},
+            )[0]
+
+        assert metadata["output_layout"] == "tensor"
+        assert json.loads(metadata["class_labels"]) == [0, 1, 2]
+        assert probabilities.shape == (len(X_test), 3)
+        assert probabilities.dtype == np.float32
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1.0, atol=1e-5)
+        np.testing.assert_array_equal(probabilities.argmax(axis=1), fitted_pipeline.predict(X_test))
+
+    def test_zipmap_option(self) -> None:
+        """Test that zipmap=True keeps the per-row dict output and records it."""
+        X, y = load_iris_data()
+        X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.2, random_state=42)
+        fitted_pipeline = train_model(create_rf_pipeline(n_estimators=10), X_train, y_train)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(fitted_pipeline, onnx_path, zipmap=True)
+
+            sess = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+            input_name = sess.get_inputs()[0].name
+            _, probabilities = sess.run(None, {input_name: X_test[:2].astype(np.float32)})
+            metadata = sess.get_modelmeta().custom_metadata_map
+
+        assert all(isinstance(row, dict) for row in probabilities)
+        assert metadata["output_layout"] == "zipmap"
+        assert metadata["probability_output"] == "output_probability"
+
 
 class TestValidateONNXModel:
     """Test cases for validate_onnx_model function."""
@@ -163,3 +220,157 @@ class TestValidateONNXModel:
             result = validate_onnx_model(fitted_pipeline, onnx_path, X_test[:5])
 
             assert isinstance(result, bool), "Should return a boolean value"
+
+
+class TestOptimizeONNXModel:
+    """Test cases for optimize_onnx_model and compare_onnx_models functions."""
+
+    def test_optimized_model_saved_next_to_original(self) -> None:
+        """Test that the optimized model is written beside the original file."""
+        X, y = load_iris_data()
+        X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.2, random_state=42)
+        fitted_pipeline = train_model(create_rf_pipeline(n_estimators=10), X_train, y_train)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(fitted_pipeline, onnx_path)
+            optimized_path = optimize_onnx_model(onnx_path)
+
+            assert optimized_path == os.path.join(tmpdir, "model.opt.onnx")
+            assert os.path.exists(optimized_path)
+            assert validate_onnx_model(fitted_pipeline, optimized_path, X_test)
+
+    def test_invalid_level(self) -> None:
+        """Test that an unknown optimization level raises ValueError."""
+        with pytest.raises(ValueError):
+            optimize_onnx_model("model.onnx", level="fastest")
+
+    def test_compare_onnx_models_report(self) -> None:
+        """Test that the report has size, latency and accuracy for both models."""
+        X, y = load_iris_data()
+        X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.2, random_state=42)
+        fitted_pipeline = train_model(create_rf_pipeline(n_estimators=10), X_train, y_train)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(fitted_pipeline, onnx_path)
+            report = compare_onnx_models(
+                fitted_pipeline, onnx_path, optimize_onnx_model(onnx_path), X_test, y_test, n_runs=5
+            )
+
+        for prefix in ("original", "optimized"):
+            assert report[f"{prefix}_size_bytes"] > 0
+            assert report[f"{prefix}_single_row_ms"] > 0
+            assert report[f"{prefix}_batch_ms"] > 0
+        assert report["original_accuracy"] == pytest.approx(
+            fitted_pipeline.score(X_test, y_test)
+        )
+        assert report["accuracy_delta"] == 0.0
+        assert report["optimized_valid"] == 1.0
+
+
+class TestParityHarness:
+    """Test cases for run_parity_harness and check_parity_report functions."""
+
+    @pytest.mark.parametrize("zipmap", [False, True])
+    def test_report_covers_every_batch_size(self, zipmap: bool) -> None:
+        """Test that the harness reports parity and latency for each batch size."""
+        X, y = load_iris_data()
+        fitted_pipeline = train_model(create_rf_pipeline(n_estimators=10), X, y)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(fitted_pipeline, onnx_path, zipmap=zipmap)
+            report = run_parity_harness(fitted_pipeline, onnx_path, X, n_runs=3)
+
+        for batch_size in HARNESS_BATCH_SIZES:
+            prefix = f"batch_{batch_size}"
+            assert report[f"{prefix}_label_agreement"] == 1.0
+            assert report[f"{prefix}_max_abs_error"] <= 0.05
+            for runtime in ("native", "onnx"):
+                p50 = report[f"{prefix}_{runtime}_p50_ms"]
+                assert 0 < p50 <= report[f"{prefix}_{runtime}_p99_ms"]
+
+        # デフォルトの基準は学習済みモデルのエクスポートで満たされる
+        check_parity_report(report)
+
+    @staticmethod
+    def _report(**overrides: float) -> dict:
+        report = {
+            "batch_8_max_abs_error": 0.0,
+            "batch_8_label_agreement": 1.0,
+            "batch_8_native_p50_ms": 10.0,
+            "batch_8_native_p99_ms": 12.0,
+            "batch_8_onnx_p50_ms": 1.0,
+            "batch_8_onnx_p99_ms": 2.0,
+        }
+        report.update(overrides)
+        return report
+
+    @pytest.mark.parametrize(
+        "overrides, kwargs",
+        [
+            ({"batch_8_max_abs_error": 0.1}, {}),
+            ({"batch_8_label_agreement": 0.99}, {}),
+            ({"batch_8_onnx_p50_ms": 11.0}, {"max_latency_ratio": 1.0}),
+            ({}, {"latency_budget_ms": {8: 1.5}}),
+        ],
+    )
+    def test_regressions_fail(self, overrides: dict, kwargs: dict) -> None:
+        """Test that parity and latency regressions raise ValueError."""
+        with pytest.raises(ValueError, match="batch_8"):
+            check_parity_report(self._report(**overrides), **kwargs)
+
+    def test_within_budget_passes(self) -> None:
+        """Test that a report within every budget passes."""
+        check_parity_report(
+            self._report(), max_latency_ratio=1.0, latency_budget_ms={8: 5.0, 64: 1.0}
+        )
+
+    def test_latency_ratio_is_opt_in(self) -> None:
+        """Test that ONNX slower than scikit-learn passes unless a ratio is given."""
+        check_parity_report(self._report(batch_8_onnx_p50_ms=20.0))
+
+    def test_baseline_regression_fails(self) -> None:
+        """Test that a p50 regression against the recorded baseline raises ValueError."""
+        baseline = self._report()
+
+        check_parity_report(self._report(batch_8_onnx_p50_ms=1.5), baseline=baseline)
+        with pytest.raises(ValueError, match="baseline p50"):
+            check_parity_report(self._report(batch_8_onnx_p50_ms=2.5), baseline=baseline)
+        with pytest.raises(ValueError, match="baseline p50"):
+            check_parity_report(
+                self._report(batch_8_onnx_p50_ms=1.5), baseline=baseline, max_baseline_ratio=1.2
+            )
+
+    def test_baseline_round_trip(self, tmp_path) -> None:
+        """Test that a missing baseline is empty and a saved baseline loads back."""
+        path = str(tmp_path / "parity.json")
+        assert load_parity_baseline(path) == {}
+
+        save_parity_baseline(path, {"original": self._report()})
+
+        assert load_parity_baseline(path) == {"original": self._report()}
+
+    def test_export_gate_checks_every_shipped_model(self, tmp_path) -> None:
+        """Test that the gate runs the harness on each model and reports the failing ones."""
+        X, y = load_iris_data()
+        fitted_pipeline = train_model(create_rf_pipeline(n_estimators=10), X, y)
+        onnx_path = str(tmp_path / "model.onnx")
+        export_to_onnx(fitted_pipeline, onnx_path)
+        onnx_paths = {"original": onnx_path, "optimized": optimize_onnx_model(onnx_path)}
+
+        reports, failures = run_export_gate(fitted_pipeline, onnx_paths, X, n_runs=3)
+
+        assert set(reports) == {"original", "optimized"}
+        assert failures == []
+
+        # 最適化済みモデルだけ、ベースラインより大幅に遅くなったとみなす
+        baseline = {
+            "optimized": {key: 1e-6 for key in reports["optimized"] if key.endswith("_p50_ms")}
+        }
+        _, failures = run_export_gate(fitted_pipeline, onnx_paths, X, baseline=baseline, n_runs=3)
+
+        assert len(failures) == 1
+        assert failures[0].startswith("optimized:")
+
@@ -0,0 +1,152 @@
+"""
+sweepモジュールのユニットテスト。
+
+試行の生成、CPUコアの割り当て、プロセスプールでのスイープ実行をテストします。
+"""
+
+import os
+import tempfile
+
+import pytest
+from joblib import Memory
+
+from iris_sklearn_rf.data_loader import load_iris_data, split_data
+from iris_sklearn_rf.sweep import (
+    DEFAULT_PARAM_GRID,
+    _init_worker,
+    grid_trials,
+    plan_workers,
+    random_trials,
+    run_sweep,
+    run_trial,
+)
+
+
+class TestTrials:
+    """Test cases for grid_trials and random_trials functions."""
+
+    def test_grid_trials_covers_all_combinations(self) -> None:
+        """Test that grid_trials returns every parameter combination."""
+        trials = grid_trials()
+
+        assert len(trials) == 36, "Default grid should have 3 * 3 * 2 * 2 trials"
+        assert all(set(trial) == set(DEFAULT_PARAM_GRID) for trial in trials)
+        assert len({tuple(sorted(trial.items(), key=str)) for trial in trials}) == 36
+
+    def test_random_trials_is_reproducible(self) -> None:
+        """Test that random_trials returns the same trials for the same seed."""
+        trials = random_trials(10, random_state=0)
+
+        assert len(trials) == 10
+        assert trials == random_trials(10, random_state=0)
+        assert all(type(trial["n_estimators"]) is int for trial in trials), "Should be Python ints"
+
+
+class TestPlanWorkers:
+    """Test cases for plan_workers function."""
+
+    def test_more_trials_than_cpus(self) -> None:
+        """Test that each worker gets one thread when trials outnumber cores."""
+        assert plan_workers(36, n_cpus=8) == (8, 1)
+
+    def test_fewer_trials_than_cpus(self) -> None:
+        """Test that spare cores are given to each trial."""
+        assert plan_workers(2, n_cpus=8) == (2, 4)
+
+    def test_explicit_workers(self) -> None:
+        """Test that threads per trial are derived from the worker count."""
+        assert plan_workers(36, n_workers=3, n_cpus=8) == (3, 2)
+
+    def test_explicit_jobs_per_trial(self) -> None:
+        """Test that the worker count is derived from threads per trial."""
+        assert plan_workers(36, n_jobs_per_trial=4, n_cpus=8) == (2, 4)
+
+    def test_workers_capped_by_trials(self) -> None:
+        """Test that no idle workers are started."""
+        assert plan_workers(2, n_workers=8, n_cpus=8) == (2, 4)
+
+    def test_explicit_workers_capped_by_cpus(self) -> None:
+        """Test that an explicit worker count above the core count is clamped."""
+        assert plan_workers(36, n_workers=16, n_cpus=8) == (8, 1)
+
+    def test_explicit_oversubscription_warns(self) -> None:
+        """Test that explicit workers * threads above the core count warns."""
+        with pytest.warns(RuntimeWarning, match="oversubscribes 8 CPUs"):
+            assert plan_workers(36, n_workers=4, n_jobs_per_trial=4, n_cpus=8) == (4, 4)
+
+    @pytest.mark.parametrize("n_trials", [1, 3, 7, 16, 100])
+    @pytest.mark.parametrize("n_cpus", [1, 2, 6, 64])
+    def test_never_oversubscribes(self, n_trials: int, n_cpus: int) -> None:
+        """Test that workers * threads never exceeds the available cores."""
+        n_workers, n_jobs = plan_workers(n_trials, n_cpus=n_cpus)
+
+        assert n_workers * n_jobs <= n_cpus
+        assert 1 <= n_workers <= n_trials
+
+    def test_invalid_arguments(self) -> None:
+        """Test that non-positive counts raise ValueError."""
+        with pytest.raises(ValueError):
+            plan_workers(0)
+        with pytest.raises(ValueError):
+            plan_workers(10, n_workers=0)
+        with pytest.raises(ValueError):
+            plan_workers(10, n_jobs_per_trial=0)
+
+
+class TestRunSweep:
+    """Test cases for run_trial and run_sweep functions."""
+
+    def test_run_trial_trains_evaluates_and_exports(self) -> None:
+        """Test that a single trial produces metrics and a valid ONNX model."""
+        X, y = load_iris_data()
+        X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.2, random_state=42)
+        _init_worker(X_train, X_test, y_train, y_test, n_jobs=1)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = run_trial(3, {"n_estimators": 10, "max_depth": 3}, tmpdir)
+
+            assert result.trial_id == 3
+            assert result.metrics["accuracy"] > 0.8
+            assert result.onnx_valid, "ONNX predictions should match sklearn"
+            assert os.path.basename(result.onnx_path) == "iris_rf_trial_0003.onnx"
+            assert os.path.exists(result.onnx_path)
+
+    def test_run_sweep_streams_all_trials(self) -> None:
+        """Test that run_sweep yields one result per trial from worker processes."""
+        X, y = load_iris_data()
+        X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.2, random_state=42)
+        trials = [{"n_estimators": n, "max_depth": 3} for n in (5, 10, 15)]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            results = list(
+                run_sweep(trials, X_train, X_test, y_train, y_test, output_dir=tmpdir, n_workers=2)
+            )
+
+            assert sorted(result.trial_id for result in results) == [0, 1, 2]
+            assert all(result.onnx_valid for result in results)
+            assert all(result.params == trials[result.trial_id] for result in results)
+            assert len(os.listdir(tmpdir)) == 3, "Each trial should export its own ONNX model"
+
+    def test_run_sweep_shares_scaler_cache(self, tmp_path) -> None:
+        """Test that trials share the fitted scaler through the cache."""
+        X, y = load_iris_data()
+        X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.2, random_state=42)
+        trials = [{"n_estimators": n, "max_depth": 3} for n in (5, 10)]
+        memory = Memory(tmp_path / "cache", verbose=0)
+
+        for _ in range(2):
+            results = list(
+                run_sweep(
+                    trials,
+                    X_train,
+                    X_test,
+                    y_train,
+                    y_test,
+                    output_dir=str(tmp_path / "models"),
+                    n_workers=1,
+                    memory=memory,
+                )
+            )
+            assert all(result.onnx_valid for result in results)
+
+        assert len(list((tmp_path / "cache").rglob("output.pkl"))) == 1
@@ -4,11 +4,27 @@ trainerモジュールのユニットテスト。
 モデルの学習と評価機能をテストします。
 """
 
+import tracemalloc
+
+import numpy as np
+import pytest
 from sklearn.pipeline import Pipeline
 
-from iris_sklearn_rf.data_loader import load_iris_data, split_data
-from iris_sklearn_rf.model import create_rf_pipeline
-from iris_sklearn_rf.trainer import evaluate_model, train_model
+from iris_sklearn_rf.data_loader import (
+    IRIS_FEATURE_COLUMNS,
+    ChunkedDataSource,
+    load_iris_data,
+    split_data,
+)
+from iris_sklearn_rf.model import create_incremental_pipeline, create_rf_pipeline
+from iris_sklearn_rf.onnx_exporter import export_to_onnx, validate_onnx_model
+from iris_sklearn_rf.trainer import (
+    cross_validate_model,
+    evaluate_incremental,
+    evaluate_model,
+    train_incremental,
+    train_model,
+)
 
 
 class TestTrainModel:
@@ -168,3 +184,166 @@ class TestEvaluateModel:
         # Same model on same data should produce identical metrics
         for key in metrics1:
             assert metrics1[key] == metrics2[key], f"Metric '{key}' should be reproducible"
+
+
+class TestCrossValidateModel:
+    """Test cases for cross_validate_model function."""
+
+    def test_returns_mean_and_std_for_each_metric(self) -> None:
+        """Test that every evaluate_model metric gets a mean and a std."""
+        X, y = load_iris_data()
+        pipeline = create_rf_pipeline(n_estimators=10, random_state=42)
+
+        cv_metrics = cross_validate_model(pipeline, X, y, n_splits=3, n_repeats=2, n_jobs=2)
+
+        expected_metrics = evaluate_model(train_model(pipeline, X, y), X, y)
+        assert set(cv_metrics) == {
+            f"cv_{name}_{stat}" for name in expected_metrics for stat in ("mean", "std")
+        }
+        assert cv_metrics["cv_accuracy_mean"] > 0.85, "Iris CV accuracy should be high"
+        assert all(0.0 <= value <= 1.0 for value in cv_metrics.values())
+
+    def test_parallel_matches_sequential(self) -> None:
+        """Test that running folds in worker processes gives the same scores."""
+        X, y = load_iris_data()
+
+        sequential = cross_validate_model(
+            create_rf_pipeline(n_estimators=10, random_state=42), X, y, n_splits=3, n_jobs=1
+        )
+        parallel = cross_validate_model(
+            create_rf_pipeline(n_estimators=10, random_state=42), X, y, n_splits=3, n_jobs=3
+        )
+
+        assert sequential == pytest.approx(parallel)
+
+    def test_does_not_fit_given_pipeline(self) -> None:
+        """Test that the pipeline passed in is left unfitted."""
+        X, y = load_iris_data()
+        pipeline = create_rf_pipeline(n_estimators=10)
+
+        cross_validate_model(pipeline, X, y, n_splits=3, n_jobs=1)
+
+        assert not hasattr(pipeline.named_steps["classifier"], "estimators_")
+
+
+def _write_csv(path, X: np.ndarray, y: np.ndarray, columns=IRIS_FEATURE_COLUMNS) -> str:
+    """Write features and labels as a CSV file with a header row."""
+    np.savetxt(
+        path,
+        np.column_stack([X, y]),
+        delimiter=",",
+        header=",".join([*columns, "label"]),
+        comments="",
+        fmt="%.4f",
+    )
+    return str(path)
+
+
+class TestIncrementalTraining:
+    """Test cases for train_incremental and evaluate_incremental functions."""
+
+    def test_train_incremental_learns_iris(self, tmp_path) -> None:
+        """Test that chunk-by-chunk training reaches a useful accuracy."""
+        X, y = load_iris_data()
+        X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.2, random_state=42)
+        source = ChunkedDataSource(
+            _write_csv(tmp_path / "train.csv", X_train, y_train),
+            IRIS_FEATURE_COLUMNS,
+            "label",
+            chunk_size=16,
+        )
+
+        pipeline = train_incremental(create_incremental_pipeline(), source, [0, 1, 2], n_epochs=20)
+
+        assert evaluate_model(pipeline, X_test, y_test)["accuracy"] > 0.8
+        np.testing.assert_allclose(pipeline.named_steps["scaler"].mean_, X_train.mean(axis=0))
+
+    def test_evaluate_incremental_matches_evaluate_model(self, tmp_path) -> None:
+        """Test that metrics from summed per-chunk confusion matrices match evaluate_model."""
+        X, y = load_iris_data()
+        X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.4, random_state=0)
+        # 精度が1.0にならないよう、弱いモデルで評価する
+        pipeline = train_model(create_rf_pipeline(n_estimators=1, max_depth=1), X_train, y_train)
+        source = ChunkedDataSource(
+            _write_csv(tmp_path / "test.csv", X_test, y_test),
+            IRIS_FEATURE_COLUMNS,
+            "label",
+            chunk_size=7,
+        )
+
+        chunked = evaluate_incremental(pipeline, source, [0, 1, 2])
+
+        assert chunked == pytest.approx(evaluate_model(pipeline, X_test, y_test))
+
+    def test_incremental_pipeline_exports_to_onnx(self, tmp_path) -> None:
+        """Test that the incremental pipeline goes through the same ONNX export path."""
+        X, y = load_iris_data()
+        source = ChunkedDataSource(
+            _write_csv(tmp_path / "iris.csv", X, y), IRIS_FEATURE_COLUMNS, "label", chunk_size=50
+        )
+        pipeline = train_incremental(create_incremental_pipeline(), source, [0, 1, 2])
+
+        onnx_path = str(tmp_path / "iris_sgd.onnx")
+        export_to_onnx(pipeline, onnx_path)
+
+        assert validate_onnx_model(pipeline, onnx_path, X)
+
+    def test_exports_feature_width_other_than_iris(self, tmp_path) -> None:
+        """Test that the ONNX input width follows the trained feature columns."""
+        X, y = load_iris_data()
+        # 元の4特徴量に2つの派生特徴量を加えた6列のテーブル
+        X_wide = np.column_stack([X, X[:, 0] * X[:, 1], X[:, 2] * X[:, 3]])
+        columns = [*IRIS_FEATURE_COLUMNS, "sepal_area", "petal_area"]
+        source = ChunkedDataSource(
+            _write_csv(tmp_path / "wide.csv", X_wide, y, columns), columns, "label", chunk_size=50
+        )
+        # 決定関数が飽和して float32 の確率が同値にならないよう、正則化を強める
+        pipeline = train_incremental(create_incremental_pipeline(alpha=0.01), source, [0, 1, 2])
+
+        onnx_path = str(tmp_path / "wide.onnx")
+        export_to_onnx(pipeline, onnx_path)
+
+        assert validate_onnx_model(pipeline, onnx_path, X_wide)
+
+    def test_invalid_arguments(self, tmp_path) -> None:
+        """Test that zero epochs and empty data raise ValueError."""
+        with pytest.raises(ValueError):
+            train_incremental(create_incremental_pipeline(), [], [0, 1, 2], n_epochs=0)
+        with pytest.raises(ValueError):
+            train_incremental(create_incremental_pipeline(), [], [0, 1, 2])
+
+        X, y = load_iris_data()
+        pipeline = train_model(create_rf_pipeline(n_estimators=1), X, y)
+        with pytest.raises(ValueError, match="No evaluation data"):
+            evaluate_incremental(pipeline, [], [0, 1, 2])
+
+    def test_memory_is_bounded_by_chunk_size(self, tmp_path) -> None:
+        """Test that peak memory while training stays far below the size of the dataset."""
+        X, y = load_iris_data()
+        rng = np.random.default_rng(0)
+        n_rows = 100_000
+        indices = rng.integers(0, len(X), n_rows)
+        X_large = X[indices] + rng.normal(0, 0.05, (n_rows, X.shape[1]))
+        source = ChunkedDataSource(
+            _write_csv(tmp_path / "large.csv", X_large, y[indices]),
+            IRIS_FEATURE_COLUMNS,
+            "label",
+            chunk_size=2500,
+        )
+        # データ全体を読み込んだ場合の配列サイズ（特徴量 + ラベル）
+        full_bytes = n_rows * (X.shape[1] + 1) * 8
+        del X_large, indices
+
+        tracemalloc.start()
+        try:
+            pipeline = train_incremental(create_incremental_pipeline(), source, [0, 1, 2])
+            metrics = evaluate_incremental(pipeline, source, [0, 1, 2])
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert metrics["accuracy"] > 0.8
+        assert peak_bytes < full_bytes / 4, (
+            f"Peak memory {peak_bytes} bytes should be bounded by the chunk size, "
+            f"not the dataset size ({full_bytes} bytes)"
+        )
@@ -0,0 +1,122 @@
+"""
+外れ値検出バックエンドのスケーリングベンチマーク。
+
+Irisの特徴量をブートストラップ抽出してノイズを加えた合成データで、
+バックエンドごとの学習時間・予測時間をサンプル数に対して計測します。
+
+使用例:
+    python -m iris_sklearn_outlier.benchmark --n-samples 1000 10000 100000
+"""
+
+import argparse
+import time
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+from iris_sklearn_outlier.data_loader import load_iris_data
+from iris_sklearn_outlier.model import BACKENDS, create_ocs_pipeline
+from iris_sklearn_outlier.trainer import evaluate_model, train_model
+
+
+def make_synthetic_data(n_samples: int, random_state: int = 42) -> np.ndarray:
+    """
+    Irisの特徴量をn_samples行に拡張した合成データを作成する。
+
+    Args:
+        n_samples: 作成するサンプル数
+        random_state: 乱数シード
+
+    Returns:
+        np.ndarray: 特徴量行列 (n_samples, 4) - float32型
+
+    Examples:
+        >>> make_synthetic_data(1000).shape
+        (1000, 4)
+    """
+    rng = np.random.default_rng(random_state)
+    X = load_iris_data()
+    indices = rng.integers(0, len(X), size=n_samples)
+    # 重複行をなくすため、特徴量ごとの標準偏差の5%のノイズを加える
+    noise = rng.normal(scale=0.05 * X.std(axis=0), size=(n_samples, X.shape[1]))
+    return (X[indices] + noise).astype(np.float32)
+
+
+def benchmark_backends(
+    n_samples_list: Sequence[int],
+    backends: Sequence[str] = BACKENDS,
+    nu: float = 0.1,
+    random_state: int = 42,
+) -> List[Dict[str, Union[str, int, float]]]:
+    """
+    バックエンドごとの学習時間・予測時間をサンプル数に対して計測する。
+
+    Args:
+        n_samples_list: 計測するサンプル数のリスト
+        backends: 計測するバックエンド（デフォルト: 全バックエンド）
+        nu: 外れ値の上限割合
+        random_state: 乱数シード
+
+    Returns:
+        list: 1計測ごとの結果（backend, n_samples, fit_seconds, predict_seconds, outlier_rate）
+
+    Examples:
+        >>> rows = benchmark_backends([500], backends=["isolation_forest"])
+        >>> rows[0]["backend"], rows[0]["n_samples"]
+        ('isolation_forest', 500)
+
+    Notes:
+        - 予測時間は学習データ全体に対するevaluate_model（predict）の時間
+        - "ocsvm"は学習がサンプル数の2乗以上で増えるため、大きなn_samplesでは時間がかかる
+    """
+    results: List[Dict[str, Union[str, int, float]]] = []
+    for n_samples in n_samples_list:
+        X = make_synthetic_data(n_samples, random_state=random_state)
+        for backend in backends:
+            pipeline = create_ocs_pipeline(nu=nu, backend=backend, random_state=random_state)
+
+            start = time.perf_counter()
+            train_model(pipeline, X)
+            fit_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            outlier_rate = evaluate_model(pipeline, X)
+            predict_seconds = time.perf_counter() - start
+
+            results.append(
+                {
+                    "backend": backend,
+                    "n_samples": n_samples,
+                    "fit_seconds": fit_seconds,
+                    "predict_seconds": predict_seconds,
+                    "outlier_rate": outlier_rate,
+                }
+            )
+    return results
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する。"""
+    parser = argparse.ArgumentParser(description="Benchmark outlier detection backends")
+    parser.add_argument(
+        "--n-samples",
+        nargs="+",
+        type=int,
+        default=[1_000, 10_000, 50_000],
+        help="計測するサンプル数",
+    )
+    parser.add_argument(
+        "--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS), help="バックエンド"
+    )
+    args = parser.parse_args()
+
+    print(f"{'backend':<18}{'n_samples':>10}{'fit [s]':>10}{'predict [s]':>13}{'outlier':>9}")
+    for row in benchmark_backends(args.n_samples, backends=args.backends):
+        print(
+            f"{row['backend']:<18}{row['n_samples']:>10}{row['fit_seconds']:>10.3f}"
+            f"{row['predict_seconds']:>13.3f}{row['outlier_rate']:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,26 +3,48 @@ One-Class SVM外れ値検出モデルの定義モジュール。
 
 このモジュールはStandardScalerとOneClassSVMを
 組み合わせたscikit-learn Pipelineを作成する機能を提供します。
+大規模データ向けに、OneClassSVMの代わりにIsolationForestや
+Nystroemカーネル近似 + SGDOneClassSVMを使うバックエンドも選択できます。
 """
 
-from typing import Union
+from typing import Any, Dict, Union
 
+from sklearn.ensemble import IsolationForest  # type: ignore[import-untyped]
+from sklearn.kernel_approximation import Nystroem  # type: ignore[import-untyped]
+from sklearn.linear_model import SGDOneClassSVM  # type: ignore[import-untyped]
 from sklearn.pipeline import Pipeline  # type: ignore[import-untyped]
 from sklearn.preprocessing import StandardScaler  # type: ignore[import-untyped]
 from sklearn.svm import OneClassSVM  # type: ignore[import-untyped]
 
+# 外れ値検出のバックエンド
+# - "ocsvm": OneClassSVM。学習はサンプル数の2乗以上、予測はサポートベクター数に比例する
+# - "isolation_forest": IsolationForest。学習・予測ともサンプル数にほぼ線形
+# - "nystroem_sgd": Nystroem（RBFカーネルの近似）+ SGDOneClassSVM。学習・予測ともサンプル数に線形
+BACKENDS = ("ocsvm", "isolation_forest", "nystroem_sgd")
+
 
 def create_ocs_pipeline(
     nu: float = 0.1,
     gamma: Union[str, float] = "auto",
     kernel: str = "rbf",
+    backend: str = "ocsvm",
+    n_components: int = 100,
+    n_estimators: int = 100,
+    random_state: int = 42,
 ) -> Pipeline:
     """
     One-Class SVM外れ値検出パイプラインを作成する。
 
     パイプラインの構成:
     1. StandardScaler: 特徴量を平均0、分散1に正規化
-    2. OneClassSVM: 外れ値検出（教師なし学習）
+    2. 外れ値検出器（教師なし学習、backendで選択）
+        - "ocsvm": OneClassSVM（ステップ名 "ocs"）
+        - "isolation_forest": IsolationForest（ステップ名 "iforest"）。
+          nuを外れ値の割合（contamination）として使用
+        - "nystroem_sgd": Nystroem（ステップ名 "nystroem"）+ SGDOneClassSVM
+          （ステップ名 "sgd_ocs"）。RBFカーネルをn_components次元の特徴量で近似する
+
+    どのバックエンドも予測結果は +1（正常）、-1（外れ値）で、同じONNXエクスポートで変換できます。
 
     Args:
         nu: 外れ値の上限割合（0 < nu <= 1）
@@ -38,9 +60,17 @@ def create_ocs_pipeline(
             - "poly": 多項式カーネル
             - "sigmoid": シグモイドカーネル
             - デフォルト: "rbf"
+            - "nystroem_sgd"は"rbf"のみ対応
+        backend: 外れ値検出のバックエンド（BACKENDSのいずれか、デフォルト: "ocsvm"）
+        n_components: Nystroemの近似次元数（"nystroem_sgd"のみ、デフォルト: 100）
+        n_estimators: 決定木の数（"isolation_forest"のみ、デフォルト: 100）
+        random_state: 乱数シード（"isolation_forest", "nystroem_sgd"のみ、デフォルト: 42）
 
     Returns:
-        Pipeline: StandardScaler + OneClassSVM のパイプライン
+        Pipeline: StandardScaler + 外れ値検出器 のパイプライン
+
+    Raises:
+        ValueError: 不明なbackend、または"nystroem_sgd"で未対応のkernel・gammaの場合
 
     Examples:
         >>> # デフォルトパラメータでパイプライン作成
@@ -53,14 +83,96 @@ def create_ocs_pipeline(
         >>> pipeline.named_steps["ocs"].nu
         0.2
 
+        >>> # 大規模データ向けのバックエンド
+        >>> pipeline = create_ocs_pipeline(backend="nystroem_sgd", n_components=200)
+        >>> [name for name, _ in pipeline.steps]
+        ['scaler', 'nystroem', 'sgd_ocs']
+
     Notes:
         - nuパラメータは外れ値の割合を制御する重要なハイパーパラメータ
         - 正常データのみで学習し、境界外のデータを外れ値として検出
         - 予測結果: +1（正常）、-1（外れ値）
     """
-    steps = [
-        ("scaler", StandardScaler()),
-        ("ocs", OneClassSVM(nu=nu, gamma=gamma, kernel=kernel)),
-    ]
+    if backend == "ocsvm":
+        detector_steps = [("ocs", OneClassSVM(nu=nu, gamma=gamma, kernel=kernel))]
+    elif backend == "isolation_forest":
+        detector_steps = [
+            (
+                "iforest",
+                IsolationForest(
+                    n_estimators=n_estimators, contamination=nu, random_state=random_state
+                ),
+            )
+        ]
+    elif backend == "nystroem_sgd":
+        if kernel != "rbf":
+            raise ValueError(f"nystroem_sgd backend supports only the rbf kernel, got {kernel!r}")
+        if isinstance(gamma, str) and gamma != "auto":
+            raise ValueError(
+                f"nystroem_sgd backend supports gamma='auto' or a float, got {gamma!r}"
+            )
+        detector_steps = [
+            (
+                "nystroem",
+                Nystroem(
+                    kernel="rbf",
+                    # Nystroemはgamma=Noneで1/n_features（OneClassSVMのgamma="auto"と同じ）
+                    gamma=None if gamma == "auto" else gamma,
+                    n_components=n_components,
+                    random_state=random_state,
+                ),
+            ),
+            ("sgd_ocs", SGDOneClassSVM(nu=nu, random_state=random_state)),
+        ]
+    else:
+        raise ValueError(f"backend must be one of {list(BACKENDS)}, got {backend!r}")
+
+    steps = [("scaler", StandardScaler()), *detector_steps]
     pipeline = Pipeline(steps=steps)
     return pipeline
+
+
+def get_model_params(pipeline: Pipeline) -> Dict[str, Any]:
+    """
+    パイプラインの外れ値検出器の名前と、その検出器が実際に使うハイパーパラメータを取得する。
+
+    MLflowに記録するためのもので、バックエンドが使わないパラメータ
+    （IsolationForestのgamma・kernelなど）は含めません。
+
+    Args:
+        pipeline: create_ocs_pipelineで作成したパイプライン
+
+    Returns:
+        Dict[str, Any]: "model"（検出器の名前）とハイパーパラメータの辞書
+            - "ocsvm": model="one_class_svm", nu, gamma, kernel
+            - "isolation_forest": model="isolation_forest", contamination, n_estimators
+            - "nystroem_sgd": model="nystroem_sgd_one_class_svm", nu, gamma, kernel, n_components
+
+    Raises:
+        ValueError: 外れ値検出器のステップが見つからない場合
+
+    Examples:
+        >>> get_model_params(create_ocs_pipeline(backend="isolation_forest"))
+        {'model': 'isolation_forest', 'contamination': 0.1, 'n_estimators': 100}
+    """
+    steps = pipeline.named_steps
+    if "ocs" in steps:
+        ocs = steps["ocs"]
+        return {"model": "one_class_svm", "nu": ocs.nu, "gamma": ocs.gamma, "kernel": ocs.kernel}
+    if "iforest" in steps:
+        iforest = steps["iforest"]
+        return {
+            "model": "isolation_forest",
+            "contamination": iforest.contamination,
+            "n_estimators": iforest.n_estimators,
+        }
+    if "sgd_ocs" in steps:
+        nystroem = steps["nystroem"]
+        return {
+            "model": "nystroem_sgd_one_class_svm",
+            "nu": steps["sgd_ocs"].nu,
+            "gamma": "auto" if nystroem.gamma is None else nystroem.gamma,
+            "kernel": nystroem.kernel,
+            "n_components": nystroem.n_components,
+        }
+    raise ValueError(f"No outlier detector step in pipeline: {list(steps)}")
@@ -3,14 +3,103 @@ ONNXエクスポートと検証モジュール。
 
 このモジュールはscikit-learnモデルをONNX形式にエクスポートし、
 エクスポートされたモデルを検証する機能を提供します。
+エクスポート後にONNX Runtimeのグラフ最適化を適用し、元のモデルとの
+サイズ・レイテンシ・予測の差を比較する機能も提供します。
+
+複数のバッチサイズでscikit-learnとONNX Runtimeの決定関数値・ラベル・レイテンシを比較し、
+パリティやレイテンシが基準を満たさないエクスポートを失敗させる検証ハーネスも提供します。
+
+skl2onnxにはNystroemの変換器がないため、RBFカーネルのNystroemを
+MatMul/Expで表す変換器をモジュールの読み込み時に登録します。
 """
 
+import json
+import os
+import time
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
 import numpy as np
 import onnxruntime as rt  # type: ignore[import-untyped]
-from skl2onnx import convert_sklearn  # type: ignore[import-untyped]
+from skl2onnx import convert_sklearn, update_registered_converter  # type: ignore[import-untyped]
+from skl2onnx.algebra.onnx_ops import (  # type: ignore[import-untyped]
+    OnnxAdd,
+    OnnxExp,
+    OnnxMatMul,
+    OnnxMax,
+    OnnxMul,
+    OnnxSub,
+)
 from skl2onnx.common.data_types import FloatTensorType  # type: ignore[import-untyped]
+from sklearn.kernel_approximation import Nystroem  # type: ignore[import-untyped]
 from sklearn.pipeline import Pipeline  # type: ignore[import-untyped]
 
+# 変換に使うONNXのopset（IsolationForestの変換にはai.onnx.mlのopset 3が必要）
+TARGET_OPSET = {"": 17, "ai.onnx.ml": 3}
+
+# 検証ハーネスで計測するバッチサイズ（入力が足りない場合は行を繰り返して作る）
+HARNESS_BATCH_SIZES = (1, 8, 64, 512, 4096)
+
+# 記録済みのベースラインに対するONNXのp50レイテンシの許容倍率
+# （計測回数が少ないp50のばらつきで誤って失敗しないよう、2倍を超える遅化のみを回帰とみなす）
+MAX_BASELINE_LATENCY_RATIO = 2.0
+
+
+def _nystroem_shape_calculator(operator) -> None:  # type: ignore[no-untyped-def]
+    """Nystroemの出力形状 (N, n_components) を設定する。"""
+    n_rows = operator.inputs[0].get_first_dimension()
+    n_components = operator.raw_operator.components_.shape[0]
+    operator.outputs[0].type = FloatTensorType([n_rows, n_components])
+
+
+def _nystroem_converter(scope, operator, container) -> None:  # type: ignore[no-untyped-def]
+    """
+    RBFカーネルのNystroemをONNXの演算子に変換する。
+
+    K(x, c) = exp(-gamma * ||x - c||^2) を ||x||^2 - 2 x・c + ||c||^2 で計算し、
+    正規化行列 normalization_ を掛けます。
+    """
+    op = operator.raw_operator
+    if op.kernel != "rbf":
+        raise NotImplementedError(f"Nystroem kernel {op.kernel!r} is not supported, only 'rbf'")
+
+    opv = container.target_opset
+    X = operator.inputs[0]
+    components = op.components_.astype(np.float32)
+    gamma = op.gamma if op.gamma is not None else 1.0 / components.shape[1]
+
+    # 距離の2乗（丸め誤差で負にならないよう0で下限を取る）
+    x_sq = OnnxMatMul(
+        OnnxMul(X, X, op_version=opv),
+        np.ones((components.shape[1], 1), dtype=np.float32),
+        op_version=opv,
+    )
+    cross = OnnxMatMul(X, components.T, op_version=opv)
+    c_sq = (components**2).sum(axis=1).reshape(1, -1)
+    twice_cross = OnnxMul(cross, np.array([2.0], dtype=np.float32), op_version=opv)
+    sq_dist = OnnxAdd(OnnxSub(x_sq, twice_cross, op_version=opv), c_sq, op_version=opv)
+    sq_dist = OnnxMax(sq_dist, np.array([0.0], dtype=np.float32), op_version=opv)
+
+    kernel = OnnxExp(
+        OnnxMul(sq_dist, np.array([-gamma], dtype=np.float32), op_version=opv),
+        op_version=opv,
+    )
+    features = OnnxMatMul(
+        kernel,
+        op.normalization_.T.astype(np.float32),
+        op_version=opv,
+        output_names=operator.outputs[:1],
+    )
+    features.add_to(scope, container)
+
+
+update_registered_converter(
+    Nystroem,
+    "SklearnNystroem",
+    _nystroem_shape_calculator,
+    _nystroem_converter,
+)
+
 
 def export_to_onnx(pipeline: Pipeline, onnx_path: str) -> None:
     """
@@ -41,6 +130,7 @@ def export_to_onnx(pipeline: Pipeline, onnx_path: str) -> None:
     Notes:
         - 入力: FloatTensorType([None, 4]) - バッチサイズ可変、4特徴量
         - 出力: label（予測クラス）とscore（決定関数値）
+        - どのバックエンド（ocsvm, isolation_forest, nystroem_sgd）も同じ関数で変換できる
         - ONNXモデルは異なるフレームワーク間での相互運用に便利
     """
     # Iris データは4つの特徴量を持つ
@@ -48,7 +138,9 @@ def export_to_onnx(pipeline: Pipeline, onnx_path: str) -> None:
     initial_type = [("float_input", FloatTensorType([None, 4]))]
 
     # scikit-learnモデルをONNX形式に変換
-    onnx_model = convert_sklearn(pipeline, initial_types=initial_type)
+    onnx_model = convert_sklearn(
+        pipeline, initial_types=initial_type, target_opset=TARGET_OPSET
+    )
 
     # ONNX形式でファイルに保存
     with open(onnx_path, "wb") as f:
@@ -91,6 +183,8 @@ def validate_onnx_model(
         - ONNXRuntimeを使用してONNXモデルで推論
         - label出力を比較（+1 or -1）
         - 浮動小数点誤差は許容しない（厳密な一致を要求）
+        - 呼び出しごとにセッションを作成する。複数のバッチサイズで決定関数値・レイテンシまで
+          検証する場合は、セッションを1回だけ作成するrun_parity_harnessを使用する
     """
     # scikit-learnモデルでの予測
     sklearn_predictions = pipeline.predict(X_test)
@@ -110,3 +204,355 @@ def validate_onnx_model(
 
     # 予測結果の比較
     return np.array_equal(sklearn_predictions, onnx_predictions)
+
+
+# オフライン最適化のレベル
+# "all"はレイアウト変換などCPU固有の最適化を含むため、同じ種類のCPUで推論する場合のみ使用する
+OPTIMIZATION_LEVELS = {
+    "basic": rt.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": rt.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": rt.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+def optimize_onnx_model(
+    onnx_path: str,
+    optimized_path: Optional[str] = None,
+    level: str = "extended",
+) -> str:
+    """
+    ONNX Runtimeのオフライングラフ最適化を適用したモデルを保存する。
+
+    Args:
+        onnx_path: 元のONNXモデルのパス
+        optimized_path: 保存先のパス（Noneの場合は元のモデルの隣に *.opt.onnx）
+        level: 最適化レベル（"basic", "extended", "all"）
+
+    Returns:
+        str: 最適化済みモデルのパス
+
+    Raises:
+        ValueError: 不明な最適化レベルの場合
+
+    Examples:
+        >>> optimize_onnx_model("/tmp/iris_ocs_0.onnx")
+        '/tmp/iris_ocs_0.opt.onnx'
+
+    Notes:
+        - 最適化済みのモデルを配布すると、推論サーバー起動時の最適化を省略できる
+        - One-Class SVM・IsolationForestのグラフはai.onnx.mlの演算子（SVMRegressor,
+          TreeEnsembleRegressor等）で構成されるため、INT8量子化（MatMul/Conv等が対象）は
+          適用されない
+    """
+    if level not in OPTIMIZATION_LEVELS:
+        raise ValueError(f"level must be one of {list(OPTIMIZATION_LEVELS)}, got {level!r}")
+
+    if optimized_path is None:
+        root, ext = os.path.splitext(onnx_path)
+        optimized_path = f"{root}.opt{ext or '.onnx'}"
+
+    sess_options = rt.SessionOptions()
+    sess_options.graph_optimization_level = OPTIMIZATION_LEVELS[level]
+    sess_options.optimized_model_filepath = optimized_path
+    rt.InferenceSession(onnx_path, sess_options, providers=["CPUExecutionProvider"])
+    return optimized_path
+
+
+def measure_latency(onnx_path: str, X: np.ndarray, n_runs: int = 100) -> Dict[str, float]:
+    """
+    1行とバッチ全体の推論レイテンシ（中央値、ミリ秒）を計測する。
+
+    Args:
+        onnx_path: ONNXモデルのパス
+        X: 入力データ（バッチレイテンシはX全体で計測）
+        n_runs: 計測回数
+
+    Returns:
+        dict: single_row_ms, batch_ms
+
+    Notes:
+        - セッションは1回だけ作成し、ウォームアップ後に計測する
+    """
+    session = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+    label_name = session.get_outputs()[0].name
+
+    X_float32 = X.astype(np.float32)
+    latencies = {}
+    for name, batch in (("single_row_ms", X_float32[:1]), ("batch_ms", X_float32)):
+        session.run([label_name], {input_name: batch})  # ウォームアップ
+        timings = []
+        for _ in range(n_runs):
+            start = time.perf_counter()
+            session.run([label_name], {input_name: batch})
+            timings.append((time.perf_counter() - start) * 1000)
+        latencies[name] = float(np.median(timings))
+    return latencies
+
+
+def compare_onnx_models(
+    pipeline: Pipeline,
+    onnx_path: str,
+    optimized_path: str,
+    X: np.ndarray,
+    n_runs: int = 100,
+) -> Dict[str, float]:
+    """
+    元のONNXモデルと最適化済みモデルのサイズ・レイテンシ・予測を比較する。
+
+    外れ値検出には正解ラベルがないため、精度の代わりにscikit-learnの予測との
+    一致率（agreement）と外れ値率（outlier_rate）を比較します。
+
+    Args:
+        pipeline: 学習済みscikit-learn Pipeline
+        onnx_path: 元のONNXモデルのパス
+        optimized_path: 最適化済みONNXモデルのパス
+        X: 評価用特徴量行列 (n_samples, 4)
+        n_runs: レイテンシの計測回数
+
+    Returns:
+        dict: original_*/optimized_* のsize_bytes, single_row_ms, batch_ms, agreement,
+            outlier_rate と各差分（*_delta）、最適化済みモデルのパリティ（optimized_valid）
+
+    Notes:
+        - optimized_validはvalidate_onnx_model（厳密な一致）の結果（1.0 or 0.0）
+    """
+    sklearn_predictions = pipeline.predict(X)
+
+    report: Dict[str, float] = {}
+    for prefix, path in (("original", onnx_path), ("optimized", optimized_path)):
+        session = rt.InferenceSession(path, providers=["CPUExecutionProvider"])
+        input_name = session.get_inputs()[0].name
+        label_name = session.get_outputs()[0].name
+        onnx_predictions = session.run([label_name], {input_name: X.astype(np.float32)})[0]
+        onnx_predictions = onnx_predictions.flatten()
+
+        report[f"{prefix}_size_bytes"] = float(os.path.getsize(path))
+        for name, value in measure_latency(path, X, n_runs=n_runs).items():
+            report[f"{prefix}_{name}"] = value
+        report[f"{prefix}_agreement"] = float(np.mean(onnx_predictions == sklearn_predictions))
+        report[f"{prefix}_outlier_rate"] = float(np.mean(onnx_predictions == -1))
+
+    for name in ("size_bytes", "single_row_ms", "batch_ms", "agreement", "outlier_rate"):
+        report[f"{name}_delta"] = report[f"optimized_{name}"] - report[f"original_{name}"]
+    report["optimized_valid"] = float(validate_onnx_model(pipeline, optimized_path, X))
+    return report
+
+
+def _latency_percentiles_ms(predict: Callable[[], object], n_runs: int) -> Tuple[float, float]:
+    """ウォームアップ後にn_runs回実行し、レイテンシのp50とp99（ミリ秒）を返す。"""
+    predict()  # ウォームアップ
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        predict()
+        timings.append((time.perf_counter() - start) * 1000)
+    p50, p99 = np.percentile(timings, [50, 99])
+    return float(p50), float(p99)
+
+
+def run_parity_harness(
+    pipeline: Pipeline,
+    onnx_path: str,
+    X: np.ndarray,
+    batch_sizes: Sequence[int] = HARNESS_BATCH_SIZES,
+    n_runs: int = 50,
+) -> Dict[str, float]:
+    """
+    複数のバッチサイズでscikit-learnとONNX Runtimeの予測・レイテンシを比較する。
+
+    外れ値検出には確率がないため、確率の代わりに決定関数値（ONNXのscore出力と
+    decision_function）の誤差を比較します。セッションは1回だけ作成し、
+    全バッチサイズの推論・計測で使い回します。
+
+    Args:
+        pipeline: 学習済みscikit-learn Pipeline
+        onnx_path: ONNXモデルのパス
+        X: 入力データ。バッチサイズより行が少ない場合は行を繰り返して使う
+        batch_sizes: 計測するバッチサイズ（デフォルト: 1, 8, 64, 512, 4096）
+        n_runs: バッチサイズごとのレイテンシの計測回数
+
+    Returns:
+        dict: バッチサイズごとの batch_{N}_max_abs_error（決定関数値の最大絶対誤差）、
+            batch_{N}_label_agreement（ラベルの一致率）、
+            batch_{N}_native_p50_ms, batch_{N}_native_p99_ms（scikit-learnのdecision_function）、
+            batch_{N}_onnx_p50_ms, batch_{N}_onnx_p99_ms（ONNX Runtime）
+
+    Examples:
+        >>> report = run_parity_harness(fitted_pipeline, "/tmp/iris_ocs_0.onnx", X)
+        >>> report["batch_4096_label_agreement"]
+        1.0
+    """
+    session = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+    output_names = [output.name for output in session.get_outputs()[:2]]
+
+    X_float32 = X.astype(np.float32)
+    report: Dict[str, float] = {}
+    for batch_size in batch_sizes:
+        batch = np.resize(X_float32, (batch_size, X_float32.shape[1]))
+        onnx_labels, onnx_scores = session.run(output_names, {input_name: batch})
+
+        prefix = f"batch_{batch_size}"
+        report[f"{prefix}_max_abs_error"] = float(
+            np.max(np.abs(pipeline.decision_function(batch) - onnx_scores.flatten()))
+        )
+        report[f"{prefix}_label_agreement"] = float(
+            np.mean(pipeline.predict(batch) == onnx_labels.flatten())
+        )
+        report[f"{prefix}_native_p50_ms"], report[f"{prefix}_native_p99_ms"] = (
+            _latency_percentiles_ms(partial(pipeline.decision_function, batch), n_runs)
+        )
+        report[f"{prefix}_onnx_p50_ms"], report[f"{prefix}_onnx_p99_ms"] = (
+            _latency_percentiles_ms(
+                partial(session.run, output_names, {input_name: batch}), n_runs
+            )
+        )
+    return report
+
+
+def check_parity_report(
+    report: Dict[str, float],
+    max_abs_error: float = 1e-2,
+    min_label_agreement: float = 1.0,
+    max_latency_ratio: Optional[float] = None,
+    latency_budget_ms: Optional[Dict[int, float]] = None,
+    baseline: Optional[Dict[str, float]] = None,
+    max_baseline_ratio: float = MAX_BASELINE_LATENCY_RATIO,
+) -> None:
+    """
+    run_parity_harnessの結果が基準を満たすか検証し、満たさない場合はエクスポートを失敗させる。
+
+    Args:
+        report: run_parity_harnessの結果
+        max_abs_error: 決定関数値の最大絶対誤差の上限（デフォルト: 0.01）
+        min_label_agreement: ラベルの一致率の下限
+        max_latency_ratio: ONNX Runtimeのp50レイテンシの上限（scikit-learnのp50に対する倍率）。
+            Noneの場合は検証しない
+        latency_budget_ms: バッチサイズごとのONNX Runtimeのp99レイテンシの上限（ミリ秒）。
+            Noneの場合は検証しない
+        baseline: 前回検証を通過したモデルのrun_parity_harnessの結果（load_parity_baseline）。
+            Noneの場合、またはバッチサイズが含まれない場合は検証しない
+        max_baseline_ratio: ONNX Runtimeのp50レイテンシの上限（ベースラインのp50に対する倍率、
+            デフォルト: 2.0）
+
+    Raises:
+        ValueError: いずれかのバッチサイズで基準を満たさない場合（全ての違反を列挙する）
+
+    Notes:
+        - "nystroem_sgd"はカーネルをfloat32で計算するため、決定関数値の誤差が1e-3程度になる
+    """
+    failures: List[str] = []
+    batch_sizes = sorted(
+        int(name.split("_")[1]) for name in report if name.endswith("_label_agreement")
+    )
+    for batch_size in batch_sizes:
+        prefix = f"batch_{batch_size}"
+        error = report[f"{prefix}_max_abs_error"]
+        if error > max_abs_error:
+            failures.append(f"{prefix}: max_abs_error {error:.2e} > {max_abs_error:.2e}")
+        agreement = report[f"{prefix}_label_agreement"]
+        if agreement < min_label_agreement:
+            failures.append(
+                f"{prefix}: label_agreement {agreement:.4f} < {min_label_agreement:.4f}"
+            )
+        onnx_p50 = report[f"{prefix}_onnx_p50_ms"]
+        native_p50 = report[f"{prefix}_native_p50_ms"]
+        if max_latency_ratio is not None and onnx_p50 > native_p50 * max_latency_ratio:
+            failures.append(
+                f"{prefix}: onnx p50 {onnx_p50:.3f} ms > {max_latency_ratio} x "
+                f"native p50 {native_p50:.3f} ms"
+            )
+        budget = (latency_budget_ms or {}).get(batch_size)
+        onnx_p99 = report[f"{prefix}_onnx_p99_ms"]
+        if budget is not None and onnx_p99 > budget:
+            failures.append(f"{prefix}: onnx p99 {onnx_p99:.3f} ms > budget {budget:.3f} ms")
+        baseline_p50 = (baseline or {}).get(f"{prefix}_onnx_p50_ms")
+        if baseline_p50 is not None and onnx_p50 > baseline_p50 * max_baseline_ratio:
+            failures.append(
+                f"{prefix}: onnx p50 {onnx_p50:.3f} ms > {max_baseline_ratio} x "
+                f"baseline p50 {baseline_p50:.3f} ms"
+            )
+
+    if failures:
+        raise ValueError("ONNX model failed parity/latency checks: " + "; ".join(failures))
+
+
+def load_parity_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    記録済みのパリティ・レイテンシのベースラインを読み込む。
+
+    Args:
+        path: save_parity_baselineで保存したJSONファイルのパス
+
+    Returns:
+        dict: モデル名（"original", "optimized" など）ごとのrun_parity_harnessの結果。
+            ファイルがない場合は空の辞書
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        baseline: Dict[str, Dict[str, float]] = json.load(f)
+    return baseline
+
+
+def save_parity_baseline(path: str, reports: Dict[str, Dict[str, float]]) -> None:
+    """
+    検証を通過したモデルのrun_parity_harnessの結果を次回のベースラインとして保存する。
+
+    レイテンシはマシンに依存するため、ベースラインは推論に使うものと同じ種類のマシンで記録します。
+
+    Args:
+        path: 保存先のJSONファイルのパス
+        reports: モデル名ごとのrun_parity_harnessの結果
+    """
+    with open(path, "w") as f:
+        json.dump(reports, f, indent=2, sort_keys=True)
+
+
+def run_export_gate(
+    pipeline: Pipeline,
+    onnx_paths: Dict[str, str],
+    X: np.ndarray,
+    baseline: Optional[Dict[str, Dict[str, float]]] = None,
+    max_latency_ratio: Optional[float] = None,
+    latency_budget_ms: Optional[Dict[int, float]] = None,
+    max_baseline_ratio: float = MAX_BASELINE_LATENCY_RATIO,
+    n_runs: int = 50,
+) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+    """
+    出荷する全てのONNXモデル（元のモデルと最適化・量子化済みモデル）をハーネスで検証する。
+
+    モデルごとにrun_parity_harnessを実行し、check_parity_reportの基準と、
+    baselineに同じ名前のモデルの結果がある場合はそのレイテンシからの回帰を検証します。
+    ファイルの削除やベースラインの保存は行わないため、呼び出し元で結果を記録してから判断できます。
+
+    Args:
+        pipeline: 元の学習済みscikit-learn Pipeline
+        onnx_paths: モデル名とONNXモデルのパス（例: {"original": ..., "optimized": ...}）
+        X: 入力データ（run_parity_harnessと同じ）
+        baseline: load_parity_baselineで読み込んだモデル名ごとのベースライン
+        max_latency_ratio: check_parity_reportに渡す（Noneの場合は検証しない）
+        latency_budget_ms: check_parity_reportに渡す（Noneの場合は検証しない）
+        max_baseline_ratio: check_parity_reportに渡す（デフォルト: 2.0）
+        n_runs: バッチサイズごとのレイテンシの計測回数
+
+    Returns:
+        Tuple[dict, list]: モデル名ごとのrun_parity_harnessの結果と、基準を満たさなかった
+            モデルのエラーメッセージのリスト（全て通過した場合は空）
+    """
+    reports: Dict[str, Dict[str, float]] = {}
+    failures: List[str] = []
+    for name, onnx_path in onnx_paths.items():
+        reports[name] = run_parity_harness(pipeline, onnx_path, X, n_runs=n_runs)
+        try:
+            check_parity_report(
+                reports[name],
+                max_latency_ratio=max_latency_ratio,
+                latency_budget_ms=latency_budget_ms,
+                baseline=(baseline or {}).get(name),
+                max_baseline_ratio=max_baseline_ratio,
+            )
+        except ValueError as e:
+            failures.append(f"{name}: {e}")
+    return reports, failures
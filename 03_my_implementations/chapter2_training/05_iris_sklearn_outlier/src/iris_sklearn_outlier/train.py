@@ -3,7 +3,7 @@ Iris外れ値検出のメイン学習スクリプト。
 
 このスクリプトは以下の完全な学習パイプラインを実行します:
 1. データの読み込み
-2. One-Class SVMモデルの学習
+2. 外れ値検出モデルの学習（デフォルトはOne-Class SVM）
 3. 外れ値率の評価
 4. MLflowへの実験記録
 5. モデルのONNX形式へのエクスポート
@@ -15,8 +15,17 @@ import mlflow
 import mlflow.sklearn
 
 from iris_sklearn_outlier.data_loader import load_iris_data
-from iris_sklearn_outlier.model import create_ocs_pipeline
-from iris_sklearn_outlier.onnx_exporter import export_to_onnx, validate_onnx_model
+from iris_sklearn_outlier.model import BACKENDS, create_ocs_pipeline, get_model_params
+from iris_sklearn_outlier.onnx_exporter import (
+    HARNESS_BATCH_SIZES,
+    compare_onnx_models,
+    export_to_onnx,
+    load_parity_baseline,
+    optimize_onnx_model,
+    run_export_gate,
+    save_parity_baseline,
+    validate_onnx_model,
+)
 from iris_sklearn_outlier.trainer import evaluate_model, train_model
 
 
@@ -29,11 +38,35 @@ def main() -> None:
     # MLflow実験ID（環境変数から取得、デフォルトは0）
     mlflow_experiment_id = int(os.getenv("MLFLOW_EXPERIMENT_ID", 0))
 
+    # 外れ値検出のバックエンド（環境変数から取得、デフォルトはOne-Class SVM）
+    # 大規模データでは "isolation_forest" または "nystroem_sgd" を使用する
+    backend = os.getenv("OUTLIER_BACKEND", "ocsvm")
+    if backend not in BACKENDS:
+        raise ValueError(f"OUTLIER_BACKEND must be one of {list(BACKENDS)}, got {backend!r}")
+
     # ハイパーパラメータ
     nu = 0.1  # 外れ値の上限割合
     gamma = "auto"  # RBFカーネルパラメータ
     kernel = "rbf"  # カーネル関数
 
+    # ONNXモデルのレイテンシ上限（オプトイン、環境変数から取得。未設定の場合は検証しない）
+    # - ONNX_MAX_LATENCY_RATIO: scikit-learnのp50に対する倍率
+    # - ONNX_LATENCY_BUDGET_MS: バッチサイズごとのp99の上限（ミリ秒、例: "1=0.5,4096=20"）
+    # 既定では前回通過したモデルのレイテンシ（ベースライン）からの回帰のみを検証する
+    max_onnx_latency_ratio = (
+        float(os.environ["ONNX_MAX_LATENCY_RATIO"]) if os.getenv("ONNX_MAX_LATENCY_RATIO") else None
+    )
+    onnx_latency_budget_ms = (
+        {
+            int(batch_size): float(budget_ms)
+            for batch_size, budget_ms in (
+                item.split("=") for item in os.environ["ONNX_LATENCY_BUDGET_MS"].split(",")
+            )
+        }
+        if os.getenv("ONNX_LATENCY_BUDGET_MS")
+        else None
+    )
+
     # 1. データの読み込み
     print("\n[1/5] データを読み込み中...")
     X = load_iris_data()
@@ -42,11 +75,14 @@ def main() -> None:
 
     # 2. モデルの作成と学習
     print("\n[2/5] モデルを学習中...")
-    pipeline = create_ocs_pipeline(nu=nu, gamma=gamma, kernel=kernel)
+    pipeline = create_ocs_pipeline(nu=nu, gamma=gamma, kernel=kernel, backend=backend)
     fitted_pipeline = train_model(pipeline, X)
-    n_support = len(fitted_pipeline.named_steps["ocs"].support_)
-    print("  ✓ 学習完了")
-    print(f"  ✓ サポートベクター数: {n_support}")
+    print(f"  ✓ 学習完了（バックエンド: {backend}）")
+    # サポートベクターを持つのはOne-Class SVMのみ
+    n_support = None
+    if backend == "ocsvm":
+        n_support = len(fitted_pipeline.named_steps["ocs"].support_)
+        print(f"  ✓ サポートベクター数: {n_support}")
 
     # 3. モデルの評価
     print("\n[3/5] モデルを評価中...")
@@ -60,15 +96,15 @@ def main() -> None:
     print("\n[4/5] MLflowに記録中...")
 
     # パラメータの記録
+    # 検出器の名前と、バックエンドが実際に使うハイパーパラメータのみを記録する
     mlflow.log_param("normalize", "StandardScaler")
-    mlflow.log_param("model", "one_class_svm")
-    mlflow.log_param("nu", nu)
-    mlflow.log_param("gamma", gamma)
-    mlflow.log_param("kernel", kernel)
+    mlflow.log_param("backend", backend)
+    mlflow.log_params(get_model_params(fitted_pipeline))
 
     # メトリクスの記録
     mlflow.log_metric("outlier_rate", outlier_rate)
-    mlflow.log_metric("n_support_vectors", n_support)
+    if n_support is not None:
+        mlflow.log_metric("n_support_vectors", n_support)
     mlflow.log_metric("n_outliers", n_outliers)
     mlflow.log_metric("n_inliers", n_inliers)
 
@@ -88,8 +124,68 @@ def main() -> None:
     is_valid = validate_onnx_model(fitted_pipeline, onnx_path, X[:10])
     print(f"  ✓ ONNX検証: {'成功' if is_valid else '失敗'}")
 
+    # グラフ最適化を適用したモデルを隣に保存（出荷する全てのモデルを検証するため、検証より先に作成）
+    optimized_path = optimize_onnx_model(onnx_path)
+    onnx_paths = {"original": onnx_path, "optimized": optimized_path}
+
+    # 出荷する全てのモデルについて、バッチサイズごとの決定関数値・ラベル・レイテンシを検証
+    # （基準を満たさない場合、または前回通過したモデルからレイテンシが回帰した場合は失敗させる）
+    # レイテンシはバックエンドごとに大きく異なるため、ベースラインもバックエンドごとに分ける
+    baseline_name = f"iris_ocs_{mlflow_experiment_id}_{backend}.parity.json"
+    baseline_path = os.getenv("ONNX_PARITY_BASELINE", os.path.join("/tmp/", baseline_name))
+    parity_reports, parity_failures = run_export_gate(
+        fitted_pipeline,
+        onnx_paths,
+        X,
+        baseline=load_parity_baseline(baseline_path),
+        max_latency_ratio=max_onnx_latency_ratio,
+        latency_budget_ms=onnx_latency_budget_ms,
+    )
+    for name, parity_report in parity_reports.items():
+        print(f"  ✓ パリティ・レイテンシ（{name}、p50 / p99 ms）:")
+        for batch_size in HARNESS_BATCH_SIZES:
+            prefix = f"batch_{batch_size}"
+            print(
+                f"    - バッチ{batch_size:>5}: 誤差 {parity_report[f'{prefix}_max_abs_error']:.2e}, "
+                f"一致率 {parity_report[f'{prefix}_label_agreement']:.4f}, "
+                f"sklearn {parity_report[f'{prefix}_native_p50_ms']:.3f} / "
+                f"{parity_report[f'{prefix}_native_p99_ms']:.3f}, "
+                f"ONNX {parity_report[f'{prefix}_onnx_p50_ms']:.3f} / "
+                f"{parity_report[f'{prefix}_onnx_p99_ms']:.3f}"
+            )
+        metric_prefix = "onnx_parity" if name == "original" else f"onnx_parity_{name}"
+        mlflow.log_metrics(
+            {f"{metric_prefix}_{key}": value for key, value in parity_report.items()}
+        )
+    if parity_failures:
+        # 基準を満たさないモデルは出力先に残さない
+        for path in onnx_paths.values():
+            os.remove(path)
+        raise ValueError("ONNX export gate failed: " + " | ".join(parity_failures))
+    save_parity_baseline(baseline_path, parity_reports)
+
+    # 元のモデルと最適化済みモデルのサイズ・レイテンシ・予測を比較
+    report = compare_onnx_models(fitted_pipeline, onnx_path, optimized_path, X)
+    print(f"  ✓ 最適化済みONNXモデル: {optimized_path}")
+    print(
+        f"    - サイズ: {report['original_size_bytes']:.0f} → "
+        f"{report['optimized_size_bytes']:.0f} bytes"
+    )
+    print(
+        f"    - レイテンシ（1行）: {report['original_single_row_ms']:.3f} → "
+        f"{report['optimized_single_row_ms']:.3f} ms"
+    )
+    print(
+        f"    - レイテンシ（{len(X)}行）: {report['original_batch_ms']:.3f} → "
+        f"{report['optimized_batch_ms']:.3f} ms"
+    )
+    print(f"    - 予測一致率の差: {report['agreement_delta']:+.4f}")
+    print(f"    - ONNX検証: {'成功' if report['optimized_valid'] else '失敗'}")
+    mlflow.log_metrics({f"onnx_{name}": value for name, value in report.items()})
+
     # ONNXモデルをMLflowに記録
     mlflow.log_artifact(onnx_path)
+    mlflow.log_artifact(optimized_path)
     print("  ✓ ONNXモデルをMLflowに記録")
 
     # 完了
@@ -98,7 +194,8 @@ def main() -> None:
     print("=" * 80)
     print("\n📊 結果サマリー:")
     print(f"  - 外れ値率: {outlier_rate:.4f}")
-    print(f"  - サポートベクター数: {n_support}")
+    if n_support is not None:
+        print(f"  - サポートベクター数: {n_support}")
     print(f"  - MLflow実験ID: {mlflow_experiment_id}")
     print(f"  - ONNXモデル: {onnx_name}")
     print()
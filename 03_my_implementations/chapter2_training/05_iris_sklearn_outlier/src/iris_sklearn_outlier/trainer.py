@@ -1,7 +1,7 @@
 """
 モデルの学習と評価モジュール。
 
-このモジュールはOne-Class SVMモデルの学習と外れ値率の評価を行う機能を提供します。
+このモジュールは外れ値検出モデルの学習と外れ値率の評価を行う機能を提供します。
 """
 
 import numpy as np
@@ -10,7 +10,7 @@ from sklearn.pipeline import Pipeline  # type: ignore[import-untyped]
 
 def train_model(pipeline: Pipeline, X: np.ndarray) -> Pipeline:
     """
-    One-Class SVMモデルを学習する。
+    外れ値検出モデルを学習する。
 
     教師なし学習のため、ラベルyは不要。
     全データを正常データとして学習し、その分布の境界を学習する。
@@ -71,6 +71,5 @@ def evaluate_model(pipeline: Pipeline, X: np.ndarray) -> float:
         - 学習データで評価すると、nuに近い値になることが期待される
     """
     predictions = pipeline.predict(X)
-    n_outliers = sum(1 for pred in predictions if pred == -1)
-    outlier_rate = n_outliers / len(X)
+    outlier_rate = np.count_nonzero(predictions == -1) / len(X)
     return float(outlier_rate)
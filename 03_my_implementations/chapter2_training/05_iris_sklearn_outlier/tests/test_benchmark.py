@@ -0,0 +1,42 @@
+"""
+benchmarkモジュールのユニットテスト。
+
+合成データの作成とバックエンドごとの計測結果をテストします。
+"""
+
+from iris_sklearn_outlier.benchmark import benchmark_backends, make_synthetic_data
+from iris_sklearn_outlier.model import BACKENDS
+
+
+class TestMakeSyntheticData:
+    """Test cases for make_synthetic_data function."""
+
+    def test_shape_and_dtype(self) -> None:
+        """Test that synthetic data has the requested rows and Iris features."""
+        X = make_synthetic_data(1000)
+
+        assert X.shape == (1000, 4)
+        assert X.dtype.name == "float32"
+
+    def test_reproducible(self) -> None:
+        """Test that the same seed gives the same data."""
+        X1 = make_synthetic_data(100, random_state=0)
+        X2 = make_synthetic_data(100, random_state=0)
+
+        assert (X1 == X2).all()
+
+
+class TestBenchmarkBackends:
+    """Test cases for benchmark_backends function."""
+
+    def test_one_row_per_backend_and_size(self) -> None:
+        """Test that every backend is measured at every sample size."""
+        rows = benchmark_backends([300, 600])
+
+        assert [(row["backend"], row["n_samples"]) for row in rows] == [
+            (backend, n_samples) for n_samples in (300, 600) for backend in BACKENDS
+        ]
+        for row in rows:
+            assert row["fit_seconds"] > 0
+            assert row["predict_seconds"] > 0
+            assert 0.0 <= row["outlier_rate"] <= 1.0
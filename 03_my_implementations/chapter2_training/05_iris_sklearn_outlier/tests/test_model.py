@@ -4,11 +4,16 @@ modelモジュールのユニットテスト。
 One-Class SVMモデルパイプラインの構築と設定をテストします。
 """
 
+import pytest
+from sklearn.ensemble import IsolationForest
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import SGDOneClassSVM
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.svm import OneClassSVM
 
-from iris_sklearn_outlier.model import create_ocs_pipeline
+from iris_sklearn_outlier.data_loader import load_iris_data
+from iris_sklearn_outlier.model import BACKENDS, create_ocs_pipeline, get_model_params
 
 
 class TestCreateOCSPipeline:
@@ -109,3 +114,97 @@ class TestCreateOCSPipeline:
 
         assert predictions.shape == (1,), "Should predict for 1 sample"
         assert predictions[0] in [1, -1], "Prediction should be 1 (inlier) or -1 (outlier)"
+
+
+class TestOutlierBackends:
+    """Test cases for the scalable backends of create_ocs_pipeline."""
+
+    def test_isolation_forest_backend(self) -> None:
+        """Test that the isolation_forest backend uses nu as contamination."""
+        pipeline = create_ocs_pipeline(nu=0.2, backend="isolation_forest", n_estimators=50)
+
+        assert [name for name, _ in pipeline.steps] == ["scaler", "iforest"]
+        iforest = pipeline.named_steps["iforest"]
+        assert isinstance(iforest, IsolationForest)
+        assert iforest.contamination == 0.2
+        assert iforest.n_estimators == 50
+
+    def test_nystroem_sgd_backend(self) -> None:
+        """Test that the nystroem_sgd backend approximates the RBF kernel."""
+        pipeline = create_ocs_pipeline(nu=0.2, backend="nystroem_sgd", n_components=50)
+
+        assert [name for name, _ in pipeline.steps] == ["scaler", "nystroem", "sgd_ocs"]
+        nystroem = pipeline.named_steps["nystroem"]
+        assert isinstance(nystroem, Nystroem)
+        assert nystroem.kernel == "rbf"
+        assert nystroem.gamma is None, "gamma='auto' should map to Nystroem's 1/n_features"
+        assert nystroem.n_components == 50
+        sgd_ocs = pipeline.named_steps["sgd_ocs"]
+        assert isinstance(sgd_ocs, SGDOneClassSVM)
+        assert sgd_ocs.nu == 0.2
+
+    def test_nystroem_sgd_float_gamma(self) -> None:
+        """Test that a float gamma is passed to Nystroem."""
+        pipeline = create_ocs_pipeline(gamma=0.5, backend="nystroem_sgd")
+
+        assert pipeline.named_steps["nystroem"].gamma == 0.5
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_backend_outlier_rate_close_to_nu(self, backend: str) -> None:
+        """Test that every backend flags roughly nu of the training data."""
+        X = load_iris_data()
+
+        pipeline = create_ocs_pipeline(nu=0.1, backend=backend)
+        pipeline.fit(X)
+        predictions = pipeline.predict(X)
+
+        assert set(predictions) <= {-1, 1}
+        assert 0.05 <= (predictions == -1).mean() <= 0.15
+
+    def test_unknown_backend(self) -> None:
+        """Test that an unknown backend raises ValueError."""
+        with pytest.raises(ValueError):
+            create_ocs_pipeline(backend="lof")
+
+    @pytest.mark.parametrize("kwargs", [{"kernel": "linear"}, {"gamma": "scale"}])
+    def test_nystroem_sgd_unsupported_options(self, kwargs: dict) -> None:
+        """Test that nystroem_sgd rejects kernels and gammas it cannot reproduce."""
+        with pytest.raises(ValueError):
+            create_ocs_pipeline(backend="nystroem_sgd", **kwargs)
+
+
+class TestGetModelParams:
+    """Test cases for get_model_params function."""
+
+    @pytest.mark.parametrize(
+        "backend, expected",
+        [
+            (
+                "ocsvm",
+                {"model": "one_class_svm", "nu": 0.2, "gamma": "auto", "kernel": "rbf"},
+            ),
+            (
+                "isolation_forest",
+                {"model": "isolation_forest", "contamination": 0.2, "n_estimators": 100},
+            ),
+            (
+                "nystroem_sgd",
+                {
+                    "model": "nystroem_sgd_one_class_svm",
+                    "nu": 0.2,
+                    "gamma": "auto",
+                    "kernel": "rbf",
+                    "n_components": 100,
+                },
+            ),
+        ],
+    )
+    def test_params_follow_backend(self, backend: str, expected: dict) -> None:
+        """Test that each backend reports its own model name and only the params it uses."""
+        assert get_model_params(create_ocs_pipeline(nu=0.2, backend=backend)) == expected
+
+    def test_pipeline_without_detector(self) -> None:
+        """Test that a pipeline without a detector step raises ValueError."""
+        with pytest.raises(ValueError):
+            get_model_params(Pipeline([("scaler", StandardScaler())]))
+
@@ -7,11 +7,27 @@ ONNXモデルのエクスポートと検証機能をテストします。
 import os
 import tempfile
 
+import numpy as np
+import onnxruntime as rt
 import pytest
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import SGDOneClassSVM
+from sklearn.pipeline import Pipeline
 
 from iris_sklearn_outlier.data_loader import load_iris_data
-from iris_sklearn_outlier.model import create_ocs_pipeline
-from iris_sklearn_outlier.onnx_exporter import export_to_onnx, validate_onnx_model
+from iris_sklearn_outlier.model import BACKENDS, create_ocs_pipeline
+from iris_sklearn_outlier.onnx_exporter import (
+    HARNESS_BATCH_SIZES,
+    check_parity_report,
+    compare_onnx_models,
+    export_to_onnx,
+    load_parity_baseline,
+    optimize_onnx_model,
+    run_export_gate,
+    run_parity_harness,
+    save_parity_baseline,
+    validate_onnx_model,
+)
 from iris_sklearn_outlier.trainer import train_model
 
 
@@ -155,3 +171,184 @@ class TestValidateONNXModel:
             result = validate_onnx_model(fitted_pipeline, onnx_path, X[:5])
 
             assert isinstance(result, bool), "Should return a boolean value"
+
+
+class TestBackendExport:
+    """Test cases for exporting the scalable backends with the same export path."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_export_and_validate_each_backend(self, backend: str) -> None:
+        """Test that every backend exports to ONNX with matching labels."""
+        X = load_iris_data()
+        fitted_pipeline = train_model(create_ocs_pipeline(backend=backend), X)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(fitted_pipeline, onnx_path)
+
+            assert validate_onnx_model(fitted_pipeline, onnx_path, X)
+
+    def test_nystroem_scores_match_sklearn(self) -> None:
+        """Test that the custom Nystroem converter reproduces the decision function."""
+        X = load_iris_data()
+        fitted_pipeline = train_model(create_ocs_pipeline(backend="nystroem_sgd"), X)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(fitted_pipeline, onnx_path)
+            session = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+            scores = session.run(None, {session.get_inputs()[0].name: X})[1]
+
+        np.testing.assert_allclose(
+            scores.ravel(), fitted_pipeline.decision_function(X), atol=1e-2
+        )
+
+    def test_nystroem_non_rbf_kernel_not_supported(self) -> None:
+        """Test that Nystroem with a non-RBF kernel cannot be exported."""
+        X = load_iris_data()
+        pipeline = Pipeline(
+            [("nystroem", Nystroem(kernel="poly", n_components=10)), ("sgd_ocs", SGDOneClassSVM())]
+        )
+        pipeline.fit(X)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(NotImplementedError):
+                export_to_onnx(pipeline, os.path.join(tmpdir, "model.onnx"))
+
+
+class TestOptimizeONNXModel:
+    """Test cases for optimize_onnx_model and compare_onnx_models functions."""
+
+    def test_optimized_model_saved_next_to_original(self) -> None:
+        """Test that the optimized model is written beside the original and stays valid."""
+        X = load_iris_data()
+        fitted_pipeline = train_model(create_ocs_pipeline(), X)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(fitted_pipeline, onnx_path)
+            optimized_path = optimize_onnx_model(onnx_path)
+
+            assert optimized_path == os.path.join(tmpdir, "model.opt.onnx")
+            assert validate_onnx_model(fitted_pipeline, optimized_path, X)
+
+    def test_invalid_level(self) -> None:
+        """Test that an unknown optimization level raises ValueError."""
+        with pytest.raises(ValueError):
+            optimize_onnx_model("model.onnx", level="fastest")
+
+    def test_compare_onnx_models_report(self) -> None:
+        """Test that the report compares size, latency and predictions."""
+        X = load_iris_data()
+        fitted_pipeline = train_model(create_ocs_pipeline(), X)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(fitted_pipeline, onnx_path)
+            report = compare_onnx_models(
+                fitted_pipeline, onnx_path, optimize_onnx_model(onnx_path), X, n_runs=5
+            )
+
+        for prefix in ("original", "optimized"):
+            assert report[f"{prefix}_size_bytes"] > 0
+            assert report[f"{prefix}_single_row_ms"] > 0
+            assert report[f"{prefix}_batch_ms"] > 0
+            assert report[f"{prefix}_agreement"] == 1.0
+        assert report["outlier_rate_delta"] == 0.0
+        assert report["optimized_valid"] == 1.0
+
+
+class TestParityHarness:
+    """Test cases for run_parity_harness and check_parity_report functions."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_report_covers_every_batch_size(self, backend: str) -> None:
+        """Test that the harness reports score parity and latency for each batch size."""
+        X = load_iris_data()
+        fitted_pipeline = train_model(create_ocs_pipeline(backend=backend), X)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            onnx_path = os.path.join(tmpdir, "model.onnx")
+            export_to_onnx(fitted_pipeline, onnx_path)
+            report = run_parity_harness(fitted_pipeline, onnx_path, X, n_runs=3)
+
+        for batch_size in HARNESS_BATCH_SIZES:
+            prefix = f"batch_{batch_size}"
+            assert report[f"{prefix}_label_agreement"] == 1.0
+            for runtime in ("native", "onnx"):
+                p50 = report[f"{prefix}_{runtime}_p50_ms"]
+                assert 0 < p50 <= report[f"{prefix}_{runtime}_p99_ms"]
+
+        # パリティの基準はどのバックエンドでも満たされる
+        check_parity_report(report)
+
+    @staticmethod
+    def _report(**overrides: float) -> dict:
+        report = {
+            "batch_8_max_abs_error": 0.0,
+            "batch_8_label_agreement": 1.0,
+            "batch_8_native_p50_ms": 10.0,
+            "batch_8_native_p99_ms": 12.0,
+            "batch_8_onnx_p50_ms": 1.0,
+            "batch_8_onnx_p99_ms": 2.0,
+        }
+        report.update(overrides)
+        return report
+
+    @pytest.mark.parametrize(
+        "overrides, kwargs",
+        [
+            ({"batch_8_max_abs_error": 0.1}, {}),
+            ({"batch_8_label_agreement": 0.99}, {}),
+            ({"batch_8_onnx_p50_ms": 11.0}, {"max_latency_ratio": 1.0}),
+            ({}, {"latency_budget_ms": {8: 1.5}}),
+        ],
+    )
+    def test_regressions_fail(self, overrides: dict, kwargs: dict) -> None:
+        """Test that parity and latency regressions raise ValueError."""
+        with pytest.raises(ValueError, match="batch_8"):
+            check_parity_report(self._report(**overrides), **kwargs)
+
+    def test_within_budget_passes(self) -> None:
+        """Test that a report within every budget passes."""
+        check_parity_report(self._report(), max_latency_ratio=1.0, latency_budget_ms={8: 5.0})
+
+    def test_baseline_regression_fails(self) -> None:
+        """Test that a p50 regression against the recorded baseline raises ValueError."""
+        baseline = self._report()
+
+        check_parity_report(self._report(batch_8_onnx_p50_ms=1.5), baseline=baseline)
+        with pytest.raises(ValueError, match="baseline p50"):
+            check_parity_report(self._report(batch_8_onnx_p50_ms=2.5), baseline=baseline)
+
+    def test_baseline_round_trip(self, tmp_path) -> None:
+        """Test that a missing baseline is empty and a saved baseline loads back."""
+        path = str(tmp_path / "parity.json")
+        assert load_parity_baseline(path) == {}
+
+        save_parity_baseline(path, {"original": self._report()})
+
+        assert load_parity_baseline(path) == {"original": self._report()}
+
+    def test_export_gate_passes_slow_backend_by_default(self, tmp_path) -> None:
+        """Test that IsolationForest, slower in ONNX than scikit-learn, passes the default gate."""
+        X = load_iris_data()
+        fitted_pipeline = train_model(create_ocs_pipeline(backend="isolation_forest"), X)
+        onnx_path = str(tmp_path / "model.onnx")
+        export_to_onnx(fitted_pipeline, onnx_path)
+        onnx_paths = {"original": onnx_path, "optimized": optimize_onnx_model(onnx_path)}
+
+        reports, failures = run_export_gate(fitted_pipeline, onnx_paths, X, n_runs=3)
+
+        assert set(reports) == {"original", "optimized"}
+        assert failures == []
+
+        # 最適化済みモデルだけ、ベースラインより大幅に遅くなったとみなす
+        baseline = {
+            "optimized": {key: 1e-6 for key in reports["optimized"] if key.endswith("_p50_ms")}
+        }
+        _, failures = run_export_gate(fitted_pipeline, onnx_paths, X, baseline=baseline, n_runs=3)
+
+        assert len(failures) == 1
+        assert failures[0].startswith("optimized:")
+
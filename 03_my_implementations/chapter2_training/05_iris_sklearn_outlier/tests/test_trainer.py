@@ -4,10 +4,11 @@ trainerモジュールのユニットテスト。
 モデルの学習と外れ値率の評価機能をテストします。
 """
 
+import pytest
 from sklearn.pipeline import Pipeline
 
 from iris_sklearn_outlier.data_loader import load_iris_data
-from iris_sklearn_outlier.model import create_ocs_pipeline
+from iris_sklearn_outlier.model import BACKENDS, create_ocs_pipeline
 from iris_sklearn_outlier.trainer import evaluate_model, train_model
 
 
@@ -142,3 +143,16 @@ class TestEvaluateModel:
         actual_rate = evaluate_model(fitted_pipeline, X)
 
         assert abs(actual_rate - expected_rate) < 1e-6, "Outlier rate should match manual count"
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_evaluate_model_counts_outliers_for_each_backend(self, backend: str) -> None:
+        """Test that outlier_rate matches the predictions of every backend."""
+        X = load_iris_data()
+
+        fitted_pipeline = train_model(create_ocs_pipeline(backend=backend), X)
+        expected_rate = (fitted_pipeline.predict(X) == -1).sum() / len(X)
+
+        actual_rate = evaluate_model(fitted_pipeline, X)
+
+        assert isinstance(actual_rate, float)
+        assert actual_rate == pytest.approx(expected_rate)
@@ -3,13 +3,28 @@ CIFAR-10データセットの読み込みと前処理モジュール。
 
 このモジュールはtorchvisionを使ってCIFAR-10データセットをダウンロード・読み込み、
 適切な前処理を施してDataLoaderを作成します。
+
+デフォルトでは画像を一度だけデコードしてuint8の.npyファイルにキャッシュし、
+メモリマップで読み込みます。正規化はサンプル単位ではなくバッチ単位の1回のテンソル演算で行い、
+複数の永続ワーカーが次のバッチを先読みするため、エポック時間がデータ読み込みに律速されません。
 """
 
-from typing import Tuple
+import os
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
 
-from torch.utils.data import DataLoader
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset
 from torchvision import datasets, transforms
 
+# CIFAR-10の平均と標準偏差（チャネルごと）
+CIFAR10_MEAN = (0.4914, 0.4822, 0.4465)
+CIFAR10_STD = (0.2023, 0.1994, 0.2010)
+
+# キャッシュを作成するデータ分割
+CACHE_SPLITS = ("train", "test")
+
 
 def get_transforms() -> transforms.Compose:
     """
@@ -30,17 +45,215 @@ def get_transforms() -> transforms.Compose:
         [
             transforms.ToTensor(),
             transforms.Normalize(
-                mean=(0.4914, 0.4822, 0.4465),  # CIFAR-10の平均
-                std=(0.2023, 0.1994, 0.2010),  # CIFAR-10の標準偏差
+                mean=CIFAR10_MEAN,  # CIFAR-10の平均
+                std=CIFAR10_STD,  # CIFAR-10の標準偏差
             ),
         ]
     )
     return transform
 
 
+def normalize_batch(images: torch.Tensor) -> torch.Tensor:
+    """
+    uint8画像のバッチを1回のテンソル演算で正規化する。
+
+    get_transforms()のToTensor + Normalizeをバッチ全体に対して行うのと同じ結果になります。
+
+    Args:
+        images: uint8画像のバッチ（N, 3, 32, 32）
+
+    Returns:
+        torch.Tensor: 正規化済みのfloat32画像（N, 3, 32, 32）
+
+    Examples:
+        >>> images = torch.zeros(8, 3, 32, 32, dtype=torch.uint8)
+        >>> normalize_batch(images).dtype
+        torch.float32
+    """
+    mean = torch.tensor(CIFAR10_MEAN).view(1, 3, 1, 1) * 255.0
+    std = torch.tensor(CIFAR10_STD).view(1, 3, 1, 1) * 255.0
+    return images.float().sub_(mean).div_(std)
+
+
+def cache_paths(cache_dir: str, split: str) -> Tuple[Path, Path]:
+    """
+    キャッシュファイル（画像とラベル）のパスを返す。
+
+    Args:
+        cache_dir: キャッシュディレクトリ
+        split: データ分割（"train" or "test"）
+
+    Returns:
+        (images_path, labels_path): 画像とラベルの.npyファイルのパス
+    """
+    cache = Path(cache_dir)
+    return cache / f"{split}_images.npy", cache / f"{split}_labels.npy"
+
+
+def _save_npy(path: Path, array: np.ndarray) -> None:
+    # 書き込み途中のファイルを読まないよう、一時ファイルに書いてから置き換える
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def build_cifar10_cache(data_dir: str = "./data", cache_dir: Optional[str] = None) -> str:
+    """
+    CIFAR-10を一度だけデコードし、uint8の.npyファイルとしてキャッシュする。
+
+    画像はモデルの入力と同じ (N, 3, 32, 32) のuint8で保存します。
+    キャッシュが既に存在する分割はスキップします。
+
+    Args:
+        data_dir: データ保存ディレクトリ（デフォルト: "./data"）
+        cache_dir: キャッシュディレクトリ（デフォルト: data_dir/cifar10_cache）
+
+    Returns:
+        str: キャッシュディレクトリ
+
+    Examples:
+        >>> cache_dir = build_cifar10_cache("./data")
+        >>> dataset = CachedCIFAR10(cache_dir, split="train")
+    """
+    cache_dir = cache_dir or os.path.join(data_dir, "cifar10_cache")
+    os.makedirs(cache_dir, exist_ok=True)
+
+    for split in CACHE_SPLITS:
+        images_path, labels_path = cache_paths(cache_dir, split)
+        if images_path.exists() and labels_path.exists():
+            continue
+
+        dataset = datasets.CIFAR10(root=data_dir, train=split == "train", download=True)
+        # (N, 32, 32, 3) → (N, 3, 32, 32)
+        _save_npy(images_path, np.ascontiguousarray(dataset.data.transpose(0, 3, 1, 2)))
+        _save_npy(labels_path, np.asarray(dataset.targets, dtype=np.int64))
+
+    return cache_dir
+
+
+class CachedCIFAR10(Dataset):
+    """
+    uint8の.npyキャッシュをメモリマップで読み込むCIFAR-10データセット。
+
+    DataLoaderはバッチのインデックスを__getitems__に渡すため、バッチ単位で読み込み、
+    normalize_batchで正規化したバッチ（images, labels）を返します。
+    メモリマップは各ワーカープロセスで開き直すため、ワーカーへのデータのコピーは発生しません。
+
+    Args:
+        cache_dir: build_cifar10_cacheで作成したキャッシュディレクトリ
+        split: データ分割（"train" or "test"）
+
+    Examples:
+        >>> dataset = CachedCIFAR10(build_cifar10_cache(), split="test")
+        >>> images, labels = dataset.__getitems__([0, 1, 2])
+        >>> images.shape
+        torch.Size([3, 3, 32, 32])
+    """
+
+    def __init__(self, cache_dir: str, split: str = "train") -> None:
+        self.images_path, self.labels_path = cache_paths(cache_dir, split)
+        self.labels = torch.from_numpy(np.load(self.labels_path))
+        self._images: Optional[np.ndarray] = None
+
+    @property
+    def images(self) -> np.ndarray:
+        """uint8画像のメモリマップ（N, 3, 32, 32）。"""
+        if self._images is None:
+            self._images = np.load(self.images_path, mmap_mode="r")
+        return self._images
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __getitem__(self, index: int) -> Tuple[torch.Tensor, int]:
+        images, labels = self.__getitems__([index])
+        return images[0], int(labels[0])
+
+    def __getitems__(self, indices: List[int]) -> Tuple[torch.Tensor, torch.Tensor]:
+        # メモリマップからバッチ分だけ読み出す（ファンシーインデックスでコピーされる）
+        images = torch.from_numpy(np.asarray(self.images[np.asarray(indices)]))
+        return normalize_batch(images), self.labels[indices]
+
+    def __getstate__(self) -> dict:
+        # メモリマップはワーカープロセスで開き直す
+        state = self.__dict__.copy()
+        state["_images"] = None
+        return state
+
+
+def _collate_batch(batch: Any) -> Any:
+    # CachedCIFAR10.__getitems__が作成済みのバッチをそのまま返す
+    return batch
+
+
+def default_num_workers() -> int:
+    """
+    DataLoaderのワーカー数のデフォルト値（利用可能なCPUコア数、最大4）を返す。
+
+    Returns:
+        int: ワーカー数
+    """
+    if hasattr(os, "sched_getaffinity"):
+        n_cpus = len(os.sched_getaffinity(0))
+    else:
+        n_cpus = os.cpu_count() or 1
+    return min(4, n_cpus)
+
+
+def create_cached_loaders(
+    cache_dir: str,
+    batch_size: int = 32,
+    num_workers: Optional[int] = None,
+    prefetch_factor: int = 4,
+) -> Tuple[DataLoader, DataLoader]:
+    """
+    キャッシュから学習用・テスト用のDataLoaderを作成する。
+
+    ワーカーはエポックをまたいで維持され（persistent_workers）、
+    各ワーカーがprefetch_factor個のバッチを先読みします。
+
+    Args:
+        cache_dir: build_cifar10_cacheで作成したキャッシュディレクトリ
+        batch_size: バッチサイズ（デフォルト: 32）
+        num_workers: ワーカー数（デフォルト: default_num_workers()、0でメインプロセス）
+        prefetch_factor: ワーカーあたりの先読みバッチ数（デフォルト: 4）
+
+    Returns:
+        (train_loader, test_loader): 学習用とテスト用のDataLoaderのタプル
+    """
+    if num_workers is None:
+        num_workers = default_num_workers()
+
+    loader_options: dict = {
+        "batch_size": batch_size,
+        "num_workers": num_workers,
+        "collate_fn": _collate_batch,
+        "pin_memory": torch.cuda.is_available(),
+    }
+    if num_workers > 0:
+        loader_options["persistent_workers"] = True
+        loader_options["prefetch_factor"] = prefetch_factor
+
+    train_loader = DataLoader(
+        CachedCIFAR10(cache_dir, split="train"),
+        shuffle=True,  # 学習時はシャッフル
+        **loader_options,
+    )
+    test_loader = DataLoader(
+        CachedCIFAR10(cache_dir, split="test"),
+        shuffle=False,  # テスト時はシャッフルしない
+        **loader_options,
+    )
+    return train_loader, test_loader
+
+
 def load_cifar10_data(
     batch_size: int = 32,
     data_dir: str = "./data",
+    cached: bool = True,
+    num_workers: Optional[int] = None,
+    prefetch_factor: int = 4,
 ) -> Tuple[DataLoader, DataLoader]:
     """
     CIFAR-10データセットを読み込み、DataLoaderを作成する。
@@ -48,6 +261,10 @@ def load_cifar10_data(
     Args:
         batch_size: バッチサイズ（デフォルト: 32）
         data_dir: データ保存ディレクトリ（デフォルト: "./data"）
+        cached: uint8キャッシュとバッチ単位の正規化を使うか（デフォルト: True）。
+            Falseの場合はtorchvisionのCIFAR10でサンプルごとに変換します
+        num_workers: ワーカー数（デフォルト: cached=Trueならdefault_num_workers()、Falseなら0）
+        prefetch_factor: ワーカーあたりの先読みバッチ数（デフォルト: 4）
 
     Returns:
         (train_loader, test_loader): 学習用とテスト用のDataLoaderのタプル
@@ -60,12 +277,21 @@ def load_cifar10_data(
         torch.Size([64, 3, 32, 32])
 
     Notes:
-        - 初回実行時はデータセットがダウンロードされます
+        - 初回実行時はデータセットがダウンロードされ、キャッシュが作成されます
         - 学習データ: 50,000枚
         - テストデータ: 10,000枚
         - 画像サイズ: 32×32 RGB
         - クラス数: 10
     """
+    if cached:
+        cache_dir = build_cifar10_cache(data_dir)
+        return create_cached_loaders(
+            cache_dir,
+            batch_size=batch_size,
+            num_workers=num_workers,
+            prefetch_factor=prefetch_factor,
+        )
+
     transform = get_transforms()
 
     # CIFAR-10学習データセットをダウンロード・読み込み
@@ -89,14 +315,14 @@ def load_cifar10_data(
         train_dataset,
         batch_size=batch_size,
         shuffle=True,  # 学習時はシャッフル
-        num_workers=0,  # マルチプロセス不使用（互換性のため）
+        num_workers=num_workers or 0,
     )
 
     test_loader = DataLoader(
         test_dataset,
         batch_size=batch_size,
         shuffle=False,  # テスト時はシャッフルしない
-        num_workers=0,
+        num_workers=num_workers or 0,
     )
 
     return train_loader, test_loader
@@ -83,9 +83,9 @@ class SimpleCNN(nn.Module):
         # (batch, 6, 14, 14) → (batch, 16, 10, 10) → (batch, 16, 5, 5)
         x = self.pool(F.relu(self.conv2(x)))
 
-        # 平坦化
+        # 平坦化（channels_lastの活性化はviewできないため、必要な場合のみコピーするflattenを使う）
         # (batch, 16, 5, 5) → (batch, 400)
-        x = x.view(-1, 16 * 5 * 5)
+        x = torch.flatten(x, 1)
 
         # 全結合層1 + ReLU
         # (batch, 400) → (batch, 120)
@@ -3,14 +3,52 @@ PyTorchモデルのONNXエクスポートと検証モジュール。
 
 このモジュールはPyTorchモデルをONNX形式にエクスポートし、
 エクスポートされたモデルを検証する機能を提供します。
+エクスポート後の最適化（ONNX Runtimeのグラフ最適化、INT8量子化）と、
+元のモデルとのサイズ・レイテンシ・精度の比較も提供します。
+複数のバッチサイズでPyTorchとONNX Runtimeの確率・予測クラス・レイテンシを比較し、
+パリティやレイテンシが基準を満たさないエクスポートを失敗させる検証ハーネスも提供します。
 """
 
-from typing import Tuple
+import json
+import os
+import time
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
+import onnx
 import onnxruntime as rt  # type: ignore[import-untyped]
 import torch
 import torch.nn as nn
+from onnxruntime.quantization import (  # type: ignore[import-untyped]
+    CalibrationDataReader,
+    QuantType,
+    quantize_dynamic,
+    quantize_static,
+)
+from torch.utils.data import DataLoader
+
+# オフライン最適化のレベル
+# "all"はレイアウト変換などCPU固有の最適化を含むため、同じ種類のCPUで推論する場合のみ使用する
+OPTIMIZATION_LEVELS = {
+    "basic": rt.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": rt.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": rt.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+# 量子化の方式
+QUANTIZATION_MODES = ("dynamic", "static")
+
+# 検証ハーネスで計測するバッチサイズ（入力が足りない場合は画像を繰り返して作る）
+HARNESS_BATCH_SIZES = (1, 8, 64, 512, 4096)
+
+# 記録済みのベースラインに対するONNXのp50レイテンシの許容倍率
+# （計測回数が少ないp50のばらつきで誤って失敗しないよう、2倍を超える遅化のみを回帰とみなす）
+MAX_BASELINE_LATENCY_RATIO = 2.0
+
+# INT8量子化済みモデルのパリティの基準（run_export_gateのoverridesに指定する）
+# 量子化誤差で確率がずれ、境界付近の予測クラスが変わるため、元のモデルより緩める
+INT8_PARITY_CRITERIA = {"max_abs_error": 0.2, "min_label_agreement": 0.95}
 
 
 def export_to_onnx(
@@ -35,6 +73,9 @@ def export_to_onnx(
         - モデルは自動的に評価モードに切り替わります
         - 入力名: "input"
         - 出力名: "output"
+        - 重みを1つのファイルに含めるため、TorchScriptベースのエクスポーター（dynamo=False）を使います。
+          torch.exportベースのエクスポーター（PyTorch 2.9以降の既定）は重みを外部データ
+          （*.onnx.data）に書き出し、そのグラフにはINT8量子化の形状推論が失敗します
     """
     model.eval()  # 評価モードに切り替え
 
@@ -50,6 +91,7 @@ def export_to_onnx(
         input_names=["input"],
         output_names=["output"],
         export_params=True,
+        dynamo=False,
         dynamic_axes={
             "input": {0: "batch_size"},  # バッチサイズを可変にする
             "output": {0: "batch_size"},
@@ -85,6 +127,8 @@ def validate_onnx_model(
     Notes:
         - PyTorchとONNX Runtimeの予測クラスを比較します
         - クラス予測が一致すればTrueを返します
+        - 呼び出しごとにセッションを作成します。複数のバッチサイズで確率・レイテンシまで
+          検証する場合は、セッションを1回だけ作成するrun_parity_harnessを使用します
     """
     pytorch_model.eval()
 
@@ -111,3 +155,545 @@ def validate_onnx_model(
     # PyTorchとONNXの予測クラスが一致するか確認
     pytorch_predicted_np = pytorch_predicted.numpy()
     return np.array_equal(pytorch_predicted_np, onnx_predicted)
+
+
+def derived_model_path(onnx_path: str, suffix: str) -> str:
+    """
+    元のモデルと同じディレクトリに置く派生モデルのパスを返す。
+
+    Args:
+        onnx_path: 元のONNXモデルのパス
+        suffix: ファイル名に付けるサフィックス
+
+    Returns:
+        str: 派生モデルのパス
+
+    Examples:
+        >>> derived_model_path("models/cifar10_cnn.onnx", "opt")
+        'models/cifar10_cnn.opt.onnx'
+    """
+    root, ext = os.path.splitext(onnx_path)
+    return f"{root}.{suffix}{ext or '.onnx'}"
+
+
+def onnx_model_size_bytes(onnx_path: str) -> int:
+    """
+    ONNXモデルのサイズ（バイト）を、外部データファイルを含めて返す。
+
+    Args:
+        onnx_path: ONNXモデルのパス
+
+    Returns:
+        int: モデルファイルと、重みを保存した外部データファイル（*.onnx.dataなど）の合計サイズ
+    """
+    model = onnx.load(onnx_path, load_external_data=False)
+    locations = {
+        entry.value
+        for tensor in model.graph.initializer
+        if tensor.data_location == onnx.TensorProto.EXTERNAL
+        for entry in tensor.external_data
+        if entry.key == "location"
+    }
+    base_dir = os.path.dirname(onnx_path)
+    return os.path.getsize(onnx_path) + sum(
+        os.path.getsize(os.path.join(base_dir, location)) for location in locations
+    )
+
+
+def optimize_onnx_model(
+    onnx_path: str,
+    optimized_path: Optional[str] = None,
+    level: str = "extended",
+) -> str:
+    """
+    ONNX Runtimeのオフライングラフ最適化を適用したモデルを保存する。
+
+    定数畳み込みやConv + Add + Reluなどの演算子融合を適用したグラフを保存するため、
+    推論サーバーの起動時に最適化を省略できます。
+
+    Args:
+        onnx_path: 元のONNXモデルのパス
+        optimized_path: 保存先のパス（デフォルト: 元のモデルの隣に *.opt.onnx）
+        level: 最適化レベル（"basic", "extended", "all"）（デフォルト: "extended"）
+
+    Returns:
+        str: 最適化済みモデルのパス
+
+    Raises:
+        ValueError: 不明な最適化レベルの場合
+
+    Examples:
+        >>> export_to_onnx(model, "models/cifar10_cnn.onnx")
+        >>> optimize_onnx_model("models/cifar10_cnn.onnx")
+        'models/cifar10_cnn.opt.onnx'
+    """
+    if level not in OPTIMIZATION_LEVELS:
+        raise ValueError(f"level must be one of {list(OPTIMIZATION_LEVELS)}, got {level!r}")
+
+    optimized_path = optimized_path or derived_model_path(onnx_path, "opt")
+    sess_options = rt.SessionOptions()
+    sess_options.graph_optimization_level = OPTIMIZATION_LEVELS[level]
+    sess_options.optimized_model_filepath = optimized_path
+    rt.InferenceSession(onnx_path, sess_options, providers=["CPUExecutionProvider"])
+    return optimized_path
+
+
+class LoaderCalibrationDataReader(CalibrationDataReader):
+    """
+    DataLoaderのバッチを静的量子化のキャリブレーションデータとして渡すリーダー。
+
+    Args:
+        data_loader: キャリブレーションに使うDataLoader（テストデータなど）
+        input_name: ONNXモデルの入力名（デフォルト: "input"）
+        max_batches: 使用するバッチ数の上限（デフォルト: 10）
+    """
+
+    def __init__(
+        self,
+        data_loader: DataLoader,
+        input_name: str = "input",
+        max_batches: int = 10,
+    ) -> None:
+        self.data_loader = data_loader
+        self.input_name = input_name
+        self.max_batches = max_batches
+        self._batches: Optional[Iterator] = None
+        self._count = 0
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        """次のキャリブレーション入力を返す（終了時はNone）。"""
+        if self._batches is None:
+            self._batches = iter(self.data_loader)
+        if self._count >= self.max_batches:
+            return None
+        try:
+            images, _ = next(self._batches)
+        except StopIteration:
+            return None
+        self._count += 1
+        return {self.input_name: images.numpy().astype(np.float32)}
+
+    def rewind(self) -> None:
+        """最初のバッチから読み直す。"""
+        self._batches = None
+        self._count = 0
+
+
+def quantize_onnx_model(
+    onnx_path: str,
+    quantized_path: Optional[str] = None,
+    mode: str = "dynamic",
+    calibration_loader: Optional[DataLoader] = None,
+    max_calibration_batches: int = 10,
+) -> str:
+    """
+    ONNXモデルをINT8に量子化して保存する。
+
+    - dynamic: 全結合層（MatMul/Gemm）の重みをINT8にし、活性化は推論時に量子化する。
+      キャリブレーションは不要です
+    - static: キャリブレーションデータで活性化の範囲を求め、畳み込み層と全結合層を
+      QDQ形式でINT8にする
+
+    Args:
+        onnx_path: 元のONNXモデルのパス
+        quantized_path: 保存先のパス（デフォルト: 元のモデルの隣に *.int8_{mode}.onnx）
+        mode: 量子化の方式（"dynamic" or "static"）（デフォルト: "dynamic"）
+        calibration_loader: 静的量子化のキャリブレーションに使うDataLoader
+        max_calibration_batches: キャリブレーションに使うバッチ数（デフォルト: 10）
+
+    Returns:
+        str: 量子化済みモデルのパス
+
+    Raises:
+        ValueError: 不明な方式、または静的量子化でcalibration_loaderがない場合
+
+    Examples:
+        >>> _, test_loader = load_cifar10_data(batch_size=64)
+        >>> quantize_onnx_model(
+        ...     "models/cifar10_cnn.onnx", mode="static", calibration_loader=test_loader
+        ... )
+        'models/cifar10_cnn.int8_static.onnx'
+
+    Notes:
+        - 動的量子化のConvInteger演算子はCPU実行プロバイダでINT8重みに対応しないため、
+          動的量子化は全結合層のみを対象にします
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"mode must be one of {QUANTIZATION_MODES}, got {mode!r}")
+
+    quantized_path = quantized_path or derived_model_path(onnx_path, f"int8_{mode}")
+
+    if mode == "dynamic":
+        quantize_dynamic(
+            onnx_path,
+            quantized_path,
+            op_types_to_quantize=["MatMul", "Gemm"],
+            weight_type=QuantType.QInt8,
+        )
+        return quantized_path
+
+    if calibration_loader is None:
+        raise ValueError("calibration_loader is required for static quantization")
+
+    session = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    reader = LoaderCalibrationDataReader(
+        calibration_loader,
+        input_name=session.get_inputs()[0].name,
+        max_batches=max_calibration_batches,
+    )
+    quantize_static(
+        onnx_path,
+        quantized_path,
+        reader,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+    )
+    return quantized_path
+
+
+def measure_latency(
+    onnx_path: str,
+    batch: np.ndarray,
+    n_runs: int = 50,
+) -> Dict[str, float]:
+    """
+    1サンプルとバッチの推論レイテンシ（中央値、ミリ秒）を計測する。
+
+    Args:
+        onnx_path: ONNXモデルのパス
+        batch: 入力バッチ (batch_size, 3, 32, 32)
+        n_runs: 計測回数（デフォルト: 50）
+
+    Returns:
+        dict: single_row_ms, batch_ms
+
+    Notes:
+        - セッションは1回だけ作成し、ウォームアップ後に計測します
+    """
+    session = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+
+    batch = batch.astype(np.float32)
+    latencies = {}
+    for name, inputs in (("single_row_ms", batch[:1]), ("batch_ms", batch)):
+        session.run(None, {input_name: inputs})  # ウォームアップ
+        timings = []
+        for _ in range(n_runs):
+            start = time.perf_counter()
+            session.run(None, {input_name: inputs})
+            timings.append((time.perf_counter() - start) * 1000)
+        latencies[name] = float(np.median(timings))
+    return latencies
+
+
+def evaluate_onnx_model(
+    onnx_path: str,
+    test_loader: DataLoader,
+    max_batches: Optional[int] = None,
+) -> float:
+    """
+    ONNXモデルのテストデータでの精度（%）を計算する。
+
+    Args:
+        onnx_path: ONNXモデルのパス
+        test_loader: テストデータのDataLoader
+        max_batches: 評価するバッチ数の上限（デフォルト: None、全バッチ）
+
+    Returns:
+        float: 精度（0〜100）
+    """
+    session = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+
+    correct = 0
+    total = 0
+    for i, (images, labels) in enumerate(test_loader):
+        if max_batches is not None and i >= max_batches:
+            break
+        outputs = session.run(None, {input_name: images.numpy().astype(np.float32)})[0]
+        correct += int((np.argmax(outputs, axis=1) == labels.numpy()).sum())
+        total += len(labels)
+    return 100.0 * correct / total
+
+
+def compare_onnx_models(
+    pytorch_model: nn.Module,
+    onnx_path: str,
+    variant_paths: Dict[str, str],
+    test_loader: DataLoader,
+    n_runs: int = 50,
+    max_batches: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    元のONNXモデルと最適化・量子化済みモデルのサイズ・レイテンシ・精度を比較する。
+
+    各モデルのパリティ（PyTorchとの予測クラスの一致）もvalidate_onnx_modelで検証します。
+
+    Args:
+        pytorch_model: 元のPyTorchモデル
+        onnx_path: 元のONNXモデルのパス
+        variant_paths: 比較するモデルの名前とパス（例: {"optimized": ..., "int8_static": ...}）
+        test_loader: テストデータのDataLoader（レイテンシは最初のバッチで計測）
+        n_runs: レイテンシの計測回数（デフォルト: 50）
+        max_batches: 精度を評価するバッチ数の上限（デフォルト: None、全バッチ）
+
+    Returns:
+        dict: {名前}_size_bytes（外部データを含む）, {名前}_single_row_ms, {名前}_batch_ms, {名前}_accuracy,
+            {名前}_valid（1.0 or 0.0）。元のモデル以外は各値の差分（{名前}_*_delta）も含む
+
+    Examples:
+        >>> report = compare_onnx_models(
+        ...     model, "models/cifar10_cnn.onnx", {"optimized": optimized_path}, test_loader
+        ... )
+        >>> report["optimized_accuracy_delta"]
+        0.0
+    """
+    images, _ = next(iter(test_loader))
+    batch = images.numpy()
+
+    report: Dict[str, float] = {}
+    for name, path in {"original": onnx_path, **variant_paths}.items():
+        report[f"{name}_size_bytes"] = float(onnx_model_size_bytes(path))
+        for metric, value in measure_latency(path, batch, n_runs=n_runs).items():
+            report[f"{name}_{metric}"] = value
+        report[f"{name}_accuracy"] = evaluate_onnx_model(path, test_loader, max_batches)
+        report[f"{name}_valid"] = float(validate_onnx_model(pytorch_model, path, images))
+
+    for name in variant_paths:
+        for metric in ("size_bytes", "single_row_ms", "batch_ms", "accuracy"):
+            report[f"{name}_{metric}_delta"] = (
+                report[f"{name}_{metric}"] - report[f"original_{metric}"]
+            )
+    return report
+
+
+def _latency_percentiles_ms(predict: Callable[[], object], n_runs: int) -> Tuple[float, float]:
+    """ウォームアップ後にn_runs回実行し、レイテンシのp50とp99（ミリ秒）を返す。"""
+    predict()  # ウォームアップ
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        predict()
+        timings.append((time.perf_counter() - start) * 1000)
+    p50, p99 = np.percentile(timings, [50, 99])
+    return float(p50), float(p99)
+
+
+def run_parity_harness(
+    pytorch_model: nn.Module,
+    onnx_path: str,
+    test_input: torch.Tensor,
+    batch_sizes: Sequence[int] = HARNESS_BATCH_SIZES,
+    n_runs: int = 20,
+) -> Dict[str, float]:
+    """
+    複数のバッチサイズでPyTorchとONNX Runtimeの予測・レイテンシを比較する。
+
+    確率はどちらの出力（ロジット）にもsoftmaxを適用して比較します。
+    セッションは1回だけ作成し、全バッチサイズの推論・計測で使い回します。
+
+    Args:
+        pytorch_model: PyTorchモデル
+        onnx_path: ONNXモデルのパス
+        test_input: 入力画像 (N, 3, 32, 32)。バッチサイズより少ない場合は繰り返して使う
+        batch_sizes: 計測するバッチサイズ（デフォルト: 1, 8, 64, 512, 4096）
+        n_runs: バッチサイズごとのレイテンシの計測回数（デフォルト: 20）
+
+    Returns:
+        dict: バッチサイズごとの batch_{N}_max_abs_error（確率の最大絶対誤差）、
+            batch_{N}_label_agreement（予測クラスの一致率）、
+            batch_{N}_native_p50_ms, batch_{N}_native_p99_ms（PyTorch）、
+            batch_{N}_onnx_p50_ms, batch_{N}_onnx_p99_ms（ONNX Runtime）
+
+    Examples:
+        >>> images, _ = next(iter(test_loader))
+        >>> report = run_parity_harness(model, "models/cifar10_cnn.onnx", images)
+        >>> report["batch_64_label_agreement"]
+        1.0
+    """
+    pytorch_model.eval()
+    session = rt.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+
+    inputs = test_input.numpy().astype(np.float32)
+    report: Dict[str, float] = {}
+    for batch_size in batch_sizes:
+        batch = np.resize(inputs, (batch_size, *inputs.shape[1:]))
+        batch_tensor = torch.from_numpy(batch)
+
+        def predict_pytorch(batch_tensor: torch.Tensor = batch_tensor) -> torch.Tensor:
+            with torch.no_grad():
+                return pytorch_model(batch_tensor)
+
+        pytorch_proba = torch.softmax(predict_pytorch(), dim=1).numpy()
+        onnx_output = session.run(None, {input_name: batch})[0]
+        onnx_proba = torch.softmax(torch.from_numpy(onnx_output), dim=1).numpy()
+
+        prefix = f"batch_{batch_size}"
+        report[f"{prefix}_max_abs_error"] = float(np.max(np.abs(pytorch_proba - onnx_proba)))
+        report[f"{prefix}_label_agreement"] = float(
+            np.mean(np.argmax(pytorch_proba, axis=1) == np.argmax(onnx_proba, axis=1))
+        )
+        report[f"{prefix}_native_p50_ms"], report[f"{prefix}_native_p99_ms"] = (
+            _latency_percentiles_ms(predict_pytorch, n_runs)
+        )
+        report[f"{prefix}_onnx_p50_ms"], report[f"{prefix}_onnx_p99_ms"] = (
+            _latency_percentiles_ms(partial(session.run, None, {input_name: batch}), n_runs)
+        )
+    return report
+
+
+def check_parity_report(
+    report: Dict[str, float],
+    max_abs_error: float = 1e-4,
+    min_label_agreement: float = 1.0,
+    max_latency_ratio: Optional[float] = None,
+    latency_budget_ms: Optional[Dict[int, float]] = None,
+    baseline: Optional[Dict[str, float]] = None,
+    max_baseline_ratio: float = MAX_BASELINE_LATENCY_RATIO,
+) -> None:
+    """
+    run_parity_harnessの結果が基準を満たすか検証し、満たさない場合はエクスポートを失敗させる。
+
+    Args:
+        report: run_parity_harnessの結果
+        max_abs_error: 確率の最大絶対誤差の上限（デフォルト: 1e-4）
+        min_label_agreement: 予測クラスの一致率の下限（デフォルト: 1.0）
+        max_latency_ratio: ONNX Runtimeのp50レイテンシの上限（PyTorchのp50に対する倍率）。
+            Noneの場合は検証しない
+        latency_budget_ms: バッチサイズごとのONNX Runtimeのp99レイテンシの上限（ミリ秒）。
+            Noneの場合は検証しない
+        baseline: 前回検証を通過したモデルのrun_parity_harnessの結果（load_parity_baseline）。
+            Noneの場合、またはバッチサイズが含まれない場合は検証しない
+        max_baseline_ratio: ONNX Runtimeのp50レイテンシの上限（ベースラインのp50に対する倍率、
+            デフォルト: 2.0）
+
+    Raises:
+        ValueError: いずれかのバッチサイズで基準を満たさない場合（全ての違反を列挙する）
+
+    Examples:
+        >>> check_parity_report(report, max_latency_ratio=1.0, latency_budget_ms={1: 1.0})
+
+    Notes:
+        - INT8量子化済みモデルは確率の誤差が大きくなるため、max_abs_errorを緩めて検証します
+    """
+    failures: List[str] = []
+    batch_sizes = sorted(
+        int(name.split("_")[1]) for name in report if name.endswith("_label_agreement")
+    )
+    for batch_size in batch_sizes:
+        prefix = f"batch_{batch_size}"
+        error = report[f"{prefix}_max_abs_error"]
+        if error > max_abs_error:
+            failures.append(f"{prefix}: max_abs_error {error:.2e} > {max_abs_error:.2e}")
+        agreement = report[f"{prefix}_label_agreement"]
+        if agreement < min_label_agreement:
+            failures.append(
+                f"{prefix}: label_agreement {agreement:.4f} < {min_label_agreement:.4f}"
+            )
+        onnx_p50 = report[f"{prefix}_onnx_p50_ms"]
+        native_p50 = report[f"{prefix}_native_p50_ms"]
+        if max_latency_ratio is not None and onnx_p50 > native_p50 * max_latency_ratio:
+            failures.append(
+                f"{prefix}: onnx p50 {onnx_p50:.3f} ms > {max_latency_ratio} x "
+                f"native p50 {native_p50:.3f} ms"
+            )
+        budget = (latency_budget_ms or {}).get(batch_size)
+        onnx_p99 = report[f"{prefix}_onnx_p99_ms"]
+        if budget is not None and onnx_p99 > budget:
+            failures.append(f"{prefix}: onnx p99 {onnx_p99:.3f} ms > budget {budget:.3f} ms")
+        baseline_p50 = (baseline or {}).get(f"{prefix}_onnx_p50_ms")
+        if baseline_p50 is not None and onnx_p50 > baseline_p50 * max_baseline_ratio:
+            failures.append(
+                f"{prefix}: onnx p50 {onnx_p50:.3f} ms > {max_baseline_ratio} x "
+                f"baseline p50 {baseline_p50:.3f} ms"
+            )
+
+    if failures:
+        raise ValueError("ONNX model failed parity/latency checks: " + "; ".join(failures))
+
+
+def load_parity_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    記録済みのパリティ・レイテンシのベースラインを読み込む。
+
+    Args:
+        path: save_parity_baselineで保存したJSONファイルのパス
+
+    Returns:
+        dict: モデル名（"original", "optimized" など）ごとのrun_parity_harnessの結果。
+            ファイルがない場合は空の辞書
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        baseline: Dict[str, Dict[str, float]] = json.load(f)
+    return baseline
+
+
+def save_parity_baseline(path: str, reports: Dict[str, Dict[str, float]]) -> None:
+    """
+    検証を通過したモデルのrun_parity_harnessの結果を次回のベースラインとして保存する。
+
+    レイテンシはマシンに依存するため、ベースラインは推論に使うものと同じ種類のマシンで記録します。
+
+    Args:
+        path: 保存先のJSONファイルのパス
+        reports: モデル名ごとのrun_parity_harnessの結果
+    """
+    with open(path, "w") as f:
+        json.dump(reports, f, indent=2, sort_keys=True)
+
+
+def run_export_gate(
+    pytorch_model: nn.Module,
+    onnx_paths: Dict[str, str],
+    test_input: torch.Tensor,
+    baseline: Optional[Dict[str, Dict[str, float]]] = None,
+    max_latency_ratio: Optional[float] = None,
+    latency_budget_ms: Optional[Dict[int, float]] = None,
+    max_baseline_ratio: float = MAX_BASELINE_LATENCY_RATIO,
+    overrides: Optional[Dict[str, Dict[str, float]]] = None,
+    n_runs: int = 20,
+) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+    """
+    出荷する全てのONNXモデル（元のモデルと最適化・量子化済みモデル）をハーネスで検証する。
+
+    モデルごとにrun_parity_harnessを実行し、check_parity_reportの基準と、
+    baselineに同じ名前のモデルの結果がある場合はそのレイテンシからの回帰を検証します。
+    ファイルの削除やベースラインの保存は行わないため、呼び出し元で結果を記録してから判断できます。
+
+    Args:
+        pytorch_model: 元のPyTorchモデル
+        onnx_paths: モデル名とONNXモデルのパス（例: {"original": ..., "optimized": ...}）
+        test_input: 入力画像 (N, 3, 32, 32)（run_parity_harnessと同じ）
+        baseline: load_parity_baselineで読み込んだモデル名ごとのベースライン
+        max_latency_ratio: check_parity_reportに渡す（Noneの場合は検証しない）
+        latency_budget_ms: check_parity_reportに渡す（Noneの場合は検証しない）
+        max_baseline_ratio: check_parity_reportに渡す（デフォルト: 2.0）
+        overrides: モデル名ごとのmax_abs_error, min_label_agreementの上書き
+            （例: INT8量子化済みモデルにINT8_PARITY_CRITERIA）
+        n_runs: バッチサイズごとのレイテンシの計測回数
+
+    Returns:
+        Tuple[dict, list]: モデル名ごとのrun_parity_harnessの結果と、基準を満たさなかった
+            モデルのエラーメッセージのリスト（全て通過した場合は空）
+    """
+    reports: Dict[str, Dict[str, float]] = {}
+    failures: List[str] = []
+    for name, onnx_path in onnx_paths.items():
+        reports[name] = run_parity_harness(pytorch_model, onnx_path, test_input, n_runs=n_runs)
+        criteria = (overrides or {}).get(name, {})
+        try:
+            check_parity_report(
+                reports[name],
+                max_abs_error=criteria.get("max_abs_error", 1e-4),
+                min_label_agreement=criteria.get("min_label_agreement", 1.0),
+                max_latency_ratio=max_latency_ratio,
+                latency_budget_ms=latency_budget_ms,
+                baseline=(baseline or {}).get(name),
+                max_baseline_ratio=max_baseline_ratio,
+            )
+        except ValueError as e:
+            failures.append(f"{name}: {e}")
+    return reports, failures
@@ -5,16 +5,103 @@ CIFAR-10 CNN学習のメインスクリプト。
 MLflowで実験を管理し、ONNXモデルをエクスポートします。
 """
 
+import argparse
 import os
+from typing import Tuple
 
 import mlflow
 import torch
 
 from cifar10_cnn.data_loader import load_cifar10_data
-from cifar10_cnn.mlflow_manager import log_metrics, log_model, log_params
+from cifar10_cnn.mlflow_manager import BatchLogger, log_model
 from cifar10_cnn.model import create_simple_cnn
-from cifar10_cnn.onnx_exporter import export_to_onnx, validate_onnx_model
-from cifar10_cnn.trainer import train_model
+from cifar10_cnn.onnx_exporter import (
+    HARNESS_BATCH_SIZES,
+    INT8_PARITY_CRITERIA,
+    compare_onnx_models,
+    export_to_onnx,
+    load_parity_baseline,
+    optimize_onnx_model,
+    quantize_onnx_model,
+    run_export_gate,
+    save_parity_baseline,
+    validate_onnx_model,
+)
+from cifar10_cnn.trainer import configure_threads, train_model
+
+
+def parse_args() -> argparse.Namespace:
+    """コマンドライン引数（CPU性能設定）を解析する。"""
+    parser = argparse.ArgumentParser(description="Train SimpleCNN on CIFAR-10 with MLflow tracking")
+    parser.add_argument(
+        "--intra-op-threads",
+        type=int,
+        default=None,
+        help="演算内のスレッド数（デフォルト: PyTorchの既定値）",
+    )
+    parser.add_argument(
+        "--inter-op-threads",
+        type=int,
+        default=None,
+        help="演算間のスレッド数（デフォルト: PyTorchの既定値）",
+    )
+    parser.add_argument(
+        "--channels-last",
+        action="store_true",
+        help="channels_lastメモリ形式で学習する",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="torch.compileでモデルをコンパイルする",
+    )
+    parser.add_argument(
+        "--accumulation-steps",
+        type=int,
+        default=1,
+        help="勾配を累積するステップ数（デフォルト: 1）",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=None,
+        help="DataLoaderのワーカー数（デフォルト: 最大4）",
+    )
+    parser.add_argument(
+        "--quantize",
+        choices=["none", "dynamic", "static", "both"],
+        default="none",
+        help="エクスポート後のINT8量子化（staticはテストデータでキャリブレーション）",
+    )
+    parser.add_argument(
+        "--onnx-max-latency-ratio",
+        type=float,
+        default=None,
+        help="ONNXモデルのp50レイテンシの上限（PyTorchに対する倍率、デフォルト: 検証しない）",
+    )
+    parser.add_argument(
+        "--onnx-latency-budget-ms",
+        type=_parse_latency_budget,
+        action="append",
+        default=None,
+        metavar="BATCH=MS",
+        help="バッチサイズごとのONNXモデルのp99レイテンシの上限（複数指定可、例: 1=2.0）",
+    )
+    parser.add_argument(
+        "--onnx-parity-baseline",
+        default="models/cifar10_cnn.parity.json",
+        help="レイテンシの回帰を検出するベースライン（検証を通過するたびに更新）",
+    )
+    return parser.parse_args()
+
+
+def _parse_latency_budget(value: str) -> Tuple[int, float]:
+    """"BATCH=MS"形式の引数を (バッチサイズ, p99の上限ミリ秒) に変換する。"""
+    try:
+        batch_size, budget_ms = value.split("=")
+        return int(batch_size), float(budget_ms)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected BATCH=MS, got {value!r}") from None
 
 
 def main() -> None:
@@ -28,6 +115,8 @@ def main() -> None:
         4. ONNXエクスポート
         5. MLflow記録
     """
+    args = parse_args()
+
     print("=" * 80)
     print("CIFAR-10 CNN 学習パイプライン")
     print("=" * 80)
@@ -41,11 +130,20 @@ def main() -> None:
     # デバイス設定（GPU利用可能なら自動的に使用）
     device = "cuda" if torch.cuda.is_available() else "cpu"
     print(f"使用デバイス: {device}")
+
+    # CPUスレッド数の設定
+    threads = configure_threads(args.intra_op_threads, args.inter_op_threads)
+    print(
+        f"スレッド数: intra-op {threads['intra_op_threads']}, "
+        f"inter-op {threads['inter_op_threads']}"
+    )
     print()
 
     # [1/5] データ読み込み
     print("[1/5] データを読み込み中...")
-    train_loader, test_loader = load_cifar10_data(batch_size=batch_size)
+    train_loader, test_loader = load_cifar10_data(
+        batch_size=batch_size, num_workers=args.num_workers
+    )
     print(f"  ✓ 学習データ: {len(train_loader.dataset)} サンプル")
     print(f"  ✓ テストデータ: {len(test_loader.dataset)} サンプル")
     print()
@@ -57,55 +155,10 @@ def main() -> None:
     print(f"  ✓ パラメータ数: {sum(p.numel() for p in model.parameters()):,}")
     print()
 
-    # [3/5] モデル学習
-    print("[3/5] モデルを学習中...")
-    print(f"  エポック数: {epochs}")
-    print(f"  バッチサイズ: {batch_size}")
-    print(f"  学習率: {learning_rate}")
-    print()
-
-    metrics = train_model(
-        model,
-        train_loader,
-        test_loader,
-        epochs=epochs,
-        learning_rate=learning_rate,
-        device=device,
-    )
-
-    test_loss = metrics["test_loss"]
-    test_accuracy = metrics["test_accuracy"]
-
-    print()
-    print(f"  ✓ テスト損失: {test_loss:.4f}")
-    print(f"  ✓ テスト精度: {test_accuracy:.2f}%")
-    print()
-
-    # [4/5] ONNXエクスポート
-    print("[4/5] ONNXモデルをエクスポート中...")
-    os.makedirs("models", exist_ok=True)
-    onnx_path = "models/cifar10_cnn.onnx"
-
-    export_to_onnx(model, onnx_path)
-    print(f"  ✓ ONNXモデル作成: {onnx_path}")
-
-    # ONNX検証
-    test_input = torch.randn(4, 3, 32, 32)
-    is_valid = validate_onnx_model(model, onnx_path, test_input)
-
-    if is_valid:
-        print("  ✓ ONNX検証: 成功")
-    else:
-        print("  ✗ ONNX検証: 失敗")
-    print()
-
-    # [5/5] MLflow記録
-    print("[5/5] MLflowに記録中...")
-
+    # 学習中のメトリクスも記録するため、学習前にMLflowのRunを開始
     mlflow.set_experiment("cifar10_cnn")
 
-    with mlflow.start_run():
-        # パラメータを記録
+    with mlflow.start_run(), BatchLogger() as logger:
         params = {
             "epochs": epochs,
             "batch_size": batch_size,
@@ -113,17 +166,145 @@ def main() -> None:
             "optimizer": "Adam",
             "model": "SimpleCNN",
             "device": device,
+            "channels_last": args.channels_last,
+            "compile": args.compile,
+            "accumulation_steps": args.accumulation_steps,
+            "num_workers": train_loader.num_workers,
+            **threads,
         }
-        log_params(params)
+        logger.log_params(params)
+
+        # [3/5] モデル学習
+        print("[3/5] モデルを学習中...")
+        print(f"  エポック数: {epochs}")
+        print(f"  バッチサイズ: {batch_size}")
+        print(f"  学習率: {learning_rate}")
+        print(f"  実効バッチサイズ: {batch_size * args.accumulation_steps}")
+        print()
 
-        # メトリクスを記録
-        log_metrics(metrics)
+        metrics = train_model(
+            model,
+            train_loader,
+            test_loader,
+            epochs=epochs,
+            learning_rate=learning_rate,
+            device=device,
+            logger=logger,
+            channels_last=args.channels_last,
+            compile_model=args.compile,
+            accumulation_steps=args.accumulation_steps,
+        )
 
-        # モデルを記録
+        test_loss = metrics["test_loss"]
+        test_accuracy = metrics["test_accuracy"]
+
+        print()
+        print(f"  ✓ テスト損失: {test_loss:.4f}")
+        print(f"  ✓ テスト精度: {test_accuracy:.2f}%")
+        print()
+
+        # 学習結果はONNXの検証より先に記録する（エクスポートが基準を満たさなくても学習は失われない）
+        logger.log_metrics(metrics)
         log_model(model, artifact_path="model")
 
-        # ONNXモデルも記録
+        # [4/5] ONNXエクスポート
+        print("[4/5] ONNXモデルをエクスポート中...")
+        os.makedirs("models", exist_ok=True)
+        onnx_path = "models/cifar10_cnn.onnx"
+
+        export_to_onnx(model, onnx_path)
+        print(f"  ✓ ONNXモデル作成: {onnx_path}")
+
+        # ONNX検証
+        test_input = torch.randn(4, 3, 32, 32)
+        is_valid = validate_onnx_model(model, onnx_path, test_input)
+
+        if is_valid:
+            print("  ✓ ONNX検証: 成功")
+        else:
+            print("  ✗ ONNX検証: 失敗")
+
+        # エクスポート後の最適化（グラフ最適化 + オプションのINT8量子化）
+        # 出荷する全てのモデルを検証するため、検証より先に作成する
+        variant_paths = {"optimized": optimize_onnx_model(onnx_path)}
+        modes = ["dynamic", "static"] if args.quantize == "both" else [args.quantize]
+        for mode in modes:
+            if mode != "none":
+                variant_paths[f"int8_{mode}"] = quantize_onnx_model(
+                    onnx_path, mode=mode, calibration_loader=test_loader
+                )
+        onnx_paths = {"original": onnx_path, **variant_paths}
+        # INT8モデルは量子化誤差があるため、パリティの基準を緩める
+        int8_criteria = {
+            name: INT8_PARITY_CRITERIA for name in variant_paths if name.startswith("int8_")
+        }
+
+        # 出荷する全てのモデルについて、バッチサイズごとの確率・予測クラス・レイテンシを検証
+        # （基準を満たさない場合、または前回通過したモデルからレイテンシが回帰した場合は失敗させる）
+        test_images, _ = next(iter(test_loader))
+        parity_reports, parity_failures = run_export_gate(
+            model,
+            onnx_paths,
+            test_images,
+            baseline=load_parity_baseline(args.onnx_parity_baseline),
+            max_latency_ratio=args.onnx_max_latency_ratio,
+            latency_budget_ms=(
+                dict(args.onnx_latency_budget_ms) if args.onnx_latency_budget_ms else None
+            ),
+            overrides=int8_criteria,
+        )
+        for name, parity_report in parity_reports.items():
+            print(f"  ✓ パリティ・レイテンシ（{name}、p50 / p99 ms）:")
+            for harness_batch_size in HARNESS_BATCH_SIZES:
+                prefix = f"batch_{harness_batch_size}"
+                print(
+                    f"    - バッチ{harness_batch_size:>5}: "
+                    f"誤差 {parity_report[f'{prefix}_max_abs_error']:.2e}, "
+                    f"一致率 {parity_report[f'{prefix}_label_agreement']:.4f}, "
+                    f"PyTorch {parity_report[f'{prefix}_native_p50_ms']:.3f} / "
+                    f"{parity_report[f'{prefix}_native_p99_ms']:.3f}, "
+                    f"ONNX {parity_report[f'{prefix}_onnx_p50_ms']:.3f} / "
+                    f"{parity_report[f'{prefix}_onnx_p99_ms']:.3f}"
+                )
+            metric_prefix = "onnx_parity" if name == "original" else f"onnx_parity_{name}"
+            logger.log_metrics(
+                {f"{metric_prefix}_{key}": value for key, value in parity_report.items()}
+            )
+        if parity_failures:
+            # 基準を満たさないモデルは出力先に残さない
+            for path in onnx_paths.values():
+                os.remove(path)
+            raise ValueError("ONNX export gate failed: " + " | ".join(parity_failures))
+        save_parity_baseline(args.onnx_parity_baseline, parity_reports)
+
+        report = compare_onnx_models(model, onnx_path, variant_paths, test_loader)
+        for name, path in variant_paths.items():
+            print(f"  ✓ {name}: {path}")
+            print(
+                f"    - サイズ: {report[f'{name}_size_bytes'] / 1024:.1f} KB "
+                f"({report[f'{name}_size_bytes_delta'] / 1024:+.1f} KB)"
+            )
+            print(
+                f"    - レイテンシ: 1枚 {report[f'{name}_single_row_ms']:.3f} ms "
+                f"({report[f'{name}_single_row_ms_delta']:+.3f}), "
+                f"{batch_size}枚 {report[f'{name}_batch_ms']:.3f} ms "
+                f"({report[f'{name}_batch_ms_delta']:+.3f})"
+            )
+            print(
+                f"    - 精度: {report[f'{name}_accuracy']:.2f}% "
+                f"({report[f'{name}_accuracy_delta']:+.2f}), "
+                f"ONNX検証: {'成功' if report[f'{name}_valid'] else '失敗'}"
+            )
+        print()
+
+        # [5/5] MLflow記録（テストメトリクスとモデルは学習直後に記録済み）
+        print("[5/5] MLflowに記録中...")
+
+        # ONNXモデル（最適化・量子化済みを含む）と比較結果も記録
         mlflow.log_artifact(onnx_path, artifact_path="onnx")
+        for path in variant_paths.values():
+            mlflow.log_artifact(path, artifact_path="onnx")
+        logger.log_metrics({f"onnx_{name}": value for name, value in report.items()})
 
         print("  ✓ パラメータとメトリクスを記録")
         print("  ✓ モデルとONNXを記録")
@@ -2,15 +2,57 @@
 モデルの学習と評価を行うモジュール。
 
 このモジュールはCNNモデルの学習ループと評価ループを提供します。
+CPU向けの性能設定（スレッド数、channels_last、torch.compile、勾配累積）と、
+エポックごとのスループット・データ待ち時間の計測も提供します。
 """
 
-from typing import Dict
+import time
+from typing import TYPE_CHECKING, Dict, Optional
 
 import torch
 import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import DataLoader
 
+if TYPE_CHECKING:
+    from cifar10_cnn.mlflow_manager import BatchLogger
+
+
+def configure_threads(
+    intra_op_threads: Optional[int] = None,
+    inter_op_threads: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    PyTorchのCPUスレッド数を設定する。
+
+    intra-opは1つの演算（畳み込みなど）内の並列数、inter-opは独立した演算間の並列数です。
+    inter-opスレッド数はプロセス内で最初の並列処理が始まる前にしか変更できないため、
+    変更できない場合は現在の値のままにします。
+
+    Args:
+        intra_op_threads: 演算内のスレッド数（デフォルト: None、変更しない）
+        inter_op_threads: 演算間のスレッド数（デフォルト: None、変更しない）
+
+    Returns:
+        dict: 設定後のスレッド数（intra_op_threads, inter_op_threads）
+
+    Examples:
+        >>> configure_threads(intra_op_threads=4)["intra_op_threads"]
+        4
+    """
+    if intra_op_threads is not None:
+        torch.set_num_threads(intra_op_threads)
+    if inter_op_threads is not None and inter_op_threads != torch.get_num_interop_threads():
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError:
+            print("Warning: inter-opスレッド数は並列処理の開始後には変更できません")
+
+    return {
+        "intra_op_threads": torch.get_num_threads(),
+        "inter_op_threads": torch.get_num_interop_threads(),
+    }
+
 
 def evaluate_model(
     model: nn.Module,
@@ -80,10 +122,22 @@ def train_model(
     epochs: int = 5,
     learning_rate: float = 0.001,
     device: str = "cpu",
+    logger: Optional["BatchLogger"] = None,
+    channels_last: bool = False,
+    compile_model: bool = False,
+    accumulation_steps: int = 1,
 ) -> Dict[str, float]:
     """
     モデルを学習する。
 
+    エポックごとに学習スループット（画像/秒）と、DataLoaderからのバッチ待ち時間
+    （data_wait）および順伝播・逆伝播・パラメータ更新の時間（compute）を計測して表示します。
+
+    loggerを指定すると、ステップごとの学習損失（train_loss）と、エポックごとの平均損失
+    （train_epoch_loss）・スループット（train_images_per_sec）・時間内訳
+    （train_data_wait_seconds, train_compute_seconds, train_data_wait_fraction）を記録します。
+    記録はバックグラウンドで書き込まれるため、学習ループは書き込みを待ちません。
+
     Args:
         model: 学習対象のモデル
         train_loader: 学習データのDataLoader
@@ -91,6 +145,12 @@ def train_model(
         epochs: エポック数（デフォルト: 5）
         learning_rate: 学習率（デフォルト: 0.001）
         device: デバイス（"cpu" or "cuda"）
+        logger: 学習中のメトリクスを記録するBatchLogger（デフォルト: None）
+        channels_last: 重みと入力をchannels_lastメモリ形式にするか（デフォルト: False）。
+            CPUの畳み込みカーネル（oneDNN）はNHWC形式の方が高速です
+        compile_model: torch.compileでモデルをコンパイルするか（デフォルト: False）
+        accumulation_steps: 勾配を累積するステップ数（デフォルト: 1）。
+            実効バッチサイズは batch_size × accumulation_steps になります
 
     Returns:
         dict: 最終的なテストメトリクス（test_loss, test_accuracy）
@@ -110,40 +170,89 @@ def train_model(
         >>> "test_accuracy" in metrics
         True
     """
-    model = model.to(device)
+    if accumulation_steps < 1:
+        raise ValueError(f"accumulation_steps must be >= 1, got {accumulation_steps}")
+
+    memory_format = torch.channels_last if channels_last else torch.contiguous_format
+    model = model.to(device, memory_format=memory_format)
     model.train()  # 学習モード
 
+    # コンパイル済みモデルは元のモデルとパラメータを共有する
+    forward_model = torch.compile(model) if compile_model else model
+
     # 損失関数と最適化アルゴリズム
     criterion = nn.CrossEntropyLoss()
     optimizer = optim.Adam(model.parameters(), lr=learning_rate)
+    steps_per_epoch = len(train_loader)
 
     # 学習ループ
     for epoch in range(epochs):
         running_loss = 0.0
+        data_wait_seconds = 0.0
+        compute_seconds = 0.0
+        n_images = 0
+
+        # 勾配をゼロにリセット
+        optimizer.zero_grad()
 
+        batch_start = time.perf_counter()
         for i, (images, labels) in enumerate(train_loader):
-            images = images.to(device)
-            labels = labels.to(device)
+            compute_start = time.perf_counter()
+            data_wait_seconds += compute_start - batch_start
 
-            # 勾配をゼロにリセット
-            optimizer.zero_grad()
+            images = images.to(device, memory_format=memory_format)
+            labels = labels.to(device)
 
             # 順伝播
-            outputs = model(images)
+            outputs = forward_model(images)
             loss = criterion(outputs, labels)
 
-            # 逆伝播
-            loss.backward()
-
-            # パラメータ更新
-            optimizer.step()
-
-            # 損失を累積
-            running_loss += loss.item()
-
-        # エポックごとの平均損失を表示
-        avg_epoch_loss = running_loss / len(train_loader)
-        print(f"Epoch [{epoch + 1}/{epochs}], Loss: {avg_epoch_loss:.4f}")
+            # 逆伝播（累積するステップ数で割り、累積後の勾配をバッチ平均に揃える）
+            # エポック末尾の端数のウィンドウは実際に累積するステップ数で割る
+            window_start = i - i % accumulation_steps
+            window_steps = min(accumulation_steps, steps_per_epoch - window_start)
+            (loss / window_steps).backward()
+
+            # パラメータ更新（accumulation_stepsごと、およびエポックの最後）
+            if (i + 1) % accumulation_steps == 0 or i + 1 == steps_per_epoch:
+                optimizer.step()
+                optimizer.zero_grad()
+
+            # 損失を累積（item()で計算の完了を待つため、計測時間に計算が含まれる）
+            step_loss = loss.item()
+            running_loss += step_loss
+            n_images += labels.size(0)
+
+            if logger is not None:
+                logger.log_metric("train_loss", step_loss, step=epoch * steps_per_epoch + i)
+
+            batch_start = time.perf_counter()
+            compute_seconds += batch_start - compute_start
+
+        # エポックごとの平均損失と時間内訳を表示
+        avg_epoch_loss = running_loss / steps_per_epoch
+        epoch_seconds = data_wait_seconds + compute_seconds
+        epoch_metrics = {
+            "train_epoch_loss": avg_epoch_loss,
+            "train_images_per_sec": n_images / epoch_seconds if epoch_seconds > 0 else 0.0,
+            "train_data_wait_seconds": data_wait_seconds,
+            "train_compute_seconds": compute_seconds,
+            "train_data_wait_fraction": (
+                data_wait_seconds / epoch_seconds if epoch_seconds > 0 else 0.0
+            ),
+        }
+        print(
+            f"Epoch [{epoch + 1}/{epochs}], Loss: {avg_epoch_loss:.4f}, "
+            f"{epoch_metrics['train_images_per_sec']:.0f} images/sec "
+            f"(data wait {data_wait_seconds:.2f}s, compute {compute_seconds:.2f}s)"
+        )
+
+        if logger is not None:
+            logger.log_metrics(epoch_metrics, step=epoch)
+
+    # ONNXエクスポートなど後続の処理のため、重みを標準のメモリ形式に戻す
+    if channels_last:
+        model = model.to(memory_format=torch.contiguous_format)
 
     # 最終評価
     final_metrics = evaluate_model(model, test_loader, device)
@@ -4,9 +4,34 @@
 CIFAR-10データセットの読み込みと前処理をテストします。
 """
 
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
 from torch.utils.data import DataLoader
 
-from cifar10_cnn.data_loader import get_transforms, load_cifar10_data
+from cifar10_cnn.data_loader import (
+    CachedCIFAR10,
+    cache_paths,
+    create_cached_loaders,
+    get_transforms,
+    load_cifar10_data,
+    normalize_batch,
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> str:
+    """ダウンロードせずに小さなuint8キャッシュを作成する。"""
+    rng = np.random.default_rng(0)
+    for split, n in (("train", 64), ("test", 16)):
+        images_path, labels_path = cache_paths(str(tmp_path), split)
+        np.save(images_path, rng.integers(0, 256, size=(n, 3, 32, 32), dtype=np.uint8))
+        np.save(labels_path, np.arange(n, dtype=np.int64) % 10)
+    return str(tmp_path)
 
 
 class TestTransforms:
@@ -114,3 +139,78 @@ class TestLoadCifar10Data:
         train_loader, test_loader = load_cifar10_data(batch_size=4, data_dir=custom_dir)
         assert train_loader is not None
         assert test_loader is not None
+
+
+class TestNormalizeBatch:
+    """normalize_batch関数のテスト。"""
+
+    def test_matches_per_sample_transforms(self) -> None:
+        """バッチ単位の正規化がToTensor + Normalizeと一致することを確認する。"""
+        images = torch.randint(0, 256, (4, 3, 32, 32), dtype=torch.uint8)
+        transform = get_transforms()
+
+        expected = torch.stack(
+            [transform(Image.fromarray(image.permute(1, 2, 0).numpy())) for image in images]
+        )
+
+        torch.testing.assert_close(normalize_batch(images), expected)
+
+
+class TestCachedCIFAR10:
+    """CachedCIFAR10クラスのテスト。"""
+
+    def test_getitems_returns_normalized_batch(self, cache_dir: str) -> None:
+        """__getitems__が正規化済みのバッチを返すことを確認する。"""
+        dataset = CachedCIFAR10(cache_dir, split="train")
+        images, labels = dataset.__getitems__([3, 1, 2])
+
+        raw = np.load(cache_paths(cache_dir, "train")[0])
+        assert len(dataset) == 64
+        assert images.dtype == torch.float32
+        assert labels.tolist() == [3, 1, 2]
+        torch.testing.assert_close(images, normalize_batch(torch.from_numpy(raw[[3, 1, 2]])))
+
+    def test_pickle_does_not_copy_images(self, cache_dir: str) -> None:
+        """ワーカーへ渡す際にメモリマップの内容がコピーされないことを確認する。"""
+        dataset = CachedCIFAR10(cache_dir, split="train")
+        dataset.__getitems__([0])  # メモリマップを開く
+
+        restored = pickle.loads(pickle.dumps(dataset))
+
+        assert restored._images is None
+        torch.testing.assert_close(restored[5][0], dataset[5][0])
+
+
+class TestCreateCachedLoaders:
+    """create_cached_loaders関数のテスト。"""
+
+    @pytest.mark.parametrize("num_workers", [0, 2])
+    def test_yields_full_epoch(self, cache_dir: str, num_workers: int) -> None:
+        """1エポックで全サンプルが正しい形状のバッチで返されることを確認する。"""
+        train_loader, test_loader = create_cached_loaders(
+            cache_dir, batch_size=10, num_workers=num_workers
+        )
+
+        batches = list(train_loader)
+        assert train_loader.batch_size == 10
+        assert batches[0][0].shape == (10, 3, 32, 32)
+        assert batches[-1][0].shape == (4, 3, 32, 32)
+        assert sorted(torch.cat([labels for _, labels in batches]).tolist()) == sorted(
+            (np.arange(64) % 10).tolist()
+        )
+        assert sum(len(labels) for _, labels in test_loader) == 16
+
+    def test_workers_are_persistent(self, cache_dir: str) -> None:
+        """ワーカーがエポックをまたいで維持され、先読みが有効であることを確認する。"""
+        train_loader, _ = create_cached_loaders(
+            cache_dir, batch_size=16, num_workers=2, prefetch_factor=3
+        )
+
+        assert train_loader.persistent_workers
+        assert train_loader.prefetch_factor == 3
+
+        first_epoch = iter(train_loader)
+        list(first_epoch)
+        second_epoch = iter(train_loader)
+        list(second_epoch)
+        assert first_epoch is second_epoch, "Persistent workers should reuse the iterator"
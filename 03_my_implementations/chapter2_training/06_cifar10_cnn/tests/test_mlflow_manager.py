@@ -5,12 +5,21 @@ MLflowを使った実験管理機能をテストします。
 """
 
 import tempfile
+import threading
+from typing import Any, List
 
 import mlflow
 import pytest
 import torch.nn as nn
 
-from cifar10_cnn.mlflow_manager import log_metrics, log_model, log_params
+from cifar10_cnn.mlflow_manager import (
+    MAX_ENTITIES_PER_BATCH,
+    MAX_PARAMS_TAGS_PER_BATCH,
+    BatchLogger,
+    log_metrics,
+    log_model,
+    log_params,
+)
 from cifar10_cnn.model import SimpleCNN
 
 
@@ -135,3 +144,100 @@ class TestLogModel:
 
             # モデル関連のファイルが存在することを確認
             assert len(artifacts) > 0
+
+
+class RecordingClient:
+    """log_batchの呼び出しを記録するクライアント（gateがセットされるまで書き込みを待つ）。"""
+
+    def __init__(self) -> None:
+        self.batches: List[Any] = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def log_batch(self, run_id: str, metrics: Any, params: Any, tags: Any) -> None:
+        self.gate.wait()
+        self.batches.append((list(metrics), list(params), list(tags)))
+
+
+class WorkerStopped(BaseException):
+    """バックグラウンドスレッドを終了させる例外（Exception以外）。"""
+
+
+class FailingClient:
+    """log_batchで指定した例外を送出するクライアント。"""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+    def log_batch(self, run_id: str, metrics: Any, params: Any, tags: Any) -> None:
+        raise self.error
+
+
+class TestBatchLogger:
+    """BatchLoggerクラスのテスト。"""
+
+    def test_logs_step_metrics_to_mlflow(self, mlflow_tracking_uri: str) -> None:
+        """ステップごとのメトリクスとパラメータがMLflowに記録されることを確認する。"""
+        with mlflow.start_run() as run:
+            with BatchLogger() as logger:
+                logger.log_params({"epochs": 5})
+                for step in range(10):
+                    logger.log_metric("train_loss", 1.0 / (step + 1), step=step)
+
+        client = mlflow.tracking.MlflowClient()
+        history = client.get_metric_history(run.info.run_id, "train_loss")
+
+        assert sorted(metric.step for metric in history) == list(range(10))
+        assert mlflow.get_run(run.info.run_id).data.params["epochs"] == "5"
+
+    def test_log_metric_does_not_block(self) -> None:
+        """書き込みが止まっていてもlog_metricが即座に戻ることを確認する。"""
+        client = RecordingClient()
+        client.gate.clear()
+        logger = BatchLogger("run", flush_interval=0.01, client=client)  # type: ignore[arg-type]
+
+        for step in range(1000):
+            logger.log_metric("train_loss", 0.1, step=step)
+        assert client.batches == []
+
+        client.gate.set()
+        logger.close()
+        assert sum(len(metrics) for metrics, _, _ in client.batches) == 1000
+
+    def test_batches_respect_mlflow_limits(self) -> None:
+        """1回のlog_batchがMLflowの上限を超えないことを確認する。"""
+        client = RecordingClient()
+        with BatchLogger("run", client=client) as logger:  # type: ignore[arg-type]
+            for step in range(2500):
+                logger.log_metric("train_loss", 0.1, step=step)
+            logger.log_params({f"p{i}": i for i in range(150)})
+
+        for metrics, params, tags in client.batches:
+            assert len(params) <= MAX_PARAMS_TAGS_PER_BATCH
+            assert len(metrics) + len(params) + len(tags) <= MAX_ENTITIES_PER_BATCH
+        assert sum(len(metrics) for metrics, _, _ in client.batches) == 2500
+
+    def test_stopped_thread_is_raised_on_flush(self) -> None:
+        """バックグラウンドスレッドが終了した場合、flushが待ち続けずに例外を送出することを確認する。"""
+        logger = BatchLogger("run", client=FailingClient(WorkerStopped()))  # type: ignore[arg-type]
+        logger.log_metric("train_loss", 0.1)
+
+        with pytest.raises(WorkerStopped):
+            logger.flush()
+        with pytest.raises(RuntimeError, match="has stopped"):
+            logger.close()
+
+    def test_exit_does_not_mask_exception(self) -> None:
+        """withブロック内の例外が書き込みエラーで置き換えられないことを確認する。"""
+        client = FailingClient(ConnectionError("tracking server unavailable"))
+        with pytest.raises(ValueError):
+            with BatchLogger("run", client=client) as logger:  # type: ignore[arg-type]
+                logger.log_metric("train_loss", 0.1)
+                raise ValueError("training failed")
+
+    def test_exit_raises_write_errors(self) -> None:
+        """例外なく抜けたwithブロックでは書き込みエラーが送出されることを確認する。"""
+        client = FailingClient(ConnectionError("tracking server unavailable"))
+        with pytest.raises(ConnectionError):
+            with BatchLogger("run", client=client) as logger:  # type: ignore[arg-type]
+                logger.log_metric("train_loss", 0.1)
@@ -6,13 +6,29 @@ PyTorchモデルのONNXエクスポートと検証をテストします。
 
 import os
 import tempfile
+from pathlib import Path
 
+import onnx
 import pytest
 import torch
 import torch.nn as nn
+from torch.utils.data import DataLoader, TensorDataset
 
 from cifar10_cnn.model import SimpleCNN
-from cifar10_cnn.onnx_exporter import export_to_onnx, validate_onnx_model
+from cifar10_cnn.onnx_exporter import (
+    HARNESS_BATCH_SIZES,
+    check_parity_report,
+    compare_onnx_models,
+    export_to_onnx,
+    load_parity_baseline,
+    onnx_model_size_bytes,
+    optimize_onnx_model,
+    quantize_onnx_model,
+    run_export_gate,
+    run_parity_harness,
+    save_parity_baseline,
+    validate_onnx_model,
+)
 
 
 @pytest.fixture
@@ -58,6 +74,15 @@ class TestExportToOnnx:
 
         assert os.path.exists(temp_onnx_path)
 
+    def test_export_to_onnx_embeds_weights(self, model: nn.Module, tmp_path: Path) -> None:
+        """重みが外部データではなくONNXファイル自体に含まれることを確認する。"""
+        onnx_path = tmp_path / "model.onnx"
+        export_to_onnx(model, str(onnx_path))
+
+        assert [path.name for path in tmp_path.iterdir()] == ["model.onnx"]
+        n_params = sum(p.numel() for p in model.parameters())
+        assert os.path.getsize(onnx_path) > n_params * 4
+
     def test_export_to_onnx_eval_mode(self, model: nn.Module, temp_onnx_path: str) -> None:
         """export_to_onnx関数がモデルを評価モードにすることを確認する。"""
         # 学習モードにする
@@ -115,3 +140,222 @@ class TestValidateOnnxModel:
         # validate_onnx_modelがTrueを返せば、出力が一致していることを意味する
         result = validate_onnx_model(model, temp_onnx_path, test_input)
         assert result is True
+
+
+@pytest.fixture
+def test_loader() -> DataLoader:
+    """キャリブレーション・評価用のダミーDataLoaderを作成する。"""
+    images = torch.randn(32, 3, 32, 32)
+    labels = torch.randint(0, 10, (32,))
+    return DataLoader(TensorDataset(images, labels), batch_size=8)
+
+
+class TestPostExportOptimization:
+    """エクスポート後の最適化・量子化のテスト。"""
+
+    def test_optimize_onnx_model(self, model: nn.Module, tmp_path: Path) -> None:
+        """最適化済みモデルが元のモデルの隣に保存され、予測が一致することを確認する。"""
+        onnx_path = str(tmp_path / "model.onnx")
+        export_to_onnx(model, onnx_path)
+
+        optimized_path = optimize_onnx_model(onnx_path)
+
+        assert optimized_path == str(tmp_path / "model.opt.onnx")
+        assert validate_onnx_model(model, optimized_path, torch.randn(4, 3, 32, 32))
+
+    def test_optimize_invalid_level(self) -> None:
+        """不明な最適化レベルでエラーになることを確認する。"""
+        with pytest.raises(ValueError):
+            optimize_onnx_model("model.onnx", level="fastest")
+
+    def test_model_size_includes_external_data(self, model: nn.Module, tmp_path: Path) -> None:
+        """外部データに重みを保存したモデルのサイズに外部データファイルが含まれることを確認する。"""
+        onnx_path = str(tmp_path / "model.onnx")
+        export_to_onnx(model, onnx_path)
+        external_path = str(tmp_path / "external.onnx")
+        onnx.save_model(
+            onnx.load(onnx_path),
+            external_path,
+            save_as_external_data=True,
+            location="external.onnx.data",
+            size_threshold=0,
+        )
+
+        assert os.path.getsize(external_path) < os.path.getsize(onnx_path)
+        assert onnx_model_size_bytes(external_path) == os.path.getsize(external_path) + (
+            os.path.getsize(tmp_path / "external.onnx.data")
+        )
+
+    @pytest.mark.parametrize("mode", ["dynamic", "static"])
+    def test_quantize_onnx_model(
+        self, model: nn.Module, tmp_path: Path, test_loader: DataLoader, mode: str
+    ) -> None:
+        """量子化済みモデルが元のモデルより小さく、推論できることを確認する。"""
+        onnx_path = str(tmp_path / "model.onnx")
+        export_to_onnx(model, onnx_path)
+
+        quantized_path = quantize_onnx_model(onnx_path, mode=mode, calibration_loader=test_loader)
+
+        assert quantized_path == str(tmp_path / f"model.int8_{mode}.onnx")
+        assert onnx_model_size_bytes(quantized_path) < onnx_model_size_bytes(onnx_path)
+        is_valid = validate_onnx_model(model, quantized_path, torch.randn(4, 3, 32, 32))
+        assert isinstance(is_valid, bool)
+
+    def test_static_quantization_requires_calibration(
+        self, model: nn.Module, temp_onnx_path: str
+    ) -> None:
+        """静的量子化にキャリブレーションデータが必要なことを確認する。"""
+        export_to_onnx(model, temp_onnx_path)
+        with pytest.raises(ValueError):
+            quantize_onnx_model(temp_onnx_path, mode="static")
+
+    def test_compare_onnx_models(
+        self, model: nn.Module, tmp_path: Path, test_loader: DataLoader
+    ) -> None:
+        """比較結果にサイズ・レイテンシ・精度とその差分が含まれることを確認する。"""
+        onnx_path = str(tmp_path / "model.onnx")
+        export_to_onnx(model, onnx_path)
+        variant_paths = {
+            "optimized": optimize_onnx_model(onnx_path),
+            "int8_dynamic": quantize_onnx_model(onnx_path, mode="dynamic"),
+        }
+
+        report = compare_onnx_models(model, onnx_path, variant_paths, test_loader, n_runs=3)
+
+        for name in ("original", "optimized", "int8_dynamic"):
+            assert report[f"{name}_size_bytes"] > 0
+            assert report[f"{name}_single_row_ms"] > 0
+            assert report[f"{name}_batch_ms"] > 0
+            assert 0 <= report[f"{name}_accuracy"] <= 100
+        assert report["original_valid"] == 1.0
+        assert report["optimized_valid"] == 1.0
+        assert report["optimized_accuracy_delta"] == 0.0
+        assert report["int8_dynamic_size_bytes_delta"] < 0
+
+
+class TestParityHarness:
+    """run_parity_harness関数とcheck_parity_report関数のテスト。"""
+
+    def test_report_covers_every_batch_size(self, model: nn.Module, temp_onnx_path: str) -> None:
+        """全バッチサイズのパリティとレイテンシが記録され、基準を満たすことを確認する。"""
+        export_to_onnx(model, temp_onnx_path)
+
+        report = run_parity_harness(model, temp_onnx_path, torch.randn(16, 3, 32, 32), n_runs=3)
+
+        for batch_size in HARNESS_BATCH_SIZES:
+            prefix = f"batch_{batch_size}"
+            assert report[f"{prefix}_label_agreement"] == 1.0
+            assert report[f"{prefix}_max_abs_error"] < 1e-4
+            for runtime in ("native", "onnx"):
+                p50 = report[f"{prefix}_{runtime}_p50_ms"]
+                assert 0 < p50 <= report[f"{prefix}_{runtime}_p99_ms"]
+        check_parity_report(report)
+
+    def test_custom_batch_sizes(self, model: nn.Module, temp_onnx_path: str) -> None:
+        """指定したバッチサイズだけが計測されることを確認する。"""
+        export_to_onnx(model, temp_onnx_path)
+
+        report = run_parity_harness(
+            model, temp_onnx_path, torch.randn(2, 3, 32, 32), batch_sizes=[3], n_runs=2
+        )
+
+        assert sorted(report) == sorted(
+            f"batch_3_{name}"
+            for name in (
+                "max_abs_error",
+                "label_agreement",
+                "native_p50_ms",
+                "native_p99_ms",
+                "onnx_p50_ms",
+                "onnx_p99_ms",
+            )
+        )
+
+    @staticmethod
+    def _report(**overrides: float) -> dict:
+        report = {
+            "batch_8_max_abs_error": 0.0,
+            "batch_8_label_agreement": 1.0,
+            "batch_8_native_p50_ms": 10.0,
+            "batch_8_native_p99_ms": 12.0,
+            "batch_8_onnx_p50_ms": 1.0,
+            "batch_8_onnx_p99_ms": 2.0,
+        }
+        report.update(overrides)
+        return report
+
+    @pytest.mark.parametrize(
+        "overrides, kwargs",
+        [
+            ({"batch_8_max_abs_error": 0.1}, {}),
+            ({"batch_8_label_agreement": 0.99}, {}),
+            ({"batch_8_onnx_p50_ms": 11.0}, {"max_latency_ratio": 1.0}),
+            ({}, {"latency_budget_ms": {8: 1.5}}),
+        ],
+    )
+    def test_regressions_fail(self, overrides: dict, kwargs: dict) -> None:
+        """パリティやレイテンシが基準を満たさない場合にエラーになることを確認する。"""
+        with pytest.raises(ValueError, match="batch_8"):
+            check_parity_report(self._report(**overrides), **kwargs)
+
+    def test_latency_ratio_is_opt_in(self) -> None:
+        """PyTorchより遅いONNXモデルでも、倍率を指定しなければ通過することを確認する。"""
+        check_parity_report(self._report(batch_8_onnx_p50_ms=20.0))
+
+    def test_baseline_regression_fails(self) -> None:
+        """ベースラインからp50が回帰した場合にエラーになることを確認する。"""
+        baseline = self._report()
+
+        check_parity_report(self._report(batch_8_onnx_p50_ms=1.5), baseline=baseline)
+        with pytest.raises(ValueError, match="baseline p50"):
+            check_parity_report(self._report(batch_8_onnx_p50_ms=2.5), baseline=baseline)
+        with pytest.raises(ValueError, match="baseline p50"):
+            check_parity_report(
+                self._report(batch_8_onnx_p50_ms=1.5), baseline=baseline, max_baseline_ratio=1.2
+            )
+
+    def test_baseline_round_trip(self, tmp_path: Path) -> None:
+        """ベースラインがない場合は空で、保存したベースラインを読み込めることを確認する。"""
+        path = str(tmp_path / "parity.json")
+        assert load_parity_baseline(path) == {}
+
+        save_parity_baseline(path, {"original": self._report()})
+
+        assert load_parity_baseline(path) == {"original": self._report()}
+
+    def test_export_gate_checks_every_shipped_model(self, model: nn.Module, tmp_path: Path) -> None:
+        """出荷する全てのモデルが検証され、基準を満たさないモデルだけが報告されることを確認する。"""
+        onnx_path = str(tmp_path / "model.onnx")
+        export_to_onnx(model, onnx_path)
+        onnx_paths = {"original": onnx_path, "optimized": optimize_onnx_model(onnx_path)}
+        test_input = torch.randn(4, 3, 32, 32)
+
+        reports, failures = run_export_gate(model, onnx_paths, test_input, n_runs=2)
+
+        assert set(reports) == {"original", "optimized"}
+        assert failures == []
+
+        # 最適化済みモデルだけ、ベースラインより大幅に遅くなったとみなす
+        baseline = {
+            "optimized": {key: 1e-6 for key in reports["optimized"] if key.endswith("_p50_ms")}
+        }
+        _, failures = run_export_gate(model, onnx_paths, test_input, baseline=baseline, n_runs=2)
+
+        assert len(failures) == 1
+        assert failures[0].startswith("optimized:")
+
+    def test_export_gate_applies_overrides(self, model: nn.Module, tmp_path: Path) -> None:
+        """モデルごとに上書きしたパリティの基準で検証されることを確認する。"""
+        onnx_path = str(tmp_path / "model.onnx")
+        export_to_onnx(model, onnx_path)
+
+        _, failures = run_export_gate(
+            model,
+            {"original": onnx_path},
+            torch.randn(4, 3, 32, 32),
+            overrides={"original": {"max_abs_error": -1.0}},
+            n_runs=2,
+        )
+
+        assert len(failures) == 1
+        assert "max_abs_error" in failures[0]
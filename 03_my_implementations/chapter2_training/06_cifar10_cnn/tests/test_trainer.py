@@ -4,13 +4,17 @@
 モデルの学習と評価の機能をテストします。
 """
 
+from pathlib import Path
+
 import pytest
 import torch
 import torch.nn as nn
 from torch.utils.data import DataLoader, TensorDataset
 
+from cifar10_cnn.mlflow_manager import BatchLogger
 from cifar10_cnn.model import SimpleCNN
-from cifar10_cnn.trainer import evaluate_model, train_model
+from cifar10_cnn.onnx_exporter import export_to_onnx, validate_onnx_model
+from cifar10_cnn.trainer import configure_threads, evaluate_model, train_model
 
 
 @pytest.fixture
@@ -192,3 +196,143 @@ class TestTrainModel:
 
         # エラーなく完了することを確認
         assert result is not None
+
+
+class TestTrainModelLogging:
+    """train_model関数のメトリクス記録のテスト。"""
+
+    def test_train_model_logs_step_metrics(
+        self, model: nn.Module, dummy_data: tuple[DataLoader, DataLoader]
+    ) -> None:
+        """loggerを指定するとステップごと・エポックごとの損失が記録されることを確認する。"""
+
+        class RecordingClient:
+            def __init__(self) -> None:
+                self.metrics: list = []
+
+            def log_batch(self, run_id: str, metrics: list, params: list, tags: list) -> None:
+                self.metrics.extend(metrics)
+
+        train_loader, test_loader = dummy_data
+        client = RecordingClient()
+
+        with BatchLogger("run", client=client) as logger:  # type: ignore[arg-type]
+            train_model(model, train_loader, test_loader, epochs=2, device="cpu", logger=logger)
+
+        step_losses = [metric for metric in client.metrics if metric.key == "train_loss"]
+        epoch_losses = [metric for metric in client.metrics if metric.key == "train_epoch_loss"]
+
+        # 100サンプル / バッチサイズ10 = 10ステップ × 2エポック
+        assert sorted(metric.step for metric in step_losses) == list(range(20))
+        assert sorted(metric.step for metric in epoch_losses) == [0, 1]
+
+
+class TestCPUPerformanceMode:
+    """CPU性能設定のテスト。"""
+
+    def test_configure_threads(self) -> None:
+        """configure_threads関数がintra-opスレッド数を設定することを確認する。"""
+        original = torch.get_num_threads()
+        try:
+            threads = configure_threads(intra_op_threads=1)
+            assert threads["intra_op_threads"] == 1
+            assert torch.get_num_threads() == 1
+        finally:
+            torch.set_num_threads(original)
+
+    def test_channels_last_training(
+        self, model: nn.Module, dummy_data: tuple[DataLoader, DataLoader], tmp_path: Path
+    ) -> None:
+        """channels_lastで学習でき、学習後のモデルをそのままONNXにエクスポートできることを確認する。"""
+        train_loader, test_loader = dummy_data
+        result = train_model(model, train_loader, test_loader, epochs=1, channels_last=True)
+
+        assert "test_accuracy" in result
+        assert all(p.is_contiguous() for p in model.parameters())
+
+        onnx_path = str(tmp_path / "model.onnx")
+        export_to_onnx(model, onnx_path)
+        assert validate_onnx_model(model, onnx_path, torch.randn(4, 3, 32, 32))
+
+    def test_gradient_accumulation_matches_larger_batch(self) -> None:
+        """勾配累積が大きいバッチでの学習と同じ更新になることを確認する。"""
+        # 丸め誤差でAdamの更新が変わらないよう倍精度で比較する
+        torch.manual_seed(0)
+        images = torch.randn(40, 3, 32, 32, dtype=torch.float64)
+        labels = torch.randint(0, 10, (40,))
+        dataset = TensorDataset(images, labels)
+        test_loader = DataLoader(dataset, batch_size=20)
+
+        model_large = SimpleCNN().double()
+        model_accumulated = SimpleCNN().double()
+        model_accumulated.load_state_dict(model_large.state_dict())
+
+        train_model(model_large, DataLoader(dataset, batch_size=20), test_loader, epochs=1)
+        train_model(
+            model_accumulated,
+            DataLoader(dataset, batch_size=10),
+            test_loader,
+            epochs=1,
+            accumulation_steps=2,
+        )
+
+        for p_large, p_accumulated in zip(model_large.parameters(), model_accumulated.parameters()):
+            torch.testing.assert_close(p_large, p_accumulated)
+
+    def test_gradient_accumulation_partial_window(self) -> None:
+        """エポック末尾の端数のウィンドウも、同じ大きさのバッチでの学習と同じ更新になることを確認する。"""
+        torch.manual_seed(0)
+        images = torch.randn(50, 3, 32, 32, dtype=torch.float64)
+        labels = torch.randint(0, 10, (50,))
+        dataset = TensorDataset(images, labels)
+        test_loader = DataLoader(dataset, batch_size=25)
+
+        model_large = SimpleCNN().double()
+        model_accumulated = SimpleCNN().double()
+        model_accumulated.load_state_dict(model_large.state_dict())
+
+        # バッチ30件 + 端数20件 と、10件 × 累積3ステップ（最後のウィンドウは2ステップ）
+        train_model(model_large, DataLoader(dataset, batch_size=30), test_loader, epochs=1)
+        train_model(
+            model_accumulated,
+            DataLoader(dataset, batch_size=10),
+            test_loader,
+            epochs=1,
+            accumulation_steps=3,
+        )
+
+        for p_large, p_accumulated in zip(model_large.parameters(), model_accumulated.parameters()):
+            torch.testing.assert_close(p_large, p_accumulated)
+
+    def test_invalid_accumulation_steps(
+        self, model: nn.Module, dummy_data: tuple[DataLoader, DataLoader]
+    ) -> None:
+        """accumulation_stepsが1未満の場合はエラーになることを確認する。"""
+        train_loader, test_loader = dummy_data
+        with pytest.raises(ValueError):
+            train_model(model, train_loader, test_loader, accumulation_steps=0)
+
+    def test_throughput_metrics_logged(
+        self, model: nn.Module, dummy_data: tuple[DataLoader, DataLoader]
+    ) -> None:
+        """エポックごとのスループットと時間内訳が記録されることを確認する。"""
+
+        class RecordingClient:
+            def __init__(self) -> None:
+                self.metrics: list = []
+
+            def log_batch(self, run_id: str, metrics: list, params: list, tags: list) -> None:
+                self.metrics.extend(metrics)
+
+        train_loader, test_loader = dummy_data
+        client = RecordingClient()
+
+        with BatchLogger("run", client=client) as logger:  # type: ignore[arg-type]
+            train_model(model, train_loader, test_loader, epochs=2, logger=logger)
+
+        logged = {(metric.key, metric.step): metric.value for metric in client.metrics}
+        for epoch in range(2):
+            assert logged[("train_images_per_sec", epoch)] > 0
+            assert 0 <= logged[("train_data_wait_fraction", epoch)] <= 1
+            assert logged[("train_compute_seconds", epoch)] > 0
+            assert ("train_data_wait_seconds", epoch) in logged
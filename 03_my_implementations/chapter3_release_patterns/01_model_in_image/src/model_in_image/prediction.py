@@ -43,6 +43,7 @@ class Classifier:
         label: クラスインデックスとラベル名のマッピング
         input_name: モデルの入力名
         output_name: モデルの出力名
+        probability_name: 確率の出力名
     """
 
     def __init__(self, model_filepath: str, label_filepath: str):
@@ -59,6 +60,7 @@ class Classifier:
         self.label: Dict[str, str] = {}
         self.input_name: str = ""
         self.output_name: str = ""
+        self.probability_name: str = ""
 
         self.load_model()
         self.load_label()
@@ -80,6 +82,11 @@ class Classifier:
             self.classifier = rt.InferenceSession(self.model_filepath)
             self.input_name = self.classifier.get_inputs()[0].name
             self.output_name = self.classifier.get_outputs()[0].name
+            # 確率の出力名（エクスポート時のメタデータ、なければ2番目の出力）
+            metadata = self.classifier.get_modelmeta().custom_metadata_map
+            self.probability_name = metadata.get(
+                "probability_output", self.classifier.get_outputs()[1].name
+            )
             logger.info("モデルの読み込みが完了しました")
             logger.info(f"入力名: {self.input_name}, 出力名: {self.output_name}")
         except Exception as e:
@@ -128,21 +135,15 @@ class Classifier:
             # データをnumpy配列に変換
             np_data = np.array(data).astype(np.float32)
 
-            # 推論実行
-            prediction = self.classifier.run(None, {self.input_name: np_data})
-
-            # SVMモデルの出力は2番目の要素に確率が入っている
-            # prediction[1]は辞書型で、キーが各クラス、値が確率
-            if isinstance(prediction[1], list) and len(prediction[1]) > 0:
-                probabilities = prediction[1][0]
-                if isinstance(probabilities, dict):
-                    # 辞書の値を配列に変換（クラス順）
-                    output = np.array(list(probabilities.values()))
-                else:
-                    output = np.array(probabilities)
-            else:
-                # フォールバック: prediction[1]を直接使用
-                output = np.array(prediction[1])
+            # 推論実行（確率の出力のみ取得）
+            probabilities = self.classifier.run(
+                [self.probability_name], {self.input_name: np_data}
+            )[0]
+
+            # 確率はテンソル出力なら (N, クラス数) のndarray、ZipMap出力なら行ごとの辞書のリスト
+            if isinstance(probabilities, list):
+                probabilities = np.array([list(row.values()) for row in probabilities])
+            output = probabilities[0]
 
             logger.info(f"推論結果: {output}")
             return output
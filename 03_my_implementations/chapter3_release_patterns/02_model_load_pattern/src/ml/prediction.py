@@ -35,6 +35,7 @@ class Classifier:
         self.label: Dict[str, str] = {}
         self.input_name = ""
         self.output_name = ""
+        self.probability_name = ""
 
         self.load_model()
         self.load_label()
@@ -45,6 +46,11 @@ class Classifier:
         self.classifier = rt.InferenceSession(self.model_filepath)
         self.input_name = self.classifier.get_inputs()[0].name
         self.output_name = self.classifier.get_outputs()[0].name
+        # 確率の出力名（エクスポート時のメタデータ、なければ2番目の出力）
+        metadata = self.classifier.get_modelmeta().custom_metadata_map
+        self.probability_name = metadata.get(
+            "probability_output", self.classifier.get_outputs()[1].name
+        )
         logger.info(f"model loaded successfully")
 
     def load_label(self) -> None:
@@ -65,8 +71,11 @@ class Classifier:
             各クラスの確率値（shape: [3]）
         """
         np_data = np.array(data).astype(np.float32)
-        prediction = self.classifier.run(None, {self.input_name: np_data})
-        output = np.array(list(prediction[1][0].values()))
+        probabilities = self.classifier.run([self.probability_name], {self.input_name: np_data})[0]
+        # 確率はテンソル出力なら (N, クラス数) のndarray、ZipMap出力なら行ごとの辞書のリスト
+        if isinstance(probabilities, list):
+            probabilities = np.array([list(row.values()) for row in probabilities])
+        output = probabilities[0]
         logger.info(f"predict proba: {output}")
         return output
 
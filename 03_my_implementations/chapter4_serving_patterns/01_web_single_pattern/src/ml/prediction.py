@@ -49,6 +49,7 @@ class Classifier:
         self.label: Dict[str, str] = {}
         self.input_name: str = ""
         self.output_name: str = ""
+        self.probability_name: str = ""
 
         self.load_model()
         self.load_label()
@@ -58,6 +59,11 @@ class Classifier:
         self.classifier = rt.InferenceSession(self.model_filepath)
         self.input_name = self.classifier.get_inputs()[0].name
         self.output_name = self.classifier.get_outputs()[0].name
+        # 確率の出力名（エクスポート時のメタデータ、なければ2番目の出力）
+        metadata = self.classifier.get_modelmeta().custom_metadata_map
+        self.probability_name = metadata.get(
+            "probability_output", self.classifier.get_outputs()[1].name
+        )
 
     def load_label(self):
         """ラベルファイルを読み込む"""
@@ -75,9 +81,11 @@ class Classifier:
             確率値の配列 [setosa確率, versicolor確率, virginica確率]
         """
         np_data = np.array(data).astype(np.float32)
-        prediction = self.classifier.run(None, {self.input_name: np_data})
-        # prediction[1]は辞書形式で確率値を含む
-        output = np.array(list(prediction[1][0].values()))
+        probabilities = self.classifier.run([self.probability_name], {self.input_name: np_data})[0]
+        # 確率はテンソル出力なら (N, クラス数) のndarray、ZipMap出力なら行ごとの辞書のリスト
+        if isinstance(probabilities, list):
+            probabilities = np.array([list(row.values()) for row in probabilities])
+        output = probabilities[0]
         return output
 
     def predict_label(self, data: List[List[float]]) -> str:
@@ -44,6 +44,7 @@ class Classifier:
         self.label: Dict[str, str] = {}
         self.input_name = ""
         self.output_name = ""
+        self.probability_name = ""
 
         self.load_model()
         self.load_label()
@@ -54,6 +55,11 @@ class Classifier:
         self.classifier = rt.InferenceSession(self.model_filepath)
         self.input_name = self.classifier.get_inputs()[0].name
         self.output_name = self.classifier.get_outputs()[0].name
+        # 確率の出力名（エクスポート時のメタデータ、なければ2番目の出力）
+        metadata = self.classifier.get_modelmeta().custom_metadata_map
+        self.probability_name = metadata.get(
+            "probability_output", self.classifier.get_outputs()[1].name
+        )
         logger.info(f"Model loaded successfully. Input: {self.input_name}, Output: {self.output_name}")
 
     def load_label(self) -> None:
@@ -74,11 +80,12 @@ class Classifier:
             各クラスの確率値（ndarray）
         """
         np_data = np.array(data).astype(np.float32)
-        prediction = self.classifier.run(None, {self.input_name: np_data})
+        probabilities = self.classifier.run([self.probability_name], {self.input_name: np_data})[0]
 
-        # ONNX Runtimeの出力形式: prediction[1][0]が確率値のdict
-        # 例: {0: 0.971, 1: 0.016, 2: 0.013}
-        output = np.array(list(prediction[1][0].values()))
+        # 確率はテンソル出力なら (N, クラス数) のndarray、ZipMap出力なら行ごとの辞書のリスト
+        if isinstance(probabilities, list):
+            probabilities = np.array([list(row.values()) for row in probabilities])
+        output = probabilities[0]
         logger.info(f"Prediction probabilities: {output}")
 
         return output